@@ -6,17 +6,24 @@ from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import func, String
+from sqlalchemy import func, select, String
 
 from app.core.database import get_db
 from app.api import deps
 from app.models.user import User, UserRole
 from app.models.waste_report import WasteReport, WasteReportStatus
 from app.models.household import SegregationLog
-from app.models.carbon import CarbonActivity, CarbonActivityType
+from app.models.carbon import CarbonActivityType
 from app.models.bulk import BulkGenerator, OrganizationStatus
 from app.schemas.user import UserRead, UserRole as UserRoleSchema
 from app.core.carbon_engine import record_carbon_activity, PCC_PER_KG_CO2
+from app.services.analytics_rollup_service import (
+    carbon_breakdown,
+    carbon_daily,
+    rollups_refreshed_at,
+    segregation_totals,
+)
+from app.services.auth_session_service import revoke_user_sessions
 from app.services.pcc_award_service import award_reference
 
 
@@ -42,6 +49,8 @@ class AdminSummary(BaseModel):
 
     total_carbon_kg: float
     total_pcc_tokens: float
+    # Segregation and carbon figures are as of this rollup refresh (None: never refreshed).
+    rollups_refreshed_at: Optional[datetime] = None
 
 
 class CarbonDailyPoint(BaseModel):
@@ -56,6 +65,7 @@ class CarbonSummary(BaseModel):
     by_role: Dict[str, Dict[str, float]]
     by_activity_type: Dict[str, Dict[str, float]]
     daily: List[CarbonDailyPoint]
+    rollups_refreshed_at: Optional[datetime] = None
 
 
 class AwardPCCBody(BaseModel):
@@ -119,44 +129,41 @@ def get_admin_summary(
     db: Session = Depends(get_db),
     current_user=Depends(deps.require_super_admin),
 ):
-    total_users = db.query(User).count()
-    total_citizens = db.query(User).filter(User.role == UserRole.CITIZEN).count()
-    total_workers = db.query(User).filter(User.role == UserRole.WASTE_WORKER).count()
-    total_bulk = db.query(User).filter(User.role == UserRole.BULK_GENERATOR).count()
-    pending_approvals = db.query(User).filter(User.is_active.is_(False)).count()
-
-    total_waste_reports = db.query(WasteReport).count()
-    open_waste_reports = (
-        db.query(WasteReport)
-        .filter(WasteReport.status == WasteReportStatus.OPEN.value)
-        .count()
-    )
-    resolved_waste_reports = (
-        db.query(WasteReport)
-        .filter(WasteReport.status == WasteReportStatus.RESOLVED.value)
-        .count()
-    )
-
-    total_segregation_logs = db.query(SegregationLog).count()
-    avg_score = db.query(func.avg(SegregationLog.segregation_score)).scalar()
-    avg_score = float(avg_score) if avg_score is not None else None
+    users = db.execute(
+        select(
+            func.count(),
+            func.count().filter(User.role == UserRole.CITIZEN),
+            func.count().filter(User.role == UserRole.WASTE_WORKER),
+            func.count().filter(User.role == UserRole.BULK_GENERATOR),
+            func.count().filter(User.is_active.is_(False)),
+        )
+    ).one()
+    reports = db.execute(
+        select(
+            func.count(),
+            func.count().filter(WasteReport.status == WasteReportStatus.OPEN.value),
+            func.count().filter(WasteReport.status == WasteReportStatus.RESOLVED.value),
+        )
+    ).one()
 
-    total_carbon = db.query(func.sum(CarbonActivity.carbon_kg)).scalar() or 0.0
-    total_pcc = db.query(func.sum(CarbonActivity.pcc_tokens)).scalar() or 0.0
+    # Segregation and carbon figures come from the daily rollups.
+    total_segregation_logs, avg_score = segregation_totals(db)
+    carbon = carbon_breakdown(db)
 
     return AdminSummary(
-        total_users=total_users,
-        total_citizens=total_citizens,
-        total_waste_workers=total_workers,
-        total_bulk_generators=total_bulk,
-        pending_approvals=pending_approvals,
-        total_waste_reports=total_waste_reports,
-        open_waste_reports=open_waste_reports,
-        resolved_waste_reports=resolved_waste_reports,
+        total_users=users[0],
+        total_citizens=users[1],
+        total_waste_workers=users[2],
+        total_bulk_generators=users[3],
+        pending_approvals=users[4],
+        total_waste_reports=reports[0],
+        open_waste_reports=reports[1],
+        resolved_waste_reports=reports[2],
         total_segregation_logs=total_segregation_logs,
         avg_segregation_score=avg_score,
-        total_carbon_kg=float(total_carbon),
-        total_pcc_tokens=float(total_pcc),
+        total_carbon_kg=carbon.total_carbon_kg,
+        total_pcc_tokens=carbon.total_pcc_tokens,
+        rollups_refreshed_at=rollups_refreshed_at(db),
     )
 
 
@@ -244,6 +251,8 @@ def deactivate_user(
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = False
     db.add(user)
+    # Access tokens are trusted until they expire; revoking refresh tokens ends the sessions.
+    revoke_user_sessions(db, user.id)
     db.commit()
     db.refresh(user)
     return user
@@ -268,6 +277,8 @@ def update_user_role(
 
     user.role = UserRole(body.role.value)
     db.add(user)
+    # Sessions carry the role as a claim; make the user sign in again with the new one.
+    revoke_user_sessions(db, user.id)
     db.commit()
     db.refresh(user)
     return user
@@ -278,76 +289,32 @@ def update_user_role(
 # -------------------------
 @router.get("/analytics/carbon", response_model=CarbonSummary)
 def get_carbon_summary(
-    days: int = Query(30, ge=1, le=365),
+    days: int = Query(30, ge=1, le=36500),
+    start: Optional[date] = Query(None, description="First day of the daily series (overrides days)"),
+    end: Optional[date] = Query(None, description="Last day of the daily series; defaults to today"),
+    ward: Optional[str] = Query(None, description="Restrict the daily series to one ward"),
     db: Session = Depends(get_db),
     current_user=Depends(deps.require_super_admin),
 ):
-    since = datetime.utcnow() - timedelta(days=days)
-
-    total_carbon = db.query(func.sum(CarbonActivity.carbon_kg)).scalar() or 0.0
-    total_pcc = db.query(func.sum(CarbonActivity.pcc_tokens)).scalar() or 0.0
-
-    by_role: Dict[str, Dict[str, float]] = {}
-    rows = (
-        db.query(
-            User.role,
-            func.sum(CarbonActivity.carbon_kg),
-            func.sum(CarbonActivity.pcc_tokens),
-        )
-        .join(User, CarbonActivity.user_id == User.id)
-        .group_by(User.role)
-        .all()
-    )
-    for role, c_sum, p_sum in rows:
-        by_role[role.value] = {
-            "carbon_kg": float(c_sum or 0.0),
-            "pcc_tokens": float(p_sum or 0.0),
-        }
-
-    by_activity_type: Dict[str, Dict[str, float]] = {}
-    rows = (
-        db.query(
-            CarbonActivity.activity_type,
-            func.sum(CarbonActivity.carbon_kg),
-            func.sum(CarbonActivity.pcc_tokens),
-        )
-        .group_by(CarbonActivity.activity_type)
-        .all()
-    )
-    for atype, c_sum, p_sum in rows:
-        by_activity_type[atype.value] = {
-            "carbon_kg": float(c_sum or 0.0),
-            "pcc_tokens": float(p_sum or 0.0),
-        }
-
-    rows = (
-        db.query(
-            func.date_trunc("day", CarbonActivity.created_at).label("day"),
-            func.sum(CarbonActivity.carbon_kg),
-            func.sum(CarbonActivity.pcc_tokens),
-        )
-        .filter(CarbonActivity.created_at >= since)
-        .group_by("day")
-        .order_by("day")
-        .all()
-    )
-
-    daily_points: List[CarbonDailyPoint] = []
-    for day, c_sum, p_sum in rows:
-        daily_points.append(
-            CarbonDailyPoint(
-                date=day.date(),
-                carbon_kg=float(c_sum or 0.0),
-                pcc_tokens=float(p_sum or 0.0),
-            )
-        )
+    # Served from carbon_daily_rollups, so the range costs the same however long it is.
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=days)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+
+    carbon = carbon_breakdown(db)
+    daily_points = [
+        CarbonDailyPoint(date=day, carbon_kg=c_sum, pcc_tokens=p_sum)
+        for day, c_sum, p_sum in carbon_daily(db, start=start, end=end, ward=ward)
+    ]
 
     return CarbonSummary(
-        total_carbon_kg=float(total_carbon),
-        total_pcc_tokens=float(total_pcc),
-        by_role=by_role,
-        by_activity_type=by_activity_type,
+        total_carbon_kg=carbon.total_carbon_kg,
+        total_pcc_tokens=carbon.total_pcc_tokens,
+        by_role=carbon.by_role,
+        by_activity_type=carbon.by_activity_type,
         daily=daily_points,
+        rollups_refreshed_at=rollups_refreshed_at(db),
     )
 
 
@@ -544,7 +511,7 @@ def award_pcc_tokens(
         pcc_tokens=tokens,
         metadata=details,
     )
-
+    db.commit()
     db.refresh(user)
 
     return {
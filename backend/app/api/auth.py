@@ -1,21 +1,23 @@
 # app/api/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.security import (
-    verify_password,
+    check_password_async,
     get_password_hash,
-    create_access_token,
 )
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserRead, UserProfileUpdate
-from app.schemas.auth import Token
+from app.schemas.auth import RefreshTokenRequest, Token
 from app.schemas.bulk import BulkRegisterRequest
 from app.api import deps
+from app.services.auth_session_service import end_session, rotate_refresh_token, start_session
 from app.services.bulk_service import register_bulk_generator
+from app.services.rate_limit_service import RateLimit, by_client, enforce_rate_limit, rate_limit
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -96,24 +98,66 @@ def register_bulk_user(
 # ---------------------------------------------------------
 # LOGIN (JWT)
 # ---------------------------------------------------------
-@router.post("/login", response_model=Token)
-def login(
+# Guessing is limited per address and account. The per-address ceiling alone
+# is high, since a depot's workers can all sign in from one NAT address.
+LOGIN_ACCOUNT_LIMIT = RateLimit(requests=10, period=60)
+
+
+def login_rate_limit(request: Request, form_data: OAuth2PasswordRequestForm = Depends()) -> None:
+    enforce_rate_limit("auth.login.account", LOGIN_ACCOUNT_LIMIT, f"{by_client(request)}:{form_data.username.strip().lower()}")
+
+
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(rate_limit("auth.login", 100, per_seconds=60)), Depends(login_rate_limit)],
+)
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
     """Standard email/password login."""
 
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await run_in_threadpool(db.query(User).filter(User.email == form_data.username).first)
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Unknown emails still pay for one verify, so response time does not reveal them.
+    ok, new_hash = await check_password_async(form_data.password, user.hashed_password if user else None)
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password.",
         )
 
-    token = create_access_token(subject=user.id)
+    if new_hash:
+        # Stored hash predates the current PASSWORD_HASH_ROUNDS; upgrade it transparently.
+        # Committed together with the new session below.
+        user.hashed_password = new_hash
+
+    pair = await run_in_threadpool(start_session, db, user)
+
+    return Token(**pair.__dict__)
+
 
-    return Token(access_token=token)
+# ---------------------------------------------------------
+# REFRESH / LOGOUT
+# ---------------------------------------------------------
+@router.post("/refresh", response_model=Token, dependencies=[Depends(rate_limit("auth.refresh", 30, per_seconds=60))])
+def refresh_tokens(
+    payload: RefreshTokenRequest,
+    db: Session = Depends(get_db),
+):
+    """Rotate a refresh token: the presented one is consumed and a new pair is returned."""
+    pair = rotate_refresh_token(db, payload.refresh_token)
+    return Token(**pair.__dict__)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    payload: RefreshTokenRequest,
+    db: Session = Depends(get_db),
+):
+    """End the session the refresh token belongs to. Its access token lapses within minutes."""
+    end_session(db, payload.refresh_token)
 
 
 # ---------------------------------------------------------
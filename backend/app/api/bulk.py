@@ -83,6 +83,8 @@ def bulk_me(
                 "address": org.address,
                 "ward": org.ward,
                 "pincode": org.pincode,
+                "latitude": org.latitude,
+                "longitude": org.longitude,
                 "status": org.status,
             },
             "summary": summary,
@@ -119,6 +121,8 @@ def bulk_me_update(
                 "address": org.address,
                 "ward": org.ward,
                 "pincode": org.pincode,
+                "latitude": org.latitude,
+                "longitude": org.longitude,
                 "status": org.status,
             },
         },
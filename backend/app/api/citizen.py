@@ -1,22 +1,21 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import UTC, date, datetime, timedelta
+from datetime import UTC, date, datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.database import get_db
+from app.core.http_cache import conditional_json_response
 from app.models.admin_ops import PlatformSetting
 from app.models.badge import Badge, UserBadge
 from app.models.bulk import Transaction
 from app.models.household import Household, HouseholdMember, SegregationLog
 from app.models.notification import Notification
-from app.models.pcc import EmissionFactor
 from app.models.training import TrainingModule, TrainingProgress
 from app.models.user import User
 from app.models.waste_report import WasteReport, WasteReportStatus
@@ -37,11 +36,18 @@ from app.schemas.citizen import (
     TrainingModuleCitizenOut,
     WasteReportCreateIn,
     WasteReportOut,
-    WeeklyBreakdownPoint,
-    WeeklyScorePoint,
 )
 from app.schemas.waste_classes import WASTE_CLASS_IDS
 from app.services.badge_engine import list_user_badge_items
+from app.services.citizen_dashboard_service import (
+    DEFAULT_PCC_UNIT_KGCO2E,
+    PCC_UNIT_SETTING,
+    build_citizen_summary,
+    setting_number,
+)
+from app.services.segregation_summary_service import cached_segregation_summary
+from app.services.streak_service import record_segregation_activity
+from app.services.wallet_service import user_wallet_totals
 from app.services.waste_report_service import create_waste_report
 
 router = APIRouter(prefix="/citizen", tags=["citizen"])
@@ -69,26 +75,7 @@ def _setting_number(db: Session, key: str, default: float) -> float:
     row = db.query(PlatformSetting).filter(PlatformSetting.key == key).first()
     if not row:
         return default
-    v: Any = row.value_json
-    if isinstance(v, dict):
-        v = v.get("value", v.get(key))
-    try:
-        return float(v)
-    except (TypeError, ValueError):
-        return default
-
-
-def _load_emission_factors(db: Session) -> dict[str, float]:
-    factors = {r.category.lower(): float(r.kgco2e_per_kg) for r in db.query(EmissionFactor).filter(EmissionFactor.active.is_(True)).all()}
-    return {
-        "dry": factors.get("dry", 1.0),
-        "wet": factors.get("wet", 0.5),
-        "reject": factors.get("reject", 1.5),
-    }
-
-
-def _week_start(d: date) -> date:
-    return d - timedelta(days=d.weekday())
+    return setting_number(row.value_json, key, default)
 
 
 def _ensure_household_member(db: Session, user_id: int, household_id: int, make_primary: bool = False) -> HouseholdMember:
@@ -196,88 +183,13 @@ def _waste_report_out(r: WasteReport) -> WasteReportOut:
 
 @router.get("/summary")
 def get_citizen_summary(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.require_citizen),
-) -> dict[str, Any]:
-    reports_total = db.query(WasteReport).filter(WasteReport.reporter_id == current_user.id).count()
-    reports_pending = (
-        db.query(WasteReport)
-        .filter(
-            WasteReport.reporter_id == current_user.id,
-            WasteReport.status.in_([WasteReportStatus.OPEN.value, WasteReportStatus.IN_PROGRESS.value]),
-        )
-        .count()
-    )
-    reports_resolved = (
-        db.query(WasteReport)
-        .filter(WasteReport.reporter_id == current_user.id, WasteReport.status == WasteReportStatus.RESOLVED.value)
-        .count()
-    )
-
-    today = datetime.now(UTC).date()
-    today_log = (
-        db.query(SegregationLog)
-        .filter(SegregationLog.citizen_id == current_user.id, SegregationLog.log_date == today)
-        .order_by(SegregationLog.created_at.desc())
-        .first()
-    )
-
-    done_dates = {
-        row[0]
-        for row in db.query(SegregationLog.log_date)
-        .filter(SegregationLog.citizen_id == current_user.id)
-        .distinct()
-        .all()
-        if row[0]
-    }
-    streak = 0
-    cursor = today
-    while cursor in done_dates:
-        streak += 1
-        cursor = cursor - timedelta(days=1)
-
-    training_total = (
-        db.query(TrainingModule)
-        .filter(TrainingModule.audience == "citizen", TrainingModule.is_published.is_(True))
-        .count()
-    )
-    training_completed = (
-        db.query(TrainingProgress)
-        .join(TrainingModule, TrainingModule.id == TrainingProgress.module_id)
-        .filter(
-            TrainingProgress.user_id == current_user.id,
-            TrainingProgress.completed.is_(True),
-            TrainingModule.audience == "citizen",
-            TrainingModule.is_published.is_(True),
-        )
-        .count()
-    )
-    badges_earned = db.query(UserBadge).filter(UserBadge.user_id == current_user.id).count()
-
-    pcc = get_pcc_summary(db=db, current_user=current_user)
-
-    return {
-        "training": {
-            "completed_modules": training_completed,
-            "total_modules": training_total,
-            "badges_earned": badges_earned,
-            "next_module_title": None,
-        },
-        "segregation": {
-            "today_status": "DONE" if today_log else "PENDING",
-            "today_score": float(today_log.quality_score if today_log and today_log.quality_score is not None else (today_log.segregation_score if today_log else 0)) if today_log else None,
-            "streak_days": streak,
-        },
-        "reports": {
-            "total": reports_total,
-            "pending": reports_pending,
-            "resolved": reports_resolved,
-        },
-        "carbon": {
-            "co2_saved_kg": pcc.co2_saved_kg,
-            "pcc_tokens": pcc.net_pcc,
-        },
-    }
+) -> Response:
+    summary = build_citizen_summary(db, user_id=current_user.id, today=datetime.now(UTC).date())
+    db.commit()
+    return conditional_json_response(request, summary)
 
 
 @router.get("/households", response_model=list[HouseholdOut])
@@ -551,6 +463,8 @@ def create_segregation_log_endpoint(
     )
     db.add(log)
     try:
+        db.flush()
+        record_segregation_activity(db, log)
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -622,91 +536,16 @@ def segregation_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.require_citizen),
 ) -> SegregationSummaryOut:
-    q = db.query(SegregationLog).filter(SegregationLog.citizen_id == current_user.id)
     if household_id is not None:
         _require_household_access(db, current_user.id, household_id)
-        q = q.filter(SegregationLog.household_id == household_id)
-
-    since = datetime.now(UTC).date() - timedelta(days=weeks * 7)
-    logs = q.filter(SegregationLog.log_date >= since).order_by(SegregationLog.log_date.asc()).all()
-
-    if not logs:
-        return SegregationSummaryOut(
-            avg_score=0,
-            totals={"dry_total": 0, "wet_total": 0, "reject_total": 0},
-            estimated_pcc_preview=0,
-            weekly_score_points=[],
-            weekly_breakdown=[],
-            recent_logs=[],
-        )
-
-    totals = {
-        "dry_total": round(sum(float(x.dry_kg or 0) for x in logs), 2),
-        "wet_total": round(sum(float(x.wet_kg or 0) for x in logs), 2),
-        "reject_total": round(sum(float(x.reject_kg or 0) for x in logs), 2),
-    }
-
-    avg_score = round(
-        sum(float(x.quality_score if x.quality_score is not None else x.segregation_score or 0) for x in logs) / len(logs),
-        2,
-    )
-
-    by_week: dict[date, list[SegregationLog]] = defaultdict(list)
-    for l in logs:
-        by_week[_week_start(l.log_date)].append(l)
-
-    weekly_score_points: list[WeeklyScorePoint] = []
-    weekly_breakdown: list[WeeklyBreakdownPoint] = []
-    for w in sorted(by_week.keys()):
-        items = by_week[w]
-        week_end = w + timedelta(days=6)
-        week_label = f"{w.strftime('%d %b')} - {week_end.strftime('%d %b')}"
-        weekly_score_points.append(
-            WeeklyScorePoint(
-                week_label=week_label,
-                avg_score=round(
-                    sum(float(i.quality_score if i.quality_score is not None else i.segregation_score or 0) for i in items) / len(items),
-                    2,
-                ),
-            )
-        )
-        weekly_breakdown.append(
-            WeeklyBreakdownPoint(
-                week_label=week_label,
-                dry_kg=round(sum(float(i.dry_kg or 0) for i in items), 2),
-                wet_kg=round(sum(float(i.wet_kg or 0) for i in items), 2),
-                reject_kg=round(sum(float(i.reject_kg or 0) for i in items), 2),
-            )
-        )
-
-    factors = _load_emission_factors(db)
-    pcc_unit = _setting_number(db, "pcc_unit_kgco2e", 10.0)
-    co2e = (
-        totals["dry_total"] * factors["dry"]
-        + totals["wet_total"] * factors["wet"]
-        + totals["reject_total"] * factors["reject"]
-    )
-    preview = round(co2e / pcc_unit, 2) if pcc_unit > 0 else 0
-
-    recent_logs = [
-        {
-            "date": x.log_date,
-            "dry": float(x.dry_kg or 0),
-            "wet": float(x.wet_kg or 0),
-            "reject": float(x.reject_kg or 0),
-            "score": float(x.quality_score if x.quality_score is not None else x.segregation_score or 0),
-        }
-        for x in logs[-10:][::-1]
-    ]
-
-    return SegregationSummaryOut(
-        avg_score=avg_score,
-        totals=totals,
-        estimated_pcc_preview=preview,
-        weekly_score_points=weekly_score_points,
-        weekly_breakdown=weekly_breakdown,
-        recent_logs=recent_logs,
+    summary = cached_segregation_summary(
+        db,
+        user_id=current_user.id,
+        household_id=household_id,
+        weeks=weeks,
+        today=datetime.now(UTC).date(),
     )
+    return SegregationSummaryOut(**summary)
 
 
 @router.get("/pcc/summary", response_model=CitizenPccSummaryOut)
@@ -714,17 +553,9 @@ def get_pcc_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.require_citizen),
 ) -> CitizenPccSummaryOut:
-    rows = db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
-    credited_f = 0.0
-    debited_f = 0.0
-    for row in rows:
-        amount = float(row.amount_pcc if row.amount_pcc is not None else row.amount_points or 0)
-        tx_kind = (row.type or str(row.tx_type) or "").lower()
-        if "debit" in tx_kind:
-            debited_f += amount
-        else:
-            credited_f += amount
-    unit = _setting_number(db, "pcc_unit_kgco2e", 10.0)
+    totals = user_wallet_totals(db, current_user.id)
+    credited_f, debited_f = totals.credited, totals.debited
+    unit = _setting_number(db, PCC_UNIT_SETTING, DEFAULT_PCC_UNIT_KGCO2E)
     net = round(credited_f - debited_f, 2)
     return CitizenPccSummaryOut(
         total_credited=round(credited_f, 2),
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -8,6 +10,7 @@ from app.models.facility import Facility
 from app.models.waste_report import WasteReport
 from app.models.household import SegregationLog
 from app.models.carbon import CarbonActivity
+from app.services.ops_heatmap_service import BY_WARD, HEATMAP_WINDOW_HOURS, PUBLIC_METRICS, get_heatmap
 
 router = APIRouter(prefix="/city", tags=["city_ops"])
 
@@ -26,3 +29,21 @@ def get_city_metrics(
         "carbon_activities_total": db.query(CarbonActivity).count(),
         "segregation_logs_total": db.query(SegregationLog).count(),
     }
+
+
+@router.get("/heatmap")
+def get_ops_heatmap(
+    by: str = Query(BY_WARD, pattern="^(ward|zone)$"),
+    hours: int = Query(24, ge=1, le=HEATMAP_WINDOW_HOURS),
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names; default all"),
+    areas: Optional[str] = Query(None, description="Comma-separated wards/zones; default all"),
+    db: Session = Depends(get_db),
+    current_user = Depends(deps.require_super_admin),
+):
+    """Open reports, pending pickups, logged weight by category and segregation score per area × hour."""
+    metric_list = [m.strip() for m in metrics.split(",") if m.strip()] if metrics else None
+    unknown = sorted(set(metric_list or []) - set(PUBLIC_METRICS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metrics: {', '.join(unknown)}")
+    area_list = [a.strip() for a in areas.split(",")] if areas else None
+    return get_heatmap(db, by=by, last_hours=hours, metrics=metric_list, areas=area_list)
@@ -1,7 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.core.config import settings
 from app.core.database import get_db
@@ -11,6 +11,17 @@ from app.models.user import User, UserRole
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
+def claims_user(db: Session, user_id: int, role: UserRole) -> User:
+    """
+    The caller as a persistent User built from token claims without a query.
+    Only id, role and is_active are populated; reading any other column loads
+    the row on first access.
+    """
+    user = User(id=user_id, role=role, is_active=True)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme),
@@ -24,11 +35,22 @@ def get_current_user(
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         sub: str | None = payload.get("sub")
-        if sub is None:
+        if sub is None or payload.get("typ", "access") != "access":
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
+    role = payload.get("role")
+    if role is not None:
+        # Short-lived session token: role and active flag are trusted claims.
+        if not payload.get("active"):
+            raise HTTPException(status_code=400, detail="Inactive user")
+        try:
+            return claims_user(db, int(sub), UserRole(role))
+        except ValueError:
+            raise credentials_exception
+
+    # Token issued before session claims existed: check the row as before.
     user = db.get(User, int(sub))
     if user is None:
         raise credentials_exception
@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -8,6 +8,13 @@ from app.api import deps
 from app.models.facility import Facility
 from app.schemas.facility import FacilityCreate, FacilityRead
 from app.services.facility_service import create_facility, update_facility
+from app.services.geo_service import (
+    DEFAULT_NEARBY_LIMIT,
+    MAX_NEARBY_LIMIT,
+    MAX_RADIUS_KM,
+    locate,
+    parse_bbox,
+)
 
 router = APIRouter(prefix="/facilities", tags=["facilities"])
 
@@ -31,6 +38,41 @@ def list_facilities(
 ):
     return db.query(Facility).order_by(Facility.created_at.desc()).all()
 
+# Nearby facilities endpoint (any signed-in user)
+
+@router.get("/nearby", response_model=List[FacilityRead])
+def list_nearby_facilities(
+    latitude: Optional[float] = Query(default=None, ge=-90, le=90),
+    longitude: Optional[float] = Query(default=None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(default=None, gt=0, le=MAX_RADIUS_KM),
+    bbox: Optional[str] = Query(default=None, description="min_lat,min_lon,max_lat,max_lon"),
+    type: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_NEARBY_LIMIT, ge=1, le=MAX_NEARBY_LIMIT),
+    db: Session = Depends(get_db),
+    current_user = Depends(deps.get_current_user),
+):
+    q = db.query(Facility).filter(Facility.is_active.is_(True))
+    if type:
+        q = q.filter(Facility.type == type.upper())
+
+    try:
+        located = locate(
+            q,
+            Facility,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            bbox=parse_bbox(bbox) if bbox else None,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return [
+        FacilityRead.model_validate(facility).model_copy(update={"distance_km": distance})
+        for facility, distance in located
+    ]
+
 # Update facility endpoint
 
 @router.patch("/{facility_id}", response_model=FacilityRead)
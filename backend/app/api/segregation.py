@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -12,8 +12,23 @@ from app.schemas.household import (
     HouseholdRead,
     HouseholdLinkRequest,
 )
-from app.schemas.segregation import SegregationLogCreate, SegregationLogRead
-from app.services.segregation_service import log_segregation, list_logs_for_worker
+from app.schemas.segregation import (
+    SegregationBulkCreate,
+    SegregationBulkReport,
+    SegregationLogCreate,
+    SegregationLogRead,
+)
+from app.services.segregation_service import (
+    ROW_CREATED,
+    ROW_DUPLICATE,
+    ROW_INVALID,
+    BulkLogRow,
+    BulkRowResult,
+    ingest_segregation_logs,
+    list_logs_for_worker,
+    log_segregation,
+    parse_segregation_csv,
+)
 
 router = APIRouter(prefix="/segregation", tags=["segregation"])
 
@@ -245,6 +260,53 @@ def create_segregation_log(
     return log
 
 
+def _require_bulk_logger(current_user: User) -> None:
+    if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
+        raise HTTPException(
+            status_code=403, detail="Only waste workers can record logs"
+        )
+
+
+def _bulk_report(results: List[BulkRowResult]) -> SegregationBulkReport:
+    return SegregationBulkReport(
+        created=sum(1 for r in results if r.status == ROW_CREATED),
+        duplicates=sum(1 for r in results if r.status == ROW_DUPLICATE),
+        invalid=sum(1 for r in results if r.status == ROW_INVALID),
+        results=results,
+    )
+
+
+@router.post("/logs/bulk", response_model=SegregationBulkReport)
+def create_segregation_logs_bulk(
+    body: SegregationBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    _require_bulk_logger(current_user)
+    rows = [
+        (number, BulkLogRow(**row.model_dump()))
+        for number, row in enumerate(body.rows, start=1)
+    ]
+    results = ingest_segregation_logs(db, worker_id=current_user.id, rows=rows)
+    return _bulk_report(results)
+
+
+@router.post("/logs/bulk/csv", response_model=SegregationBulkReport)
+def upload_segregation_logs_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    _require_bulk_logger(current_user)
+    try:
+        text = file.file.read().decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8")
+    rows, unparsed = parse_segregation_csv(text)
+    results = ingest_segregation_logs(db, worker_id=current_user.id, rows=rows)
+    return _bulk_report(sorted(results + unparsed, key=lambda r: r.row))
+
+
 @router.get("/logs/me", response_model=List[SegregationLogRead])
 def list_my_segregation_logs(
     db: Session = Depends(get_db),
@@ -1,4 +1,4 @@
-from datetime import datetime, UTC
+from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -7,18 +7,16 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.api import deps
 from app.models.training import TrainingModule, TrainingProgress
-from app.models.notification import Notification
 from app.models.user import UserRole
 from app.schemas.training import (
+    TrainingBadgeItemRead,
     TrainingModuleRead,
     TrainingCompleteRequest,
     TrainingProgressRead,
 )
-from app.services.carbon_service import add_carbon_activity
-from app.services.badge_service import award_badge_if_not_awarded, create_badge_if_missing
-from app.models.badge import BadgeCategory
+from app.services.task_queue_service import TASK_CARBON_ACTIVITY, enqueue_task
 from app.services.training_service import (
-    evaluate_training_milestone_badges,
+    apply_training_completion_effects,
     get_published_module,
     list_published_modules,
 )
@@ -95,7 +93,22 @@ def complete_training_module(
         progress.completed_at = now
 
     db.flush()
-    unlocked_badges = _handle_training_completion_effects(db, current_user.id, module.id, score)
+    # Badges and their notifications are awarded now so the response can announce
+    # unlocks; the carbon activity is recorded by the task worker.
+    unlocked = apply_training_completion_effects(db, user_id=current_user.id, module_id=module.id, score=score)
+    completion_key = f"{progress.id}:{now.isoformat()}"
+    enqueue_task(
+        db,
+        TASK_CARBON_ACTIVITY,
+        {
+            "user_id": current_user.id,
+            "activity_type": "TRAINING_COMPLETED",
+            "co2e_kg": 0.5 * (score / 100.0),
+            "reference_id": module.id,
+            "description": f"Completed training module {module.id} with score {score}",
+        },
+        key=f"training_progress:{completion_key}",
+    )
     db.commit()
     db.refresh(progress)
 
@@ -106,7 +119,17 @@ def complete_training_module(
         completed=progress.completed,
         score=progress.score,
         completed_at=progress.completed_at,
-        newly_unlocked_badges=unlocked_badges,
+        newly_unlocked_badges=[
+            TrainingBadgeItemRead(
+                code=badge.code or badge.criteria_key or f"badge_{badge.id}",
+                name=badge.name,
+                description=badge.description,
+                category=badge.category,
+                awarded_at=now,
+                metadata={"source": "training_milestone", "audience": "citizen"},
+            )
+            for badge in unlocked
+        ],
     )
 
 
@@ -122,81 +145,3 @@ def get_my_training_progress(
     )
     return items
 
-
-def _handle_training_completion_effects(
-    db: Session,
-    user_id: int,
-    module_id: int,
-    score: float,
-) -> list[dict]:
-    criteria_key = f"training_module_{module_id}_completed"
-    create_badge_if_missing(
-        db=db,
-        name=f"Training Champion · Module {module_id}",
-        criteria_key=criteria_key,
-        category=BadgeCategory.TRAINING,
-        description=f"Completed training module {module_id}",
-        icon="badge_training_completed",
-    )
-    award_badge_if_not_awarded(
-        db=db,
-        user_id=user_id,
-        criteria_key=criteria_key,
-    )
-
-    co2e_kg = 0.5 * (score / 100.0)
-    add_carbon_activity(
-        db=db,
-        user_id=user_id,
-        activity_type="TRAINING_COMPLETED",
-        co2e_kg=co2e_kg,
-        reference_id=module_id,
-        description=f"Completed training module {module_id} with score {score}",
-    )
-
-    completed_count = (
-        db.query(TrainingProgress)
-        .join(TrainingModule, TrainingModule.id == TrainingProgress.module_id)
-        .filter(
-            TrainingProgress.user_id == user_id,
-            TrainingProgress.completed.is_(True),
-            TrainingModule.audience == "citizen",
-            TrainingModule.is_published.is_(True),
-        )
-        .count()
-    )
-    total_count = (
-        db.query(TrainingModule)
-        .filter(TrainingModule.audience == "citizen", TrainingModule.is_published.is_(True))
-        .count()
-    )
-    unlocked = evaluate_training_milestone_badges(
-        db,
-        user_id=user_id,
-        audience="citizen",
-        completed_count=completed_count,
-        total_count=total_count,
-    )
-
-    payload = []
-    for badge in unlocked:
-        code = badge.code or badge.criteria_key or f"badge_{badge.id}"
-        db.add(
-            Notification(
-                user_id=user_id,
-                title="Badge Unlocked",
-                body=f"You earned {code.upper()} from training milestones.",
-                is_read=False,
-            )
-        )
-        payload.append(
-            {
-                "code": code,
-                "name": badge.name,
-                "description": badge.description,
-                "category": badge.category,
-                "awarded_at": datetime.now(UTC).replace(tzinfo=None),
-                "metadata": {"source": "training_milestone", "audience": "citizen"},
-            }
-        )
-    return payload
@@ -24,7 +24,15 @@ from app.schemas.marketing import (
     TestimonialCreate,
     TestimonialUpdate,
 )
-from app.services.marketing_service import upsert_config
+from app.services.marketing_service import (
+    SECTION_CASE_STUDIES,
+    SECTION_CONFIG,
+    SECTION_FAQS,
+    SECTION_PARTNERS,
+    SECTION_TESTIMONIALS,
+    public_content_cache,
+    upsert_config,
+)
 from app.services.admin_audit_service import log_admin_action
 
 router = APIRouter(prefix="/admin/content", tags=["admin-content"])
@@ -47,12 +55,15 @@ def _get_or_404(db: Session, model: type[ModelT], row_id: int) -> ModelT:
     return row
 
 
-def _commit(db: Session) -> None:
+def _commit(db: Session, *, section: str | None = None) -> None:
+    """Commit; `section` names the public marketing response this write makes stale."""
     try:
         db.commit()
     except Exception:
         db.rollback()
         raise
+    if section is not None:
+        public_content_cache.invalidate(section)
 
 
 @router.get("/partners", response_model=APIEnvelope)
@@ -67,7 +78,7 @@ def create_partner(payload: PartnerCreate, db: Session = Depends(get_db), curren
     db.add(row)
     db.flush()
     log_admin_action(db, actor=current_user, action="create", entity="partner", entity_id=row.id, metadata=payload.model_dump())
-    _commit(db)
+    _commit(db, section=SECTION_PARTNERS)
     db.refresh(row)
     return APIEnvelope(message="Partner created.", data={"partner": _serialize(row, ["id", "name", "logo_url", "href", "order", "active"])})
 
@@ -80,7 +91,7 @@ def update_partner(partner_id: int, payload: PartnerUpdate, db: Session = Depend
         setattr(row, k, v)
     db.add(row)
     log_admin_action(db, actor=current_user, action="update", entity="partner", entity_id=row.id, metadata=updates)
-    _commit(db)
+    _commit(db, section=SECTION_PARTNERS)
     db.refresh(row)
     return APIEnvelope(message="Partner updated.", data={"partner": _serialize(row, ["id", "name", "logo_url", "href", "order", "active"])})
 
@@ -90,7 +101,7 @@ def delete_partner(partner_id: int, db: Session = Depends(get_db), current_user:
     row = _get_or_404(db, MarketingPartner, partner_id)
     db.delete(row)
     log_admin_action(db, actor=current_user, action="delete", entity="partner", entity_id=partner_id)
-    _commit(db)
+    _commit(db, section=SECTION_PARTNERS)
     return APIEnvelope(message="Partner deleted.", data={})
 
 
@@ -106,7 +117,7 @@ def create_testimonial(payload: TestimonialCreate, db: Session = Depends(get_db)
     db.add(row)
     db.flush()
     log_admin_action(db, actor=current_user, action="create", entity="testimonial", entity_id=row.id, metadata=payload.model_dump())
-    _commit(db)
+    _commit(db, section=SECTION_TESTIMONIALS)
     db.refresh(row)
     return APIEnvelope(message="Testimonial created.", data={"testimonial": _serialize(row, ["id", "name", "title", "org", "quote", "avatar_url", "order", "active"])})
 
@@ -119,7 +130,7 @@ def update_testimonial(testimonial_id: int, payload: TestimonialUpdate, db: Sess
         setattr(row, k, v)
     db.add(row)
     log_admin_action(db, actor=current_user, action="update", entity="testimonial", entity_id=row.id, metadata=updates)
-    _commit(db)
+    _commit(db, section=SECTION_TESTIMONIALS)
     db.refresh(row)
     return APIEnvelope(message="Testimonial updated.", data={"testimonial": _serialize(row, ["id", "name", "title", "org", "quote", "avatar_url", "order", "active"])})
 
@@ -129,7 +140,7 @@ def delete_testimonial(testimonial_id: int, db: Session = Depends(get_db), curre
     row = _get_or_404(db, MarketingTestimonial, testimonial_id)
     db.delete(row)
     log_admin_action(db, actor=current_user, action="delete", entity="testimonial", entity_id=testimonial_id)
-    _commit(db)
+    _commit(db, section=SECTION_TESTIMONIALS)
     return APIEnvelope(message="Testimonial deleted.", data={})
 
 
@@ -145,7 +156,7 @@ def create_case_study(payload: CaseStudyCreate, db: Session = Depends(get_db), c
     db.add(row)
     db.flush()
     log_admin_action(db, actor=current_user, action="create", entity="case_study", entity_id=row.id, metadata=payload.model_dump())
-    _commit(db)
+    _commit(db, section=SECTION_CASE_STUDIES)
     db.refresh(row)
     return APIEnvelope(message="Case study created.", data={"case_study": _serialize(row, ["id", "title", "org", "metric_1", "metric_2", "summary", "href", "order", "active"])})
 
@@ -158,7 +169,7 @@ def update_case_study(case_study_id: int, payload: CaseStudyUpdate, db: Session
         setattr(row, k, v)
     db.add(row)
     log_admin_action(db, actor=current_user, action="update", entity="case_study", entity_id=row.id, metadata=updates)
-    _commit(db)
+    _commit(db, section=SECTION_CASE_STUDIES)
     db.refresh(row)
     return APIEnvelope(message="Case study updated.", data={"case_study": _serialize(row, ["id", "title", "org", "metric_1", "metric_2", "summary", "href", "order", "active"])})
 
@@ -168,7 +179,7 @@ def delete_case_study(case_study_id: int, db: Session = Depends(get_db), current
     row = _get_or_404(db, MarketingCaseStudy, case_study_id)
     db.delete(row)
     log_admin_action(db, actor=current_user, action="delete", entity="case_study", entity_id=case_study_id)
-    _commit(db)
+    _commit(db, section=SECTION_CASE_STUDIES)
     return APIEnvelope(message="Case study deleted.", data={})
 
 
@@ -184,7 +195,7 @@ def create_faq(payload: FAQCreate, db: Session = Depends(get_db), current_user:
     db.add(row)
     db.flush()
     log_admin_action(db, actor=current_user, action="create", entity="faq", entity_id=row.id, metadata=payload.model_dump())
-    _commit(db)
+    _commit(db, section=SECTION_FAQS)
     db.refresh(row)
     return APIEnvelope(message="FAQ created.", data={"faq": _serialize(row, ["id", "question", "answer", "order", "active"])})
 
@@ -197,7 +208,7 @@ def update_faq(faq_id: int, payload: FAQUpdate, db: Session = Depends(get_db), c
         setattr(row, k, v)
     db.add(row)
     log_admin_action(db, actor=current_user, action="update", entity="faq", entity_id=row.id, metadata=updates)
-    _commit(db)
+    _commit(db, section=SECTION_FAQS)
     db.refresh(row)
     return APIEnvelope(message="FAQ updated.", data={"faq": _serialize(row, ["id", "question", "answer", "order", "active"])})
 
@@ -207,7 +218,7 @@ def delete_faq(faq_id: int, db: Session = Depends(get_db), current_user: User =
     row = _get_or_404(db, MarketingFAQ, faq_id)
     db.delete(row)
     log_admin_action(db, actor=current_user, action="delete", entity="faq", entity_id=faq_id)
-    _commit(db)
+    _commit(db, section=SECTION_FAQS)
     return APIEnvelope(message="FAQ deleted.", data={})
 
 
@@ -215,7 +226,7 @@ def delete_faq(faq_id: int, db: Session = Depends(get_db), current_user: User =
 def put_config(payload: MarketingConfigUpsert, db: Session = Depends(get_db), current_user: User = Depends(deps.require_super_admin)):
     row = upsert_config(db, payload.key, payload.value_json)
     log_admin_action(db, actor=current_user, action="update", entity="marketing_config", entity_id=payload.key, metadata={"key": payload.key})
-    _commit(db)
+    _commit(db, section=SECTION_CONFIG)
     db.refresh(row)
     return APIEnvelope(message="Config updated.", data={"config": _serialize(row, ["id", "key", "value_json"])})
 
@@ -7,14 +7,14 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import PlainTextResponse
-from sqlalchemy import String, and_, func, or_
+from sqlalchemy import String, func, or_
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.database import get_db
 from app.core.security import get_password_hash
 from app.models.admin_ops import AuditLog, PlatformSetting, WorkforceAssignment, Zone
-from app.models.bulk import BulkApprovalStatus, BulkGenerator, OrganizationStatus, Transaction, TransactionType, WasteLog
+from app.models.bulk import BulkApprovalStatus, BulkGenerator, OrganizationStatus, Transaction, WasteLog
 from app.models.contact import ContactMessage
 from app.models.household import Household, SegregationLog
 from app.models.leads import DemoRequest
@@ -28,6 +28,8 @@ from app.schemas.admin_ops import (
     ApprovalListResponse,
     AuditLogItem,
     AuditLogListResponse,
+    BackgroundTaskItem,
+    BackgroundTaskListResponse,
     GenericOk,
     PccSummaryResponse,
     PccSettingsRead,
@@ -60,8 +62,11 @@ from app.schemas.admin_ops import (
     AdminKpiSummary,
 )
 from app.services.admin_audit_service import log_admin_action
+from app.services.auth_session_service import revoke_user_sessions
 from app.services.bulk_service import approve_bulk_org, reject_bulk_org
 from app.services.pcc_award_service import award_reference, revoke_reference
+from app.services.pcc_ledger_service import wallet_ledger_totals
+from app.services.task_queue_service import list_tasks, retry_task
 
 router = APIRouter(prefix="/admin", tags=["admin-ops"])
 
@@ -223,6 +228,7 @@ def act_approval(
         if linked is not None:
             linked.is_active = False
             db.add(linked)
+            revoke_user_sessions(db, linked.id)
 
     log_admin_action(
         db,
@@ -265,6 +271,7 @@ def reject_bulk_organization(
     if linked is not None:
         linked.is_active = False
         db.add(linked)
+        revoke_user_sessions(db, linked.id)
     log_admin_action(
         db,
         actor=current_user,
@@ -429,6 +436,8 @@ def update_workforce(
         user.full_name = updates["full_name"]
     if "is_active" in updates:
         user.is_active = updates["is_active"]
+        if not user.is_active:
+            revoke_user_sessions(db, user.id)
     db.add(user)
 
     assignment = db.query(WorkforceAssignment).filter(WorkforceAssignment.user_id == user.id).first()
@@ -502,13 +511,7 @@ def pcc_summary(
     db: Session = Depends(get_db),
     _: User = Depends(deps.require_super_admin),
 ):
-    credited = db.query(func.coalesce(func.sum(Transaction.amount_pcc), 0.0)).filter(
-        and_(Transaction.tx_type == TransactionType.CREDIT, Transaction.amount_pcc.is_not(None))
-    ).scalar() or 0.0
-    debited = db.query(func.coalesce(func.sum(Transaction.amount_pcc), 0.0)).filter(
-        and_(Transaction.tx_type == TransactionType.DEBIT, Transaction.amount_pcc.is_not(None))
-    ).scalar() or 0.0
-    total = db.query(func.count(Transaction.id)).scalar() or 0
+    credited, debited, total = wallet_ledger_totals(db)
     return PccSummaryResponse(total_credited=float(credited), total_debited=float(debited), net_pcc=float(credited - debited), tx_count=int(total))
 
 
@@ -637,8 +640,10 @@ def pcc_transactions(
         qry = qry.filter(func.lower(Transaction.tx_type.cast(String)) == effective_type.lower())
 
     total = qry.count()
-    credited = qry.filter(Transaction.tx_type == TransactionType.CREDIT).with_entities(func.coalesce(func.sum(Transaction.amount_pcc), 0.0)).scalar() or 0.0
-    debited = qry.filter(Transaction.tx_type == TransactionType.DEBIT).with_entities(func.coalesce(func.sum(Transaction.amount_pcc), 0.0)).scalar() or 0.0
+    # The summary figures, count included, all come from the ledger; `total` pages the items.
+    credited, debited, entries = wallet_ledger_totals(
+        db, date_from=date_from, date_to=date_to, user_id=user_id, tx_type=effective_type
+    )
     rows = (
         qry.order_by(Transaction.created_at.desc(), Transaction.id.desc())
         .offset((page - 1) * page_size)
@@ -650,7 +655,7 @@ def pcc_transactions(
             id=row.id,
             user_id=row.user_id,
             type=row.tx_type.value if hasattr(row.tx_type, "value") else str(row.tx_type),
-            amount_pcc=float(row.amount_pcc or 0.0),
+            amount_pcc=row.amount_pcc or 0.0,
             reason=row.reason,
             ref_type=row.ref_type,
             ref_id=row.ref_id,
@@ -667,7 +672,7 @@ def pcc_transactions(
         total_credited=float(credited),
         total_debited=float(debited),
         net_pcc=float(credited - debited),
-        transactions_count=total,
+        transactions_count=entries,
     )
 
 
@@ -813,11 +818,11 @@ def list_citizen_segregation_logs(
             user_name=user.full_name or user.email,
             household=hh.name if hh else None,
             waste_category=log.waste_category,
-            weight_kg=float(log.weight_kg or (log.dry_kg or 0.0) + (log.wet_kg or 0.0) + (log.reject_kg or 0.0)),
-            quality_score=float(log.quality_score) if log.quality_score is not None else None,
+            weight_kg=log.weight_kg or (log.dry_kg or 0.0) + (log.wet_kg or 0.0) + (log.reject_kg or 0.0),
+            quality_score=log.quality_score,
             quality_level=log.quality_level,
             pcc_status=(log.pcc_status or "pending"),
-            awarded_pcc_amount=float(log.awarded_pcc_amount) if log.awarded_pcc_amount is not None else None,
+            awarded_pcc_amount=log.awarded_pcc_amount,
             created_at=log.created_at,
             evidence_image_url=log.evidence_image_url,
         )
@@ -874,11 +879,11 @@ def list_bulk_generator_logs(
             user_id=user.id,
             org_name=bg.organization_name if bg else None,
             waste_category=str(log.category.value if hasattr(log.category, "value") else log.category).lower() if log.category else None,
-            weight_kg=float(log.weight_kg or log.logged_weight or 0.0),
+            weight_kg=log.weight_kg or log.logged_weight or 0.0,
             quality_level=log.quality_level,
             verification_status=log.verification_status or "pending",
             pcc_status=log.pcc_status or "pending",
-            awarded_pcc_amount=float(log.awarded_pcc_amount) if log.awarded_pcc_amount is not None else None,
+            awarded_pcc_amount=log.awarded_pcc_amount,
             created_at=log.logged_at,
         )
         for log, user, bg in rows
@@ -1018,6 +1023,55 @@ def list_audit_logs(
     return AuditLogListResponse(items=items, total=total)
 
 
+def _task_item(row) -> BackgroundTaskItem:
+    return BackgroundTaskItem(
+        id=row.id,
+        kind=row.kind,
+        idempotency_key=row.idempotency_key,
+        status=row.status,
+        attempts=row.attempts,
+        max_attempts=row.max_attempts,
+        payload=row.payload or {},
+        last_error=row.last_error,
+        run_after=row.run_after,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        completed_at=row.completed_at,
+    )
+
+
+@router.get("/tasks", response_model=BackgroundTaskListResponse)
+def list_background_tasks(
+    status_filter: str | None = Query(default="dead", alias="status"),
+    kind: str | None = Query(default=None),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _: User = Depends(deps.require_super_admin),
+):
+    """Dead-letter view by default; pass status=pending|running|done to inspect the rest."""
+    rows, total = list_tasks(db, status=status_filter or None, kind=kind, page=page, page_size=page_size)
+    return BackgroundTaskListResponse(items=[_task_item(r) for r in rows], total=total)
+
+
+@router.post("/tasks/{task_id}/retry", response_model=BackgroundTaskItem)
+def retry_background_task(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.require_super_admin),
+):
+    try:
+        row = retry_task(db, task_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if row is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    log_admin_action(db, actor=current_user, action="retry", entity="background_task", entity_id=row.id, metadata={"kind": row.kind})
+    db.commit()
+    db.refresh(row)
+    return _task_item(row)
+
+
 @router.get("/settings", response_model=SettingsRead)
 def get_settings(
     db: Session = Depends(get_db),
@@ -1,66 +1,64 @@
 from __future__ import annotations
 
-import time
-from collections import defaultdict, deque
-from typing import Any
+from dataclasses import replace
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.http_cache import CachedBody, cached_json_response, compute_etag, prepare_body
 from app.schemas.leads import ContactCreate, LeadCreate, NewsletterSubscribe
 from app.schemas.marketing import APIEnvelope
 from app.services.lead_service import create_contact_message, create_lead, subscribe_newsletter
 from app.services.marketing_service import (
-    get_config,
+    SECTION_CASE_STUDIES,
+    SECTION_CONFIG,
+    SECTION_FAQS,
+    SECTION_PARTNERS,
+    SECTION_TESTIMONIALS,
+    get_configs,
     list_case_studies,
     list_faqs,
     list_partners,
     list_testimonials,
+    public_content_cache,
+)
+from app.services.rate_limit_service import rate_limit
+from app.services.stats_service import (
+    SECTION_SAMPLE_LEDGER,
+    SECTION_STATS,
+    get_public_stats,
+    public_stats_cache,
+    sample_ledger_rows,
 )
-from app.services.stats_service import get_public_stats, sample_ledger_rows
 
 router = APIRouter(prefix="/public", tags=["public-marketing"])
 
-_BUCKET: dict[str, deque[float]] = defaultdict(deque)
-
-
-def _rate_limit(key_prefix: str, max_requests: int = 8, per_seconds: int = 60):
-    def _dep(request: Request):
-        ip = request.client.host if request.client else "unknown"
-        key = f"{key_prefix}:{ip}"
-        now = time.time()
-        q = _BUCKET[key]
-        while q and now - q[0] > per_seconds:
-            q.popleft()
-        if len(q) >= max_requests:
-            raise HTTPException(status_code=429, detail="Too many requests. Please try again shortly.")
-        q.append(now)
-
-    return _dep
-
 
 def _obj_to_dict(obj: object, fields: list[str]) -> dict[str, Any]:
     return {f: getattr(obj, f) for f in fields}
 
 
-@router.get("/stats", response_model=APIEnvelope)
-def public_stats(db: Session = Depends(get_db)):
+def _stats_payload(db: Session) -> dict[str, Any]:
     stats = get_public_stats(db)
-    return APIEnvelope(message="Public stats fetched.", data={"stats": stats.__dict__})
+    return APIEnvelope(message="Public stats fetched.", data={"stats": stats.__dict__}).model_dump()
 
 
-@router.get("/partners", response_model=APIEnvelope)
-def public_partners(db: Session = Depends(get_db)):
+def _sample_ledger_payload(db: Session) -> dict[str, Any]:
+    rows = sample_ledger_rows(db)
+    return APIEnvelope(message="Sample ledger fetched.", data={"rows": rows}).model_dump()
+
+
+def _partners_payload(db: Session) -> dict[str, Any]:
     rows = list_partners(db, active_only=True)
     return APIEnvelope(
         message="Partners fetched.",
         data={"partners": [_obj_to_dict(r, ["id", "name", "logo_url", "href", "order", "active"]) for r in rows]},
-    )
+    ).model_dump()
 
 
-@router.get("/testimonials", response_model=APIEnvelope)
-def public_testimonials(db: Session = Depends(get_db)):
+def _testimonials_payload(db: Session) -> dict[str, Any]:
     rows = list_testimonials(db, active_only=True)
     return APIEnvelope(
         message="Testimonials fetched.",
@@ -70,11 +68,10 @@ def public_testimonials(db: Session = Depends(get_db)):
                 for r in rows
             ]
         },
-    )
+    ).model_dump()
 
 
-@router.get("/case-studies", response_model=APIEnvelope)
-def public_case_studies(db: Session = Depends(get_db)):
+def _case_studies_payload(db: Session) -> dict[str, Any]:
     rows = list_case_studies(db, active_only=True)
     return APIEnvelope(
         message="Case studies fetched.",
@@ -84,44 +81,143 @@ def public_case_studies(db: Session = Depends(get_db)):
                 for r in rows
             ]
         },
-    )
+    ).model_dump()
 
 
-@router.get("/faqs", response_model=APIEnvelope)
-def public_faqs(db: Session = Depends(get_db)):
+def _faqs_payload(db: Session) -> dict[str, Any]:
     rows = list_faqs(db, active_only=True)
     return APIEnvelope(
         message="FAQs fetched.",
         data={"faqs": [_obj_to_dict(r, ["id", "question", "answer", "order", "active"]) for r in rows]},
-    )
+    ).model_dump()
 
 
-@router.get("/config", response_model=APIEnvelope)
-def public_config(db: Session = Depends(get_db)):
+def _config_payload(db: Session) -> dict[str, Any]:
     return APIEnvelope(
         message="Config fetched.",
-        data={
-            "org_type_copy": get_config(db, "org_type_copy"),
-            "seed_metrics": get_config(db, "seed_metrics"),
-            "cta": get_config(db, "cta"),
-        },
-    )
+        data=get_configs(db, ["org_type_copy", "seed_metrics", "cta"]),
+    ).model_dump()
 
 
-@router.get("/sample-ledger", response_model=APIEnvelope)
-def public_sample_ledger(db: Session = Depends(get_db)):
-    rows = sample_ledger_rows(db)
-    return APIEnvelope(message="Sample ledger fetched.", data={"rows": rows})
+_SECTION_SOURCES = {
+    SECTION_STATS: (public_stats_cache, _stats_payload),
+    SECTION_PARTNERS: (public_content_cache, _partners_payload),
+    SECTION_TESTIMONIALS: (public_content_cache, _testimonials_payload),
+    SECTION_CASE_STUDIES: (public_content_cache, _case_studies_payload),
+    SECTION_FAQS: (public_content_cache, _faqs_payload),
+    SECTION_CONFIG: (public_content_cache, _config_payload),
+    SECTION_SAMPLE_LEDGER: (public_stats_cache, _sample_ledger_payload),
+}
+
+# Bundle field -> key of the section's `data` to embed (None: all of it).
+_BUNDLE_FIELDS: dict[str, Optional[str]] = {
+    SECTION_STATS: "stats",
+    SECTION_PARTNERS: "partners",
+    SECTION_TESTIMONIALS: "testimonials",
+    SECTION_CASE_STUDIES: "case_studies",
+    SECTION_FAQS: "faqs",
+    SECTION_CONFIG: None,
+    SECTION_SAMPLE_LEDGER: "rows",
+}
+
+# Last serialized bundle per field selection; reused while its combined ETag holds.
+_bundle_bodies: dict[tuple[str, ...], CachedBody] = {}
+
+
+def _section_entry(db: Session, section: str) -> CachedBody:
+    # The session only connects on a miss, so cache hits cost no DB round trip.
+    cache, build = _SECTION_SOURCES[section]
+    return cache.get_or_build(section, lambda: build(db))
+
 
+def _cached_section(request: Request, db: Session, section: str) -> Response:
+    return cached_json_response(request, _section_entry(db, section))
 
-@router.post("/leads", response_model=APIEnvelope, status_code=status.HTTP_201_CREATED, dependencies=[Depends(_rate_limit("leads"))])
+
+def _bundle_selection(fields: Optional[str]) -> tuple[str, ...]:
+    if not fields:
+        return tuple(_BUNDLE_FIELDS)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(requested - set(_BUNDLE_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown bundle field(s): {', '.join(unknown)}")
+    return tuple(f for f in _BUNDLE_FIELDS if f in requested)
+
+
+@router.get("/stats", response_model=APIEnvelope)
+def public_stats(request: Request, db: Session = Depends(get_db)):
+    return _cached_section(request, db, SECTION_STATS)
+
+
+@router.get("/partners", response_model=APIEnvelope)
+def public_partners(request: Request, db: Session = Depends(get_db)):
+    return _cached_section(request, db, SECTION_PARTNERS)
+
+
+@router.get("/testimonials", response_model=APIEnvelope)
+def public_testimonials(request: Request, db: Session = Depends(get_db)):
+    return _cached_section(request, db, SECTION_TESTIMONIALS)
+
+
+@router.get("/case-studies", response_model=APIEnvelope)
+def public_case_studies(request: Request, db: Session = Depends(get_db)):
+    return _cached_section(request, db, SECTION_CASE_STUDIES)
+
+
+@router.get("/faqs", response_model=APIEnvelope)
+def public_faqs(request: Request, db: Session = Depends(get_db)):
+    return _cached_section(request, db, SECTION_FAQS)
+
+
+@router.get("/config", response_model=APIEnvelope)
+def public_config(request: Request, db: Session = Depends(get_db)):
+    return _cached_section(request, db, SECTION_CONFIG)
+
+
+@router.get("/sample-ledger", response_model=APIEnvelope)
+def public_sample_ledger(request: Request, db: Session = Depends(get_db)):
+    return _cached_section(request, db, SECTION_SAMPLE_LEDGER)
+
+
+@router.get("/bundle", response_model=APIEnvelope)
+def public_bundle(
+    request: Request,
+    fields: Optional[str] = Query(
+        default=None,
+        description=f"Comma-separated sections to include (default: all). One of: {', '.join(_BUNDLE_FIELDS)}",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Every landing-page section in one response, each taken from the cache
+    behind its own endpoint. The ETag combines the section ETags, so an
+    unchanged bundle is answered with 304 without re-serializing anything.
+    """
+    selected = _bundle_selection(fields)
+    entries = {section: _section_entry(db, section) for section in selected}
+    etag = compute_etag("|".join(f"{section}={entries[section].etag}" for section in selected).encode("utf-8"))
+
+    entry = _bundle_bodies.get(selected)
+    if entry is None or entry.etag != etag:
+        data = {}
+        for section in selected:
+            section_data = entries[section].payload["data"]
+            key = _BUNDLE_FIELDS[section]
+            data[section] = section_data if key is None else section_data[key]
+        payload = APIEnvelope(message="Landing bundle fetched.", data=data).model_dump()
+        entry = replace(prepare_body(payload), etag=etag)
+        _bundle_bodies[selected] = entry
+    return cached_json_response(request, entry)
+
+
+@router.post("/leads", response_model=APIEnvelope, status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("leads", 8, per_seconds=60))])
 def create_public_lead(payload: LeadCreate, db: Session = Depends(get_db)):
     with db.begin():
         row = create_lead(db, payload)
     return APIEnvelope(message="Lead captured.", data={"lead_id": row.id, "status": row.status})
 
 
-@router.post("/contact", response_model=APIEnvelope, status_code=status.HTTP_201_CREATED, dependencies=[Depends(_rate_limit("contact"))])
+@router.post("/contact", response_model=APIEnvelope, status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("contact", 8, per_seconds=60))])
 def create_public_contact(payload: ContactCreate, db: Session = Depends(get_db)):
     with db.begin():
         row = create_contact_message(db, payload)
@@ -132,7 +228,7 @@ def create_public_contact(payload: ContactCreate, db: Session = Depends(get_db))
     "/newsletter/subscribe",
     response_model=APIEnvelope,
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(_rate_limit("newsletter"))],
+    dependencies=[Depends(rate_limit("newsletter", 8, per_seconds=60))],
 )
 def newsletter_subscribe(payload: NewsletterSubscribe, db: Session = Depends(get_db)):
     with db.begin():
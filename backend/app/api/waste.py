@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from pydantic import BaseModel
 
 from app.api import deps
-from app.api.waste_reporting import classify_image_with_model
+from app.api.waste_reporting import WasteClassificationCandidate, classify_image_with_model, classify_rate_limit
 from app.models.user import User
 
 router = APIRouter(prefix="/waste", tags=["waste"])
@@ -30,10 +30,14 @@ class WasteFileClassificationOut(BaseModel):
     where_to_take: list[str] | None = None
     guidance_source: str | None = None
     low_confidence_threshold: float | None = None
-    alternatives: list[dict] | None = None
+    alternatives: list[WasteClassificationCandidate] | None = None
 
 
-@router.post("/classify-file", response_model=WasteFileClassificationOut)
+@router.post(
+    "/classify-file",
+    response_model=WasteFileClassificationOut,
+    dependencies=[Depends(classify_rate_limit)],
+)
 async def classify_file(
     file: UploadFile | None = File(default=None),
     current_user: User = Depends(deps.get_current_user),
@@ -80,5 +84,5 @@ async def classify_file(
         where_to_take=ml_result.where_to_take,
         guidance_source=ml_result.guidance_source,
         low_confidence_threshold=ml_result.low_confidence_threshold,
-        alternatives=[item.model_dump() for item in (ml_result.alternatives or [])],
+        alternatives=ml_result.alternatives or [],
     )
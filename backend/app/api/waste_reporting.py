@@ -6,7 +6,7 @@ import os
 from pathlib import Path
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -22,8 +22,19 @@ from app.schemas.waste_classes import (
     get_waste_guidance,
 )
 from app.schemas.waste_report import WasteReportRead
+from app.services.geo_service import (
+    DEFAULT_NEARBY_LIMIT,
+    MAX_NEARBY_LIMIT,
+    MAX_RADIUS_KM,
+    locate,
+    parse_bbox,
+)
+from app.services.rate_limit_service import by_credentials, rate_limit
 from app.services.waste_report_service import (
+    auto_assign_open_reports,
+    claim_report_for_worker,
     create_waste_report,
+    set_report_status_by_worker,
     update_report_status,
 )
 
@@ -358,6 +369,9 @@ def classify_image_with_model(image_bytes: bytes) -> WasteClassificationResponse
 
 router = APIRouter(prefix="/waste", tags=["waste_reporting"])
 
+# Shared by /waste/classify and /waste/classify-file: one classifier budget per caller.
+classify_rate_limit = rate_limit("waste.classify", 30, per_seconds=60, key=by_credentials)
+
 UPLOAD_DIR = os.path.join(settings.MEDIA_ROOT, "waste_reports")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
@@ -368,22 +382,60 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.get("/reports/available", response_model=List[WasteReportRead])
 def list_available_reports_for_workers(
+    latitude: Optional[float] = Query(default=None, ge=-90, le=90),
+    longitude: Optional[float] = Query(default=None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(default=None, gt=0, le=MAX_RADIUS_KM),
+    bbox: Optional[str] = Query(default=None, description="min_lat,min_lon,max_lat,max_lon"),
+    limit: int = Query(default=DEFAULT_NEARBY_LIMIT, ge=1, le=MAX_NEARBY_LIMIT),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user),
 ):
-    """Waste worker: list OPEN & unassigned reports."""
+    """
+    Waste worker: list OPEN & unassigned reports.
+
+    With latitude/longitude (optionally radius_km) or bbox the list is
+    restricted to that area, sorted nearest-first and capped at `limit`.
+    """
     if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
         raise HTTPException(403, "Only waste workers can access this.")
 
-    return (
-        db.query(WasteReport)
-        .filter(
-            WasteReport.status == WasteReportStatus.OPEN.value,
-            WasteReport.assigned_worker_id.is_(None),
-        )
-        .order_by(WasteReport.created_at.asc())
-        .all()
+    q = db.query(WasteReport).filter(
+        WasteReport.status == WasteReportStatus.OPEN.value,
+        WasteReport.assigned_worker_id.is_(None),
     )
+    if latitude is None and longitude is None and bbox is None:
+        return q.order_by(WasteReport.created_at.asc()).all()
+
+    try:
+        located = locate(
+            q,
+            WasteReport,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            bbox=parse_bbox(bbox) if bbox else None,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+
+    return [
+        WasteReportRead.model_validate(report).model_copy(update={"distance_km": distance})
+        for report, distance in located
+    ]
+
+
+@router.post("/reports/auto-assign", response_model=List[WasteReportRead])
+def auto_assign_reports_for_worker(
+    limit: int = Query(default=5, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Waste worker: take the next N open reports without racing other workers."""
+    if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
+        raise HTTPException(403, "Only waste workers can access this.")
+
+    return auto_assign_open_reports(db, worker_id=current_user.id, limit=limit)
 
 
 @router.get("/reports/assigned/me", response_model=List[WasteReportRead])
@@ -574,22 +626,7 @@ def worker_claim_report(
     if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
         raise HTTPException(403, "Workers only")
 
-    report = db.query(WasteReport).filter(WasteReport.id == report_id).first()
-    if not report:
-        raise HTTPException(404, "Report not found")
-
-    if report.assigned_worker_id and report.assigned_worker_id != current_user.id:
-        raise HTTPException(400, "Already assigned to another worker")
-
-    if report.status != WasteReportStatus.OPEN.value:
-        raise HTTPException(400, "Only OPEN reports may be claimed")
-
-    report.assigned_worker_id = current_user.id
-    report.status = WasteReportStatus.IN_PROGRESS.value
-
-    db.commit()
-    db.refresh(report)
-    return report
+    return claim_report_for_worker(db, report_id=report_id, worker_id=current_user.id)
 
 
 class WorkerStatusUpdateBody(BaseModel):
@@ -606,31 +643,19 @@ def worker_update_report_status(
     if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
         raise HTTPException(403, "Workers only")
 
-    report = db.query(WasteReport).filter(WasteReport.id == report_id).first()
-    if not report:
-        raise HTTPException(404, "Report not found")
-
-    if current_user.role == UserRole.WASTE_WORKER and report.assigned_worker_id != current_user.id:
-        raise HTTPException(403, "Not assigned to this report")
-
-    if body.status not in (WasteReportStatus.IN_PROGRESS, WasteReportStatus.RESOLVED):
-        raise HTTPException(400, "Workers can only set IN_PROGRESS or RESOLVED")
-
-    updated = update_report_status(
-        db=db,
+    return set_report_status_by_worker(
+        db,
         report_id=report_id,
+        worker=current_user,
         new_status=body.status,
-        assigned_worker_id=report.assigned_worker_id or current_user.id,
     )
 
-    return updated
-
 
 # ============================================================================
 # CLASSIFY ONLY
 # ============================================================================
 
-@router.post("/classify", response_model=WasteClassificationResponse)
+@router.post("/classify", response_model=WasteClassificationResponse, dependencies=[Depends(classify_rate_limit)])
 async def classify_endpoint(
     image: UploadFile = File(...),
     latitude: Optional[float] = Form(None),
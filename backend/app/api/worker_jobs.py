@@ -1,13 +1,29 @@
+import asyncio
+import json
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.models.user import User, UserRole
+from app.models.waste_report import WasteReport, WasteReportStatus
 from app.schemas.bulk import ApiEnvelope, VerificationCreate, WorkerPickupStatusUpdate
+from app.schemas.route_plan import RoutePlanRequest
+from app.schemas.waste_report import WasteReportRead
+from app.schemas.worker_sync import (
+    WorkerSyncMutationOut,
+    WorkerSyncRemoved,
+    WorkerSyncRequest,
+    WorkerSyncResponse,
+)
 from app.services.bulk_service import (
+    MAX_AUTO_ASSIGN_JOBS,
+    auto_assign_worker_jobs,
     claim_worker_job,
     get_worker_badge_summary,
     list_assigned_worker_jobs,
@@ -15,10 +31,44 @@ from app.services.bulk_service import (
     update_worker_job_status,
     verify_bulk_waste,
 )
+from app.services.job_feed_service import job_feed
+from app.services.route_planning_service import plan_worker_route
+from app.services.worker_sync_service import apply_mutations, collect_delta
 
 
 router = APIRouter(prefix="/worker", tags=["worker_jobs"])
 
+FEED_HEARTBEAT_SECONDS = 15.0
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}\n\n"
+
+
+def _load_feed_snapshot(token: str) -> dict:
+    # Uses its own short-lived session so the stream never pins a DB connection.
+    db = SessionLocal()
+    try:
+        current_user = deps.get_current_user(db=db, token=token)
+        if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
+            raise HTTPException(status_code=403, detail="Worker role required.")
+        jobs = list_available_worker_jobs(db, current_user=current_user)
+        reports = (
+            db.query(WasteReport)
+            .filter(
+                WasteReport.status == WasteReportStatus.OPEN.value,
+                WasteReport.assigned_worker_id.is_(None),
+            )
+            .order_by(WasteReport.created_at.asc())
+            .all()
+        )
+        return {
+            "jobs": [j.model_dump() for j in jobs],
+            "reports": [WasteReportRead.model_validate(r).model_dump() for r in reports],
+        }
+    finally:
+        db.close()
+
 
 @router.get("/jobs/available", response_model=ApiEnvelope)
 def worker_jobs_available(
@@ -29,6 +79,47 @@ def worker_jobs_available(
     return ApiEnvelope(message="Available jobs fetched.", data={"items": [j.model_dump() for j in jobs]})
 
 
+@router.get("/jobs/stream")
+async def worker_jobs_stream(request: Request, token: str = Depends(deps.oauth2_scheme)):
+    """
+    Server-Sent Events feed of open work.
+
+    Sends one `snapshot` event (available pickups + open reports), then
+    `job.created` / `job.claimed` / `job.cancelled` / `report.created` /
+    `report.claimed` deltas as they are committed. A `resync` event means the
+    client fell behind and should reconnect for a fresh snapshot.
+    """
+    # Subscribe before loading the snapshot so no event committed in between is missed.
+    sub = job_feed.subscribe()
+    try:
+        snapshot = await run_in_threadpool(_load_feed_snapshot, token)
+    except BaseException:
+        job_feed.unsubscribe(sub)
+        raise
+
+    async def _events():
+        try:
+            yield _sse("snapshot", snapshot)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=FEED_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    yield _sse("resync", {})
+                    break
+                yield _sse(event.type, {**event.data, "at": event.at})
+        finally:
+            job_feed.unsubscribe(sub)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/jobs/assigned", response_model=ApiEnvelope)
 def worker_jobs_assigned(
     db: Session = Depends(get_db),
@@ -39,6 +130,19 @@ def worker_jobs_assigned(
     return ApiEnvelope(message="Assigned jobs fetched.", data={"items": [j.model_dump() for j in jobs], "badge_summary": badge_summary})
 
 
+@router.post("/jobs/auto-assign", response_model=ApiEnvelope)
+def worker_auto_assign_jobs(
+    limit: int = Query(default=5, ge=1, le=MAX_AUTO_ASSIGN_JOBS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.require_roles(UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN)),
+):
+    jobs = auto_assign_worker_jobs(db, current_user=current_user, limit=limit)
+    return ApiEnvelope(
+        message=f"{len(jobs)} job(s) assigned." if jobs else "No open jobs available.",
+        data={"items": [j.model_dump() for j in jobs]},
+    )
+
+
 @router.post("/jobs/{pickup_request_id}/claim", response_model=ApiEnvelope)
 def worker_claim_pickup_job(
     pickup_request_id: int,
@@ -132,6 +236,48 @@ def worker_submit_verification(
     )
 
 
+@router.post("/route/plan", response_model=ApiEnvelope)
+def worker_plan_route(
+    payload: RoutePlanRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.require_roles(UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN)),
+):
+    plan = plan_worker_route(db, current_user=current_user, payload=payload)
+    return ApiEnvelope(
+        message=f"Route planned with {len(plan.stops)} stop(s).",
+        data=plan.model_dump(),
+    )
+
+
+@router.post("/sync", response_model=WorkerSyncResponse, response_model_exclude_none=True)
+def worker_sync(
+    payload: WorkerSyncRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.require_roles(UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN)),
+):
+    """
+    Offline sync: apply queued mutations in order, then return what changed
+    since `watermark` (everything relevant when it is omitted or stale).
+    """
+    outcomes = apply_mutations(
+        db,
+        user=current_user,
+        mutations=[(m.key, m.op, m.args) for m in payload.mutations],
+    )
+    delta = collect_delta(db, user=current_user, watermark=payload.watermark)
+    response = WorkerSyncResponse(
+        watermark=delta.watermark,
+        full=delta.full,
+        mutations=[WorkerSyncMutationOut(**o.__dict__) for o in outcomes],
+        pickups=delta.pickups,
+        reports=[WasteReportRead.model_validate(r) for r in delta.reports],
+        segregation_logs=delta.segregation_logs,
+        removed=WorkerSyncRemoved(pickups=delta.removed_pickups, reports=delta.removed_reports),
+    )
+    db.commit()
+    return response
+
+
 @router.get("/badges/me", response_model=ApiEnvelope)
 def worker_badges_me(
     db: Session = Depends(get_db),
@@ -0,0 +1,164 @@
+# app/core/badge_rules.py
+
+"""
+Declarative badge rules, as stored in Badge.rule_json.
+
+    {"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": 50}
+    {"metric": "training_completed", "op": ">=", "ref": "training_total"}
+    {"all": [rule, ...]}   {"any": [rule, ...]}
+
+An optional top-level "scope" (e.g. {"target": "worker"}) restricts a rule to
+evaluation contexts carrying the same keys. Rules compile once into plain
+predicates over a metrics mapping; a metric missing from the snapshot makes
+its comparison false. compile_vector_rule() builds the same rule over NumPy
+columns (one entry per user, NaN = missing) for batch recomputation.
+"""
+
+import json
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Optional
+
+import numpy as np
+
+Metrics = Mapping[str, Any]
+Predicate = Callable[[Metrics], bool]
+Columns = Mapping[str, np.ndarray]
+VectorPredicate = Callable[[Columns, int], np.ndarray]
+
+OPS: dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+}
+
+
+class RuleError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    predicate: Predicate
+    scope: tuple[tuple[str, Any], ...] = ()
+
+    def applies_to(self, context: Mapping[str, Any]) -> bool:
+        return all(context.get(k) == v for k, v in self.scope)
+
+    def __call__(self, metrics: Metrics, context: Optional[Mapping[str, Any]] = None) -> bool:
+        if not self.applies_to(context or {}):
+            return False
+        return self.predicate(metrics)
+
+
+def is_declarative(rule: Any) -> bool:
+    return isinstance(rule, dict) and any(k in rule for k in ("metric", "all", "any"))
+
+
+def _compile_node(node: Any) -> Predicate:
+    if not isinstance(node, dict):
+        raise RuleError(f"Rule node must be an object, got {type(node).__name__}.")
+
+    if "all" in node or "any" in node:
+        combinator = "all" if "all" in node else "any"
+        children = node[combinator]
+        if not isinstance(children, list) or not children:
+            raise RuleError(f"'{combinator}' needs a non-empty list of rules.")
+        parts = tuple(_compile_node(c) for c in children)
+        if combinator == "all":
+            return lambda m: all(p(m) for p in parts)
+        return lambda m: any(p(m) for p in parts)
+
+    metric = node.get("metric")
+    if not isinstance(metric, str) or not metric:
+        raise RuleError("Rule needs a 'metric' name.")
+    op_name = node.get("op", ">=")
+    op = OPS.get(op_name)
+    if op is None:
+        raise RuleError(f"Unsupported operator {op_name!r}.")
+
+    if "ref" in node:
+        ref = node["ref"]
+
+        def compare_ref(m: Metrics) -> bool:
+            left, right = m.get(metric), m.get(ref)
+            return left is not None and right is not None and op(left, right)
+
+        return compare_ref
+
+    if "threshold" not in node:
+        raise RuleError(f"Rule on {metric!r} needs a 'threshold' or 'ref'.")
+    threshold = node["threshold"]
+
+    def compare(m: Metrics) -> bool:
+        value = m.get(metric)
+        return value is not None and op(value, threshold)
+
+    return compare
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(rule_text: str) -> CompiledRule:
+    rule = json.loads(rule_text)
+    scope = rule.get("scope") or {}
+    if not isinstance(scope, dict):
+        raise RuleError("'scope' must be an object.")
+    body = {k: v for k, v in rule.items() if k != "scope"}
+    return CompiledRule(predicate=_compile_node(body), scope=tuple(sorted(scope.items())))
+
+
+def compile_rule(rule: Mapping[str, Any]) -> CompiledRule:
+    """Compile (and memoise) a declarative rule."""
+    return _compile_cached(json.dumps(rule, sort_keys=True))
+
+
+def _compile_vector_node(node: Any) -> VectorPredicate:
+    if not isinstance(node, dict):
+        raise RuleError(f"Rule node must be an object, got {type(node).__name__}.")
+
+    if "all" in node or "any" in node:
+        combinator = "all" if "all" in node else "any"
+        children = node[combinator]
+        if not isinstance(children, list) or not children:
+            raise RuleError(f"'{combinator}' needs a non-empty list of rules.")
+        parts = tuple(_compile_vector_node(c) for c in children)
+        reduce = np.logical_and.reduce if combinator == "all" else np.logical_or.reduce
+        return lambda cols, n: reduce([p(cols, n) for p in parts])
+
+    metric = node.get("metric")
+    if not isinstance(metric, str) or not metric:
+        raise RuleError("Rule needs a 'metric' name.")
+    op = OPS.get(node.get("op", ">="))
+    if op is None:
+        raise RuleError(f"Unsupported operator {node.get('op')!r}.")
+    if "ref" not in node and "threshold" not in node:
+        raise RuleError(f"Rule on {metric!r} needs a 'threshold' or 'ref'.")
+
+    def column(cols: Columns, name: str, n: int) -> np.ndarray:
+        col = cols.get(name)
+        return np.full(n, np.nan) if col is None else col
+
+    if "ref" in node:
+        ref = node["ref"]
+        return lambda cols, n: op(column(cols, metric, n), column(cols, ref, n))
+    threshold = float(node["threshold"])
+    # NaN compares false, so missing values never pass.
+    return lambda cols, n: op(column(cols, metric, n), threshold)
+
+
+@lru_cache(maxsize=1024)
+def _compile_vector_cached(rule_text: str) -> tuple[VectorPredicate, tuple[tuple[str, Any], ...]]:
+    rule = json.loads(rule_text)
+    scope = rule.get("scope") or {}
+    if not isinstance(scope, dict):
+        raise RuleError("'scope' must be an object.")
+    body = {k: v for k, v in rule.items() if k != "scope"}
+    return _compile_vector_node(body), tuple(sorted(scope.items()))
+
+
+def compile_vector_rule(rule: Mapping[str, Any]) -> tuple[VectorPredicate, tuple[tuple[str, Any], ...]]:
+    """Vectorised form of compile_rule(): (predicate over columns, scope)."""
+    return _compile_vector_cached(json.dumps(rule, sort_keys=True))
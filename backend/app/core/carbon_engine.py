@@ -4,8 +4,14 @@ from typing import Optional, Dict
 
 from sqlalchemy.orm import Session
 
-from app.models.user import User
 from app.models.carbon import CarbonActivity, CarbonActivityType
+from app.services.pcc_ledger_service import (
+    ACCOUNT_USER_BALANCE,
+    LEGACY_CARBON_ACTIVITIES,
+    LedgerPosting,
+    post_ledger_entries,
+)
+from app.services.wallet_service import adjust_user_balance
 
 
 # Emission / savings factors (kg CO2e per kg waste)
@@ -103,7 +109,8 @@ def record_carbon_activity(
     metadata: Optional[Dict] = None,
 ) -> Optional[CarbonActivity]:
     """
-    Create a CarbonActivity row and update user's PCC balance.
+    Create a CarbonActivity row, update user's PCC balance and append the
+    matching pcc_ledger entry. Flushes; the caller commits.
 
     `metadata` is stored in CarbonActivity.details for audit purposes.
     """
@@ -111,8 +118,7 @@ def record_carbon_activity(
     if abs(carbon_kg) < 1e-6 and abs(pcc_tokens) < 1e-6:
         return None
 
-    user = db.get(User, user_id)
-    if not user:
+    if adjust_user_balance(db, user_id, pcc_tokens) is None:
         return None
 
     details = metadata or {}
@@ -125,12 +131,24 @@ def record_carbon_activity(
         details=details,
     )
 
-    current_balance = _safe_default(user.pcc_balance)
-    user.pcc_balance = current_balance + float(pcc_tokens)
-
     db.add(activity)
-    db.add(user)
-    db.commit()
-    db.refresh(activity)
+    db.flush()
+    post_ledger_entries(
+        db,
+        [
+            LedgerPosting(
+                account_kind=ACCOUNT_USER_BALANCE,
+                account_id=user_id,
+                amount_pcc=float(pcc_tokens),
+                carbon_kgco2e=float(carbon_kg),
+                source="carbon_activity",
+                ref_type=activity_type.value,
+                legacy_table=LEGACY_CARBON_ACTIVITIES,
+                legacy_id=activity.id,
+                user_id=user_id,
+                details=details,
+            )
+        ],
+    )
 
     return activity
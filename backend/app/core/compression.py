@@ -0,0 +1,96 @@
+"""
+Response compression for the whole API.
+
+Bodies of at least COMPRESSION_MINIMUM_BYTES are compressed for clients that
+accept it: Brotli when the optional `brotli` package is installed and the client
+sends `br`, gzip otherwise. Already encoded responses (the pre-gzipped public
+marketing bodies), event streams and images pass through unchanged.
+
+Compression is per chunk, so streamed responses stay streamed. Chunks of
+THREAD_MINIMUM_BYTES or more are compressed in a worker thread to keep the event
+loop free.
+"""
+
+from __future__ import annotations
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:  # optional: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+THREAD_MINIMUM_BYTES = 128 * 1024
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """True when Accept-Encoding lists `coding` without q=0."""
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        if name.strip() != coding:
+            continue
+        key, _, value = params.partition("=")
+        if key.strip() != "q":
+            return True
+        try:
+            return float(value) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_BYTES:
+            return await anyio.to_thread.run_sync(self._compress_body, body, more_body)
+        return self._compress_body(body, more_body)
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        out = self._compressor.process(body)
+        return out + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        responder: ASGIApp
+        if brotli is not None and accepts_encoding(accept, "br"):
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif accepts_encoding(accept, "gzip"):
+            responder = GZipResponder(
+                self.app,
+                self.minimum_size,
+                self.gzip_level,
+                thread_minimum_size=THREAD_MINIMUM_BYTES,
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
@@ -6,7 +6,16 @@ class Settings(BaseModel):
     PROJECT_NAME: str = "Prakriti.AI"
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = os.getenv("JWT_SECRET", os.getenv("SECRET_KEY", "CHANGE_ME_SUPER_SECRET"))
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
+    # Access tokens are trusted without a DB lookup, so they stay short-lived;
+    # clients renew them with the rotating refresh token from /auth/refresh.
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+    # pbkdf2_sha256 iterations for new hashes; stored hashes at any other cost
+    # are re-hashed on the user's next successful login.
+    PASSWORD_HASH_ROUNDS: int = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+    # Login verifies passwords in this many worker processes (0: in the API threadpool).
+    PASSWORD_VERIFY_PROCESSES: int = int(os.getenv("PASSWORD_VERIFY_PROCESSES", str(min(4, os.cpu_count() or 1))))
 
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "prakriti")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "prakriti")
@@ -38,6 +47,41 @@ class Settings(BaseModel):
             "http://127.0.0.1:5173",
         ]
 
+    # Background task queue: polling threads started inside the API process.
+    # Set to 0 when running dedicated workers (python -m app.scripts.run_task_worker).
+    TASK_WORKER_THREADS: int = int(os.getenv("TASK_WORKER_THREADS", "1"))
+    TASK_POLL_INTERVAL_SECONDS: float = float(os.getenv("TASK_POLL_INTERVAL_SECONDS", "2.0"))
+
+    # Token chain: pending token transactions are sealed into one block every
+    # TOKEN_BLOCK_INTERVAL_SECONDS, or sooner once TOKEN_BLOCK_MAX_TXS are waiting.
+    TOKEN_BLOCK_INTERVAL_SECONDS: int = int(os.getenv("TOKEN_BLOCK_INTERVAL_SECONDS", "30"))
+    TOKEN_BLOCK_MAX_TXS: int = int(os.getenv("TOKEN_BLOCK_MAX_TXS", "256"))
+
+    # Admin analytics read daily rollups refreshed this often by the task queue.
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS: int = int(os.getenv("ANALYTICS_ROLLUP_INTERVAL_SECONDS", "300"))
+
+    # Write requests sent with an Idempotency-Key replay their stored response
+    # for this long; larger responses are not stored (a retry re-executes).
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = int(os.getenv("IDEMPOTENCY_MAX_RESPONSE_BYTES", str(1024 * 1024)))
+
+    # Rate limits: "memory" keeps per-process buckets (LRU-bounded), "postgres"
+    # shares them across workers through the rate_limit_buckets table.
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MEMORY_MAX_KEYS", "100000"))
+
+    # Public marketing responses are cached per process; admin edits clear the
+    # editing process's copy at once, other processes within this many seconds.
+    MARKETING_CACHE_TTL_SECONDS: int = int(os.getenv("MARKETING_CACHE_TTL_SECONDS", "300"))
+    # Live platform stats and the sample ledger on the landing page are recomputed this often.
+    PUBLIC_STATS_CACHE_TTL_SECONDS: int = int(os.getenv("PUBLIC_STATS_CACHE_TTL_SECONDS", "60"))
+
+    # Responses of at least this many bytes are sent gzip- or (with the optional
+    # brotli package) br-encoded to clients that accept it.
+    COMPRESSION_MINIMUM_BYTES: int = int(os.getenv("COMPRESSION_MINIMUM_BYTES", "1024"))
+    GZIP_COMPRESSION_LEVEL: int = int(os.getenv("GZIP_COMPRESSION_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+
     # NEW → folder where all uploads (waste photos, ML inputs) are stored
     MEDIA_ROOT: str = "uploads"
 
@@ -0,0 +1,122 @@
+# app/core/geo.py
+
+"""
+Geohash helpers for proximity lookups on plain latitude/longitude columns.
+
+Rows store a geohash next to their coordinates; a B-tree index on that column
+(text_pattern_ops) turns "points inside this box" into a handful of prefix
+range scans. Exact filtering and ordering then run on the raw floats.
+"""
+
+import math
+from typing import Optional
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # ~5m cells; stored on every located row
+MAX_COVER_CELLS = 32
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+BBox = tuple[float, float, float, float]  # (min_lat, min_lon, max_lat, max_lon)
+
+
+def geohash_encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars: list[str] = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                value = (value << 1) | 1
+                lon_lo = mid
+            else:
+                value <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                value = (value << 1) | 1
+                lat_lo = mid
+            else:
+                value <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def geohash_for(lat: Optional[float], lon: Optional[float]) -> Optional[str]:
+    if lat is None or lon is None:
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        return None
+    return geohash_encode(lat, lon)
+
+
+def cell_size_deg(precision: int) -> tuple[float, float]:
+    """(lat_height, lon_width) in degrees of a geohash cell at this precision."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bbox_around(lat: float, lon: float, radius_km: float) -> BBox:
+    dlat = radius_km / KM_PER_DEG_LAT
+    dlon = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return (
+        max(-90.0, lat - dlat),
+        max(-180.0, lon - dlon),
+        min(90.0, lat + dlat),
+        min(180.0, lon + dlon),
+    )
+
+
+def _cell_index_range(lo: float, hi: float, origin: float, size: float, cells: int) -> range:
+    start = max(0, int(math.floor((lo - origin) / size)))
+    stop = min(cells - 1, int(math.floor((hi - origin) / size)))
+    return range(start, stop + 1)
+
+
+def covering_prefixes(bbox: BBox, max_cells: int = MAX_COVER_CELLS) -> list[str]:
+    """
+    Geohash prefixes whose cells together cover the box.
+
+    Picks the finest precision that needs at most `max_cells` cells, so callers
+    get a short OR of prefix scans. Returns [] when even one-character cells
+    would exceed the budget (i.e. effectively "no spatial pruning").
+    """
+    min_lat, min_lon, max_lat, max_lon = bbox
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        h, w = cell_size_deg(precision)
+        lat_cells = int(round(180.0 / h))
+        lon_cells = int(round(360.0 / w))
+        lat_idx = _cell_index_range(min_lat, max_lat, -90.0, h, lat_cells)
+        lon_idx = _cell_index_range(min_lon, max_lon, -180.0, w, lon_cells)
+        if len(lat_idx) * len(lon_idx) > max_cells:
+            continue
+        prefixes = {
+            geohash_encode(-90.0 + (i + 0.5) * h, -180.0 + (j + 0.5) * w, precision)
+            for i in lat_idx
+            for j in lon_idx
+        }
+        return sorted(prefixes)
+    return []
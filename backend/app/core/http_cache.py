@@ -0,0 +1,125 @@
+"""
+Conditional-GET helpers: strong ETags over serialized bodies and 304 replies.
+
+ResponseCache keeps pre-serialized, pre-gzipped bodies for content that only
+changes on known writes (e.g. public marketing sections). Writers call
+invalidate(); the TTL bounds staleness in other worker processes, whose
+caches never see that call.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison, as used for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def serialize_json(payload: Any) -> bytes:
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def conditional_json_response(
+    request: Request,
+    payload: Any,
+    *,
+    cache_control: str = "private, no-cache",
+) -> Response:
+    """JSON response carrying an ETag; 304 with no body when the client already has it."""
+    body = serialize_json(payload)
+    etag = compute_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+GZIP_MIN_BYTES = 512
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    payload: Any
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+
+
+def prepare_body(payload: Any) -> CachedBody:
+    body = serialize_json(payload)
+    # mtime=0 keeps the compressed bytes deterministic for identical bodies.
+    packed = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+    return CachedBody(payload=payload, body=body, etag=compute_etag(body), gzip_body=packed)
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return any(
+        part.split(";")[0].strip().lower() == "gzip"
+        for part in request.headers.get("accept-encoding", "").split(",")
+    )
+
+
+def cached_json_response(request: Request, entry: CachedBody, *, cache_control: str = "public, no-cache") -> Response:
+    """Serve a prepared body: 304 on a matching ETag, gzip bytes when the client accepts them."""
+    encoded = entry.gzip_body is not None and _accepts_gzip(request)
+    # Each encoding is its own representation, so it gets its own strong ETag.
+    etag = entry.etag[:-1] + '-gzip"' if encoded else entry.etag
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoded:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[str, tuple[float, CachedBody]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        hit = self._entries.get(key)
+        if hit is None or hit[0] <= self._clock():
+            return None
+        return hit[1]
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> CachedBody:
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            # Another thread may have rebuilt it while we waited.
+            entry = self.get(key)
+            if entry is None:
+                entry = prepare_body(build())
+                self._entries[key] = (self._clock() + self.ttl_seconds, entry)
+            return entry
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop the given keys, or everything when called without any."""
+        with self._lock:
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
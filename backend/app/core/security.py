@@ -1,14 +1,29 @@
+import asyncio
+import multiprocessing
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
-from jose import jwt
+from jose import JWTError, jwt
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Hashes made at any other round count are "deprecated" and get re-hashed on login.
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 ALGORITHM = "HS256"
 
+_dummy_hash: Optional[str] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -18,13 +33,72 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def check_password(plain_password: str, hashed_password: Optional[str]) -> tuple[bool, Optional[str]]:
+    """
+    (matches, replacement hash or None). With no stored hash (unknown user) this
+    still runs one verify at the current cost, so both paths take the same time.
+    """
+    global _dummy_hash
+    if hashed_password is None:
+        if _dummy_hash is None:
+            _dummy_hash = pwd_context.hash(secrets.token_urlsafe(16))
+        pwd_context.verify(plain_password, _dummy_hash)
+        return False, None
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: never fork the API process with its DB connections and worker threads.
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_VERIFY_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+async def check_password_async(plain_password: str, hashed_password: Optional[str]) -> tuple[bool, Optional[str]]:
+    """check_password() in the verify process pool, keeping PBKDF2 off the request threadpool."""
+    if settings.PASSWORD_VERIFY_PROCESSES <= 0:
+        return await run_in_threadpool(check_password, plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), check_password, plain_password, hashed_password)
+
+
+def shutdown_password_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
 def create_access_token(
     subject: Union[str, int],
     expires_delta: Optional[timedelta] = None,
+    claims: Optional[dict[str, Any]] = None,
 ) -> str:
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"sub": str(subject), "exp": expire}
+    to_encode = {**(claims or {}), "sub": str(subject), "exp": expire}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+def bearer_subject(authorization: Optional[str]) -> Optional[str]:
+    """The `sub` of a valid access token in an `Authorization: Bearer` header, else None."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    try:
+        payload = jwt.decode(token.strip(), settings.SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    sub = payload.get("sub")
+    if sub is None or payload.get("typ", "access") != "access":
+        return None
+    return str(sub)
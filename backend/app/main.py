@@ -1,5 +1,6 @@
 # app/main.py:
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -8,8 +9,10 @@ from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 
 from app import models  # noqa: F401  # ensure SQLAlchemy models are imported
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.core.database import Base, engine
+from app.core.security import shutdown_password_pool
 
 # API routers
 from app.api import admin as admin_router
@@ -31,6 +34,9 @@ from app.api.v1 import admin_demo_requests as admin_demo_requests_router
 from app.api.v1 import admin_training as admin_training_router
 from app.api.v1 import public as public_router
 from app.routers import pcc as pcc_router
+from app.services.analytics_rollup_service import schedule_rollup_refresh
+from app.services.idempotency_service import IdempotencyMiddleware
+from app.services.task_queue_service import start_task_workers, stop_task_workers
 from app.core.database import SessionLocal
 from app.services.marketing_service import seed_marketing_content
 
@@ -102,6 +108,25 @@ def ensure_pcc_schema_compat() -> None:
         conn.execute(text("ALTER TABLE IF EXISTS wallets ADD COLUMN IF NOT EXISTS org_id INTEGER NULL;"))
         conn.execute(text("ALTER TABLE IF EXISTS wallets ADD COLUMN IF NOT EXISTS balance_pcc DOUBLE PRECISION NOT NULL DEFAULT 0.0;"))
         conn.execute(text("ALTER TABLE IF EXISTS wallets ALTER COLUMN bulk_generator_id DROP NOT NULL;"))
+        conn.execute(
+            text(
+                """
+                DO $$
+                BEGIN
+                  IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'wallets' AND column_name = 'balance_pcc' AND data_type = 'double precision'
+                  ) THEN
+                    ALTER TABLE wallets
+                      ALTER COLUMN balance_points TYPE NUMERIC(18, 6),
+                      ALTER COLUMN balance_pcc TYPE NUMERIC(18, 6),
+                      ALTER COLUMN lifetime_credited TYPE NUMERIC(18, 6),
+                      ALTER COLUMN lifetime_debited TYPE NUMERIC(18, 6);
+                  END IF;
+                END $$;
+                """
+            )
+        )
 
         conn.execute(text("ALTER TABLE IF EXISTS transactions ADD COLUMN IF NOT EXISTS user_id INTEGER NULL;"))
         conn.execute(text("ALTER TABLE IF EXISTS transactions ADD COLUMN IF NOT EXISTS org_id INTEGER NULL;"))
@@ -116,6 +141,8 @@ def ensure_pcc_schema_compat() -> None:
         conn.execute(text("ALTER TABLE IF EXISTS bulk_generators ADD COLUMN IF NOT EXISTS city VARCHAR(120) NULL;"))
         conn.execute(text("ALTER TABLE IF EXISTS bulk_generators ADD COLUMN IF NOT EXISTS license_number VARCHAR(120) NULL;"))
         conn.execute(text("ALTER TABLE IF EXISTS bulk_generators ADD COLUMN IF NOT EXISTS status VARCHAR(32) NOT NULL DEFAULT 'PENDING_APPROVAL';"))
+        conn.execute(text("ALTER TABLE IF EXISTS bulk_generators ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION NULL;"))
+        conn.execute(text("ALTER TABLE IF EXISTS bulk_generators ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION NULL;"))
         conn.execute(text("ALTER TABLE IF EXISTS pickup_requests ADD COLUMN IF NOT EXISTS bulk_org_id INTEGER NULL;"))
         conn.execute(text("ALTER TABLE IF EXISTS pickup_requests ADD COLUMN IF NOT EXISTS note VARCHAR(500) NULL;"))
 
@@ -401,6 +428,18 @@ def ensure_pcc_schema_compat() -> None:
                 """
             )
         )
+        # Give the older criteria_key-only badges a code so the rule engine can find them.
+        conn.execute(
+            text(
+                """
+                UPDATE badges SET code = 'first_waste_report'
+                WHERE code IS NULL AND criteria_key = 'first_waste_report';
+
+                UPDATE badges SET code = 'segregation_star_7', criteria_key = 'segregation_star_7'
+                WHERE code IS NULL AND name = 'Segregation Star (7-day streak)';
+                """
+            )
+        )
         conn.execute(
             text(
                 """
@@ -449,6 +488,55 @@ def ensure_pcc_schema_compat() -> None:
         conn.execute(text("CREATE INDEX IF NOT EXISTS ix_notifications_user_id ON notifications(user_id);"))
         conn.execute(text("CREATE INDEX IF NOT EXISTS ix_notifications_is_read ON notifications(is_read);"))
         conn.execute(text("CREATE INDEX IF NOT EXISTS ix_notifications_created_at ON notifications(created_at DESC);"))
+        conn.execute(text("ALTER TABLE IF EXISTS waste_reports ADD COLUMN IF NOT EXISTS geohash VARCHAR(12) NULL;"))
+        conn.execute(text("ALTER TABLE IF EXISTS facilities ADD COLUMN IF NOT EXISTS geohash VARCHAR(12) NULL;"))
+        conn.execute(
+            text(
+                """
+                DO $$
+                BEGIN
+                  IF to_regclass('public.pickup_requests') IS NOT NULL THEN
+                    CREATE INDEX IF NOT EXISTS ix_pickup_requests_open_queue
+                    ON pickup_requests(created_at, id)
+                    WHERE status = 'REQUESTED' AND assigned_worker_id IS NULL;
+                    CREATE INDEX IF NOT EXISTS ix_pickup_requests_updated_at ON pickup_requests(updated_at);
+                  END IF;
+                  IF to_regclass('public.waste_reports') IS NOT NULL THEN
+                    CREATE INDEX IF NOT EXISTS ix_waste_reports_open_queue
+                    ON waste_reports(created_at, id)
+                    WHERE status = 'OPEN' AND assigned_worker_id IS NULL;
+                    CREATE INDEX IF NOT EXISTS ix_waste_reports_geohash ON waste_reports(geohash text_pattern_ops);
+                    CREATE INDEX IF NOT EXISTS ix_waste_reports_updated_at ON waste_reports(updated_at);
+                  END IF;
+                  IF to_regclass('public.facilities') IS NOT NULL THEN
+                    CREATE INDEX IF NOT EXISTS ix_facilities_geohash ON facilities(geohash text_pattern_ops);
+                  END IF;
+                  IF to_regclass('public.segregation_logs') IS NOT NULL THEN
+                    CREATE INDEX IF NOT EXISTS ix_segregation_logs_citizen_date ON segregation_logs(citizen_id, log_date);
+                    CREATE INDEX IF NOT EXISTS ix_segregation_logs_created_at ON segregation_logs(created_at);
+                    CREATE INDEX IF NOT EXISTS ix_segregation_logs_worker_created ON segregation_logs(worker_id, created_at);
+                  END IF;
+                  IF to_regclass('public.carbon_activities') IS NOT NULL THEN
+                    CREATE INDEX IF NOT EXISTS ix_carbon_activities_created_at ON carbon_activities(created_at);
+                  END IF;
+                  IF to_regclass('public.token_transactions') IS NOT NULL
+                     AND to_regclass('public.token_blocks') IS NOT NULL THEN
+                    ALTER TABLE token_blocks ADD COLUMN IF NOT EXISTS merkle_root VARCHAR(64) NULL;
+                    ALTER TABLE token_blocks ADD COLUMN IF NOT EXISTS tx_count INTEGER NOT NULL DEFAULT 1;
+                    ALTER TABLE token_transactions ADD COLUMN IF NOT EXISTS block_id INTEGER NULL REFERENCES token_blocks(id);
+                    -- Link transactions already chained one-per-block before batching.
+                    UPDATE token_transactions t
+                    SET block_id = b.id
+                    FROM token_blocks b
+                    WHERE t.block_id IS NULL
+                      AND b.merkle_root IS NULL
+                      AND (b.data::jsonb ->> 'tx_id')::int = t.id;
+                    CREATE INDEX IF NOT EXISTS ix_token_transactions_pending ON token_transactions(id) WHERE block_id IS NULL;
+                  END IF;
+                END $$;
+                """
+            )
+        )
         conn.execute(
             text(
                 """
@@ -530,10 +618,46 @@ def seed_marketing_defaults() -> None:
         db.close()
 
 
+def seed_periodic_tasks() -> None:
+    # Periodic tasks re-queue themselves; this restarts the cycle after an outage.
+    db = SessionLocal()
+    try:
+        with db.begin():
+            schedule_rollup_refresh(db)
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Post-commit side effects (badges, carbon, token blocks) drain from background_tasks.
+    start_task_workers(settings.TASK_WORKER_THREADS, poll_interval=settings.TASK_POLL_INTERVAL_SECONDS)
+    try:
+        yield
+    finally:
+        stop_task_workers()
+        shutdown_password_pool()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    # --- Idempotency-Key replay for write retries ---
+    # Added before CORS so replayed responses still pass through CORSMiddleware.
+    app.add_middleware(IdempotencyMiddleware)
+
+    # --- Response compression ---
+    # Outside idempotency so stored responses stay unencoded and every replay
+    # is encoded for the retrying client's Accept-Encoding.
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_BYTES,
+        gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
     )
 
     # --- CORS ---
@@ -553,6 +677,7 @@ def create_app() -> FastAPI:
     ensure_pcc_schema_compat()
     Base.metadata.create_all(bind=engine)
     seed_marketing_defaults()
+    seed_periodic_tasks()
 
     # --- Health check ---
     @app.get("/health", tags=["health"])
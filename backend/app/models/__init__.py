@@ -33,9 +33,16 @@ from app.models.bulk import (
     TransactionStatus,
     WalletOwnerType,
 )
-from app.models.pcc import EmissionFactor, CarbonLedger
+from app.models.pcc import EmissionFactor, CarbonLedger, PccLedgerEntry
 from app.models.admin_ops import Zone, WorkforceAssignment, AuditLog, PlatformSetting
 from app.models.notification import Notification
+from app.models.task_queue import BackgroundTask, TaskStatus
+from app.models.streak import StreakCounter
+from app.models.analytics import CarbonDailyRollup, SegregationDailyRollup
+from app.models.worker_sync import WorkerSyncItem, WorkerSyncMutation
+from app.models.idempotency import IdempotencyKey
+from app.models.rate_limit import RateLimitBucket
+from app.models.auth_session import RefreshToken
 
 
 __all__ = [
@@ -73,11 +80,22 @@ __all__ = [
     "WalletOwnerType",
     "EmissionFactor",
     "CarbonLedger",
+    "PccLedgerEntry",
     "Zone",
     "WorkforceAssignment",
     "AuditLog",
     "PlatformSetting",
     "Notification",
+    "BackgroundTask",
+    "TaskStatus",
+    "StreakCounter",
+    "CarbonDailyRollup",
+    "SegregationDailyRollup",
+    "WorkerSyncMutation",
+    "WorkerSyncItem",
+    "IdempotencyKey",
+    "RateLimitBucket",
+    "RefreshToken",
     "MarketingPartner",
     "MarketingTestimonial",
     "MarketingCaseStudy",
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String
+
+from app.core.database import Base
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CarbonDailyRollup(Base):
+    """carbon_activities summed per UTC day × user role × activity type × ward ('' when unknown)."""
+
+    __tablename__ = "carbon_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    role = Column(String(32), primary_key=True)
+    activity_type = Column(String(40), primary_key=True)
+    ward = Column(String(120), primary_key=True)
+    activity_count = Column(Integer, nullable=False, default=0)
+    carbon_kg = Column(Float, nullable=False, default=0.0)
+    pcc_tokens = Column(Float, nullable=False, default=0.0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+
+class SegregationDailyRollup(Base):
+    """segregation_logs counted per log_date × household ward ('' when unknown)."""
+
+    __tablename__ = "segregation_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    ward = Column(String(120), primary_key=True)
+    log_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    dry_kg = Column(Float, nullable=False, default=0.0)
+    wet_kg = Column(Float, nullable=False, default=0.0)
+    reject_kg = Column(Float, nullable=False, default=0.0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Float,
+    Numeric,
     Enum,
     Boolean,
 )
@@ -97,6 +98,9 @@ class BulkGenerator(Base):
     address = Column(String(500), nullable=True)
     ward = Column(String(120), nullable=True)
     pincode = Column(String(6), nullable=True)
+    # Pickup point used by worker route planning.
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
 
     # Compatibility fields from prior schema.
     organization_type = Column(String(100), nullable=True)
@@ -187,7 +191,7 @@ class PickupRequest(Base):
     note = Column(String(500), nullable=True)
     status_note = Column(String(500), nullable=True)
     created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, nullable=False, index=True)
 
     waste_log = relationship("WasteLog", back_populates="pickup_requests")
     requested_by = relationship("User", foreign_keys=[requested_by_user_id], backref="bulk_pickup_requests")
@@ -243,10 +247,11 @@ class Wallet(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     org_id = Column(Integer, nullable=True, index=True)
 
-    balance_points = Column(Float, nullable=False, default=0.0)
-    balance_pcc = Column(Float, nullable=False, default=0.0)
-    lifetime_credited = Column(Float, nullable=False, default=0.0)
-    lifetime_debited = Column(Float, nullable=False, default=0.0)
+    # Fixed-point in the database (exact sums under concurrent deltas), floats in Python.
+    balance_points = Column(Numeric(18, 6, asdecimal=False), nullable=False, default=0.0)
+    balance_pcc = Column(Numeric(18, 6, asdecimal=False), nullable=False, default=0.0)
+    lifetime_credited = Column(Numeric(18, 6, asdecimal=False), nullable=False, default=0.0)
+    lifetime_debited = Column(Numeric(18, 6, asdecimal=False), nullable=False, default=0.0)
     updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, nullable=False)
 
     bulk_generator = relationship("BulkGenerator", back_populates="wallet")
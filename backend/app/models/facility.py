@@ -7,6 +7,7 @@ from sqlalchemy import (
     String,
     DateTime,
     Float,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -23,6 +24,9 @@ class FacilityType(str):
 
 class Facility(Base):
     __tablename__ = "facilities"
+    __table_args__ = (
+        Index("ix_facilities_geohash", "geohash", postgresql_ops={"geohash": "text_pattern_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -33,6 +37,7 @@ class Facility(Base):
 
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)  # derived from latitude/longitude
 
     capacity_tpd = Column(Float, nullable=True)  # tons per day
     contact_person = Column(String, nullable=True)
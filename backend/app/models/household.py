@@ -9,6 +9,7 @@ from sqlalchemy import (
     Boolean,
     Float,
     Date,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
@@ -61,7 +62,11 @@ class HouseholdMember(Base):
 
 class SegregationLog(Base):
     __tablename__ = "segregation_logs"
-    __table_args__ = (UniqueConstraint("household_id", "log_date", name="uq_household_log_date"),)
+    __table_args__ = (
+        UniqueConstraint("household_id", "log_date", name="uq_household_log_date"),
+        # Worker sync deltas.
+        Index("ix_segregation_logs_worker_created", "worker_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime
+from sqlalchemy import DDL, BigInteger, Column, Integer, String, Float, Boolean, DateTime, Index, UniqueConstraint, event
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.core.database import Base
@@ -35,3 +35,56 @@ class CarbonLedger(Base):
     quality_score = Column(Float, nullable=False, default=1.0)
     details = Column(JSONB, nullable=False, server_default="{}")
     created_at = Column(DateTime(timezone=True), nullable=False, default=utc_now, index=True)
+
+
+class PccLedgerEntry(Base):
+    """
+    Append-only record of every PCC movement, whichever legacy store it also
+    touched. amount_pcc is signed (credit > 0, debit < 0); account_kind and
+    account_id name the balance that moved (wallet, users.pcc_balance, token
+    account) and legacy_table/legacy_id the row mirrored there.
+    """
+
+    __tablename__ = "pcc_ledger"
+    __table_args__ = (
+        UniqueConstraint("legacy_table", "legacy_id", name="uq_pcc_ledger_legacy_row"),
+        Index("ix_pcc_ledger_account", "account_kind", "account_id"),
+        Index("ix_pcc_ledger_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    account_kind = Column(String(16), nullable=False)
+    account_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=True)
+    org_id = Column(Integer, nullable=True, index=True)
+
+    amount_pcc = Column(Float, nullable=False)
+    carbon_kgco2e = Column(Float, nullable=False, default=0.0)
+    source = Column(String(32), nullable=False, index=True)
+    ref_type = Column(String(64), nullable=True)
+    ref_id = Column(Integer, nullable=True)
+
+    legacy_table = Column(String(32), nullable=False)
+    legacy_id = Column(Integer, nullable=False)
+    created_by_user_id = Column(Integer, nullable=True)
+    details = Column(JSONB, nullable=False, server_default="{}")
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+
+# Same guard as migrations/20260304_pcc_ledger.sql, for tables made by create_all().
+event.listen(
+    PccLedgerEntry.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION pcc_ledger_append_only() RETURNS trigger AS $$
+        BEGIN
+          RAISE EXCEPTION 'pcc_ledger is append-only';
+        END;
+        $$ LANGUAGE plpgsql;
+        CREATE TRIGGER trg_pcc_ledger_append_only
+          BEFORE UPDATE OR DELETE ON pcc_ledger
+          FOR EACH ROW EXECUTE FUNCTION pcc_ledger_append_only();
+        """
+    ).execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy import Boolean, Column, Float, Index, String
+
+from app.core.database import Base
+
+
+class RateLimitBucket(Base):
+    """GCRA state for one rate-limited key when RATE_LIMIT_BACKEND=postgres."""
+
+    __tablename__ = "rate_limit_buckets"
+    # Counters are disposable: skip WAL so every check is a cheap in-memory page write.
+    __table_args__ = (
+        Index("ix_rate_limit_buckets_tat", "tat"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    key = Column(String(255), primary_key=True)
+    tat = Column(Float, nullable=False)  # theoretical arrival time, unix seconds
+    allowed = Column(Boolean, nullable=False, default=True)  # outcome of the latest check
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Date, DateTime, Integer, String, UniqueConstraint
+
+from app.core.database import Base
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class StreakCounter(Base):
+    """Running streak for one subject (user, household, org) and activity stream."""
+
+    __tablename__ = "streak_counters"
+    __table_args__ = (
+        UniqueConstraint("subject_type", "subject_id", "stream", name="uq_streak_counters_subject"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    subject_type = Column(String(16), nullable=False)
+    subject_id = Column(Integer, nullable=False)
+    stream = Column(String(32), nullable=False)
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_active_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utc_now, onupdate=utc_now)
@@ -8,6 +8,8 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -38,20 +40,31 @@ class TokenTransaction(Base):
     description = Column(String, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Set when the transaction is sealed into a chain block; NULL means pending.
+    block_id = Column(Integer, ForeignKey("token_blocks.id"), nullable=True)
 
     account = relationship(TokenAccount, back_populates="transactions")
 
+    __table_args__ = (
+        Index("ix_token_transactions_pending", "id", postgresql_where=text("block_id IS NULL")),
+    )
+
 
 class TokenBlock(Base):
     """
-    Optional simple blockchain-like structure to record blocks of transactions.
+    Hash chain over token transactions. Each block seals a batch of
+    transactions under a Merkle root; `data` holds the canonical JSON that
+    `hash` commits to. Blocks written before batching carry a single
+    transaction and no merkle_root.
     """
     __tablename__ = "token_blocks"
 
     id = Column(Integer, primary_key=True, index=True)
     previous_hash = Column(String, nullable=True)
     hash = Column(String, nullable=False)
-    data = Column(String, nullable=False)  # could store JSON stringified
+    data = Column(String, nullable=False)  # canonical JSON: {"merkle_root": ..., "txs": [...]}
+    merkle_root = Column(String(64), nullable=True)
+    tx_count = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime, default=datetime.utcnow)
 
     @staticmethod
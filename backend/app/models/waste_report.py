@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     Float,
     Boolean,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -28,6 +29,12 @@ class WasteReportStatus(str, enum.Enum):
 
 class WasteReport(Base):
     __tablename__ = "waste_reports"
+    __table_args__ = (
+        # text_pattern_ops lets prefix LIKE scans use the index under any collation.
+        Index("ix_waste_reports_geohash", "geohash", postgresql_ops={"geohash": "text_pattern_ops"}),
+        # Worker sync deltas.
+        Index("ix_waste_reports_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -44,6 +51,7 @@ class WasteReport(Base):
 
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)  # derived from latitude/longitude
 
     # Snapshot of AI classification at time of report
     classification_label = Column(String, nullable=True)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.database import Base
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class WorkerSyncMutation(Base):
+    """Outcome of one queued offline mutation, keyed by the client's idempotency key."""
+
+    __tablename__ = "worker_sync_mutations"
+    __table_args__ = (UniqueConstraint("user_id", "client_key", name="uq_worker_sync_mutations_user_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    client_key = Column(String(64), nullable=False)
+    op = Column(String(32), nullable=False)
+    status = Column(String(16), nullable=False)  # applied | rejected
+    http_status = Column(Integer, nullable=False, default=200)
+    detail = Column(String(500), nullable=True)
+    result_json = Column(JSONB, nullable=False, server_default="{}")
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+
+class WorkerSyncItem(Base):
+    """
+    A pickup or report id held on a worker's device from an earlier sync, so
+    `removed` only names rows that device has. Dropped once it has been told.
+    """
+
+    __tablename__ = "worker_sync_items"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(16), primary_key=True)  # pickup | report
+    item_id = Column(Integer, primary_key=True)
@@ -30,6 +30,7 @@ from app.services.carbon_engine import (
     credit_pcc_transaction,
     derive_quality_score,
 )
+from app.services.streak_service import record_verification_activity
 
 router = APIRouter(tags=["pcc"])
 
@@ -184,6 +185,7 @@ def verify_waste_log(
             waste_log.status = WasteLogStatus.VERIFIED
             db.add(waste_log)
             db.flush()
+            record_verification_activity(db, waste_log, verification.verified_at)
 
             credit = credit_pcc_transaction(
                 db,
@@ -309,6 +311,7 @@ def my_impact(
     current_user: User = Depends(deps.get_current_user),
 ):
     summary = build_impact_summary(db, user_id=current_user.id, org_id=org_id)
+    db.commit()
     return APIResponse(
         message="Impact summary fetched.",
         data={"impact": ImpactSummarySchema(**summary.__dict__).model_dump()},
@@ -263,6 +263,26 @@ class AuditLogListResponse(BaseModel):
     total: int
 
 
+class BackgroundTaskItem(BaseModel):
+    id: int
+    kind: str
+    idempotency_key: str
+    status: str
+    attempts: int
+    max_attempts: int
+    payload: dict[str, Any]
+    last_error: str | None
+    run_after: datetime
+    created_at: datetime
+    updated_at: datetime
+    completed_at: datetime | None
+
+
+class BackgroundTaskListResponse(BaseModel):
+    items: list[BackgroundTaskItem]
+    total: int
+
+
 class SettingsRead(BaseModel):
     pcc_unit_kgco2e: float
     emission_factors: dict[str, float]
@@ -4,7 +4,13 @@ from pydantic import BaseModel
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None
+    expires_in: int | None = None  # access token lifetime in seconds
 
 
 class TokenData(BaseModel):
     sub: str | None = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
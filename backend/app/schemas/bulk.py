@@ -86,6 +86,8 @@ class BulkOrgRead(BaseModel):
     address: Optional[str] = None
     ward: Optional[str] = None
     pincode: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     status: OrganizationStatusSchema
 
 
@@ -105,6 +107,8 @@ class BulkMeUpdateRequest(BaseModel):
     waste_categories: Optional[List[WasteCategorySchema]] = None
     address: Optional[str] = None
     ward: Optional[str] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
 
 
 class WasteLogCreate(BaseModel):
@@ -30,6 +30,7 @@ class FacilityRead(BaseModel):
     contact_phone: Optional[str]
     created_at: datetime
     is_active: bool
+    distance_km: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,34 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RoutePlanRequest(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    radius_km: float = Field(default=10.0, gt=0, le=50)
+    max_stops: int = Field(default=10, ge=1, le=25)
+    include_pickups: bool = True
+    include_reports: bool = True
+    # When true, the planned stops are claimed for the caller (stops another
+    # worker grabbed first are dropped and the route is re-planned).
+    assign: bool = False
+
+
+class RouteStop(BaseModel):
+    sequence: int
+    kind: str  # "pickup" | "report"
+    ref_id: int
+    label: str
+    latitude: float
+    longitude: float
+    weight_kg: Optional[float] = None
+    leg_km: float
+    cumulative_km: float
+
+
+class RoutePlan(BaseModel):
+    stops: List[RouteStop] = Field(default_factory=list)
+    total_km: float
+    baseline_km: float
+    assigned: bool = False
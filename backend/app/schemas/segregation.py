@@ -1,7 +1,7 @@
 # backend/app/schemas/segregation.py
 
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -61,3 +61,40 @@ class SegregationLogRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# -------------------------------------------------------------
+# Bulk ingestion (workers logging a whole building at once)
+# -------------------------------------------------------------
+class SegregationBulkRow(BaseModel):
+    # Household and date are checked per row so one bad row does not reject the batch.
+    household_id: int
+    log_date: date
+    dry_kg: float = Field(default=0.0, ge=0, allow_inf_nan=False)
+    wet_kg: float = Field(default=0.0, ge=0, allow_inf_nan=False)
+    reject_kg: float = Field(default=0.0, ge=0, allow_inf_nan=False)
+    notes: Optional[str] = None
+
+
+class SegregationBulkCreate(BaseModel):
+    rows: List[SegregationBulkRow] = Field(min_length=1, max_length=1000)
+
+
+class SegregationBulkRowResult(BaseModel):
+    row: int
+    status: str  # created | duplicate | invalid
+    household_id: Optional[int] = None
+    log_date: Optional[date] = None
+    log_id: Optional[int] = None
+    segregation_score: Optional[int] = None
+    detail: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SegregationBulkReport(BaseModel):
+    created: int
+    duplicates: int
+    invalid: int
+    results: List[SegregationBulkRowResult]
@@ -54,6 +54,8 @@ class WasteReportRead(BaseModel):
 
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    # Set only on proximity queries (km from the requested point).
+    distance_km: Optional[float] = None
 
     # Snapshot of AI classification at time of report
     classification_label: Optional[str] = None
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.bulk import WorkerJobRead
+from app.schemas.segregation import SegregationLogRead
+from app.schemas.waste_report import WasteReportRead
+
+SyncOp = Literal[
+    "pickup.claim",
+    "pickup.status",
+    "report.claim",
+    "report.status",
+    "verification.create",
+    "segregation.log",
+]
+
+
+class WorkerSyncMutationIn(BaseModel):
+    key: str = Field(min_length=1, max_length=64)  # client-generated, unique per worker
+    op: SyncOp
+    args: Dict[str, Any] = Field(default_factory=dict)
+
+
+class WorkerSyncRequest(BaseModel):
+    # Watermark from the previous response; omit for a full snapshot.
+    watermark: Optional[str] = None
+    mutations: List[WorkerSyncMutationIn] = Field(default_factory=list, max_length=200)
+
+
+class WorkerSyncMutationOut(BaseModel):
+    key: str
+    status: Literal["applied", "rejected"]
+    http_status: int
+    detail: Optional[str] = None
+    result: Dict[str, Any] = Field(default_factory=dict)
+    replayed: bool = False
+
+
+class WorkerSyncRemoved(BaseModel):
+    pickups: List[int] = Field(default_factory=list)
+    reports: List[int] = Field(default_factory=list)
+
+
+class WorkerSyncResponse(BaseModel):
+    watermark: str
+    full: bool
+    mutations: List[WorkerSyncMutationOut] = Field(default_factory=list)
+    pickups: List[WorkerJobRead] = Field(default_factory=list)
+    reports: List[WasteReportRead] = Field(default_factory=list)
+    segregation_logs: List[SegregationLogRead] = Field(default_factory=list)
+    removed: WorkerSyncRemoved = Field(default_factory=WorkerSyncRemoved)
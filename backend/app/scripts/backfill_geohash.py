@@ -0,0 +1,45 @@
+from app.core.database import SessionLocal
+from app.core.geo import geohash_for
+from app.models.facility import Facility
+from app.models.waste_report import WasteReport
+
+BATCH_SIZE = 1000
+
+
+def _backfill(db, model) -> int:
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(model)
+            .filter(
+                model.id > last_id,
+                model.geohash.is_(None),
+                model.latitude.isnot(None),
+                model.longitude.isnot(None),
+            )
+            .order_by(model.id.asc())
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not rows:
+            return updated
+        for row in rows:
+            row.geohash = geohash_for(row.latitude, row.longitude)
+        last_id = rows[-1].id
+        updated += len(rows)
+        db.commit()
+
+
+def run() -> None:
+    db = SessionLocal()
+    try:
+        for model in (WasteReport, Facility):
+            count = _backfill(db, model)
+            print(f"{model.__tablename__}: {count} rows geohashed")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+PASSWORD = "correct horse battery staple"
+
+
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__rounds=rounds)
+
+
+def _verify_batch(rounds: int, count: int) -> int:
+    ctx = _context(rounds)
+    stored = ctx.hash(PASSWORD)
+    for _ in range(count):
+        ctx.verify(PASSWORD, stored)
+    return count
+
+
+def run(*, rounds: int, logins: int, processes: int) -> None:
+    start = time.perf_counter()
+    _verify_batch(rounds, logins)
+    single = logins / (time.perf_counter() - start)
+    print(f"pbkdf2_sha256 rounds={rounds}: {single:.1f} logins/sec per core ({1000 / single:.1f} ms per verify)")
+
+    if processes > 1:
+        per_worker = max(1, logins // processes)
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            list(pool.map(_verify_batch, [rounds] * processes, [1] * processes))  # warm up workers
+            start = time.perf_counter()
+            done = sum(pool.map(_verify_batch, [rounds] * processes, [per_worker] * processes))
+            total = done / (time.perf_counter() - start)
+        print(f"{processes} processes: {total:.1f} logins/sec ({total / processes:.1f} per process)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure password verifications per second at a hashing cost.")
+    parser.add_argument("--rounds", type=int, default=settings.PASSWORD_HASH_ROUNDS)
+    parser.add_argument("--logins", type=int, default=200, help="Verifications per measurement.")
+    parser.add_argument("--processes", type=int, default=settings.PASSWORD_VERIFY_PROCESSES or os.cpu_count() or 1)
+    args = parser.parse_args()
+    run(rounds=args.rounds, logins=args.logins, processes=args.processes)
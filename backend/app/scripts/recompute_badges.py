@@ -0,0 +1,38 @@
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.badge_recompute_service import DEFAULT_CHUNK_SIZE, recompute_badges
+
+
+def _report(stats, first_id: int, last_id: int, awarded: int) -> None:
+    print(
+        f"users {first_id}-{last_id}: +{awarded} awards | "
+        f"{stats.users} users, {stats.awarded} awards, {stats.users_per_second:,.0f} users/s"
+    )
+
+
+def run(*, chunk_size: int = DEFAULT_CHUNK_SIZE, restart: bool = False, max_chunks: int | None = None) -> None:
+    db = SessionLocal()
+    try:
+        stats = recompute_badges(
+            db,
+            chunk_size=chunk_size,
+            resume=not restart,
+            max_chunks=max_chunks,
+            on_chunk=_report,
+        )
+        print(
+            f"done: {stats.users} users in {stats.chunks} chunks, {stats.awarded} new awards, "
+            f"{stats.elapsed_s:.1f}s ({stats.users_per_second:,.0f} users/s)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-evaluate the badge catalogue for every user.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start from the first user.")
+    parser.add_argument("--max-chunks", type=int, default=None, help="Stop after this many chunks (resume later).")
+    args = parser.parse_args()
+    run(chunk_size=args.chunk_size, restart=args.restart, max_chunks=args.max_chunks)
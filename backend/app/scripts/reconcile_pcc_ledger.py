@@ -0,0 +1,35 @@
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.pcc_ledger_service import DRIFT_TOLERANCE, backfill_ledger, find_ledger_drift
+
+
+def run(*, backfill: bool = False, tolerance: float = DRIFT_TOLERANCE, show: int = 50) -> int:
+    db = SessionLocal()
+    try:
+        if backfill:
+            inserted = backfill_ledger(db)
+            db.commit()
+            print(f"backfilled {inserted} ledger entries from legacy stores")
+
+        drift = find_ledger_drift(db, tolerance=tolerance)
+        for d in drift[:show]:
+            print(
+                f"{d.account_kind} {d.account_id}: ledger {d.ledger_total:.6f} ({d.ledger_rows} rows) | "
+                f"legacy {d.legacy_total:.6f} ({d.legacy_rows} rows) | snapshot {d.snapshot:.6f}"
+            )
+        if len(drift) > show:
+            print(f"... and {len(drift) - show} more")
+        print(f"{len(drift)} account(s) out of agreement")
+        return len(drift)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-check the PCC ledger against the legacy balance stores.")
+    parser.add_argument("--backfill", action="store_true", help="First copy legacy rows missing from the ledger.")
+    parser.add_argument("--tolerance", type=float, default=DRIFT_TOLERANCE)
+    parser.add_argument("--show", type=int, default=50, help="How many drifted accounts to print.")
+    args = parser.parse_args()
+    run(backfill=args.backfill, tolerance=args.tolerance, show=args.show)
@@ -0,0 +1,36 @@
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.wallet_service import DRIFT_TOLERANCE, find_wallet_drift, repair_wallet_snapshots
+
+
+def run(*, fix: bool = False, tolerance: float = DRIFT_TOLERANCE, show: int = 50) -> int:
+    db = SessionLocal()
+    try:
+        drift = find_wallet_drift(db, tolerance=tolerance)
+        for d in drift[:show]:
+            print(
+                f"wallet {d.wallet_id}: balance {d.balance_pcc:.6f} vs ledger {d.ledger_balance:.6f} | "
+                f"credited {d.lifetime_credited:.6f} vs {d.ledger_credited:.6f} | "
+                f"debited {d.lifetime_debited:.6f} vs {d.ledger_debited:.6f}"
+            )
+        if len(drift) > show:
+            print(f"... and {len(drift) - show} more")
+        print(f"{len(drift)} wallet(s) drifted from the transaction log")
+
+        if fix and drift:
+            repaired = repair_wallet_snapshots(db, [d.wallet_id for d in drift])
+            db.commit()
+            print(f"repaired {repaired} wallet snapshot(s)")
+        return len(drift)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check wallet balance snapshots against the transaction log.")
+    parser.add_argument("--fix", action="store_true", help="Reset drifted snapshots to the transaction totals.")
+    parser.add_argument("--tolerance", type=float, default=DRIFT_TOLERANCE)
+    parser.add_argument("--show", type=int, default=50, help="How many drifted wallets to print.")
+    args = parser.parse_args()
+    run(fix=args.fix, tolerance=args.tolerance, show=args.show)
@@ -0,0 +1,24 @@
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.analytics_rollup_service import refresh_rollups
+
+
+def run(*, rebuild: bool = False) -> None:
+    db = SessionLocal()
+    try:
+        stats = refresh_rollups(db, rebuild=rebuild)
+        db.commit()
+        if stats.rebuilt:
+            print("rebuilt carbon and segregation rollups")
+        else:
+            print(f"refreshed {stats.carbon_days} carbon days, {stats.segregation_days} segregation days")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the daily analytics rollups now.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every day instead of only changed ones.")
+    args = parser.parse_args()
+    run(rebuild=args.rebuild)
@@ -0,0 +1,44 @@
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.task_queue_service import (
+    DEFAULT_BATCH_SIZE,
+    default_worker_id,
+    purge_finished_tasks,
+    run_pending_tasks,
+)
+
+PURGE_EVERY_SECONDS = 60 * 60
+
+
+def run(*, once: bool = False, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    worker_id = default_worker_id()
+    processed = 0
+    last_purge = 0.0
+    db = SessionLocal()
+    try:
+        while True:
+            claimed = run_pending_tasks(db, worker_id=worker_id, limit=batch_size)
+            processed += claimed
+            if once and claimed == 0:
+                break
+            if time.monotonic() - last_purge > PURGE_EVERY_SECONDS:
+                purged = purge_finished_tasks(db)
+                if purged:
+                    print(f"purged {purged} finished tasks")
+                last_purge = time.monotonic()
+            if claimed < batch_size and not once:
+                time.sleep(settings.TASK_POLL_INTERVAL_SECONDS)
+    finally:
+        db.close()
+        print(f"{worker_id}: {processed} tasks processed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll background_tasks and run due side effects.")
+    parser.add_argument("--once", action="store_true", help="Drain the queue and exit.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    run(once=args.once, batch_size=args.batch_size)
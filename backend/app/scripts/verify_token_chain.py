@@ -0,0 +1,30 @@
+import argparse
+import sys
+
+from app.core.database import SessionLocal
+from app.services.token_service import seal_pending_transactions, verify_chain
+
+
+def run(*, seal: bool = False, batch_size: int = 1000) -> bool:
+    db = SessionLocal()
+    try:
+        if seal:
+            sealed = seal_pending_transactions(db)
+            db.commit()
+            print(f"sealed {sealed} pending transactions")
+
+        report = verify_chain(db, batch_size=batch_size)
+        print(f"{report.blocks} blocks, {report.transactions} transactions verified")
+        if not report.ok:
+            print(f"chain broken at block {report.bad_block_id}: {report.error}")
+        return report.ok
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream the token hash chain and validate every block.")
+    parser.add_argument("--seal", action="store_true", help="First seal pending transactions into blocks.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Blocks fetched per round trip.")
+    args = parser.parse_args()
+    sys.exit(0 if run(seal=args.seal, batch_size=args.batch_size) else 1)
@@ -0,0 +1,327 @@
+"""
+Daily rollups behind the admin analytics endpoints.
+
+carbon_daily_rollups and segregation_daily_rollups hold one row per day and
+dimension (role, activity type, ward). A background task refreshes them every
+ANALYTICS_ROLLUP_INTERVAL_SECONDS. Each refresh recomputes only the days that
+changed, which are the days of rows past the saved id watermark plus the days
+of rows created within TRAILING_WINDOW. The trailing window catches rows
+whose id was assigned before a slower transaction committed.
+
+Readers only ever touch the rollups, so any date range costs the same as the
+last 30 days. Figures lag the raw tables by at most one refresh interval;
+rollups_refreshed_at() tells readers how far.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import Date, String, and_, cast, delete, func, literal, or_, select, text, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.admin_ops import PlatformSetting
+from app.models.analytics import CarbonDailyRollup, SegregationDailyRollup
+from app.models.bulk import BulkGenerator
+from app.models.carbon import CarbonActivity
+from app.models.household import Household, HouseholdMember, SegregationLog
+from app.models.user import User
+from app.services.task_queue_service import TASK_ANALYTICS_ROLLUP, enqueue_task
+
+WATERMARK_KEY = "analytics_rollup_watermark"
+ROLLUP_LOCK_KEY = 0x70636302  # pg advisory lock serialising refreshes
+TRAILING_WINDOW = timedelta(days=2)
+UNKNOWN_WARD = ""
+
+
+@dataclass
+class RollupStats:
+    carbon_days: int = 0
+    segregation_days: int = 0
+    rebuilt: bool = False
+
+
+@dataclass
+class CarbonBreakdown:
+    total_carbon_kg: float = 0.0
+    total_pcc_tokens: float = 0.0
+    by_role: dict[str, dict[str, float]] = field(default_factory=dict)
+    by_activity_type: dict[str, dict[str, float]] = field(default_factory=dict)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+def schedule_rollup_refresh(db: Session) -> None:
+    """Queue the refresh for the current interval, due when it ends. Does not commit."""
+    interval = max(1, settings.ANALYTICS_ROLLUP_INTERVAL_SECONDS)
+    bucket = int(_utc_now().timestamp()) // interval
+    due = datetime.fromtimestamp((bucket + 1) * interval, tz=timezone.utc)
+    enqueue_task(db, TASK_ANALYTICS_ROLLUP, {}, key=bucket, run_after=due)
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+def _ward_for_user(user_id_col):
+    """A user's ward: their organisation's, else their primary (or first) household's."""
+    org_ward = (
+        select(BulkGenerator.ward)
+        .where(BulkGenerator.user_id == user_id_col, BulkGenerator.ward.isnot(None))
+        .limit(1)
+        .scalar_subquery()
+    )
+    household_ward = (
+        select(Household.ward)
+        .outerjoin(HouseholdMember, HouseholdMember.household_id == Household.id)
+        .where(
+            or_(Household.owner_user_id == user_id_col, HouseholdMember.user_id == user_id_col),
+            Household.ward.isnot(None),
+        )
+        .order_by(HouseholdMember.is_primary.desc().nulls_last(), Household.is_primary.desc(), Household.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return func.coalesce(org_ward, household_ward, literal(UNKNOWN_WARD))
+
+
+def _changed_days(db: Session, day_col, id_col, created_col, after_id: int, since: datetime) -> list[date]:
+    return list(
+        db.execute(
+            select(day_col).where(or_(id_col > after_id, created_col >= since)).distinct()
+        ).scalars()
+    )
+
+
+def _refresh_carbon(db: Session, days: Optional[list[date]]) -> None:
+    day = cast(CarbonActivity.created_at, Date)
+    scope = true()
+    if days is not None:
+        # The range lets the planner use ix_carbon_activities_created_at.
+        scope = and_(
+            CarbonActivity.created_at >= min(days),
+            CarbonActivity.created_at < max(days) + timedelta(days=1),
+            day.in_(days),
+        )
+    db.execute(
+        delete(CarbonDailyRollup)
+        .where(CarbonDailyRollup.day.in_(days) if days is not None else true())
+        .execution_options(synchronize_session=False)
+    )
+    # Resolve role and ward once per user rather than once per activity.
+    users = (
+        select(
+            User.id.label("user_id"),
+            cast(User.role, String).label("role"),
+            _ward_for_user(User.id).label("ward"),
+        )
+        .where(User.id.in_(select(CarbonActivity.user_id).where(scope)))
+        .cte("activity_users")
+    )
+    activity_type = cast(CarbonActivity.activity_type, String)
+    source = (
+        select(
+            day,
+            users.c.role,
+            activity_type,
+            users.c.ward,
+            func.count(),
+            func.sum(CarbonActivity.carbon_kg),
+            func.sum(CarbonActivity.pcc_tokens),
+            func.now(),
+        )
+        .join(users, users.c.user_id == CarbonActivity.user_id)
+        .where(scope)
+        .group_by(day, users.c.role, activity_type, users.c.ward)
+    )
+    db.execute(
+        pg_insert(CarbonDailyRollup).from_select(
+            ["day", "role", "activity_type", "ward", "activity_count", "carbon_kg", "pcc_tokens", "refreshed_at"],
+            source,
+        )
+    )
+
+
+def _refresh_segregation(db: Session, days: Optional[list[date]]) -> None:
+    scope = SegregationLog.log_date.in_(days) if days is not None else true()
+    db.execute(
+        delete(SegregationDailyRollup)
+        .where(SegregationDailyRollup.day.in_(days) if days is not None else true())
+        .execution_options(synchronize_session=False)
+    )
+    ward = func.coalesce(Household.ward, literal(UNKNOWN_WARD))
+    source = (
+        select(
+            SegregationLog.log_date,
+            ward,
+            func.count(),
+            func.sum(SegregationLog.segregation_score),
+            func.sum(SegregationLog.dry_kg),
+            func.sum(SegregationLog.wet_kg),
+            func.sum(SegregationLog.reject_kg),
+            func.now(),
+        )
+        .outerjoin(Household, Household.id == SegregationLog.household_id)
+        .where(scope)
+        .group_by(SegregationLog.log_date, ward)
+    )
+    db.execute(
+        pg_insert(SegregationDailyRollup).from_select(
+            ["day", "ward", "log_count", "score_sum", "dry_kg", "wet_kg", "reject_kg", "refreshed_at"],
+            source,
+        )
+    )
+
+
+def _load_watermark(db: Session) -> Optional[PlatformSetting]:
+    return db.query(PlatformSetting).filter(PlatformSetting.key == WATERMARK_KEY).first()
+
+
+def refresh_rollups(db: Session, *, rebuild: bool = False) -> RollupStats:
+    """
+    Bring both rollup tables up to date; `rebuild` recomputes every day.
+    Serialised on an advisory lock. Does not commit.
+    """
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_KEY})
+    row = _load_watermark(db)
+    mark: dict[str, Any] = dict(row.value_json) if row and isinstance(row.value_json, dict) and not rebuild else {}
+    rebuild = rebuild or not mark
+
+    carbon_max, segregation_max = db.execute(
+        select(
+            select(func.coalesce(func.max(CarbonActivity.id), 0)).scalar_subquery(),
+            select(func.coalesce(func.max(SegregationLog.id), 0)).scalar_subquery(),
+        )
+    ).one()
+
+    stats = RollupStats(rebuilt=rebuild)
+    if rebuild:
+        _refresh_carbon(db, None)
+        _refresh_segregation(db, None)
+    else:
+        # CarbonActivity.created_at is naive UTC; segregation_logs.created_at is timestamptz.
+        since = _utc_now() - TRAILING_WINDOW
+        carbon_days = _changed_days(
+            db,
+            cast(CarbonActivity.created_at, Date),
+            CarbonActivity.id,
+            CarbonActivity.created_at,
+            int(mark.get("carbon_activity_id") or 0),
+            since.replace(tzinfo=None),
+        )
+        segregation_days = _changed_days(
+            db,
+            SegregationLog.log_date,
+            SegregationLog.id,
+            SegregationLog.created_at,
+            int(mark.get("segregation_log_id") or 0),
+            since,
+        )
+        if carbon_days:
+            _refresh_carbon(db, carbon_days)
+        if segregation_days:
+            _refresh_segregation(db, segregation_days)
+        stats.carbon_days, stats.segregation_days = len(carbon_days), len(segregation_days)
+
+    value = {
+        "carbon_activity_id": int(carbon_max),
+        "segregation_log_id": int(segregation_max),
+        "refreshed_at": _utc_now().isoformat(),
+    }
+    if row is None:
+        row = PlatformSetting(
+            key=WATERMARK_KEY,
+            value_json=value,
+            description="Last rows folded into the analytics rollups.",
+        )
+    else:
+        row.value_json = value
+    db.add(row)
+    db.flush()
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def rollups_refreshed_at(db: Session) -> Optional[datetime]:
+    """When the rollups last caught up with the raw tables; None before the first refresh."""
+    row = _load_watermark(db)
+    value = row.value_json if row is not None and isinstance(row.value_json, dict) else {}
+    return datetime.fromisoformat(value["refreshed_at"]) if value.get("refreshed_at") else None
+
+
+def fold_carbon_breakdown(rows: Iterable[tuple[str, str, float, float]]) -> CarbonBreakdown:
+    """Totals, per-role and per-type sums from (role, activity_type, carbon_kg, pcc_tokens) rows."""
+    out = CarbonBreakdown()
+    for role, activity_type, carbon_kg, pcc_tokens in rows:
+        carbon_kg, pcc_tokens = float(carbon_kg or 0.0), float(pcc_tokens or 0.0)
+        out.total_carbon_kg += carbon_kg
+        out.total_pcc_tokens += pcc_tokens
+        for bucket, name in ((out.by_role, role), (out.by_activity_type, activity_type)):
+            entry = bucket.setdefault(name, {"carbon_kg": 0.0, "pcc_tokens": 0.0})
+            entry["carbon_kg"] += carbon_kg
+            entry["pcc_tokens"] += pcc_tokens
+    return out
+
+
+def _day_range(column, start: Optional[date], end: Optional[date]):
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column <= end)
+    return and_(*conditions) if conditions else true()
+
+
+def carbon_breakdown(db: Session, *, start: Optional[date] = None, end: Optional[date] = None) -> CarbonBreakdown:
+    rows = db.execute(
+        select(
+            CarbonDailyRollup.role,
+            CarbonDailyRollup.activity_type,
+            func.sum(CarbonDailyRollup.carbon_kg),
+            func.sum(CarbonDailyRollup.pcc_tokens),
+        )
+        .where(_day_range(CarbonDailyRollup.day, start, end))
+        .group_by(CarbonDailyRollup.role, CarbonDailyRollup.activity_type)
+    )
+    return fold_carbon_breakdown(rows)
+
+
+def carbon_daily(db: Session, *, start: date, end: date, ward: Optional[str] = None) -> list[tuple[date, float, float]]:
+    stmt = (
+        select(
+            CarbonDailyRollup.day,
+            func.sum(CarbonDailyRollup.carbon_kg),
+            func.sum(CarbonDailyRollup.pcc_tokens),
+        )
+        .where(_day_range(CarbonDailyRollup.day, start, end))
+        .group_by(CarbonDailyRollup.day)
+        .order_by(CarbonDailyRollup.day)
+    )
+    if ward is not None:
+        stmt = stmt.where(CarbonDailyRollup.ward == ward)
+    return [(day, float(c or 0.0), float(p or 0.0)) for day, c, p in db.execute(stmt)]
+
+
+def segregation_totals(db: Session) -> tuple[int, Optional[float]]:
+    """(log count, average segregation score) across every day."""
+    count, score_sum = db.execute(
+        select(
+            func.coalesce(func.sum(SegregationDailyRollup.log_count), 0),
+            func.coalesce(func.sum(SegregationDailyRollup.score_sum), 0.0),
+        )
+    ).one()
+    count = int(count)
+    return count, (float(score_sum) / count if count else None)
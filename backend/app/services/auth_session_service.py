@@ -0,0 +1,188 @@
+"""
+Login sessions: short-lived access tokens plus rotating refresh tokens.
+
+Access tokens carry the user's role and active flag ("role", "active") and the
+session id ("sid"). deps.get_current_user trusts these claims without reading
+the users table. Revocation therefore happens at refresh, the only place that
+checks the user row:
+
+  * every refresh consumes the presented token and returns a new one in the
+    same family (session);
+  * presenting an already consumed token revokes the whole family, because
+    one of the two holders must be a thief. Presenting it again within
+    REUSE_GRACE is treated as a client race instead: that request fails but
+    the family survives;
+  * deactivating a user or changing their role revokes all of their families,
+    so an old token is honoured for at most ACCESS_TOKEN_EXPIRE_MINUTES.
+
+Only sha256 hashes of refresh tokens are stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.auth_session import RefreshToken
+from app.models.user import User
+
+ACCESS_TOKEN_TYPE = "access"
+REUSE_GRACE = timedelta(seconds=30)
+PURGE_EVERY_SECONDS = 60 * 60
+
+_next_purge = 0.0
+
+
+@dataclass
+class TokenPair:
+    access_token: str
+    refresh_token: str | None
+    expires_in: int
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def access_claims(user: User, session_id: str | None) -> dict:
+    claims = {"typ": ACCESS_TOKEN_TYPE, "role": user.role.value, "active": bool(user.is_active)}
+    if session_id:
+        claims["sid"] = session_id
+    return claims
+
+
+def _invalid_refresh() -> HTTPException:
+    return HTTPException(
+        status_code=401,
+        detail="Invalid or expired refresh token.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _add_refresh_token(db: Session, *, user_id: int, family_id: str, now: datetime) -> str:
+    token = secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            family_id=family_id,
+            token_hash=hash_refresh_token(token),
+            created_at=now,
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token
+
+
+def _pair(user: User, family_id: str | None, refresh_token: str | None) -> TokenPair:
+    return TokenPair(
+        access_token=create_access_token(subject=user.id, claims=access_claims(user, family_id)),
+        refresh_token=refresh_token,
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+def start_session(db: Session, user: User) -> TokenPair:
+    """
+    Tokens for a successful login. Commits.
+
+    Inactive (pending approval) users get only an access token marked inactive;
+    there is nothing for them to refresh.
+    """
+    if user.is_active:
+        family_id = secrets.token_hex(16)
+        pair = _pair(user, family_id, _add_refresh_token(db, user_id=user.id, family_id=family_id, now=_utc_now()))
+    else:
+        pair = _pair(user, None, None)
+    db.commit()
+    _maybe_purge(db)
+    return pair
+
+
+def _revoke_family(db: Session, family_id: str, now: datetime) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rotate_refresh_token(db: Session, token: str) -> TokenPair:
+    """Exchange a refresh token for a new pair, re-reading the user row. Commits."""
+    now = _utc_now()
+    row = db.execute(
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token)).with_for_update()
+    ).scalar_one_or_none()
+    if row is None or row.revoked_at is not None or row.expires_at <= now:
+        db.rollback()
+        raise _invalid_refresh()
+    if row.used_at is not None:
+        if now - row.used_at > REUSE_GRACE:
+            _revoke_family(db, row.family_id, now)
+            db.commit()
+        else:
+            db.rollback()
+        raise _invalid_refresh()
+
+    user = db.get(User, row.user_id)
+    if user is None or not user.is_active:
+        _revoke_family(db, row.family_id, now)
+        db.commit()
+        raise _invalid_refresh()
+
+    row.used_at = now
+    pair = _pair(user, row.family_id, _add_refresh_token(db, user_id=user.id, family_id=row.family_id, now=now))
+    db.commit()
+    return pair
+
+
+def end_session(db: Session, token: str) -> None:
+    """Logout: revoke the family of the presented refresh token, if any. Commits."""
+    family_id = db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == hash_refresh_token(token))
+    ).scalar_one_or_none()
+    if family_id is not None:
+        _revoke_family(db, family_id, _utc_now())
+    db.commit()
+
+
+def revoke_user_sessions(db: Session, user_id: int) -> None:
+    """Revoke every refresh token of a user. Does not commit."""
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=_utc_now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_expired_refresh_tokens(db: Session) -> int:
+    result = db.execute(
+        delete(RefreshToken)
+        .where(RefreshToken.expires_at <= _utc_now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return int(result.rowcount or 0)
+
+
+def _maybe_purge(db: Session) -> None:
+    global _next_purge
+    now = time.monotonic()
+    if now < _next_purge:
+        return
+    _next_purge = now + PURGE_EVERY_SECONDS
+    purge_expired_refresh_tokens(db)
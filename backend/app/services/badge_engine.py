@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-from sqlalchemy import inspect
+from sqlalchemy import func, inspect, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.badge_rules import CompiledRule, RuleError, compile_rule, is_declarative
 from app.models.badge import Badge, UserBadge
 from app.models.bulk import Verification, WasteLog
+from app.models.notification import Notification
 from app.models.pcc import CarbonLedger
+from app.services.streak_service import STREAM_VERIFICATION, SUBJECT_ORG, SUBJECT_USER, get_streak
 
 MIN_QUALITY_LOGS_FOR_BADGE = 10
 
@@ -45,6 +49,62 @@ WORKER_PERFORMANCE_BADGES = [
 ]
 
 
+@dataclass(frozen=True)
+class BadgeDefinition:
+    code: str
+    name: str
+    category: str
+    threshold: float
+    rule: dict[str, Any]
+    description: Optional[str] = None
+    criteria_key: Optional[str] = None
+    icon: Optional[str] = None
+
+
+def _definitions(
+    rows: list[tuple[str, str, str, float]],
+    rule_for: Any,
+) -> list[BadgeDefinition]:
+    return [BadgeDefinition(code, name, cat, threshold, rule_for(code, threshold)) for code, name, cat, threshold in rows]
+
+
+_BULK_WORKFLOW_RULES: dict[str, dict[str, Any]] = {
+    "bulk_first_verified": {"scope": {"target": "bulk"}, "metric": "org_verified_count", "op": ">=", "threshold": 1},
+    "bulk_segregation_star": {"scope": {"target": "bulk"}, "metric": "event_score", "op": ">=", "threshold": 95.0},
+    "bulk_century_pcc": {"scope": {"target": "bulk"}, "metric": "pcc_snapshot", "op": ">=", "threshold": 100.0},
+    "worker_bulk_verifier_1": {"scope": {"target": "worker"}, "metric": "worker_verified_count", "op": ">=", "threshold": 1},
+    "worker_bulk_verifier_25": {"scope": {"target": "worker"}, "metric": "worker_verified_count", "op": ">=", "threshold": 25},
+    "worker_bulk_quality_guardian": {
+        "scope": {"target": "worker"},
+        "all": [
+            {"metric": "worker_quality_count", "op": ">=", "threshold": 10},
+            {"metric": "event_score", "op": ">=", "threshold": 95.0},
+        ],
+    },
+}
+
+CORE_BADGE_DEFINITIONS: list[BadgeDefinition] = (
+    _definitions(IMPACT_BADGES, lambda _, t: {"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": t})
+    + _definitions(CONSISTENCY_BADGES, lambda _, t: {"metric": "current_streak_days", "op": ">=", "threshold": int(t)})
+    + _definitions(
+        QUALITY_BADGES,
+        lambda _, t: {
+            "all": [
+                {"metric": "rolling_30d_quality_score", "op": ">=", "threshold": t},
+                {"metric": "rolling_30d_verified_logs", "op": ">=", "threshold": MIN_QUALITY_LOGS_FOR_BADGE},
+            ]
+        },
+    )
+    + _definitions(BULK_WORKFLOW_BADGES + WORKER_PERFORMANCE_BADGES, lambda code, _: _BULK_WORKFLOW_RULES[code])
+)
+
+# Rules for catalogue codes whose stored rule_json predates the declarative format.
+_DEFAULT_RULES: dict[str, dict[str, Any]] = {}
+# Codes known to exist in the badges table (seeding is skipped for these).
+_CONFIRMED_CODES: set[str] = set()
+_COLUMN_CACHE: dict[tuple[int, str], frozenset[str]] = {}
+
+
 @dataclass
 class ImpactSummary:
     total_carbon_saved_kgco2e: float
@@ -59,49 +119,139 @@ def _utc_now():
 
 
 def _has_column(db: Session, table: str, column: str) -> bool:
-    try:
-        cols = inspect(db.get_bind()).get_columns(table)
-        return any(c.get("name") == column for c in cols)
-    except Exception:
-        return False
+    bind = db.get_bind()
+    key = (id(bind), table)
+    cols = _COLUMN_CACHE.get(key)
+    if cols is None:
+        try:
+            cols = frozenset(c.get("name") for c in inspect(bind).get_columns(table))
+        except Exception:
+            return False
+        _COLUMN_CACHE[key] = cols
+    return column in cols
 
 
 def _waste_log_user_col(db: Session):
     return WasteLog.user_id if _has_column(db, "waste_logs", "user_id") else WasteLog.created_by_user_id
 
 
+def ensure_badge_definitions(db: Session, definitions: list[BadgeDefinition]) -> None:
+    """
+    Make sure every definition has a badges row: one SELECT for codes not yet
+    confirmed in this process, one INSERT ... ON CONFLICT DO NOTHING for the rest.
+    """
+    for d in definitions:
+        _DEFAULT_RULES.setdefault(d.code, d.rule)
+    pending = {d.code: d for d in definitions if d.code not in _CONFIRMED_CODES}
+    if not pending:
+        return
+
+    present = set(db.execute(select(Badge.code).where(Badge.code.in_(list(pending)))).scalars())
+    _CONFIRMED_CODES.update(present)
+    rows = [
+        {
+            "code": d.code,
+            "name": d.name,
+            "description": d.description or f"{d.category} badge",
+            "category": d.category,
+            "threshold": d.threshold,
+            "criteria_key": d.criteria_key or d.code,
+            "rule_json": d.rule,
+            "icon": d.icon,
+            "active": True,
+            "is_active": True,
+            "created_at": datetime.utcnow(),
+        }
+        for code, d in pending.items()
+        if code not in present
+    ]
+    if rows:
+        db.execute(pg_insert(Badge).values(rows).on_conflict_do_nothing())
+
+
 def _seed_badges_if_missing(db: Session) -> None:
-    defaults = []
-    all_badges = IMPACT_BADGES + CONSISTENCY_BADGES + QUALITY_BADGES + BULK_WORKFLOW_BADGES + WORKER_PERFORMANCE_BADGES
-    for code, name, cat, threshold in all_badges:
-        defaults.append(
-            {
-                "code": code,
-                "name": name,
-                "category": cat,
-                "threshold": threshold,
-                "rule_json": {"kind": cat.lower(), "threshold": threshold},
-            }
-        )
+    ensure_badge_definitions(db, CORE_BADGE_DEFINITIONS)
+
+
+def badge_rule(badge: Badge) -> Optional[CompiledRule]:
+    rule = badge.rule_json if is_declarative(badge.rule_json) else _DEFAULT_RULES.get(badge.code or "")
+    if rule is None:
+        return None
+    try:
+        return compile_rule(rule)
+    except RuleError:
+        return None
+
+
+def awarded_badge_ids(db: Session, user_id: int) -> set[int]:
+    return set(db.execute(select(UserBadge.badge_id).where(UserBadge.user_id == user_id)).scalars())
 
-    for row in defaults:
-        exists = db.query(Badge).filter(Badge.code == row["code"]).first()
-        if exists:
+
+def award_badges(
+    db: Session,
+    *,
+    user_id: int,
+    org_id: Optional[int],
+    badges: list[Badge],
+    metadata: dict[str, Any],
+) -> list[Badge]:
+    """Insert all awards in one statement; returns the badges that were actually new."""
+    if not badges:
+        return []
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": user_id,
+            "org_id": org_id,
+            "badge_id": badge.id,
+            "metadata_json": {**metadata, "code": badge.code},
+            "awarded_at": now,
+        }
+        for badge in badges
+    ]
+    inserted = set(
+        db.execute(
+            pg_insert(UserBadge)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[UserBadge.user_id, UserBadge.badge_id])
+            .returning(UserBadge.badge_id)
+        ).scalars()
+    )
+    return [b for b in badges if b.id in inserted]
+
+
+def evaluate_rule_badges(
+    db: Session,
+    *,
+    user_id: int,
+    org_id: Optional[int],
+    metrics: dict[str, Any],
+    context: Optional[dict[str, Any]] = None,
+    codes: Optional[list[str]] = None,
+    metadata: Optional[dict[str, Any]] = None,
+) -> list[Badge]:
+    """
+    Evaluate active badges (optionally limited to `codes`) against one metrics
+    snapshot and award the ones that pass: three statements regardless of how
+    many badges are in play.
+    """
+    q = db.query(Badge).filter(Badge.active.is_(True), Badge.code.isnot(None))
+    if codes is not None:
+        q = q.filter(Badge.code.in_(codes))
+    candidates = q.all()
+    if not candidates:
+        return []
+
+    awarded = awarded_badge_ids(db, user_id)
+    ctx = context or {}
+    due = []
+    for badge in candidates:
+        if badge.id in awarded:
             continue
-        db.add(
-            Badge(
-                code=row["code"],
-                name=row["name"],
-                description=f"{row['category']} badge",
-                category=row["category"],
-                threshold=row["threshold"],
-                criteria_key=row["code"],
-                rule_json=row["rule_json"],
-                active=True,
-                is_active=True,
-            )
-        )
-    db.flush()
+        rule = badge_rule(badge)
+        if rule is not None and rule(metrics, ctx):
+            due.append(badge)
+    return award_badges(db, user_id=user_id, org_id=org_id, badges=due, metadata=metadata or {})
 
 
 def _verified_dates(db: Session, user_id: Optional[int], org_id: Optional[int]) -> list[datetime.date]:
@@ -115,6 +265,15 @@ def _verified_dates(db: Session, user_id: Optional[int], org_id: Optional[int])
     return sorted({r[0].date() for r in rows if r and r[0] is not None})
 
 
+def _verification_streak(db: Session, user_id: Optional[int], org_id: Optional[int]) -> int:
+    if user_id is not None and org_id is None:
+        return get_streak(db, SUBJECT_USER, user_id, STREAM_VERIFICATION).current
+    if org_id is not None and user_id is None:
+        return get_streak(db, SUBJECT_ORG, org_id, STREAM_VERIFICATION).current
+    # A user's streak within one org is not tracked; scan that (narrower) history.
+    return compute_streak_days(_verified_dates(db, user_id, org_id))
+
+
 def compute_streak_days(dates: list[datetime.date]) -> int:
     if not dates:
         return 0
@@ -131,104 +290,101 @@ def rolling_quality_stats(
     db: Session, user_id: Optional[int], org_id: Optional[int], days: int = 30
 ) -> tuple[Optional[float], int]:
     since = _utc_now() - timedelta(days=days)
-    q = db.query(Verification.quality_score).join(WasteLog, WasteLog.id == Verification.waste_log_id)
+    q = db.query(func.avg(Verification.quality_score), func.count(Verification.quality_score)).join(
+        WasteLog, WasteLog.id == Verification.waste_log_id
+    )
     user_col = _waste_log_user_col(db)
     if user_id is not None:
         q = q.filter(user_col == user_id)
     if org_id is not None:
         q = q.filter(WasteLog.org_id == org_id)
-    q = q.filter(Verification.verified_at >= since)
-    rows = [float(r[0]) for r in q.all() if r and r[0] is not None]
-    if not rows:
+    avg, count = q.filter(Verification.verified_at >= since).one()
+    if not count:
         return None, 0
-    return sum(rows) / len(rows), len(rows)
+    return float(avg), int(count)
 
 
 def build_impact_summary(db: Session, user_id: Optional[int], org_id: Optional[int]) -> ImpactSummary:
-    q = db.query(CarbonLedger)
+    q = db.query(
+        func.coalesce(func.sum(CarbonLedger.carbon_saved_kgco2e), 0.0),
+        func.coalesce(func.sum(CarbonLedger.pcc_awarded), 0.0),
+    )
     if user_id is not None:
         q = q.filter(CarbonLedger.user_id == user_id)
     if org_id is not None:
         q = q.filter(CarbonLedger.org_id == org_id)
-    entries = q.all()
+    carbon, pcc = q.one()
 
-    carbon = sum(float(x.carbon_saved_kgco2e or 0.0) for x in entries)
-    pcc = sum(float(x.pcc_awarded or 0.0) for x in entries)
-    dates = _verified_dates(db, user_id, org_id)
-    streak = compute_streak_days(dates)
+    streak = _verification_streak(db, user_id, org_id)
     rolling_quality, rolling_count = rolling_quality_stats(db, user_id, org_id)
 
     return ImpactSummary(
-        total_carbon_saved_kgco2e=round(carbon, 6),
-        total_pcc_earned=round(pcc, 6),
+        total_carbon_saved_kgco2e=round(float(carbon), 6),
+        total_pcc_earned=round(float(pcc), 6),
         current_streak_days=streak,
         rolling_30d_quality_score=round(rolling_quality, 6) if rolling_quality is not None else None,
         rolling_30d_verified_logs=rolling_count,
     )
 
 
-def _already_awarded(db: Session, badge_id: int, user_id: Optional[int], org_id: Optional[int]) -> bool:
-    q = db.query(UserBadge).filter(UserBadge.badge_id == badge_id)
-    if user_id is not None:
-        q = q.filter(UserBadge.user_id == user_id)
-    if org_id is not None and _has_column(db, "user_badges", "org_id"):
-        q = q.filter(UserBadge.org_id == org_id)
-    return db.query(q.exists()).scalar()
-
-
-def _award(db: Session, badge: Badge, user_id: Optional[int], org_id: Optional[int], metadata: dict) -> None:
-    if user_id is None:
-        raise ValueError("user_id is required for badge awarding.")
-    payload = {
-        "user_id": user_id,
-        "badge_id": badge.id,
-        "metadata_json": metadata,
-    }
-    if _has_column(db, "user_badges", "org_id"):
-        payload["org_id"] = org_id
-    db.add(UserBadge(**payload))
-
-
 def evaluate_and_award_badges(db: Session, user_id: Optional[int], org_id: Optional[int] = None) -> list[Badge]:
-    if user_id is None and org_id is None:
+    if user_id is None:
         return []
 
     _seed_badges_if_missing(db)
     summary = build_impact_summary(db, user_id, org_id)
-    by_code = {b.code: b for b in db.query(Badge).filter(Badge.active.is_(True)).all() if b.code}
-    newly_awarded: list[Badge] = []
-
-    def maybe_award(code: str, condition: bool, metadata: dict):
-        badge = by_code.get(code)
-        if not badge:
-            return
-        if not condition:
-            return
-        if _already_awarded(db, badge.id, user_id, org_id):
-            return
-        _award(db, badge, user_id, org_id, metadata)
-        newly_awarded.append(badge)
-
-    for code, _, _, threshold in IMPACT_BADGES:
-        maybe_award(code, summary.total_carbon_saved_kgco2e >= threshold, {"type": "impact", "threshold": threshold})
-
-    for code, _, _, threshold in CONSISTENCY_BADGES:
-        maybe_award(code, summary.current_streak_days >= int(threshold), {"type": "consistency", "threshold": int(threshold)})
-
-    rolling_quality = summary.rolling_30d_quality_score
-    if rolling_quality is not None and summary.rolling_30d_verified_logs >= MIN_QUALITY_LOGS_FOR_BADGE:
-        for code, _, _, threshold in QUALITY_BADGES:
-            maybe_award(
-                code,
-                rolling_quality >= threshold,
-                {"type": "quality", "threshold": threshold, "window_days": 30, "min_logs": MIN_QUALITY_LOGS_FOR_BADGE},
-            )
-
+    newly_awarded = evaluate_rule_badges(
+        db,
+        user_id=user_id,
+        org_id=org_id,
+        metrics=asdict(summary),
+        context={"target": "user"},
+        codes=[code for code, _, _, _ in IMPACT_BADGES + CONSISTENCY_BADGES + QUALITY_BADGES],
+        metadata={"source": "impact_summary"},
+    )
     if newly_awarded:
         db.flush()
     return newly_awarded
 
 
+def _bulk_event_metrics(
+    db: Session,
+    *,
+    org_id: Optional[int],
+    worker_user_id: Optional[int],
+    event_payload: dict[str, Any],
+) -> dict[str, Any]:
+    """Every count the bulk/worker rules need, in a single round trip."""
+    org_verified = (
+        select(func.count(Verification.id))
+        .join(WasteLog, WasteLog.id == Verification.waste_log_id)
+        .where(WasteLog.bulk_generator_id == org_id)
+        .scalar_subquery()
+        if org_id is not None
+        else literal(0)
+    )
+    worker_verified = (
+        select(func.count(Verification.id)).where(Verification.verifier_worker_id == worker_user_id).scalar_subquery()
+        if worker_user_id is not None
+        else literal(0)
+    )
+    worker_quality = (
+        select(func.count(Verification.id))
+        .where(Verification.verifier_worker_id == worker_user_id, Verification.score >= 95.0)
+        .scalar_subquery()
+        if worker_user_id is not None
+        else literal(0)
+    )
+    org_n, worker_n, quality_n = db.execute(select(org_verified, worker_verified, worker_quality)).one()
+    return {
+        "org_verified_count": int(org_n or 0),
+        "worker_verified_count": int(worker_n or 0),
+        "worker_quality_count": int(quality_n or 0),
+        "event_score": float(event_payload.get("score") or 0.0),
+        "pcc_snapshot": float(event_payload.get("pcc_snapshot") or 0.0),
+    }
+
+
 def evaluate_bulk_worker_event_badges(
     db: Session,
     *,
@@ -237,104 +393,48 @@ def evaluate_bulk_worker_event_badges(
     org_id: Optional[int],
     event_type: str,
     event_payload: dict[str, Any],
+    targets: tuple[str, ...] = ("bulk", "worker"),
 ) -> dict[str, list[Badge]]:
     """
     Event-based badge evaluation for Bulk + Worker workflow.
-    Returns newly awarded badges split by target user.
+    Returns newly awarded badges split by target user; `targets` limits which
+    side is evaluated.
     """
-    _seed_badges_if_missing(db)
-    by_code = {b.code: b for b in db.query(Badge).filter(Badge.active.is_(True)).all() if b.code}
-
-    bulk_new: list[Badge] = []
-    worker_new: list[Badge] = []
     if event_type != "bulk_verification":
-        return {"bulk": bulk_new, "worker": worker_new}
-
-    score = float(event_payload.get("score") or 0.0)
-    pcc_snapshot = float(event_payload.get("pcc_snapshot") or 0.0)
-    waste_log_id = event_payload.get("waste_log_id")
-    pickup_request_id = event_payload.get("pickup_request_id")
-
-    def maybe_award(
-        *,
-        code: str,
-        user_id: int,
-        collect: list[Badge],
-        condition: bool,
-        metadata: dict[str, Any],
-    ) -> None:
-        badge = by_code.get(code)
-        if not badge or not condition:
-            return
-        if _already_awarded(db, badge.id, user_id, org_id):
-            return
-        _award(db, badge, user_id, org_id, metadata)
-        collect.append(badge)
-
-    bulk_verified_count = (
-        db.query(Verification)
-        .join(WasteLog, WasteLog.id == Verification.waste_log_id)
-        .filter(WasteLog.bulk_generator_id == org_id)
-        .count()
-        if org_id is not None
-        else 0
-    )
+        return {"bulk": [], "worker": []}
+
+    _seed_badges_if_missing(db)
+    metrics = _bulk_event_metrics(db, org_id=org_id, worker_user_id=worker_user_id, event_payload=event_payload)
+    codes = [code for code, _, _, _ in BULK_WORKFLOW_BADGES + WORKER_PERFORMANCE_BADGES]
     common_meta = {
         "source": "bulk_workflow",
         "trigger": "verification",
-        "waste_log_id": waste_log_id,
-        "pickup_request_id": pickup_request_id,
-        "score": score,
-        "pcc_snapshot": pcc_snapshot,
+        "waste_log_id": event_payload.get("waste_log_id"),
+        "pickup_request_id": event_payload.get("pickup_request_id"),
+        "score": metrics["event_score"],
+        "pcc_snapshot": metrics["pcc_snapshot"],
     }
-    maybe_award(
-        code="bulk_first_verified",
-        user_id=bulk_user_id,
-        collect=bulk_new,
-        condition=bulk_verified_count >= 1,
-        metadata={**common_meta, "target": "bulk"},
-    )
-    maybe_award(
-        code="bulk_segregation_star",
-        user_id=bulk_user_id,
-        collect=bulk_new,
-        condition=score >= 95.0,
-        metadata={**common_meta, "target": "bulk"},
-    )
-    maybe_award(
-        code="bulk_century_pcc",
-        user_id=bulk_user_id,
-        collect=bulk_new,
-        condition=pcc_snapshot >= 100.0,
-        metadata={**common_meta, "target": "bulk"},
-    )
 
-    if worker_user_id is not None:
-        worker_verified_count = db.query(Verification).filter(Verification.verifier_worker_id == worker_user_id).count()
-        worker_quality_count = (
-            db.query(Verification)
-            .filter(Verification.verifier_worker_id == worker_user_id, Verification.score >= 95.0)
-            .count()
-        )
-        maybe_award(
-            code="worker_bulk_verifier_1",
-            user_id=worker_user_id,
-            collect=worker_new,
-            condition=worker_verified_count >= 1,
-            metadata={**common_meta, "target": "worker"},
-        )
-        maybe_award(
-            code="worker_bulk_verifier_25",
-            user_id=worker_user_id,
-            collect=worker_new,
-            condition=worker_verified_count >= 25,
-            metadata={**common_meta, "target": "worker"},
+    bulk_new: list[Badge] = []
+    if "bulk" in targets:
+        bulk_new = evaluate_rule_badges(
+            db,
+            user_id=bulk_user_id,
+            org_id=org_id,
+            metrics=metrics,
+            context={"target": "bulk"},
+            codes=codes,
+            metadata={**common_meta, "target": "bulk"},
         )
-        maybe_award(
-            code="worker_bulk_quality_guardian",
+    worker_new: list[Badge] = []
+    if worker_user_id is not None and "worker" in targets:
+        worker_new = evaluate_rule_badges(
+            db,
             user_id=worker_user_id,
-            collect=worker_new,
-            condition=worker_quality_count >= 10 and score >= 95.0,
+            org_id=org_id,
+            metrics=metrics,
+            context={"target": "worker"},
+            codes=codes,
             metadata={**common_meta, "target": "worker"},
         )
 
@@ -343,6 +443,20 @@ def evaluate_bulk_worker_event_badges(
     return {"bulk": bulk_new, "worker": worker_new}
 
 
+def notify_badge_unlocks(db: Session, *, user_id: int, badges: list[Badge], source: str) -> None:
+    """One "Badge Unlocked" notification per badge ("You earned CODE from <source>.")."""
+    for badge in badges:
+        code = badge.code or badge.criteria_key or f"badge_{badge.id}"
+        db.add(
+            Notification(
+                user_id=user_id,
+                title="Badge Unlocked",
+                body=f"You earned {code.upper()} from {source}.",
+                is_read=False,
+            )
+        )
+
+
 def list_user_badge_items(db: Session, *, user_id: int, org_id: Optional[int] = None, limit: Optional[int] = None) -> list[dict[str, Any]]:
     query = db.query(UserBadge, Badge).join(Badge, Badge.id == UserBadge.badge_id).filter(UserBadge.user_id == user_id)
     if org_id is not None and _has_column(db, "user_badges", "org_id"):
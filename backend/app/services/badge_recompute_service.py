@@ -0,0 +1,485 @@
+"""
+Offline recomputation of the whole badge catalogue.
+
+Users are streamed in id order in chunks. For each chunk every metric the
+rules need is computed with one grouped query per source table, laid out as
+NumPy columns (one slot per user), and each badge rule is evaluated over the
+whole chunk at once. Missing awards go in with a single multi-row
+INSERT ... ON CONFLICT DO NOTHING, committed together with a checkpoint, so
+an interrupted run resumes after the last finished chunk.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import Date, Integer, cast, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.badge_rules import RuleError, VectorPredicate, compile_vector_rule, is_declarative
+from app.models.admin_ops import PlatformSetting
+from app.models.badge import Badge, UserBadge
+from app.models.bulk import BulkGenerator, Verification, Wallet, WasteLog
+from app.models.household import Household, SegregationLog
+from app.models.pcc import CarbonLedger
+from app.models.training import TrainingModule, TrainingProgress
+from app.models.user import User
+from app.models.waste_report import WasteReport
+from app.services.badge_engine import (
+    CORE_BADGE_DEFINITIONS,
+    BadgeDefinition,
+    _waste_log_user_col,
+    ensure_badge_definitions,
+)
+from app.services.segregation_service import SEGREGATION_BADGE_DEFINITIONS
+from app.services.training_service import TRAINING_BADGE_DEFINITIONS, TRAINING_MILESTONE_BADGES
+from app.services.waste_report_service import REPORTING_BADGE_DEFINITIONS
+
+CHECKPOINT_KEY = "badge_recompute_checkpoint"
+DEFAULT_CHUNK_SIZE = 2000
+INSERT_BATCH_SIZE = 5000
+
+Scope = tuple[tuple[str, Any], ...]
+
+
+def all_badge_definitions() -> list[BadgeDefinition]:
+    return (
+        CORE_BADGE_DEFINITIONS
+        + TRAINING_BADGE_DEFINITIONS
+        + SEGREGATION_BADGE_DEFINITIONS
+        + REPORTING_BADGE_DEFINITIONS
+    )
+
+
+@dataclass
+class ChunkRule:
+    badge_id: int
+    code: str
+    predicate: VectorPredicate
+    scope: Scope
+
+
+@dataclass
+class ChunkMetrics:
+    user_ids: np.ndarray
+    columns: dict[Scope, dict[str, np.ndarray]]
+    org_ids: np.ndarray  # bulk org per user (0 = none), stamped on bulk-scoped awards
+
+
+@dataclass
+class RecomputeStats:
+    users: int = 0
+    awarded: int = 0
+    chunks: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def users_per_second(self) -> float:
+        return self.users / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+
+def load_chunk_rules(db: Session, definitions: list[BadgeDefinition]) -> list[ChunkRule]:
+    defaults = {d.code: d.rule for d in definitions}
+    rules: list[ChunkRule] = []
+    for badge in db.query(Badge).filter(Badge.active.is_(True), Badge.code.isnot(None)).order_by(Badge.id.asc()):
+        rule = badge.rule_json if is_declarative(badge.rule_json) else defaults.get(badge.code)
+        if rule is None:
+            continue
+        try:
+            predicate, scope = compile_vector_rule(rule)
+        except RuleError:
+            continue
+        rules.append(ChunkRule(badge_id=badge.id, code=badge.code, predicate=predicate, scope=scope))
+    return rules
+
+
+def evaluate_chunk(
+    rules: list[ChunkRule],
+    metrics: ChunkMetrics,
+    already: np.ndarray,
+) -> list[tuple[int, int]]:
+    """
+    (user row, rule index) pairs that pass and are not yet awarded.
+
+    `already` is a users x rules boolean matrix of existing awards.
+    """
+    n = len(metrics.user_ids)
+    hits: list[tuple[int, int]] = []
+    for j, rule in enumerate(rules):
+        cols = metrics.columns.get(rule.scope)
+        if cols is None:
+            continue
+        passed = np.asarray(rule.predicate(cols, n), dtype=bool) & ~already[:, j]
+        hits.extend((int(i), j) for i in np.flatnonzero(passed))
+    return hits
+
+
+# ---------------------------------------------------------------------------
+# Set-based metrics
+# ---------------------------------------------------------------------------
+
+def _column(n: int, fill: float = 0.0) -> np.ndarray:
+    return np.full(n, fill, dtype=float)
+
+
+def _scatter(index: dict[int, int], rows: Iterable[tuple], *targets: np.ndarray) -> None:
+    for row in rows:
+        i = index.get(row[0])
+        if i is None:
+            continue
+        for target, value in zip(targets, row[1:]):
+            if value is not None:
+                target[i] = float(value)
+
+
+def _streak_query(db: Session, ids: list[int]):
+    """Length of the latest run of consecutive verification days per user (gaps-and-islands)."""
+    user_col = _waste_log_user_col(db)
+    days = (
+        select(user_col.label("user_id"), cast(Verification.verified_at, Date).label("d"))
+        .join(WasteLog, WasteLog.id == Verification.waste_log_id)
+        .where(user_col.in_(ids), Verification.verified_at.isnot(None))
+        .distinct()
+        .subquery()
+    )
+    islands = select(
+        days.c.user_id,
+        days.c.d,
+        (days.c.d - cast(func.row_number().over(partition_by=days.c.user_id, order_by=days.c.d), Integer)).label("grp"),
+    ).subquery()
+    runs = (
+        select(
+            islands.c.user_id,
+            func.count().label("length"),
+            func.max(islands.c.d).label("last_day"),
+        )
+        .group_by(islands.c.user_id, islands.c.grp)
+        .subquery()
+    )
+    return (
+        select(runs.c.user_id, runs.c.length)
+        .distinct(runs.c.user_id)
+        .order_by(runs.c.user_id, runs.c.last_day.desc())
+    )
+
+
+def compute_chunk_metrics(db: Session, ids: list[int], training_totals: dict[str, int]) -> ChunkMetrics:
+    n = len(ids)
+    index = {uid: i for i, uid in enumerate(ids)}
+    user_col = _waste_log_user_col(db)
+
+    # Unscoped (per-user) metrics.
+    carbon, pcc = _column(n), _column(n)
+    _scatter(
+        index,
+        db.execute(
+            select(
+                CarbonLedger.user_id,
+                func.sum(CarbonLedger.carbon_saved_kgco2e),
+                func.sum(CarbonLedger.pcc_awarded),
+            )
+            .where(CarbonLedger.user_id.in_(ids))
+            .group_by(CarbonLedger.user_id)
+        ),
+        carbon,
+        pcc,
+    )
+
+    streak = _column(n)
+    _scatter(index, db.execute(_streak_query(db, ids)), streak)
+
+    quality, quality_n = _column(n, np.nan), _column(n)
+    _scatter(
+        index,
+        db.execute(
+            select(user_col, func.avg(Verification.quality_score), func.count(Verification.quality_score))
+            .join(WasteLog, WasteLog.id == Verification.waste_log_id)
+            .where(user_col.in_(ids), Verification.verified_at >= _utc_now() - timedelta(days=30))
+            .group_by(user_col)
+        ),
+        quality,
+        quality_n,
+    )
+
+    reports = _column(n)
+    _scatter(
+        index,
+        db.execute(
+            select(WasteReport.reporter_id, func.count(WasteReport.id))
+            .where(WasteReport.reporter_id.in_(ids))
+            .group_by(WasteReport.reporter_id)
+        ),
+        reports,
+    )
+
+    good_logs = (
+        select(SegregationLog.household_id, func.count(SegregationLog.id).label("n"))
+        .where(
+            SegregationLog.log_date >= date.today() - timedelta(days=7),
+            SegregationLog.segregation_score >= 80,
+        )
+        .group_by(SegregationLog.household_id)
+        .subquery()
+    )
+    household_good = _column(n)
+    _scatter(
+        index,
+        db.execute(
+            select(Household.owner_user_id, func.max(good_logs.c.n))
+            .join(good_logs, good_logs.c.household_id == Household.id)
+            .where(Household.owner_user_id.in_(ids))
+            .group_by(Household.owner_user_id)
+        ),
+        household_good,
+    )
+
+    columns: dict[Scope, dict[str, np.ndarray]] = {
+        (): {
+            "total_carbon_saved_kgco2e": np.round(carbon, 6),
+            "total_pcc_earned": np.round(pcc, 6),
+            "current_streak_days": streak,
+            "rolling_30d_quality_score": quality,
+            "rolling_30d_verified_logs": quality_n,
+            "reports_submitted": reports,
+            "household_good_logs_7d": household_good,
+        }
+    }
+
+    # Bulk organisation owners (scope target=bulk).
+    org_ids = np.zeros(n, dtype=np.int64)
+    org_verified, org_best, org_balance = _column(n, np.nan), _column(n, np.nan), _column(n, np.nan)
+    org_stats = (
+        select(
+            WasteLog.bulk_generator_id.label("org_id"),
+            func.count(Verification.id).label("n"),
+            func.max(Verification.score).label("best"),
+        )
+        .join(WasteLog, WasteLog.id == Verification.waste_log_id)
+        .group_by(WasteLog.bulk_generator_id)
+        .subquery()
+    )
+    for user_id, org_id, count, best, balance in db.execute(
+        select(
+            BulkGenerator.user_id,
+            BulkGenerator.id,
+            func.coalesce(org_stats.c.n, 0),
+            org_stats.c.best,
+            Wallet.balance_pcc,
+        )
+        .outerjoin(org_stats, org_stats.c.org_id == BulkGenerator.id)
+        .outerjoin(Wallet, Wallet.bulk_generator_id == BulkGenerator.id)
+        .where(BulkGenerator.user_id.in_(ids))
+        .order_by(BulkGenerator.user_id, BulkGenerator.id)
+    ):
+        i = index[user_id]
+        org_ids[i] = org_id
+        org_verified[i] = float(count or 0)
+        org_best[i] = float(best) if best is not None else np.nan
+        org_balance[i] = float(balance or 0.0)
+    columns[(("target", "bulk"),)] = {
+        "org_verified_count": org_verified,
+        "event_score": org_best,
+        "pcc_snapshot": org_balance,
+    }
+
+    # Verifiers (scope target=worker).
+    worker_n, worker_quality, worker_best = _column(n), _column(n), _column(n, np.nan)
+    _scatter(
+        index,
+        db.execute(
+            select(
+                Verification.verifier_worker_id,
+                func.count(Verification.id),
+                func.count(Verification.id).filter(Verification.score >= 95.0),
+                func.max(Verification.score),
+            )
+            .where(Verification.verifier_worker_id.in_(ids))
+            .group_by(Verification.verifier_worker_id)
+        ),
+        worker_n,
+        worker_quality,
+        worker_best,
+    )
+    columns[(("target", "worker"),)] = {
+        "worker_verified_count": worker_n,
+        "worker_quality_count": worker_quality,
+        "event_score": worker_best,
+    }
+
+    # Training completions per audience (scope audience=...).
+    completed_by_audience = {audience: _column(n) for audience in training_totals}
+    for user_id, audience, count in db.execute(
+        select(TrainingProgress.user_id, TrainingModule.audience, func.count(TrainingProgress.id))
+        .join(TrainingModule, TrainingModule.id == TrainingProgress.module_id)
+        .where(
+            TrainingProgress.user_id.in_(ids),
+            TrainingProgress.completed.is_(True),
+            TrainingModule.is_published.is_(True),
+        )
+        .group_by(TrainingProgress.user_id, TrainingModule.audience)
+    ):
+        key = audience.value if hasattr(audience, "value") else str(audience)
+        if key in completed_by_audience:
+            completed_by_audience[key][index[user_id]] = float(count)
+    for audience, total in training_totals.items():
+        columns[(("audience", audience),)] = {
+            "training_completed": completed_by_audience[audience],
+            "training_total": np.full(n, float(total)),
+        }
+
+    return ChunkMetrics(user_ids=np.asarray(ids, dtype=np.int64), columns=columns, org_ids=org_ids)
+
+
+def _training_totals(db: Session) -> dict[str, int]:
+    totals = {audience: 0 for audience in TRAINING_MILESTONE_BADGES}
+    for audience, count in db.execute(
+        select(TrainingModule.audience, func.count(TrainingModule.id))
+        .where(TrainingModule.is_published.is_(True))
+        .group_by(TrainingModule.audience)
+    ):
+        key = audience.value if hasattr(audience, "value") else str(audience)
+        if key in totals:
+            totals[key] = int(count)
+    return totals
+
+
+# ---------------------------------------------------------------------------
+# Awards + checkpoint
+# ---------------------------------------------------------------------------
+
+def _existing_awards(db: Session, ids: list[int], rules: list[ChunkRule]) -> np.ndarray:
+    index = {uid: i for i, uid in enumerate(ids)}
+    rule_index = {r.badge_id: j for j, r in enumerate(rules)}
+    already = np.zeros((len(ids), len(rules)), dtype=bool)
+    for user_id, badge_id in db.execute(
+        select(UserBadge.user_id, UserBadge.badge_id).where(
+            UserBadge.user_id.in_(ids),
+            UserBadge.badge_id.in_(list(rule_index)),
+        )
+    ):
+        already[index[user_id], rule_index[badge_id]] = True
+    return already
+
+
+def _insert_awards(
+    db: Session,
+    hits: list[tuple[int, int]],
+    metrics: ChunkMetrics,
+    rules: list[ChunkRule],
+) -> int:
+    now = datetime.utcnow()
+    rows = []
+    for i, j in hits:
+        rule = rules[j]
+        org_id = int(metrics.org_ids[i]) if rule.scope == (("target", "bulk"),) and metrics.org_ids[i] else None
+        rows.append(
+            {
+                "user_id": int(metrics.user_ids[i]),
+                "org_id": org_id,
+                "badge_id": rule.badge_id,
+                "metadata_json": {"source": "batch_recompute", "code": rule.code},
+                "awarded_at": now,
+            }
+        )
+    inserted = 0
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        result = db.execute(
+            pg_insert(UserBadge)
+            .values(rows[start:start + INSERT_BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=[UserBadge.user_id, UserBadge.badge_id])
+            .returning(UserBadge.id)
+        )
+        inserted += len(result.scalars().all())
+    return inserted
+
+
+def _load_checkpoint(db: Session) -> dict[str, Any]:
+    row = db.query(PlatformSetting).filter(PlatformSetting.key == CHECKPOINT_KEY).first()
+    return dict(row.value_json) if row and isinstance(row.value_json, dict) else {}
+
+
+def _save_checkpoint(db: Session, value: dict[str, Any]) -> None:
+    row = db.query(PlatformSetting).filter(PlatformSetting.key == CHECKPOINT_KEY).first()
+    if row is None:
+        row = PlatformSetting(
+            key=CHECKPOINT_KEY,
+            value_json=value,
+            description="Progress of the offline badge recomputation job.",
+        )
+    else:
+        row.value_json = value
+    db.add(row)
+
+
+def recompute_badges(
+    db: Session,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    max_chunks: Optional[int] = None,
+    on_chunk: Optional[Callable[[RecomputeStats, int, int, int], None]] = None,
+) -> RecomputeStats:
+    """
+    Evaluate every active, rule-backed badge for every user.
+
+    `on_chunk(stats, first_id, last_id, awarded)` is called after each
+    committed chunk. A finished run clears the checkpoint; an interrupted one
+    resumes after the last committed user id.
+    """
+    definitions = all_badge_definitions()
+    ensure_badge_definitions(db, definitions)
+    db.commit()
+    rules = load_chunk_rules(db, definitions)
+    training_totals = _training_totals(db)
+
+    checkpoint = _load_checkpoint(db) if resume else {}
+    after_id = int(checkpoint.get("last_user_id") or 0)
+    stats = RecomputeStats()
+
+    while max_chunks is None or stats.chunks < max_chunks:
+        ids = list(
+            db.execute(select(User.id).where(User.id > after_id).order_by(User.id.asc()).limit(chunk_size)).scalars()
+        )
+        if not ids:
+            _save_checkpoint(db, {"last_user_id": None, "completed_at": _utc_now().isoformat()})
+            db.commit()
+            break
+
+        metrics = compute_chunk_metrics(db, ids, training_totals)
+        hits = evaluate_chunk(rules, metrics, _existing_awards(db, ids, rules))
+        awarded = _insert_awards(db, hits, metrics, rules) if hits else 0
+
+        after_id = ids[-1]
+        stats.users += len(ids)
+        stats.awarded += awarded
+        stats.chunks += 1
+        _save_checkpoint(
+            db,
+            {
+                "last_user_id": after_id,
+                "awarded": int(checkpoint.get("awarded") or 0) + stats.awarded,
+                "updated_at": _utc_now().isoformat(),
+            },
+        )
+        db.commit()
+        if on_chunk:
+            on_chunk(stats, ids[0], ids[-1], awarded)
+
+    return stats
@@ -6,7 +6,7 @@ from typing import Optional
 from uuid import uuid4
 
 from fastapi import HTTPException, UploadFile
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -17,9 +17,6 @@ from app.models.bulk import (
     OrganizationStatus,
     PickupRequest,
     PickupRequestStatus,
-    Transaction,
-    TransactionStatus,
-    TransactionType,
     Verification,
     Wallet,
     WalletLedger,
@@ -43,11 +40,27 @@ from app.schemas.bulk import (
     WorkerPickupStatusUpdate,
 )
 from app.services.bulk_carbon_service import calculate_carbon_and_points
-from app.services.badge_engine import evaluate_bulk_worker_event_badges, list_user_badge_items
+from app.services.badge_engine import evaluate_bulk_worker_event_badges, list_user_badge_items, notify_badge_unlocks
+from app.services.job_feed_service import (
+    JOB_CANCELLED,
+    JOB_CLAIMED,
+    JOB_CREATED,
+    publish_job_event,
+)
+from app.services.pcc_ledger_service import post_wallet_movement
+from app.services.streak_service import (
+    STREAM_VERIFICATION,
+    SUBJECT_BULK_ORG,
+    get_streak,
+    record_verification_activity,
+)
+from app.services.task_queue_service import TASK_BULK_VERIFICATION_BADGES, enqueue_task
 from app.services.training_service import list_published_modules
 
 
 BULK_ROLES = (UserRole.BULK_GENERATOR, UserRole.BULK_MANAGER, UserRole.BULK_STAFF)
+CLAIMABLE_PICKUP_STATUSES = (PickupRequestStatus.REQUESTED, PickupRequestStatus.ASSIGNED)
+MAX_AUTO_ASSIGN_JOBS = 20
 
 
 def _utc_now() -> datetime:
@@ -276,6 +289,14 @@ def update_bulk_me(db: Session, *, current_user: User, payload: BulkMeUpdateRequ
     if "ward" in updates:
         org.ward = (updates["ward"] or "").strip() or None
 
+    if "latitude" in updates or "longitude" in updates:
+        lat = updates.get("latitude", org.latitude)
+        lon = updates.get("longitude", org.longitude)
+        if (lat is None) != (lon is None):
+            raise HTTPException(status_code=400, detail="latitude and longitude must be set together.")
+        org.latitude = lat
+        org.longitude = lon
+
     current_user.meta = meta
     db.add(current_user)
     db.add(org)
@@ -378,6 +399,7 @@ def create_bulk_pickup_request(db: Session, *, current_user: User, payload: Pick
     db.add(log)
     db.commit()
     db.refresh(pickup)
+    publish_job_event(JOB_CREATED, _worker_job_read(pickup, log, org).model_dump(mode="json"))
     return pickup
 
 
@@ -404,21 +426,6 @@ def list_bulk_pickup_requests(
     return q.order_by(PickupRequest.created_at.desc()).limit(max(1, min(limit, 200))).all()
 
 
-def _calc_streak_days(days: list[date]) -> int:
-    if not days:
-        return 0
-    unique_sorted = sorted(set(days), reverse=True)
-    streak = 0
-    cursor = unique_sorted[0]
-    for d in unique_sorted:
-        if d == cursor:
-            streak += 1
-            cursor = cursor - timedelta(days=1)
-        elif d < cursor:
-            break
-    return streak
-
-
 def get_bulk_dashboard_summary(db: Session, *, current_user: User) -> BulkDashboardSummary:
     org = _resolve_bulk_org_for_user(db, current_user)
 
@@ -484,18 +491,15 @@ def get_bulk_insights_summary(db: Session, *, current_user: User) -> BulkInsight
     quality_30d_values = [float(v.score or 0) for v in verifications if v.created_at and v.created_at >= since_30]
     quality_30d = (sum(quality_30d_values) / len(quality_30d_values)) if quality_30d_values else 0.0
 
-    streak_days = _calc_streak_days([
-        (v.created_at or v.verified_at).astimezone(timezone.utc).date()
-        for v in verifications
-        if (v.created_at or v.verified_at)
-    ])
+    streak = get_streak(db, SUBJECT_BULK_ORG, org.id, STREAM_VERIFICATION)
+    db.commit()
 
     badges = list_user_badge_items(db, user_id=current_user.id, org_id=org.id)
 
     return BulkInsightsSummary(
         carbon_saved_total=round(carbon_total, 3),
         pcc_earned_total=round(max(float(wallet.lifetime_credited or 0), pcc_total), 3),
-        current_streak_days=streak_days,
+        current_streak_days=streak.current,
         quality_30d=round(quality_30d, 2),
         earned_badges=badges,
         badge_tiers=_build_badge_tiers(badges),
@@ -527,14 +531,46 @@ def get_bulk_training_modules(db: Session) -> list:
     return list_published_modules(db, "bulk_generator")
 
 
+def _worker_job_read(pickup: PickupRequest, log: WasteLog, org: BulkGenerator) -> WorkerJobRead:
+    return WorkerJobRead(
+        pickup_request_id=pickup.id,
+        waste_log_id=log.id,
+        bulk_org_id=pickup.bulk_org_id,
+        organization_name=org.organization_name,
+        category=log.category.value,
+        weight_kg=float(log.weight_kg or 0),
+        status=pickup.status.value,
+        scheduled_at=pickup.scheduled_at,
+        note=pickup.note or pickup.status_note,
+        created_at=pickup.created_at,
+    )
+
+
+def _publish_job_state(event_type: str, pickup: PickupRequest) -> None:
+    publish_job_event(
+        event_type,
+        {
+            "pickup_request_id": pickup.id,
+            "assigned_worker_id": pickup.assigned_worker_id,
+            "status": pickup.status.value,
+        },
+    )
+
+
+def _worker_jobs_query(db: Session):
+    return (
+        db.query(PickupRequest, WasteLog, BulkGenerator)
+        .join(WasteLog, WasteLog.id == PickupRequest.waste_log_id)
+        .join(BulkGenerator, BulkGenerator.id == WasteLog.bulk_generator_id)
+    )
+
+
 def list_available_worker_jobs(db: Session, *, current_user: User) -> list[WorkerJobRead]:
     if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
         raise HTTPException(status_code=403, detail="Worker role required.")
 
     rows = (
-        db.query(PickupRequest, WasteLog, BulkGenerator)
-        .join(WasteLog, WasteLog.id == PickupRequest.waste_log_id)
-        .join(BulkGenerator, BulkGenerator.id == WasteLog.bulk_generator_id)
+        _worker_jobs_query(db)
         .filter(
             PickupRequest.status == PickupRequestStatus.REQUESTED,
             PickupRequest.assigned_worker_id.is_(None),
@@ -542,22 +578,7 @@ def list_available_worker_jobs(db: Session, *, current_user: User) -> list[Worke
         .order_by(PickupRequest.created_at.asc())
         .all()
     )
-
-    return [
-        WorkerJobRead(
-            pickup_request_id=pickup.id,
-            waste_log_id=log.id,
-            bulk_org_id=pickup.bulk_org_id,
-            organization_name=org.organization_name,
-            category=log.category.value,
-            weight_kg=float(log.weight_kg or 0),
-            status=pickup.status.value,
-            scheduled_at=pickup.scheduled_at,
-            note=pickup.note or pickup.status_note,
-            created_at=pickup.created_at,
-        )
-        for pickup, log, org in rows
-    ]
+    return [_worker_job_read(pickup, log, org) for pickup, log, org in rows]
 
 
 def list_assigned_worker_jobs(db: Session, *, current_user: User) -> list[WorkerJobRead]:
@@ -565,51 +586,110 @@ def list_assigned_worker_jobs(db: Session, *, current_user: User) -> list[Worker
         raise HTTPException(status_code=403, detail="Worker role required.")
 
     rows = (
-        db.query(PickupRequest, WasteLog, BulkGenerator)
-        .join(WasteLog, WasteLog.id == PickupRequest.waste_log_id)
-        .join(BulkGenerator, BulkGenerator.id == WasteLog.bulk_generator_id)
+        _worker_jobs_query(db)
         .filter(PickupRequest.assigned_worker_id == current_user.id)
         .order_by(PickupRequest.created_at.desc())
         .all()
     )
-
-    return [
-        WorkerJobRead(
-            pickup_request_id=pickup.id,
-            waste_log_id=log.id,
-            bulk_org_id=pickup.bulk_org_id,
-            organization_name=org.organization_name,
-            category=log.category.value,
-            weight_kg=float(log.weight_kg or 0),
-            status=pickup.status.value,
-            scheduled_at=pickup.scheduled_at,
-            note=pickup.note or pickup.status_note,
-            created_at=pickup.created_at,
+    return [_worker_job_read(pickup, log, org) for pickup, log, org in rows]
+
+
+def claim_pickups(db: Session, *, worker_id: int, pickup_ids) -> list[int]:
+    """
+    The pickup claim primitive: one conditional UPDATE .. RETURNING.
+
+    Postgres row locks serialize concurrent claims, and only the first still
+    matches the WHERE clause, so a pickup can never end up with two workers.
+    `pickup_ids` is a list or an id subquery. Returns the ids that were claimed.
+    Does not commit; publish with publish_pickups_claimed() after committing.
+    """
+    return db.execute(
+        update(PickupRequest)
+        .where(
+            PickupRequest.id.in_(pickup_ids),
+            PickupRequest.status.in_(CLAIMABLE_PICKUP_STATUSES),
+            or_(
+                PickupRequest.assigned_worker_id.is_(None),
+                PickupRequest.assigned_worker_id == worker_id,
+            ),
+        )
+        .values(
+            assigned_worker_id=worker_id,
+            status=PickupRequestStatus.ASSIGNED,
+            updated_at=_utc_now(),
+        )
+        .returning(PickupRequest.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+
+def publish_pickups_claimed(worker_id: int, pickup_ids) -> None:
+    for pickup_id in pickup_ids:
+        publish_job_event(
+            JOB_CLAIMED,
+            {
+                "pickup_request_id": pickup_id,
+                "assigned_worker_id": worker_id,
+                "status": PickupRequestStatus.ASSIGNED.value,
+            },
         )
-        for pickup, log, org in rows
-    ]
 
 
 def claim_worker_job(db: Session, *, current_user: User, pickup_request_id: int) -> PickupRequest:
     if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
         raise HTTPException(status_code=403, detail="Worker role required.")
 
-    pickup = db.get(PickupRequest, pickup_request_id)
-    if pickup is None:
-        raise HTTPException(status_code=404, detail="Pickup request not found.")
-    if pickup.assigned_worker_id and pickup.assigned_worker_id != current_user.id:
-        raise HTTPException(status_code=400, detail="Pickup request already assigned to another worker.")
-    if pickup.status not in (PickupRequestStatus.REQUESTED, PickupRequestStatus.ASSIGNED):
+    if not claim_pickups(db, worker_id=current_user.id, pickup_ids=[pickup_request_id]):
+        db.rollback()
+        pickup = db.get(PickupRequest, pickup_request_id)
+        if pickup is None:
+            raise HTTPException(status_code=404, detail="Pickup request not found.")
+        if pickup.assigned_worker_id and pickup.assigned_worker_id != current_user.id:
+            raise HTTPException(status_code=409, detail="Pickup request already assigned to another worker.")
         raise HTTPException(status_code=400, detail="Pickup request cannot be claimed in current status.")
 
-    pickup.assigned_worker_id = current_user.id
-    pickup.status = PickupRequestStatus.ASSIGNED
-    db.add(pickup)
     db.commit()
+    publish_pickups_claimed(current_user.id, [pickup_request_id])
+    pickup = db.get(PickupRequest, pickup_request_id)
     db.refresh(pickup)
     return pickup
 
 
+def auto_assign_worker_jobs(db: Session, *, current_user: User, limit: int = 5) -> list[WorkerJobRead]:
+    """
+    Hand the oldest open pickups to the calling worker.
+
+    Candidate rows are locked with FOR UPDATE SKIP LOCKED, so concurrent
+    callers each receive a distinct batch instead of queueing on the same rows.
+    """
+    if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
+        raise HTTPException(status_code=403, detail="Worker role required.")
+
+    candidates = (
+        select(PickupRequest.id)
+        .where(
+            PickupRequest.status == PickupRequestStatus.REQUESTED,
+            PickupRequest.assigned_worker_id.is_(None),
+        )
+        .order_by(PickupRequest.created_at.asc(), PickupRequest.id.asc())
+        .limit(max(1, min(limit, MAX_AUTO_ASSIGN_JOBS)))
+        .with_for_update(skip_locked=True)
+    )
+    claimed_ids = claim_pickups(db, worker_id=current_user.id, pickup_ids=candidates)
+    db.commit()
+
+    if not claimed_ids:
+        return []
+    publish_pickups_claimed(current_user.id, claimed_ids)
+    rows = (
+        _worker_jobs_query(db)
+        .filter(PickupRequest.id.in_(claimed_ids))
+        .order_by(PickupRequest.created_at.asc(), PickupRequest.id.asc())
+        .all()
+    )
+    return [_worker_job_read(pickup, log, org) for pickup, log, org in rows]
+
+
 def update_worker_job_status(
     db: Session,
     *,
@@ -626,6 +706,7 @@ def update_worker_job_status(
     if current_user.role == UserRole.WASTE_WORKER and pickup.assigned_worker_id not in (None, current_user.id):
         raise HTTPException(status_code=403, detail="Pickup assigned to another worker.")
 
+    was_open = pickup.assigned_worker_id is None and pickup.status == PickupRequestStatus.REQUESTED
     if pickup.assigned_worker_id is None:
         pickup.assigned_worker_id = current_user.id
 
@@ -663,6 +744,10 @@ def update_worker_job_status(
     db.add(pickup)
     db.commit()
     db.refresh(pickup)
+    if target == PickupRequestStatus.CANCELLED:
+        _publish_job_state(JOB_CANCELLED, pickup)
+    elif was_open:
+        _publish_job_state(JOB_CLAIMED, pickup)
     return pickup
 
 
@@ -732,16 +817,14 @@ def verify_bulk_waste(
             verified_at=_utc_now(),
         )
         db.add(verification)
+        db.flush()
+        record_verification_activity(db, log, verification.verified_at)
 
         # LOGGED -> PICKUP_REQUESTED -> PICKED_UP -> VERIFIED -> CREDITED
         log.status = WasteLogStatus.VERIFIED
         log.verification_status = "verified"
         log.quality_level = "high" if score >= 95 else "medium" if score >= 80 else "low"
 
-        wallet.balance_points = float(wallet.balance_points or 0) + float(pcc_awarded)
-        wallet.balance_pcc = float(wallet.balance_pcc or 0) + float(pcc_awarded)
-        wallet.lifetime_credited = float(wallet.lifetime_credited or 0) + float(pcc_awarded)
-
         ledger = WalletLedger(
             owner_type=WalletOwnerType.BULK,
             owner_id=int(log.bulk_generator_id),
@@ -752,23 +835,21 @@ def verify_bulk_waste(
         )
         db.add(ledger)
 
-        tx = Transaction(
-            wallet_id=wallet.id,
-            verification_id=None,
+        post_wallet_movement(
+            db,
+            wallet=wallet,
+            amount=float(pcc_awarded),
+            source="bulk_verification",
+            ref_type="bulk_log",
+            ref_id=log.id,
             user_id=log.user_id,
-            created_by_user_id=current_user.id,
             org_id=log.bulk_generator_id,
-            tx_type=TransactionType.CREDIT,
-            status=TransactionStatus.COMPLETED,
-            amount_points=float(pcc_awarded),
-            amount_pcc=float(pcc_awarded),
+            created_by_user_id=current_user.id,
             reason="Bulk log verification credit",
-            ref_type="bulk_log",
-            ref_id=log.id,
             description=f"PCC credited for bulk log #{log.id}",
-            meta_json={"verification_weight": verified_weight, "score": score},
+            carbon_kgco2e=float(carbon_saved),
+            meta={"verification_weight": verified_weight, "score": score},
         )
-        db.add(tx)
 
         log.status = WasteLogStatus.CREDITED
         log.pcc_status = "awarded"
@@ -784,31 +865,51 @@ def verify_bulk_waste(
             pickup.status_note = payload.notes or pickup.status_note
             db.add(pickup)
 
+        # The verifying worker's badges are awarded now so the response can announce
+        # them; the organisation's badges are evaluated by the task worker.
         org = db.get(BulkGenerator, log.bulk_generator_id)
         unlocked_badges: list[dict] = []
         if org is not None:
-            awarded = evaluate_bulk_worker_event_badges(
+            worker_user_id = current_user.id if current_user.role == UserRole.WASTE_WORKER else None
+            event_payload = {
+                "waste_log_id": log.id,
+                "pickup_request_id": pickup.id if pickup else None,
+                "score": score,
+                "pcc_snapshot": float(wallet.balance_pcc or 0),
+            }
+            if worker_user_id is not None:
+                db.flush()
+                awarded = evaluate_bulk_worker_event_badges(
+                    db,
+                    bulk_user_id=org.user_id,
+                    worker_user_id=worker_user_id,
+                    org_id=org.id,
+                    event_type="bulk_verification",
+                    event_payload=event_payload,
+                    targets=("worker",),
+                )["worker"]
+                notify_badge_unlocks(db, user_id=worker_user_id, badges=awarded, source="bulk verification")
+                unlocked_badges = [
+                    {
+                        "code": badge.code or badge.criteria_key or f"badge_{badge.id}",
+                        "name": badge.name,
+                        "description": badge.description,
+                        "category": badge.category,
+                    }
+                    for badge in awarded
+                ]
+            enqueue_task(
                 db,
-                bulk_user_id=org.user_id,
-                worker_user_id=current_user.id if current_user.role == UserRole.WASTE_WORKER else None,
-                org_id=org.id,
-                event_type="bulk_verification",
-                event_payload={
-                    "waste_log_id": log.id,
-                    "pickup_request_id": pickup.id if pickup else None,
-                    "score": score,
-                    "pcc_snapshot": float(wallet.balance_pcc or 0),
+                TASK_BULK_VERIFICATION_BADGES,
+                {
+                    "bulk_user_id": org.user_id,
+                    "worker_user_id": worker_user_id,
+                    "org_id": org.id,
+                    "targets": ["bulk"],
+                    "event_payload": event_payload,
                 },
+                key=log.id,
             )
-            unlocked_badges = [
-                {
-                    "code": badge.code or badge.criteria_key or f"badge_{badge.id}",
-                    "name": badge.name,
-                    "description": badge.description,
-                    "category": badge.category,
-                }
-                for badge in (awarded.get("bulk", []) + awarded.get("worker", []))
-            ]
 
         db.commit()
         db.refresh(verification)
@@ -5,8 +5,9 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 
-from app.models.bulk import Transaction, TransactionStatus, TransactionType, Wallet
+from app.models.bulk import Wallet
 from app.models.pcc import CarbonLedger, EmissionFactor
+from app.services.pcc_ledger_service import post_wallet_movement
 
 PCC_UNIT_KGCO2E = 1.0
 
@@ -121,29 +122,21 @@ def credit_pcc_transaction(
         db.add(wallet)
         db.flush()
 
-    wallet.balance_pcc = float(wallet.balance_pcc or 0.0) + pcc_awarded
-    wallet.balance_points = float(wallet.balance_points or 0.0) + pcc_awarded
-    wallet.lifetime_credited = float(wallet.lifetime_credited or 0.0) + pcc_awarded
-    db.add(wallet)
-    db.flush()
-
-    tx = Transaction(
-        wallet_id=wallet.id,
+    tx = post_wallet_movement(
+        db,
+        wallet=wallet,
+        amount=pcc_awarded,
+        source="verification_credit",
+        ref_type=ref_type,
+        ref_id=ref_id,
         user_id=user_id,
         org_id=org_id,
-        tx_type=TransactionType.CREDIT,
-        type="credit",
-        status=TransactionStatus.COMPLETED,
-        amount_points=pcc_awarded,
-        amount_pcc=pcc_awarded,
         reason=reason,
-        ref_type=ref_type,
-        ref_id=ref_id,
         description=reason,
-        meta_json={"quality_score": quality_score},
+        type_label="credit",
+        carbon_kgco2e=carbon_saved_kgco2e,
+        meta={"quality_score": quality_score},
     )
-    db.add(tx)
-    db.flush()
 
     ledger = CarbonLedger(
         ref_type=ref_type,
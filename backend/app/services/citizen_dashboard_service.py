@@ -0,0 +1,166 @@
+"""
+Citizen home dashboard, aggregated in a single statement.
+
+Each section (reports, training, badges, wallet snapshots, today's log,
+streak, PCC unit) is a one-row CTE; the final SELECT cross-joins them so opening the app costs
+one round trip however many figures the dashboard shows.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, select, true
+from sqlalchemy.orm import Session
+
+from app.models.admin_ops import PlatformSetting
+from app.models.badge import UserBadge
+from app.models.bulk import Wallet
+from app.models.household import SegregationLog
+from app.models.streak import StreakCounter
+from app.models.training import TrainingModule, TrainingProgress
+from app.models.waste_report import WasteReport, WasteReportStatus
+from app.services.streak_service import STREAM_SEGREGATION, SUBJECT_USER, StreakState, get_streak
+
+PCC_UNIT_SETTING = "pcc_unit_kgco2e"
+DEFAULT_PCC_UNIT_KGCO2E = 10.0
+
+
+def setting_number(value: Any, key: str, default: float) -> float:
+    """Numeric PlatformSetting value; accepts bare numbers or {"value": n}."""
+    if isinstance(value, dict):
+        value = value.get("value", value.get(key))
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _summary_statement(user_id: int, today: date):
+    open_statuses = [WasteReportStatus.OPEN.value, WasteReportStatus.IN_PROGRESS.value]
+    reports = (
+        select(
+            func.count().label("total"),
+            func.count().filter(WasteReport.status.in_(open_statuses)).label("pending"),
+            func.count().filter(WasteReport.status == WasteReportStatus.RESOLVED.value).label("resolved"),
+        )
+        .where(WasteReport.reporter_id == user_id)
+        .cte("reports")
+    )
+    training = (
+        select(
+            func.count(TrainingModule.id).label("total"),
+            func.count(TrainingProgress.id).label("completed"),
+        )
+        .select_from(TrainingModule)
+        .outerjoin(
+            TrainingProgress,
+            and_(
+                TrainingProgress.module_id == TrainingModule.id,
+                TrainingProgress.user_id == user_id,
+                TrainingProgress.completed.is_(True),
+            ),
+        )
+        .where(TrainingModule.audience == "citizen", TrainingModule.is_published.is_(True))
+        .cte("training")
+    )
+    badges = select(func.count().label("earned")).where(UserBadge.user_id == user_id).cte("badges")
+    pcc = (
+        select(
+            func.coalesce(func.sum(Wallet.lifetime_credited), 0.0).label("credited"),
+            func.coalesce(func.sum(Wallet.lifetime_debited), 0.0).label("debited"),
+        )
+        .where(Wallet.user_id == user_id)
+        .cte("pcc")
+    )
+    today_log = (
+        select(SegregationLog.quality_score, SegregationLog.segregation_score)
+        .where(SegregationLog.citizen_id == user_id, SegregationLog.log_date == today)
+        .order_by(SegregationLog.created_at.desc())
+        .limit(1)
+        .cte("today_log")
+    )
+    streak = (
+        select(StreakCounter.current_streak, StreakCounter.longest_streak, StreakCounter.last_active_date)
+        .where(
+            StreakCounter.subject_type == SUBJECT_USER,
+            StreakCounter.subject_id == user_id,
+            StreakCounter.stream == STREAM_SEGREGATION,
+        )
+        .cte("streak")
+    )
+    unit = select(PlatformSetting.value_json).where(PlatformSetting.key == PCC_UNIT_SETTING).cte("unit")
+
+    return (
+        select(
+            reports.c.total.label("reports_total"),
+            reports.c.pending.label("reports_pending"),
+            reports.c.resolved.label("reports_resolved"),
+            training.c.total.label("training_total"),
+            training.c.completed.label("training_completed"),
+            badges.c.earned.label("badges_earned"),
+            pcc.c.credited,
+            pcc.c.debited,
+            (today_log.c.segregation_score.isnot(None)).label("has_today_log"),
+            today_log.c.quality_score.label("today_quality_score"),
+            today_log.c.segregation_score.label("today_segregation_score"),
+            streak.c.current_streak.label("streak_current"),
+            streak.c.longest_streak.label("streak_longest"),
+            streak.c.last_active_date.label("streak_last_active"),
+            unit.c.value_json.label("pcc_unit"),
+        )
+        .select_from(reports)
+        .join(training, true())
+        .join(badges, true())
+        .join(pcc, true())
+        .outerjoin(today_log, true())
+        .outerjoin(streak, true())
+        .outerjoin(unit, true())
+    )
+
+
+def build_citizen_summary(db: Session, *, user_id: int, today: date) -> dict[str, Any]:
+    row = db.execute(_summary_statement(user_id, today)).one()
+
+    if row.streak_current is None:
+        # No counter row yet: build it once (persisted by the caller's commit).
+        streak = get_streak(db, SUBJECT_USER, user_id, STREAM_SEGREGATION)
+    else:
+        streak = StreakState(
+            current=int(row.streak_current or 0),
+            longest=int(row.streak_longest or 0),
+            last_active=row.streak_last_active,
+        )
+
+    today_score: Optional[float] = None
+    if row.has_today_log:
+        today_score = float(
+            row.today_quality_score if row.today_quality_score is not None else row.today_segregation_score or 0
+        )
+
+    unit = setting_number(row.pcc_unit, PCC_UNIT_SETTING, DEFAULT_PCC_UNIT_KGCO2E)
+    net = round(float(row.credited) - float(row.debited), 2)
+
+    return {
+        "training": {
+            "completed_modules": int(row.training_completed),
+            "total_modules": int(row.training_total),
+            "badges_earned": int(row.badges_earned),
+            "next_module_title": None,
+        },
+        "segregation": {
+            "today_status": "DONE" if row.has_today_log else "PENDING",
+            "today_score": today_score,
+            "streak_days": streak.current_as_of(today),
+        },
+        "reports": {
+            "total": int(row.reports_total),
+            "pending": int(row.reports_pending),
+            "resolved": int(row.reports_resolved),
+        },
+        "carbon": {
+            "co2_saved_kg": round(net * unit, 2),
+            "pcc_tokens": net,
+        },
+    }
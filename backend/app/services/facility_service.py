@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.core.geo import geohash_for
 from app.models.facility import Facility
 from datetime import datetime
 
@@ -12,6 +13,7 @@ def create_facility(db: Session, data):
         city=data.city,
         latitude=data.latitude,
         longitude=data.longitude,
+        geohash=geohash_for(data.latitude, data.longitude),
         capacity_tpd=data.capacity_tpd,
         contact_person=data.contact_person,
         contact_phone=data.contact_phone,
@@ -27,6 +29,7 @@ def create_facility(db: Session, data):
 def update_facility(db: Session, facility: Facility, data):
     for field, value in data.dict().items():
         setattr(facility, field, value)
+    facility.geohash = geohash_for(facility.latitude, facility.longitude)
     db.commit()
     db.refresh(facility)
     return facility
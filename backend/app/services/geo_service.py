@@ -0,0 +1,96 @@
+import math
+from typing import Any, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Query
+
+from app.core.geo import (
+    KM_PER_DEG_LAT,
+    BBox,
+    bbox_around,
+    covering_prefixes,
+    haversine_km,
+)
+
+MAX_RADIUS_KM = 50.0
+DEFAULT_NEARBY_LIMIT = 50
+MAX_NEARBY_LIMIT = 200
+
+
+def parse_bbox(raw: str) -> BBox:
+    parts = [p.strip() for p in str(raw).split(",") if p.strip()]
+    if len(parts) != 4:
+        raise ValueError("bbox must be 'min_lat,min_lon,max_lat,max_lon'.")
+    min_lat, min_lon, max_lat, max_lon = (float(p) for p in parts)
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+        raise ValueError("bbox coordinates are out of range or inverted.")
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def _intersect(a: BBox, b: BBox) -> BBox:
+    return max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+
+
+def locate(
+    query: Query,
+    model: Any,
+    *,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    bbox: Optional[BBox] = None,
+    limit: int = DEFAULT_NEARBY_LIMIT,
+) -> list[tuple[Any, Optional[float]]]:
+    """
+    Apply a near/bbox filter to `query` over a model with latitude, longitude
+    and geohash columns.
+
+    Geohash prefixes prune via the index, the raw coordinates give the exact
+    cut, and results come back nearest-first (when a centre is given) with the
+    great-circle distance in km alongside each row.
+    """
+    has_center = latitude is not None and longitude is not None
+    if not has_center and bbox is None:
+        raise ValueError("Provide latitude/longitude or bbox.")
+    if has_center and not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("latitude/longitude out of range.")
+
+    if has_center and radius_km is not None:
+        radius_km = max(0.0, min(float(radius_km), MAX_RADIUS_KM))
+        circle = bbox_around(latitude, longitude, radius_km)
+        bbox = _intersect(bbox, circle) if bbox else circle
+    elif has_center and bbox is None:
+        radius_km = MAX_RADIUS_KM
+        bbox = bbox_around(latitude, longitude, radius_km)
+
+    min_lat, min_lon, max_lat, max_lon = bbox
+    if min_lat > max_lat or min_lon > max_lon:
+        return []
+
+    prefixes = covering_prefixes(bbox)
+    if prefixes:
+        query = query.filter(or_(*[model.geohash.startswith(p) for p in prefixes]))
+    query = query.filter(
+        model.latitude.between(min_lat, max_lat),
+        model.longitude.between(min_lon, max_lon),
+    )
+
+    if has_center:
+        # Equirectangular approximation: exact enough to rank and cut at city scale.
+        k = math.cos(math.radians(latitude))
+        dlat = model.latitude - latitude
+        dlon = (model.longitude - longitude) * k
+        sq_deg = dlat * dlat + dlon * dlon
+        if radius_km is not None:
+            query = query.filter(sq_deg <= (radius_km / KM_PER_DEG_LAT) ** 2)
+        query = query.order_by(sq_deg.asc(), model.id.asc())
+    else:
+        query = query.order_by(model.id.asc())
+
+    rows = query.limit(max(1, min(limit, MAX_NEARBY_LIMIT))).all()
+    if not has_center:
+        return [(row, None) for row in rows]
+    return [
+        (row, round(haversine_km(latitude, longitude, row.latitude, row.longitude), 3))
+        for row in rows
+    ]
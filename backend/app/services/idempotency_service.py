@@ -0,0 +1,357 @@
+"""
+Idempotency-Key support for write endpoints.
+
+A client that sends `Idempotency-Key: <key>` on a POST/PUT/PATCH/DELETE gets
+the first response for that key replayed on every retry, and the handler runs
+only once. Mobile retries on flaky networks therefore cannot create a second
+report, waste log, pickup, verification or lead, or run the classifier again.
+
+Keys are scoped to the caller: the user id of a valid bearer token, so a
+retry after a token refresh still replays, or the client address for
+anonymous forms. The first request for a key inserts an
+in-flight row in idempotency_keys. When it finishes, the status, headers and
+body are stored on that row for IDEMPOTENCY_TTL_SECONDS. Other requests for the
+same key then get:
+
+  * the stored response, with `Idempotent-Replayed: true`;
+  * 409 while the first request is still running. A crashed request frees its
+    key after IN_FLIGHT_LEASE;
+  * 422 when the key is reused for a different request.
+
+5xx, 408, 409 and 429 responses (a rate limit refusal, for instance) and
+bodies over IDEMPOTENCY_MAX_RESPONSE_BYTES are not stored, so a retry
+re-executes. Multipart boundaries change on every retry, so
+multipart requests are fingerprinted on method and path only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import bearer_subject
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+IN_FLIGHT_LEASE = timedelta(minutes=5)
+# Transient refusals: a retry after Retry-After (or the conflict clearing) must run again.
+RETRYABLE_STATUSES = frozenset({408, 409, 429})
+PURGE_EVERY_SECONDS = 60 * 60
+
+CLAIM_NEW = "new"
+CLAIM_REPLAY = "replay"
+CLAIM_IN_PROGRESS = "in_progress"
+CLAIM_MISMATCH = "mismatch"
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    body: bytes = b""
+
+
+@dataclass
+class Claim:
+    outcome: str
+    response: Optional[StoredResponse] = None
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _storable(status_code: int) -> bool:
+    return 0 < status_code < 500 and status_code not in RETRYABLE_STATUSES
+
+
+def principal_for(authorization: Optional[str], client_host: Optional[str]) -> str:
+    subject = bearer_subject(authorization)
+    source = f"user:{subject}" if subject else f"addr:{client_host or '-'}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def request_fingerprint(method: str, path: str, query: str, content_type: Optional[str], body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (method.upper(), path, query):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    if not (content_type or "").lower().startswith("multipart/"):
+        digest.update(body)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+def _row_filter(principal: str, key: str):
+    return (IdempotencyKey.principal == principal, IdempotencyKey.key == key)
+
+
+def begin_request(db: Session, *, principal: str, key: str, fingerprint: str) -> Claim:
+    """Take the key for a new request or report what is already stored. Commits."""
+    now = _utc_now()
+    db.execute(
+        delete(IdempotencyKey)
+        .where(*_row_filter(principal, key), IdempotencyKey.expires_at <= now)
+        .execution_options(synchronize_session=False)
+    )
+    taken = db.execute(
+        pg_insert(IdempotencyKey)
+        .values(
+            principal=principal,
+            key=key,
+            fingerprint=fingerprint,
+            created_at=now,
+            expires_at=now + IN_FLIGHT_LEASE,
+        )
+        .on_conflict_do_nothing(constraint="uq_idempotency_keys_principal_key")
+        .returning(IdempotencyKey.id)
+    ).scalar_one_or_none()
+    if taken is not None:
+        db.commit()
+        return Claim(CLAIM_NEW)
+
+    row = db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.status_code,
+            IdempotencyKey.headers_json,
+            IdempotencyKey.body,
+        ).where(*_row_filter(principal, key))
+    ).one_or_none()
+    db.commit()
+    if row is None:
+        # Expired and removed by a concurrent request between our two statements.
+        return Claim(CLAIM_IN_PROGRESS)
+    stored_fingerprint, status_code, headers, body = row
+    if stored_fingerprint != fingerprint:
+        return Claim(CLAIM_MISMATCH)
+    if status_code is None:
+        return Claim(CLAIM_IN_PROGRESS)
+    return Claim(
+        CLAIM_REPLAY,
+        StoredResponse(
+            status_code=int(status_code),
+            headers=[(str(k), str(v)) for k, v in (headers or [])],
+            body=bytes(body or b""),
+        ),
+    )
+
+
+def complete_request(db: Session, *, principal: str, key: str, response: StoredResponse, ttl_seconds: int) -> None:
+    db.execute(
+        update(IdempotencyKey)
+        .where(*_row_filter(principal, key))
+        .values(
+            status_code=response.status_code,
+            headers_json=[list(h) for h in response.headers],
+            body=response.body,
+            expires_at=_utc_now() + timedelta(seconds=ttl_seconds),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def release_request(db: Session, *, principal: str, key: str) -> None:
+    """Forget an unfinished key so the client's retry runs the handler again."""
+    db.execute(
+        delete(IdempotencyKey)
+        .where(*_row_filter(principal, key), IdempotencyKey.status_code.is_(None))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def purge_expired_keys(db: Session) -> int:
+    result = db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.expires_at <= _utc_now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return int(result.rowcount or 0)
+
+
+def _in_session(fn: Callable[..., Any], **kwargs: Any) -> Any:
+    db = SessionLocal()
+    try:
+        return fn(db, **kwargs)
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+class IdempotencyMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        ttl_seconds: Optional[int] = None,
+        max_response_bytes: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.ttl_seconds = ttl_seconds or settings.IDEMPOTENCY_TTL_SECONDS
+        self.max_response_bytes = max_response_bytes or settings.IDEMPOTENCY_MAX_RESPONSE_BYTES
+        self._next_purge = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get(HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters."},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+
+        client = scope.get("client")
+        principal = principal_for(headers.get("authorization"), client[0] if client else None)
+        fingerprint = request_fingerprint(
+            scope["method"],
+            scope["path"],
+            scope.get("query_string", b"").decode("latin-1"),
+            headers.get("content-type"),
+            body,
+        )
+        try:
+            claim = await run_in_threadpool(
+                _in_session, begin_request, principal=principal, key=key, fingerprint=fingerprint
+            )
+        except Exception:
+            # Never block writes on the idempotency store; the request just runs unprotected.
+            logger.exception("Idempotency store unavailable; running request without replay protection")
+            claim = None
+
+        if claim is not None and claim.outcome != CLAIM_NEW:
+            await self._reject_or_replay(claim, scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        if claim is None:
+            await self.app(scope, replay_receive, send)
+            return
+
+        captured = StoredResponse(status_code=0)
+        parts: list[bytes] = []
+        size = 0
+        oversized = False
+
+        async def capture_send(message: Message) -> None:
+            nonlocal size, oversized
+            if message["type"] == "http.response.start":
+                captured.status_code = int(message["status"])
+                captured.headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body" and not oversized:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size > self.max_response_bytes:
+                    oversized = True
+                    parts.clear()
+                else:
+                    parts.append(chunk)
+            await send(message)
+
+        finished = False
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            finished = True
+        finally:
+            try:
+                if finished and _storable(captured.status_code) and not oversized:
+                    captured.body = b"".join(parts)
+                    await run_in_threadpool(
+                        _in_session,
+                        complete_request,
+                        principal=principal,
+                        key=key,
+                        response=captured,
+                        ttl_seconds=self.ttl_seconds,
+                    )
+                else:
+                    await run_in_threadpool(_in_session, release_request, principal=principal, key=key)
+                await self._maybe_purge()
+            except Exception:
+                logger.exception("Could not record idempotent response for key %r", key)
+
+    async def _reject_or_replay(self, claim: Claim, scope: Scope, receive: Receive, send: Send) -> None:
+        if claim.outcome == CLAIM_MISMATCH:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used for a different request."},
+                status_code=422,
+            )
+            await response(scope, receive, send)
+            return
+        if claim.outcome == CLAIM_IN_PROGRESS:
+            response = JSONResponse(
+                {"detail": "A request with this Idempotency-Key is still being processed."},
+                status_code=409,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        stored = claim.response
+        raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in stored.headers]
+        raw_headers.append((REPLAYED_HEADER.encode("latin-1"), b"true"))
+        await send({"type": "http.response.start", "status": stored.status_code, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": stored.body, "more_body": False})
+
+    async def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + PURGE_EVERY_SECONDS
+        purged = await run_in_threadpool(_in_session, purge_expired_keys)
+        if purged:
+            logger.info("Purged %s expired idempotency keys", purged)
@@ -0,0 +1,97 @@
+"""
+In-process event bus for the worker job feed.
+
+Service functions publish job lifecycle events after their commit; the SSE
+endpoint in app/api/worker_jobs.py subscribes one queue per connected worker.
+Publishers run on FastAPI's threadpool, so events are handed to each
+subscriber's event loop with call_soon_threadsafe.
+
+The bus only sees writes made by this process. Clients get a full snapshot on
+every (re)connect, so a multi-process deployment degrades to "fresh on
+reconnect" rather than losing jobs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+JOB_CREATED = "job.created"
+JOB_CLAIMED = "job.claimed"
+JOB_CANCELLED = "job.cancelled"
+REPORT_CREATED = "report.created"
+REPORT_CLAIMED = "report.claimed"
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+@dataclass
+class JobEvent:
+    type: str
+    data: dict[str, Any]
+    at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class JobFeedSubscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[Optional[JobEvent]] = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def offer(self, event: JobEvent) -> None:
+        # Runs on the subscriber's loop. A client that cannot keep up is cut
+        # off (None sentinel) and will resync from the snapshot on reconnect.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class JobFeed:
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: set[JobFeedSubscription] = set()
+
+    def subscribe(self) -> JobFeedSubscription:
+        sub = JobFeedSubscription(asyncio.get_running_loop(), self._queue_size)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: JobFeedSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event_type: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        event = JobEvent(type=event_type, data=data)
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # Loop already closed; drop the stale subscriber.
+                self.unsubscribe(sub)
+
+
+job_feed = JobFeed()
+
+
+def publish_job_event(event_type: str, data: dict[str, Any]) -> None:
+    job_feed.publish(event_type, data)
@@ -5,6 +5,8 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.http_cache import ResponseCache
 from app.models.marketing import (
     MarketingCaseStudy,
     MarketingConfig,
@@ -14,6 +16,16 @@ from app.models.marketing import (
 )
 
 
+# Pre-serialized /public responses, one key per section; admin_content writes invalidate them.
+SECTION_PARTNERS = "partners"
+SECTION_TESTIMONIALS = "testimonials"
+SECTION_CASE_STUDIES = "case_studies"
+SECTION_FAQS = "faqs"
+SECTION_CONFIG = "config"
+
+public_content_cache = ResponseCache(ttl_seconds=settings.MARKETING_CACHE_TTL_SECONDS)
+
+
 def list_partners(db: Session, active_only: bool = True) -> Sequence[MarketingPartner]:
     q = db.query(MarketingPartner)
     if active_only:
@@ -47,6 +59,13 @@ def get_config(db: Session, key: str) -> dict[str, Any]:
     return dict(row.value_json or {}) if row else {}
 
 
+def get_configs(db: Session, keys: Sequence[str]) -> dict[str, dict[str, Any]]:
+    """get_config() for several keys in one query; missing keys map to {}."""
+    rows = db.query(MarketingConfig).filter(MarketingConfig.key.in_(list(keys))).all()
+    found = {row.key: dict(row.value_json or {}) for row in rows}
+    return {key: found.get(key, {}) for key in keys}
+
+
 def upsert_config(db: Session, key: str, value_json: dict[str, Any]) -> MarketingConfig:
     row = db.query(MarketingConfig).filter(MarketingConfig.key == key).first()
     if row is None:
@@ -0,0 +1,351 @@
+"""
+Ward/zone × hour operations heatmap for /city.
+
+Each process keeps one HeatmapCube per grouping: a NumPy array of shape
+(metric, area, hour) over the last HEATMAP_WINDOW_HOURS. Slicing by metric,
+area or hour range is then plain array indexing.
+
+The cube is maintained incrementally. A refresh rolls the window forward and
+recomputes only the hour columns that could have changed: hours holding rows
+updated since the previous refresh, plus the hours since then. The first
+refresh loads the whole window.
+
+Areas are the ward of the household / organisation involved ("ward"), or the
+zone of the worker handling the item through their active workforce
+assignment ("zone"). "" marks items with no ward or zone.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_, func, literal, select, union
+from sqlalchemy.orm import Session, aliased
+
+from app.models.admin_ops import WorkforceAssignment, Zone
+from app.models.bulk import BulkGenerator, PickupRequest, PickupRequestStatus, Verification, WasteLog, WasteLogCategory
+from app.models.household import Household, SegregationLog
+from app.models.waste_report import WasteReport, WasteReportStatus
+
+HEATMAP_WINDOW_HOURS = 7 * 24
+HEATMAP_REFRESH_SECONDS = 60
+REFRESH_OVERLAP = timedelta(minutes=5)  # covers rows committed just after the last refresh read
+
+BY_WARD = "ward"
+BY_ZONE = "zone"
+UNASSIGNED = ""
+
+METRIC_OPEN_REPORTS = "open_reports"
+METRIC_PENDING_PICKUPS = "pending_pickups"
+METRIC_SEGREGATION_LOGS = "segregation_logs"
+METRIC_SEGREGATION_SCORE_SUM = "segregation_score_sum"
+METRIC_AVG_SEGREGATION_SCORE = "avg_segregation_score"  # derived: score_sum / logs
+WEIGHT_METRICS = {c.value: f"weight_kg_{c.value.lower()}" for c in WasteLogCategory}
+
+METRICS = [
+    METRIC_OPEN_REPORTS,
+    METRIC_PENDING_PICKUPS,
+    *WEIGHT_METRICS.values(),
+    METRIC_SEGREGATION_LOGS,
+    METRIC_SEGREGATION_SCORE_SUM,
+]
+PUBLIC_METRICS = [m for m in METRICS if m != METRIC_SEGREGATION_SCORE_SUM] + [METRIC_AVG_SEGREGATION_SCORE]
+
+OPEN_REPORT_STATUSES = (WasteReportStatus.OPEN.value, WasteReportStatus.IN_PROGRESS.value)
+PENDING_PICKUP_STATUSES = (
+    PickupRequestStatus.REQUESTED,
+    PickupRequestStatus.ASSIGNED,
+    PickupRequestStatus.ACCEPTED,
+    PickupRequestStatus.IN_PROGRESS,
+    PickupRequestStatus.IN_TRANSIT,
+)
+
+HOUR = np.timedelta64(1, "h")
+
+
+def floor_hour(value: datetime) -> np.datetime64:
+    """Naive-UTC hour bucket for an aware or naive-UTC datetime."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "h")
+
+
+# ---------------------------------------------------------------------------
+# In-memory cube
+# ---------------------------------------------------------------------------
+
+class HeatmapCube:
+    """Dense (metric, area, hour) float array over a sliding window of hours."""
+
+    def __init__(self, metrics: Sequence[str], window_hours: int) -> None:
+        self.metrics = list(metrics)
+        self._metric_pos = {m: i for i, m in enumerate(self.metrics)}
+        self.window_hours = window_hours
+        self.areas: list[str] = []
+        self._area_pos: dict[str, int] = {}
+        self.start: Optional[np.datetime64] = None
+        self.values = np.zeros((len(self.metrics), 0, window_hours))
+
+    @property
+    def hours(self) -> np.ndarray:
+        if self.start is None:
+            return np.array([], dtype="datetime64[h]")
+        return self.start + np.arange(self.window_hours) * HOUR
+
+    def roll_to(self, end_hour: np.datetime64) -> None:
+        """Slide the window so its last column is `end_hour`; older columns drop off."""
+        new_start = end_hour - (self.window_hours - 1) * HOUR
+        if self.start is None:
+            self.start = new_start
+            return
+        shift = int((new_start - self.start) / HOUR)
+        if shift <= 0:
+            return
+        if shift >= self.window_hours:
+            self.values[:] = 0.0
+        else:
+            self.values[:, :, :-shift] = self.values[:, :, shift:]
+            self.values[:, :, -shift:] = 0.0
+        self.start = new_start
+
+    def _columns(self, hours: np.ndarray) -> np.ndarray:
+        return ((np.asarray(hours, dtype="datetime64[h]") - self.start) / HOUR).astype(int)
+
+    def _area_rows(self, names: Iterable[str]) -> np.ndarray:
+        rows = []
+        for name in names:
+            pos = self._area_pos.get(name)
+            if pos is None:
+                pos = self._area_pos[name] = len(self.areas)
+                self.areas.append(name)
+            rows.append(pos)
+        grow = len(self.areas) - self.values.shape[1]
+        if grow > 0:
+            pad = np.zeros((len(self.metrics), grow, self.window_hours))
+            self.values = np.concatenate([self.values, pad], axis=1)
+        return np.asarray(rows, dtype=int)
+
+    def clear_hours(self, hours: Optional[np.ndarray] = None) -> None:
+        if hours is None:
+            self.values[:] = 0.0
+            return
+        cols = self._columns(hours)
+        cols = cols[(cols >= 0) & (cols < self.window_hours)]
+        self.values[:, :, cols] = 0.0
+
+    def add(self, metric: str, areas: Sequence[str], hours: Sequence, amounts: Sequence[float]) -> None:
+        if len(areas) == 0:
+            return
+        rows = self._area_rows(areas)
+        cols = self._columns(np.asarray(hours, dtype="datetime64[h]"))
+        keep = (cols >= 0) & (cols < self.window_hours)
+        np.add.at(self.values[self._metric_pos[metric]], (rows[keep], cols[keep]), np.asarray(amounts, dtype=float)[keep])
+
+    def slice(
+        self,
+        *,
+        last_hours: int,
+        metrics: Optional[Sequence[str]] = None,
+        areas: Optional[Sequence[str]] = None,
+    ) -> dict:
+        """Cells for the latest `last_hours` hours, as {metric: [[area][hour]]}."""
+        last_hours = max(1, min(last_hours, self.window_hours))
+        area_names = [a for a in (areas if areas is not None else self.areas) if a in self._area_pos]
+        rows = np.asarray([self._area_pos[a] for a in area_names], dtype=int)
+        block = self.values[:, rows, -last_hours:]
+
+        cells = {}
+        for metric in metrics or PUBLIC_METRICS:
+            if metric == METRIC_AVG_SEGREGATION_SCORE:
+                logs = block[self._metric_pos[METRIC_SEGREGATION_LOGS]]
+                total = block[self._metric_pos[METRIC_SEGREGATION_SCORE_SUM]]
+                grid = np.divide(total, logs, out=np.zeros_like(total), where=logs > 0)
+            else:
+                grid = block[self._metric_pos[metric]]
+            cells[metric] = np.round(grid, 3).tolist()
+        hours = self.hours[-last_hours:] if self.start is not None else self.hours
+        return {
+            "hours": [str(h) + ":00Z" for h in hours],
+            "areas": area_names,
+            "cells": cells,
+        }
+
+
+# ---------------------------------------------------------------------------
+# SQL sources
+# ---------------------------------------------------------------------------
+
+def _hour(column):
+    # Bucket in UTC whatever the session time zone is.
+    return func.date_trunc("hour", func.timezone("UTC", column))
+
+
+def _with_zone(stmt, worker_id_col):
+    """Join the handling worker's active zone; WorkforceAssignment.user_id is unique."""
+    assignment = aliased(WorkforceAssignment)
+    zone = aliased(Zone)
+    stmt = stmt.outerjoin(
+        assignment, and_(assignment.user_id == worker_id_col, assignment.active.is_(True))
+    ).outerjoin(zone, zone.id == assignment.zone_id)
+    return stmt, zone.name
+
+
+def _scope(created_col, start: datetime, hours: Optional[list[datetime]]):
+    if hours is None:
+        return func.timezone("UTC", created_col) >= start
+    return and_(
+        func.timezone("UTC", created_col) >= min(hours),
+        func.timezone("UTC", created_col) < max(hours) + timedelta(hours=1),
+        _hour(created_col).in_(hours),
+    )
+
+
+def _grouped(stmt, area, hour, *values, leading=()):
+    area = func.coalesce(area, literal(UNASSIGNED))
+    return stmt.add_columns(*leading, area, hour, *values).group_by(*leading, area, hour)
+
+
+def _report_cells(by: str, start: datetime, hours):
+    stmt = select().select_from(WasteReport)
+    if by == BY_WARD:
+        household = aliased(Household)
+        stmt, area = stmt.outerjoin(household, household.id == WasteReport.household_id), household.ward
+    else:
+        stmt, area = _with_zone(stmt, WasteReport.assigned_worker_id)
+    stmt = stmt.where(WasteReport.status.in_(OPEN_REPORT_STATUSES), _scope(WasteReport.created_at, start, hours))
+    return _grouped(stmt, area, _hour(WasteReport.created_at), func.count())
+
+
+def _pickup_cells(by: str, start: datetime, hours):
+    stmt = select().select_from(PickupRequest)
+    if by == BY_WARD:
+        org = aliased(BulkGenerator)
+        org_id = func.coalesce(PickupRequest.bulk_org_id, WasteLog.bulk_org_id, WasteLog.bulk_generator_id)
+        stmt = stmt.outerjoin(WasteLog, WasteLog.id == PickupRequest.waste_log_id).outerjoin(org, org.id == org_id)
+        area = org.ward
+    else:
+        stmt, area = _with_zone(stmt, PickupRequest.assigned_worker_id)
+    stmt = stmt.where(PickupRequest.status.in_(PENDING_PICKUP_STATUSES), _scope(PickupRequest.created_at, start, hours))
+    return _grouped(stmt, area, _hour(PickupRequest.created_at), func.count())
+
+
+def _weight_cells(by: str, start: datetime, hours):
+    stmt = select().select_from(WasteLog)
+    if by == BY_WARD:
+        org = aliased(BulkGenerator)
+        household = aliased(Household)
+        stmt = stmt.outerjoin(org, org.id == func.coalesce(WasteLog.bulk_org_id, WasteLog.bulk_generator_id))
+        stmt = stmt.outerjoin(household, household.id == WasteLog.citizen_household_id)
+        area = func.coalesce(org.ward, household.ward)
+    else:
+        stmt = stmt.outerjoin(Verification, Verification.waste_log_id == WasteLog.id)
+        stmt, area = _with_zone(stmt, Verification.verifier_worker_id)
+    stmt = stmt.where(_scope(WasteLog.created_at, start, hours))
+    return _grouped(
+        stmt, area, _hour(WasteLog.created_at), func.sum(WasteLog.weight_kg), leading=(WasteLog.category,)
+    )
+
+
+def _segregation_cells(by: str, start: datetime, hours):
+    stmt = select().select_from(SegregationLog)
+    if by == BY_WARD:
+        household = aliased(Household)
+        stmt, area = stmt.outerjoin(household, household.id == SegregationLog.household_id), household.ward
+    else:
+        stmt, area = _with_zone(stmt, SegregationLog.worker_id)
+    stmt = stmt.where(_scope(SegregationLog.created_at, start, hours))
+    return _grouped(
+        stmt, area, _hour(SegregationLog.created_at), func.count(), func.sum(SegregationLog.segregation_score)
+    )
+
+
+def _changed_hours(db: Session, since: datetime) -> list[datetime]:
+    """Creation hours of rows whose state may have changed since `since`."""
+    stmt = union(
+        select(_hour(WasteReport.created_at)).where(WasteReport.updated_at >= since),
+        select(_hour(PickupRequest.created_at)).where(PickupRequest.updated_at >= since),
+        select(_hour(WasteLog.created_at)).where(WasteLog.updated_at >= since),
+        select(_hour(SegregationLog.created_at)).where(SegregationLog.created_at >= since),
+    )
+    return [h for h in db.execute(stmt).scalars() if h is not None]
+
+
+def _columnar(rows: list[tuple]) -> tuple[list[str], np.ndarray, np.ndarray]:
+    areas = [r[0] for r in rows]
+    hours = np.asarray([r[1] for r in rows], dtype="datetime64[h]")
+    amounts = np.asarray([float(r[2] or 0.0) for r in rows])
+    return areas, hours, amounts
+
+
+def load_cells(cube: HeatmapCube, db: Session, by: str, start: datetime, hours: Optional[list[datetime]]) -> None:
+    """Add every source's grouped rows for the given hours (None: whole window) to the cube."""
+    by_metric: dict[str, list[tuple]] = {}
+    by_metric[METRIC_OPEN_REPORTS] = list(db.execute(_report_cells(by, start, hours)))
+    by_metric[METRIC_PENDING_PICKUPS] = list(db.execute(_pickup_cells(by, start, hours)))
+    for category, area, hour, value in db.execute(_weight_cells(by, start, hours)):
+        key = category.value if hasattr(category, "value") else str(category)
+        by_metric.setdefault(WEIGHT_METRICS[key], []).append((area, hour, value))
+    for area, hour, count, score_sum in db.execute(_segregation_cells(by, start, hours)):
+        by_metric.setdefault(METRIC_SEGREGATION_LOGS, []).append((area, hour, count))
+        by_metric.setdefault(METRIC_SEGREGATION_SCORE_SUM, []).append((area, hour, score_sum))
+    for metric, rows in by_metric.items():
+        cube.add(metric, *_columnar(rows))
+
+
+# ---------------------------------------------------------------------------
+# Per-process heatmaps
+# ---------------------------------------------------------------------------
+
+class OpsHeatmap:
+    def __init__(self, by: str) -> None:
+        self.by = by
+        self.cube = HeatmapCube(METRICS, HEATMAP_WINDOW_HOURS)
+        self.refreshed_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session, *, now: Optional[datetime] = None, force: bool = False) -> None:
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            if (
+                not force
+                and self.refreshed_at is not None
+                and (now - self.refreshed_at).total_seconds() < HEATMAP_REFRESH_SECONDS
+            ):
+                return
+            self.cube.roll_to(floor_hour(now))
+            start = self.cube.start.astype(datetime)
+            if self.refreshed_at is None or force:
+                self.cube.clear_hours()
+                load_cells(self.cube, db, self.by, start, None)
+            else:
+                since = self.refreshed_at - REFRESH_OVERLAP
+                recent = floor_hour(since) + np.arange(int((floor_hour(now) - floor_hour(since)) / HOUR) + 1) * HOUR
+                hours = sorted(
+                    {h for h in _changed_hours(db, since) if h >= start} | {h.astype(datetime) for h in recent}
+                )
+                self.cube.clear_hours(np.asarray(hours, dtype="datetime64[h]"))
+                load_cells(self.cube, db, self.by, start, hours)
+            self.refreshed_at = now
+
+
+_heatmaps = {BY_WARD: OpsHeatmap(BY_WARD), BY_ZONE: OpsHeatmap(BY_ZONE)}
+
+
+def get_heatmap(
+    db: Session,
+    *,
+    by: str = BY_WARD,
+    last_hours: int = 24,
+    metrics: Optional[Sequence[str]] = None,
+    areas: Optional[Sequence[str]] = None,
+) -> dict:
+    heatmap = _heatmaps[by]
+    heatmap.refresh(db)
+    with heatmap._lock:
+        data = heatmap.cube.slice(last_hours=last_hours, metrics=metrics, areas=areas)
+    data["by"] = by
+    data["refreshed_at"] = heatmap.refreshed_at.isoformat() if heatmap.refreshed_at else None
+    return data
@@ -9,12 +9,13 @@ from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
 from app.models.admin_ops import PlatformSetting
-from app.models.bulk import Transaction, TransactionStatus, TransactionType, Wallet, WasteLog
+from app.models.bulk import Transaction, TransactionType, Wallet, WasteLog
 from app.models.household import SegregationLog
 from app.models.notification import Notification
 from app.models.pcc import EmissionFactor
 from app.models.user import User
 from app.services.admin_audit_service import log_admin_action
+from app.services.pcc_ledger_service import post_wallet_movement
 
 DEFAULT_PCC_UNIT = 10.0
 DEFAULT_QUALITY_MULTIPLIERS = {"low": 0.8, "medium": 1.0, "high": 1.1}
@@ -174,26 +175,19 @@ def _award_citizen_log(db: Session, *, log: SegregationLog, actor: User) -> Awar
         quality_score=log.quality_score if log.quality_score is not None else float(log.segregation_score or 0),
     )
     wallet = _ensure_wallet(db, user_id)
-    wallet.balance_pcc = float(wallet.balance_pcc or 0.0) + amount
-    wallet.balance_points = float(wallet.balance_points or 0.0) + amount
-    wallet.lifetime_credited = float(wallet.lifetime_credited or 0.0) + amount
-
-    tx = Transaction(
-        wallet_id=wallet.id,
+    tx = post_wallet_movement(
+        db,
+        wallet=wallet,
+        amount=amount,
+        source="citizen_log_award",
+        ref_type="citizen_log",
+        ref_id=log.id,
         user_id=user_id,
         created_by_user_id=actor.id,
-        tx_type=TransactionType.CREDIT,
-        status=TransactionStatus.COMPLETED,
-        amount_points=amount,
-        amount_pcc=amount,
         reason=f"Award for citizen log #{log.id}",
-        ref_type="citizen_log",
-        ref_id=log.id,
         description=f"PCC awarded for citizen segregation log #{log.id}",
-        meta_json={"reference_type": "citizen_log", "reference_id": log.id, "weight_kg": float(log.weight_kg or 0)},
+        meta={"reference_type": "citizen_log", "reference_id": log.id, "weight_kg": float(log.weight_kg or 0)},
     )
-    db.add(wallet)
-    db.add(tx)
 
     now = utc_now()
     log.pcc_status = "awarded"
@@ -241,26 +235,19 @@ def _award_bulk_log(db: Session, *, log: WasteLog, actor: User) -> AwardResult:
         quality_score=None,
     )
     wallet = _ensure_wallet(db, user_id)
-    wallet.balance_pcc = float(wallet.balance_pcc or 0.0) + amount
-    wallet.balance_points = float(wallet.balance_points or 0.0) + amount
-    wallet.lifetime_credited = float(wallet.lifetime_credited or 0.0) + amount
-
-    tx = Transaction(
-        wallet_id=wallet.id,
+    tx = post_wallet_movement(
+        db,
+        wallet=wallet,
+        amount=amount,
+        source="bulk_log_award",
+        ref_type="bulk_log",
+        ref_id=log.id,
         user_id=user_id,
         created_by_user_id=actor.id,
-        tx_type=TransactionType.CREDIT,
-        status=TransactionStatus.COMPLETED,
-        amount_points=amount,
-        amount_pcc=amount,
         reason=f"Award for bulk log #{log.id}",
-        ref_type="bulk_log",
-        ref_id=log.id,
         description=f"PCC awarded for bulk generator log #{log.id}",
-        meta_json={"reference_type": "bulk_log", "reference_id": log.id, "weight_kg": float(log.weight_kg or 0)},
+        meta={"reference_type": "bulk_log", "reference_id": log.id, "weight_kg": float(log.weight_kg or 0)},
     )
-    db.add(wallet)
-    db.add(tx)
 
     now = utc_now()
     log.pcc_status = "awarded"
@@ -339,23 +326,19 @@ def revoke_reference(db: Session, *, reference_type: str, reference_id: int, act
 
     amount = float(credit.amount_pcc or credit.amount_points or 0.0)
     wallet = _ensure_wallet(db, user_id)
-    wallet.balance_pcc = float(wallet.balance_pcc or 0.0) - amount
-    wallet.balance_points = float(wallet.balance_points or 0.0) - amount
-    wallet.lifetime_debited = float(wallet.lifetime_debited or 0.0) + amount
-
-    debit = Transaction(
-        wallet_id=wallet.id,
+    debit = post_wallet_movement(
+        db,
+        wallet=wallet,
+        amount=amount,
+        debit=True,
+        source="revoke",
+        ref_type=reference_type,
+        ref_id=reference_id,
         user_id=user_id,
         created_by_user_id=actor.id,
-        tx_type=TransactionType.DEBIT,
-        status=TransactionStatus.COMPLETED,
-        amount_points=amount,
-        amount_pcc=amount,
         reason=(reason or f"Revoke for {reference_type} #{reference_id}"),
-        ref_type=reference_type,
-        ref_id=reference_id,
         description=f"PCC revoked for {reference_type} #{reference_id}",
-        meta_json={
+        meta={
             "reference_type": reference_type,
             "reference_id": reference_id,
             "credit_transaction_id": credit.id,
@@ -363,9 +346,6 @@ def revoke_reference(db: Session, *, reference_type: str, reference_id: int, act
         },
     )
 
-    db.add(wallet)
-    db.add(debit)
-
     if reference_type == "citizen_log":
         log.pcc_status = "revoked"
         log.pcc_awarded = False
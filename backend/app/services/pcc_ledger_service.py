@@ -0,0 +1,361 @@
+"""
+Unified, append-only PCC ledger.
+
+PCC used to move through several stores that each kept their own totals:
+transactions (+ wallet snapshots), carbon_activities (+ users.pcc_balance) and
+token_transactions (+ token_accounts.balance). Every writer now goes through
+this module, which keeps the legacy row and appends a pcc_ledger entry in the
+same transaction:
+
+  * post_wallet_movement() for wallet credits/debits (awards, revokes,
+    verification credits);
+  * post_ledger_entries() for the other stores, one multi-row INSERT per call.
+
+Admin PCC totals read the ledger (wallet_ledger_totals()).
+
+pcc_ledger rows are never updated or deleted (a trigger enforces it).
+find_ledger_drift() cross-checks the ledger, the legacy rows and the balance
+snapshots for every account in one statement; backfill_ledger() copies
+legacy rows written before the ledger existed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Float, Integer, String, case, cast, func, literal, select, union, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.bulk import Transaction, TransactionStatus, TransactionType, Wallet
+from app.models.carbon import CarbonActivity
+from app.models.pcc import PccLedgerEntry
+from app.models.token import TokenAccount, TokenTransaction
+from app.models.user import User
+from app.services.wallet_service import credit_wallet, debit_wallet, to_pcc
+
+ACCOUNT_WALLET = "wallet"
+ACCOUNT_USER_BALANCE = "user_balance"
+ACCOUNT_TOKEN = "token_account"
+
+LEGACY_TRANSACTIONS = "transactions"
+LEGACY_CARBON_ACTIVITIES = "carbon_activities"
+LEGACY_TOKEN_TRANSACTIONS = "token_transactions"
+
+SOURCE_BACKFILL = "backfill"
+DRIFT_TOLERANCE = 1e-6
+
+
+@dataclass
+class LedgerPosting:
+    account_kind: str
+    account_id: int
+    amount_pcc: float
+    source: str
+    legacy_table: str
+    legacy_id: int
+    user_id: Optional[int] = None
+    org_id: Optional[int] = None
+    carbon_kgco2e: float = 0.0
+    ref_type: Optional[str] = None
+    ref_id: Optional[int] = None
+    created_by_user_id: Optional[int] = None
+    details: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class LedgerDrift:
+    account_kind: str
+    account_id: int
+    ledger_total: float
+    legacy_total: float
+    snapshot: float
+    ledger_rows: int
+    legacy_rows: int
+
+
+def post_ledger_entries(db: Session, postings: Sequence[LedgerPosting]) -> None:
+    """Append entries in one INSERT. Re-posting a legacy row is a no-op. Does not commit."""
+    if not postings:
+        return
+    db.execute(
+        pg_insert(PccLedgerEntry)
+        .values([asdict(p) for p in postings])
+        .on_conflict_do_nothing(constraint="uq_pcc_ledger_legacy_row")
+    )
+
+
+def post_wallet_movement(
+    db: Session,
+    *,
+    wallet: Wallet,
+    amount: float,
+    source: str,
+    ref_type: str,
+    ref_id: int,
+    debit: bool = False,
+    user_id: Optional[int] = None,
+    org_id: Optional[int] = None,
+    created_by_user_id: Optional[int] = None,
+    verification_id: Optional[int] = None,
+    reason: Optional[str] = None,
+    description: Optional[str] = None,
+    type_label: Optional[str] = None,
+    carbon_kgco2e: float = 0.0,
+    meta: Optional[dict[str, Any]] = None,
+) -> Transaction:
+    """
+    The single write path for wallet PCC: moves the wallet snapshot, writes
+    the transactions row and appends the ledger entry. Flushes, does not commit.
+    """
+    amount = float(to_pcc(amount))
+    (debit_wallet if debit else credit_wallet)(db, wallet, amount)
+    tx = Transaction(
+        wallet_id=wallet.id,
+        verification_id=verification_id,
+        user_id=user_id,
+        created_by_user_id=created_by_user_id,
+        org_id=org_id,
+        tx_type=TransactionType.DEBIT if debit else TransactionType.CREDIT,
+        type=type_label,
+        status=TransactionStatus.COMPLETED,
+        amount_points=amount,
+        amount_pcc=amount,
+        reason=reason,
+        ref_type=ref_type,
+        ref_id=ref_id,
+        description=description,
+        meta_json=meta or {},
+    )
+    db.add(tx)
+    db.flush()
+    post_ledger_entries(
+        db,
+        [
+            LedgerPosting(
+                account_kind=ACCOUNT_WALLET,
+                account_id=wallet.id,
+                amount_pcc=-amount if debit else amount,
+                source=source,
+                legacy_table=LEGACY_TRANSACTIONS,
+                legacy_id=tx.id,
+                user_id=user_id,
+                org_id=org_id,
+                carbon_kgco2e=carbon_kgco2e,
+                ref_type=ref_type,
+                ref_id=ref_id,
+                created_by_user_id=created_by_user_id,
+                details=dict(meta or {}),
+            )
+        ],
+    )
+    return tx
+
+
+def wallet_ledger_totals(
+    db: Session,
+    *,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    tx_type: Optional[str] = None,
+) -> tuple[float, float, int]:
+    """(credited, debited, entries) over wallet ledger entries; tx_type is "credit" or "debit"."""
+    q = select(
+        func.coalesce(func.sum(case((PccLedgerEntry.amount_pcc > 0, PccLedgerEntry.amount_pcc), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((PccLedgerEntry.amount_pcc < 0, -PccLedgerEntry.amount_pcc), else_=0.0)), 0.0),
+        func.count(),
+    ).where(PccLedgerEntry.account_kind == ACCOUNT_WALLET)
+    if date_from:
+        q = q.where(PccLedgerEntry.created_at >= date_from)
+    if date_to:
+        q = q.where(PccLedgerEntry.created_at <= date_to)
+    if user_id is not None:
+        q = q.where(PccLedgerEntry.user_id == user_id)
+    if tx_type:
+        q = q.where(PccLedgerEntry.amount_pcc < 0 if tx_type.lower() == "debit" else PccLedgerEntry.amount_pcc > 0)
+    credited, debited, entries = db.execute(q).one()
+    return float(credited), float(debited), int(entries)
+
+
+# ---------------------------------------------------------------------------
+# Reconciliation
+# ---------------------------------------------------------------------------
+
+def _signed_transaction_amount():
+    amount = func.coalesce(Transaction.amount_pcc, Transaction.amount_points, 0.0)
+    return case((Transaction.tx_type == TransactionType.DEBIT, -amount), else_=amount)
+
+
+def _account(kind: str):
+    return literal(kind, String).label("account_kind")
+
+
+def find_ledger_drift(
+    db: Session,
+    *,
+    tolerance: float = DRIFT_TOLERANCE,
+    limit: Optional[int] = None,
+) -> list[LedgerDrift]:
+    """
+    Accounts where the ledger total, the legacy rows' total and the balance
+    snapshot do not all agree.
+    """
+    ledger = (
+        select(
+            PccLedgerEntry.account_kind,
+            PccLedgerEntry.account_id,
+            func.sum(PccLedgerEntry.amount_pcc).label("total"),
+            func.count().label("n"),
+        )
+        .group_by(PccLedgerEntry.account_kind, PccLedgerEntry.account_id)
+        .cte("ledger")
+    )
+    legacy = union_all(
+        select(
+            _account(ACCOUNT_WALLET),
+            Transaction.wallet_id.label("account_id"),
+            func.sum(_signed_transaction_amount()).label("total"),
+            func.count().label("n"),
+        ).group_by(Transaction.wallet_id),
+        select(
+            _account(ACCOUNT_USER_BALANCE),
+            CarbonActivity.user_id,
+            func.sum(CarbonActivity.pcc_tokens),
+            func.count(),
+        ).group_by(CarbonActivity.user_id),
+        select(
+            _account(ACCOUNT_TOKEN),
+            TokenTransaction.account_id,
+            func.sum(TokenTransaction.amount),
+            func.count(),
+        ).group_by(TokenTransaction.account_id),
+    ).cte("legacy")
+    snapshot = union_all(
+        select(_account(ACCOUNT_WALLET), Wallet.id.label("account_id"), Wallet.balance_pcc.label("balance")),
+        select(_account(ACCOUNT_USER_BALANCE), User.id, User.pcc_balance).where(User.pcc_balance != 0),
+        select(_account(ACCOUNT_TOKEN), TokenAccount.id, TokenAccount.balance),
+    ).cte("snapshot")
+    keys = union(
+        select(ledger.c.account_kind, ledger.c.account_id),
+        select(legacy.c.account_kind, legacy.c.account_id),
+        select(snapshot.c.account_kind, snapshot.c.account_id),
+    ).subquery("accounts")
+
+    def on(cte):
+        return (cte.c.account_kind == keys.c.account_kind) & (cte.c.account_id == keys.c.account_id)
+
+    ledger_total = func.coalesce(ledger.c.total, 0.0)
+    legacy_total = func.coalesce(legacy.c.total, 0.0)
+    balance = func.coalesce(snapshot.c.balance, 0.0)
+    stmt = (
+        select(
+            keys.c.account_kind,
+            keys.c.account_id,
+            cast(ledger_total, Float),
+            cast(legacy_total, Float),
+            cast(balance, Float),
+            cast(func.coalesce(ledger.c.n, 0), Integer),
+            cast(func.coalesce(legacy.c.n, 0), Integer),
+        )
+        .select_from(keys)
+        .outerjoin(ledger, on(ledger))
+        .outerjoin(legacy, on(legacy))
+        .outerjoin(snapshot, on(snapshot))
+        .where(
+            (func.abs(ledger_total - legacy_total) > tolerance)
+            | (func.abs(legacy_total - balance) > tolerance)
+        )
+        .order_by(keys.c.account_kind, keys.c.account_id)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [
+        LedgerDrift(
+            account_kind=row[0],
+            account_id=int(row[1]),
+            ledger_total=float(row[2]),
+            legacy_total=float(row[3]),
+            snapshot=float(row[4]),
+            ledger_rows=int(row[5]),
+            legacy_rows=int(row[6]),
+        )
+        for row in db.execute(stmt)
+    ]
+
+
+def backfill_ledger(db: Session) -> int:
+    """Copy legacy rows that have no ledger entry yet, set-based. Does not commit."""
+    columns = [
+        "account_kind",
+        "account_id",
+        "user_id",
+        "org_id",
+        "amount_pcc",
+        "carbon_kgco2e",
+        "source",
+        "ref_type",
+        "ref_id",
+        "legacy_table",
+        "legacy_id",
+        "created_by_user_id",
+        "created_at",
+    ]
+    sources = [
+        select(
+            _account(ACCOUNT_WALLET),
+            Transaction.wallet_id,
+            Transaction.user_id,
+            Transaction.org_id,
+            _signed_transaction_amount(),
+            literal(0.0),
+            literal(SOURCE_BACKFILL),
+            Transaction.ref_type,
+            Transaction.ref_id,
+            literal(LEGACY_TRANSACTIONS),
+            Transaction.id,
+            Transaction.created_by_user_id,
+            Transaction.created_at,
+        ),
+        select(
+            _account(ACCOUNT_USER_BALANCE),
+            CarbonActivity.user_id,
+            CarbonActivity.user_id,
+            literal(None, Integer),
+            CarbonActivity.pcc_tokens,
+            CarbonActivity.carbon_kg,
+            literal(SOURCE_BACKFILL),
+            cast(CarbonActivity.activity_type, String),
+            literal(None, Integer),
+            literal(LEGACY_CARBON_ACTIVITIES),
+            CarbonActivity.id,
+            literal(None, Integer),
+            func.timezone("UTC", CarbonActivity.created_at),
+        ),
+        select(
+            _account(ACCOUNT_TOKEN),
+            TokenTransaction.account_id,
+            TokenAccount.user_id,
+            literal(None, Integer),
+            TokenTransaction.amount,
+            literal(0.0),
+            literal(SOURCE_BACKFILL),
+            TokenTransaction.type,
+            literal(None, Integer),
+            literal(LEGACY_TOKEN_TRANSACTIONS),
+            TokenTransaction.id,
+            literal(None, Integer),
+            func.timezone("UTC", func.coalesce(TokenTransaction.created_at, func.timezone("UTC", func.now()))),
+        ).join(TokenAccount, TokenAccount.id == TokenTransaction.account_id),
+    ]
+    inserted = 0
+    for source in sources:
+        result = db.execute(
+            pg_insert(PccLedgerEntry)
+            .from_select(columns, source)
+            .on_conflict_do_nothing(constraint="uq_pcc_ledger_legacy_row")
+        )
+        inserted += int(result.rowcount or 0)
+    return inserted
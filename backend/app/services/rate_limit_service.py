@@ -0,0 +1,194 @@
+"""
+Request rate limiting with GCRA (generic cell rate algorithm).
+
+A limit of `requests` per `period` seconds admits one request every
+period / requests seconds, with bursts of up to `requests`. The only state per
+key is its theoretical arrival time (TAT), a single float. Each check is O(1)
+regardless of the limit, unlike the sliding deques this replaces.
+
+Backends, chosen by RATE_LIMIT_BACKEND:
+
+  * memory: a per-process LRU of TATs, bounded by RATE_LIMIT_MEMORY_MAX_KEYS.
+    Each worker process enforces its own copy of every limit.
+  * postgres: one INSERT .. ON CONFLICT DO UPDATE .. RETURNING against the
+    UNLOGGED rate_limit_buckets table, so all workers share one budget.
+    If the store is unavailable, requests are let through.
+
+Routes opt in declaratively:
+
+    @router.post("/leads", dependencies=[Depends(rate_limit("leads", 8, 60))])
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Protocol
+
+from fastapi import HTTPException, Request
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.security import bearer_subject
+from app.models.rate_limit import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+PURGE_EVERY_SECONDS = 10 * 60
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.requests
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    tat: float
+    retry_after: float = 0.0
+
+
+def gcra(tat: Optional[float], now: float, limit: RateLimit) -> Decision:
+    """Admit or reject one request given the key's stored TAT (None when unseen)."""
+    new_tat = max(tat if tat is not None else now, now) + limit.interval
+    if new_tat - now > limit.period:
+        return Decision(False, tat if tat is not None else now, new_tat - now - limit.period)
+    return Decision(True, new_tat)
+
+
+class RateLimitBackend(Protocol):
+    def hit(self, key: str, limit: RateLimit) -> Decision: ...
+
+
+class MemoryRateLimitBackend:
+    """Per-process TATs. Evicting the least recently used key only forgives its backlog."""
+
+    def __init__(self, max_keys: int, clock: Callable[[], float] = time.time) -> None:
+        self.max_keys = max(1, max_keys)
+        self._clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: RateLimit) -> Decision:
+        now = self._clock()
+        with self._lock:
+            decision = gcra(self._tats.get(key), now, limit)
+            if decision.allowed:
+                self._tats[key] = decision.tat
+                self._tats.move_to_end(key)
+                while len(self._tats) > self.max_keys:
+                    self._tats.popitem(last=False)
+            return decision
+
+
+class PostgresRateLimitBackend:
+    """TATs shared by every worker through rate_limit_buckets; gcra() runs inside the upsert."""
+
+    def __init__(self, bind=engine, clock: Callable[[], float] = time.time) -> None:
+        self._bind = bind
+        self._clock = clock
+        self._next_purge = 0.0
+
+    @staticmethod
+    def statement(key: str, now: float, limit: RateLimit):
+        stmt = pg_insert(RateLimitBucket).values(key=key, tat=now + limit.interval, allowed=True)
+        new_tat = func.greatest(RateLimitBucket.tat, now) + limit.interval
+        fits = new_tat - now <= limit.period
+        return stmt.on_conflict_do_update(
+            index_elements=[RateLimitBucket.key],
+            set_={"tat": case((fits, new_tat), else_=RateLimitBucket.tat), "allowed": fits},
+        ).returning(RateLimitBucket.tat, RateLimitBucket.allowed)
+
+    def hit(self, key: str, limit: RateLimit) -> Decision:
+        now = self._clock()
+        with self._bind.begin() as conn:
+            tat, allowed = conn.execute(self.statement(key, now, limit)).one()
+            if now >= self._next_purge:
+                # A TAT in the past is indistinguishable from no row at all.
+                self._next_purge = now + PURGE_EVERY_SECONDS
+                conn.execute(delete(RateLimitBucket).where(RateLimitBucket.tat < now))
+        if allowed:
+            return Decision(True, float(tat))
+        return Decision(False, float(tat), float(tat) + limit.interval - now - limit.period)
+
+
+_backend: Optional[RateLimitBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if settings.RATE_LIMIT_BACKEND.lower() == "postgres":
+                    _backend = PostgresRateLimitBackend()
+                else:
+                    _backend = MemoryRateLimitBackend(settings.RATE_LIMIT_MEMORY_MAX_KEYS)
+    return _backend
+
+
+def set_backend(backend: Optional[RateLimitBackend]) -> None:
+    """Swap the process-wide backend (None re-reads RATE_LIMIT_BACKEND on next use)."""
+    global _backend
+    _backend = backend
+
+
+# ---------------------------------------------------------------------------
+# Keys and the route dependency
+# ---------------------------------------------------------------------------
+
+def by_client(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def by_credentials(request: Request) -> str:
+    """
+    The bearer token's user, so users behind one NAT do not share a budget and
+    a token refresh does not reset it. Falls back to the client address.
+    """
+    subject = bearer_subject(request.headers.get("authorization"))
+    return f"user:{subject}" if subject else by_client(request)
+
+
+def enforce_rate_limit(name: str, limit: RateLimit, key: str) -> None:
+    """Count one request by `key` against `name`; 429 beyond the limit."""
+    try:
+        decision = get_backend().hit(f"{name}:{key}", limit)
+    except Exception:
+        logger.exception("Rate limit store unavailable; admitting request to %s", name)
+        return
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Please try again shortly.",
+            headers={"Retry-After": str(max(1, math.ceil(decision.retry_after)))},
+        )
+
+
+def rate_limit(
+    name: str,
+    requests: int,
+    per_seconds: float = 60,
+    *,
+    key: Callable[[Request], str] = by_client,
+):
+    """Dependency admitting `requests` per `per_seconds` for each caller of `name`; 429 beyond that."""
+    limit = RateLimit(requests=requests, period=float(per_seconds))
+
+    def _dep(request: Request) -> None:
+        enforce_rate_limit(name, limit, key(request))
+
+    return _dep
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.geo import EARTH_RADIUS_KM, bbox_around
+from app.models.bulk import BulkGenerator, PickupRequest, PickupRequestStatus, WasteLog
+from app.models.user import User, UserRole
+from app.models.waste_report import WasteReport, WasteReportStatus
+from app.schemas.route_plan import RoutePlan, RoutePlanRequest, RouteStop
+from app.services.bulk_service import claim_pickups, publish_pickups_claimed
+from app.services.geo_service import locate
+from app.services.waste_report_service import claim_reports, publish_reports_claimed
+
+MAX_ROUTE_STOPS = 25
+MAX_2OPT_PASSES = 200
+
+
+@dataclass
+class _Candidate:
+    kind: str  # "pickup" | "report"
+    ref_id: int
+    latitude: float
+    longitude: float
+    label: str
+    created_at: Optional[datetime] = None
+    weight_kg: Optional[float] = None
+
+
+# ---------------------------------------------------------------------------
+# Pure routing helpers (NumPy)
+# ---------------------------------------------------------------------------
+
+def distance_matrix_km(coords: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances for an (n, 2) array of [lat, lon] degrees."""
+    rad = np.radians(np.asarray(coords, dtype=float))
+    lat = rad[:, 0][:, None]
+    lon = rad[:, 1][:, None]
+    dlat = lat - lat.T
+    dlon = lon - lon.T
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_neighbour_order(dist: np.ndarray, start: int = 0) -> np.ndarray:
+    n = dist.shape[0]
+    order = np.empty(n, dtype=int)
+    visited = np.zeros(n, dtype=bool)
+    order[0] = start
+    visited[start] = True
+    for k in range(1, n):
+        row = np.where(visited, np.inf, dist[order[k - 1]])
+        nxt = int(np.argmin(row))
+        order[k] = nxt
+        visited[nxt] = True
+    return order
+
+
+def two_opt(order: np.ndarray, dist: np.ndarray, max_passes: int = MAX_2OPT_PASSES) -> np.ndarray:
+    """
+    Best-improvement 2-opt for an open path that starts at order[0].
+
+    A zero-cost sentinel node is appended to the end, so the last real stop is
+    free to move; each pass scores every (i, j) reversal at once by broadcasting.
+    """
+    n = len(order)
+    if n < 4:
+        return order.copy()
+
+    padded = np.zeros((dist.shape[0] + 1, dist.shape[0] + 1))
+    padded[:-1, :-1] = dist
+    path = np.append(order, dist.shape[0])
+
+    idx_i = np.arange(1, n)[:, None]
+    idx_j = np.arange(1, n)[None, :]
+    valid = idx_j > idx_i
+
+    for _ in range(max_passes):
+        prev = path[idx_i - 1]
+        first = path[idx_i]
+        last = path[idx_j]
+        nxt = path[idx_j + 1]
+        delta = (
+            padded[prev, last]
+            + padded[first, nxt]
+            - padded[prev, first]
+            - padded[last, nxt]
+        )
+        delta = np.where(valid, delta, 0.0)
+        flat = int(np.argmin(delta))
+        if delta.flat[flat] >= -1e-9:
+            break
+        i, j = np.unravel_index(flat, delta.shape)
+        i += 1
+        j += 1
+        path[i:j + 1] = path[i:j + 1][::-1]
+
+    return path[:-1]
+
+
+def path_length_km(order: np.ndarray, dist: np.ndarray) -> float:
+    if len(order) < 2:
+        return 0.0
+    return float(dist[order[:-1], order[1:]].sum())
+
+
+def plan_order(start: tuple[float, float], stops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Visiting order (indices into `stops`) from `start`, plus the full distance matrix
+    with the start at index 0.
+    """
+    coords = np.vstack([np.asarray(start, dtype=float)[None, :], np.asarray(stops, dtype=float)])
+    dist = distance_matrix_km(coords)
+    order = two_opt(nearest_neighbour_order(dist, 0), dist)
+    return order[1:] - 1, dist
+
+
+# ---------------------------------------------------------------------------
+# DB-backed planning
+# ---------------------------------------------------------------------------
+
+def _pickup_candidates(db: Session, payload: RoutePlanRequest) -> list[_Candidate]:
+    min_lat, min_lon, max_lat, max_lon = bbox_around(payload.latitude, payload.longitude, payload.radius_km)
+    rows = (
+        db.query(PickupRequest, WasteLog, BulkGenerator)
+        .join(WasteLog, WasteLog.id == PickupRequest.waste_log_id)
+        .join(BulkGenerator, BulkGenerator.id == WasteLog.bulk_generator_id)
+        .filter(
+            PickupRequest.status == PickupRequestStatus.REQUESTED,
+            PickupRequest.assigned_worker_id.is_(None),
+            BulkGenerator.latitude.between(min_lat, max_lat),
+            BulkGenerator.longitude.between(min_lon, max_lon),
+        )
+        .all()
+    )
+    return [
+        _Candidate(
+            kind="pickup",
+            ref_id=pickup.id,
+            latitude=float(org.latitude),
+            longitude=float(org.longitude),
+            label=org.organization_name,
+            created_at=pickup.created_at,
+            weight_kg=float(log.weight_kg or 0),
+        )
+        for pickup, log, org in rows
+    ]
+
+
+def _report_candidates(db: Session, payload: RoutePlanRequest) -> list[_Candidate]:
+    q = db.query(WasteReport).filter(
+        WasteReport.status == WasteReportStatus.OPEN.value,
+        WasteReport.assigned_worker_id.is_(None),
+    )
+    located = locate(
+        q,
+        WasteReport,
+        latitude=payload.latitude,
+        longitude=payload.longitude,
+        radius_km=payload.radius_km,
+        limit=MAX_ROUTE_STOPS * 4,
+    )
+    return [
+        _Candidate(
+            kind="report",
+            ref_id=report.id,
+            latitude=float(report.latitude),
+            longitude=float(report.longitude),
+            label=report.public_id or f"Report #{report.id}",
+            created_at=report.created_at,
+        )
+        for report, _ in located
+    ]
+
+
+def _claim_candidates(db: Session, worker_id: int, candidates: list[_Candidate]) -> list[_Candidate]:
+    """Claim the batch with the same primitives as single claims; whatever another worker took is dropped."""
+    pickup_ids = [c.ref_id for c in candidates if c.kind == "pickup"]
+    report_ids = [c.ref_id for c in candidates if c.kind == "report"]
+    claimed_pickups = claim_pickups(db, worker_id=worker_id, pickup_ids=pickup_ids) if pickup_ids else []
+    claimed_reports = claim_reports(db, worker_id=worker_id, report_ids=report_ids) if report_ids else []
+    db.commit()
+
+    publish_pickups_claimed(worker_id, claimed_pickups)
+    publish_reports_claimed(worker_id, claimed_reports)
+    claimed = {("pickup", i) for i in claimed_pickups} | {("report", i) for i in claimed_reports}
+    return [c for c in candidates if (c.kind, c.ref_id) in claimed]
+
+
+def _build_plan(start: tuple[float, float], candidates: list[_Candidate], *, assigned: bool) -> RoutePlan:
+    if not candidates:
+        return RoutePlan(stops=[], total_km=0.0, baseline_km=0.0, assigned=assigned)
+
+    coords = np.array([[c.latitude, c.longitude] for c in candidates])
+    order, dist = plan_order(start, coords)
+
+    stops: list[RouteStop] = []
+    cumulative = 0.0
+    prev = 0
+    for seq, idx in enumerate(order, start=1):
+        leg = float(dist[prev, idx + 1])
+        cumulative += leg
+        c = candidates[idx]
+        stops.append(
+            RouteStop(
+                sequence=seq,
+                kind=c.kind,
+                ref_id=c.ref_id,
+                label=c.label,
+                latitude=c.latitude,
+                longitude=c.longitude,
+                weight_kg=c.weight_kg,
+                leg_km=round(leg, 3),
+                cumulative_km=round(cumulative, 3),
+            )
+        )
+        prev = idx + 1
+
+    # Baseline: oldest-first, i.e. what one-at-a-time claiming from the feed yields.
+    oldest_first = sorted(range(len(candidates)), key=lambda i: (candidates[i].created_at is None, candidates[i].created_at or datetime.min))
+    baseline = path_length_km(np.array([0] + [i + 1 for i in oldest_first]), dist)
+    return RoutePlan(
+        stops=stops,
+        total_km=round(cumulative, 3),
+        baseline_km=round(baseline, 3),
+        assigned=assigned,
+    )
+
+
+def plan_worker_route(db: Session, *, current_user: User, payload: RoutePlanRequest) -> RoutePlan:
+    if current_user.role not in (UserRole.WASTE_WORKER, UserRole.SUPER_ADMIN):
+        raise HTTPException(status_code=403, detail="Worker role required.")
+
+    candidates: list[_Candidate] = []
+    if payload.include_pickups:
+        candidates.extend(_pickup_candidates(db, payload))
+    if payload.include_reports:
+        candidates.extend(_report_candidates(db, payload))
+
+    # Batch = the max_stops closest open jobs; the route then orders that batch.
+    start = (payload.latitude, payload.longitude)
+    if len(candidates) > payload.max_stops:
+        coords = np.array([[c.latitude, c.longitude] for c in candidates])
+        from_start = distance_matrix_km(np.vstack([np.array(start)[None, :], coords]))[0, 1:]
+        keep = np.argsort(from_start, kind="stable")[: payload.max_stops]
+        candidates = [candidates[i] for i in sorted(keep)]
+
+    if payload.assign and candidates:
+        candidates = _claim_candidates(db, current_user.id, candidates)
+
+    return _build_plan(start, candidates, assigned=payload.assign)
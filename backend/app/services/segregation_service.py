@@ -1,6 +1,13 @@
-from datetime import datetime, date, timedelta
-from typing import Optional, List
+import csv
+import io
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta, timezone
+from typing import Collection, Optional, List, Sequence
 
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -8,11 +15,15 @@ from fastapi import HTTPException, status
 from app.models.household import Household, SegregationLog
 from app.models.badge import BadgeCategory
 from app.models.waste_report import WasteReport, WasteReportStatus
-from app.services.badge_service import (
-    create_badge_if_missing,
-    award_badge_if_not_awarded,
+from app.services.badge_engine import BadgeDefinition, ensure_badge_definitions, evaluate_rule_badges
+from app.services.streak_service import record_segregation_activity
+from app.services.task_queue_service import (
+    TASK_CARBON_ACTIVITY,
+    TASK_SEGREGATION_BADGES,
+    TASK_SEGREGATION_STREAKS,
+    enqueue_task,
+    enqueue_tasks,
 )
-from app.services.carbon_service import add_carbon_activity
 from app.services.waste_report_service import update_report_status
 
 
@@ -110,6 +121,9 @@ def log_segregation(
     )
     db.add(log)
     try:
+        db.flush()
+        record_segregation_activity(db, log)
+        _enqueue_segregation_effects(db, log=log, worker_id=worker_id)
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -119,22 +133,6 @@ def log_segregation(
         )
     db.refresh(log)
 
-    # ---- Carbon + PCC integration ----
-    # Example: convert score to CO2e savings: 0.5 kg at 100 score, scaled linearly.
-    co2e_kg = 0.5 * (score / 100.0)
-    if co2e_kg > 0:
-        add_carbon_activity(
-            db=db,
-            user_id=worker_id or household_id,  # simplified; later map better
-            activity_type="SEGREGATION_LOG",
-            co2e_kg=co2e_kg,
-            reference_id=log.id,
-            description=f"Segregation log for household {household_id}",
-        )
-
-    # ---- Badge integration (simple streak-based) ----
-    _handle_segregation_badges(db, household_id=household_id)
-
     # Auto-close linked report after successful log save.
     if linked_report is not None:
         update_report_status(
@@ -147,44 +145,276 @@ def log_segregation(
     return log
 
 
+def _carbon_payload(*, log_id: int, household_id: int, score: int, worker_id: Optional[int]) -> Optional[dict]:
+    # Example: convert score to CO2e savings: 0.5 kg at 100 score, scaled linearly.
+    co2e_kg = 0.5 * (score / 100.0)
+    if co2e_kg <= 0:
+        return None
+    return {
+        "user_id": worker_id or household_id,  # simplified; later map better
+        "activity_type": "SEGREGATION_LOG",
+        "co2e_kg": co2e_kg,
+        "reference_id": log_id,
+        "description": f"Segregation log for household {household_id}",
+    }
+
+
+def _enqueue_segregation_effects(db: Session, *, log: SegregationLog, worker_id: Optional[int]) -> None:
+    """Queue carbon + badge work for a new log; it commits with the log itself."""
+    # ---- Carbon + PCC integration ----
+    payload = _carbon_payload(
+        log_id=log.id,
+        household_id=log.household_id,
+        score=log.segregation_score,
+        worker_id=worker_id,
+    )
+    if payload is not None:
+        enqueue_task(db, TASK_CARBON_ACTIVITY, payload, key=f"segregation_log:{log.id}")
+
+    # ---- Badge integration (simple streak-based) ----
+    enqueue_task(db, TASK_SEGREGATION_BADGES, {"household_id": log.household_id}, key=log.id)
+
+
+# ---------------------------------------------------------------------------
+# Bulk ingestion
+# ---------------------------------------------------------------------------
+
+BULK_MAX_ROWS = 1000
+BULK_INSERT_CHUNK = 500
+CSV_COLUMNS = ("household_id", "log_date", "dry_kg", "wet_kg", "reject_kg", "notes")
+
+ROW_CREATED = "created"
+ROW_DUPLICATE = "duplicate"
+ROW_INVALID = "invalid"
+
+
+@dataclass
+class BulkLogRow:
+    household_id: int
+    log_date: date
+    dry_kg: float
+    wet_kg: float
+    reject_kg: float
+    notes: Optional[str] = None
+
+
+@dataclass
+class BulkRowResult:
+    row: int
+    status: str
+    household_id: Optional[int] = None
+    log_date: Optional[date] = None
+    log_id: Optional[int] = None
+    segregation_score: Optional[int] = None
+    detail: Optional[str] = None
+
+
+def parse_segregation_csv(text: str) -> tuple[list[tuple[int, BulkLogRow]], list[BulkRowResult]]:
+    """
+    Parse an upload with a CSV_COLUMNS header (notes optional). Returns the
+    (row number, row) pairs that parsed and an invalid result for each that
+    did not; row numbers are 1-based data rows.
+    """
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    missing = [c for c in CSV_COLUMNS[:-1] if c not in (reader.fieldnames or [])]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV is missing columns: {', '.join(missing)}",
+        )
+    rows: list[tuple[int, BulkLogRow]] = []
+    errors: list[BulkRowResult] = []
+    for number, record in enumerate(reader, start=1):
+        try:
+            row = BulkLogRow(
+                household_id=int(record["household_id"]),
+                log_date=date.fromisoformat(record["log_date"].strip()),
+                dry_kg=float(record["dry_kg"] or 0),
+                wet_kg=float(record["wet_kg"] or 0),
+                reject_kg=float(record["reject_kg"] or 0),
+                notes=(record.get("notes") or "").strip() or None,
+            )
+        except (TypeError, ValueError, AttributeError) as exc:
+            errors.append(BulkRowResult(row=number, status=ROW_INVALID, detail=f"Unparseable row: {exc}"))
+            continue
+        rows.append((number, row))
+    return rows, errors
+
+
+def validate_bulk_rows(
+    rows: Sequence[tuple[int, BulkLogRow]],
+    *,
+    known_households: Collection[int],
+    today: date,
+) -> tuple[list[tuple[int, BulkLogRow]], list[BulkRowResult]]:
+    """In-memory checks; the first row for a (household, date) pair wins within a batch."""
+    accepted: list[tuple[int, BulkLogRow]] = []
+    rejected: list[BulkRowResult] = []
+    seen: set[tuple[int, date]] = set()
+    for number, row in rows:
+        detail = None
+        if row.household_id not in known_households:
+            detail = "Household not found"
+        elif not all(math.isfinite(w) for w in (row.dry_kg, row.wet_kg, row.reject_kg)):
+            detail = "Weights must be finite numbers"
+        elif min(row.dry_kg, row.wet_kg, row.reject_kg) < 0:
+            detail = "Weights must be non-negative"
+        elif row.log_date > today:
+            detail = "log_date is in the future"
+        elif (row.household_id, row.log_date) in seen:
+            detail = "Repeats an earlier row for this household and date"
+        if detail is not None:
+            rejected.append(
+                BulkRowResult(
+                    row=number,
+                    status=ROW_INVALID,
+                    household_id=row.household_id,
+                    log_date=row.log_date,
+                    detail=detail,
+                )
+            )
+            continue
+        seen.add((row.household_id, row.log_date))
+        accepted.append((number, row))
+    return accepted, rejected
+
+
+def ingest_segregation_logs(
+    db: Session,
+    *,
+    worker_id: Optional[int],
+    rows: Sequence[tuple[int, BulkLogRow]],
+    today: Optional[date] = None,
+) -> list[BulkRowResult]:
+    """
+    Validate and insert many logs at once; rows whose (household, date) already
+    has a log are reported as duplicates rather than failing the batch.
+
+    Streak, carbon and badge work is queued with one INSERT per task kind and
+    commits with the logs. Commits.
+    """
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_MAX_ROWS} rows per request",
+        )
+    household_ids = {row.household_id for _, row in rows}
+    known = set(db.execute(select(Household.id).where(Household.id.in_(household_ids))).scalars()) if household_ids else set()
+    accepted, results = validate_bulk_rows(rows, known_households=known, today=today or datetime.now(timezone.utc).date())
+
+    inserted: dict[tuple[int, date], tuple[int, int]] = {}
+    for start in range(0, len(accepted), BULK_INSERT_CHUNK):
+        chunk = accepted[start:start + BULK_INSERT_CHUNK]
+        values = [
+            {
+                "household_id": row.household_id,
+                "worker_id": worker_id,
+                "log_date": row.log_date,
+                "dry_kg": row.dry_kg,
+                "wet_kg": row.wet_kg,
+                "reject_kg": row.reject_kg,
+                "segregation_score": calculate_segregation_score(row.dry_kg, row.wet_kg, row.reject_kg),
+                "notes": row.notes,
+            }
+            for _, row in chunk
+        ]
+        returned = db.execute(
+            pg_insert(SegregationLog)
+            .values(values)
+            .on_conflict_do_nothing(constraint="uq_household_log_date")
+            .returning(SegregationLog.id, SegregationLog.household_id, SegregationLog.log_date, SegregationLog.segregation_score)
+        )
+        for log_id, household_id, log_date, score in returned:
+            inserted[(household_id, log_date)] = (log_id, score)
+
+    for number, row in accepted:
+        hit = inserted.get((row.household_id, row.log_date))
+        results.append(
+            BulkRowResult(
+                row=number,
+                status=ROW_CREATED if hit else ROW_DUPLICATE,
+                household_id=row.household_id,
+                log_date=row.log_date,
+                log_id=hit[0] if hit else None,
+                segregation_score=hit[1] if hit else None,
+                detail=None if hit else f"Segregation log already exists for household {row.household_id} on {row.log_date.isoformat()}",
+            )
+        )
+    results.sort(key=lambda r: r.row)
+
+    _enqueue_bulk_effects(db, inserted=inserted, worker_id=worker_id)
+    db.commit()
+    return results
+
+
+def _enqueue_bulk_effects(db: Session, *, inserted: dict[tuple[int, date], tuple[int, int]], worker_id: Optional[int]) -> None:
+    by_household: dict[int, list[tuple[date, int]]] = defaultdict(list)
+    carbon = []
+    for (household_id, log_date), (log_id, score) in inserted.items():
+        by_household[household_id].append((log_date, log_id))
+        payload = _carbon_payload(log_id=log_id, household_id=household_id, score=score, worker_id=worker_id)
+        if payload is not None:
+            carbon.append((f"segregation_log:{log_id}", payload))
+
+    streaks, badges = [], []
+    for household_id, entries in by_household.items():
+        entries.sort()
+        # Keyed by the household's newest log in this batch, unique across batches.
+        key = max(log_id for _, log_id in entries)
+        streaks.append(
+            (key, {"household_id": household_id, "days": [d.isoformat() for d, _ in entries]})
+        )
+        badges.append((key, {"household_id": household_id}))
+
+    enqueue_tasks(db, TASK_SEGREGATION_STREAKS, streaks)
+    enqueue_tasks(db, TASK_CARBON_ACTIVITY, carbon)
+    enqueue_tasks(db, TASK_SEGREGATION_BADGES, badges)
+
+
+SEGREGATION_BADGE_DEFINITIONS = [
+    BadgeDefinition(
+        code="segregation_star_7",
+        name="Segregation Star (7-day streak)",
+        category=BadgeCategory.SEGREGATION.value,
+        threshold=7,
+        rule={"metric": "household_good_logs_7d", "op": ">=", "threshold": 7},
+        description="Household maintained good segregation for 7 days",
+        icon="badge_segregation_star",
+    ),
+]
+
+
 def _handle_segregation_badges(db: Session, household_id: int) -> None:
     """
     For now:
     - If household has 7 logs in last 7 days with score >= 80 => award 'Segregation Star'
+      to the household owner.
     """
-    seven_days_ago = date.today() - timedelta(days=7)
+    household = db.query(Household).filter(Household.id == household_id).first()
+    if household is None or not household.owner_user_id:
+        return
 
-    logs = (
-        db.query(SegregationLog)
+    seven_days_ago = date.today() - timedelta(days=7)
+    good_logs = (
+        db.query(func.count(SegregationLog.id))
         .filter(
             SegregationLog.household_id == household_id,
             SegregationLog.log_date >= seven_days_ago,
             SegregationLog.segregation_score >= 80,
         )
-        .all()
-    )
-    if len(logs) < 7:
-        return
+        .scalar()
+    ) or 0
 
-    # Ensure badge exists
-    criteria_key = f"segregation_streak_7_household_{household_id}"
-    create_badge_if_missing(
-        db=db,
-        name="Segregation Star (7-day streak)",
-        criteria_key=criteria_key,
-        category=BadgeCategory.SEGREGATION,
-        description="Household maintained good segregation for 7 days",
-        icon="badge_segregation_star",
+    ensure_badge_definitions(db, SEGREGATION_BADGE_DEFINITIONS)
+    evaluate_rule_badges(
+        db,
+        user_id=household.owner_user_id,
+        org_id=None,
+        metrics={"household_good_logs_7d": int(good_logs)},
+        codes=[d.code for d in SEGREGATION_BADGE_DEFINITIONS],
+        metadata={"source": "segregation", "household_id": household_id},
     )
-
-    # For now, award to the household owner (if exists)
-    household = db.query(Household).filter(Household.id == household_id).first()
-    if household and household.owner_user_id:
-        award_badge_if_not_awarded(
-            db=db,
-            user_id=household.owner_user_id,
-            criteria_key=criteria_key,
-        )
+    db.commit()
 
 
 def list_logs_for_worker(db: Session, *, worker_id: int) -> List[SegregationLog]:
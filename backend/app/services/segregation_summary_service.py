@@ -0,0 +1,280 @@
+"""
+Weekly segregation summary for the citizen app.
+
+A single household is bucketed in SQL with date_trunc('week') and grouped
+sums. The all-households view fetches five projected columns and buckets them
+with NumPy (weekly_buckets_numpy), so no ORM rows are built either way.
+
+Summaries are cached per (user, household, weeks, day). Each entry is
+validated against the scope's (log count, latest log id), so the cache stays
+correct across worker processes and only turns over when a log is written.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.admin_ops import PlatformSetting
+from app.models.household import SegregationLog
+from app.models.pcc import EmissionFactor
+from app.services.citizen_dashboard_service import DEFAULT_PCC_UNIT_KGCO2E, PCC_UNIT_SETTING, setting_number
+
+CACHE_MAX_ENTRIES = 4096
+RECENT_LOGS = 10
+DEFAULT_FACTORS = {"dry": 1.0, "wet": 0.5, "reject": 1.5}
+
+
+@dataclass
+class WeekBucket:
+    week_start: date
+    logs: int
+    dry_kg: float
+    wet_kg: float
+    reject_kg: float
+    score_sum: float
+
+
+def _score():
+    return func.coalesce(SegregationLog.quality_score, SegregationLog.segregation_score, 0)
+
+
+def _scope(user_id: int, household_id: Optional[int]):
+    conditions = [SegregationLog.citizen_id == user_id]
+    if household_id is not None:
+        conditions.append(SegregationLog.household_id == household_id)
+    return conditions
+
+
+# ---------------------------------------------------------------------------
+# Bucketing
+# ---------------------------------------------------------------------------
+
+def weekly_buckets_sql(db: Session, *, user_id: int, household_id: Optional[int], since: date) -> list[WeekBucket]:
+    week = cast(func.date_trunc("week", SegregationLog.log_date), Date)
+    rows = db.execute(
+        select(
+            week,
+            func.count(),
+            func.sum(SegregationLog.dry_kg),
+            func.sum(SegregationLog.wet_kg),
+            func.sum(SegregationLog.reject_kg),
+            func.sum(_score()),
+        )
+        .where(*_scope(user_id, household_id), SegregationLog.log_date >= since)
+        .group_by(week)
+        .order_by(week)
+    )
+    return [
+        WeekBucket(w, int(n), float(dry or 0), float(wet or 0), float(rej or 0), float(score or 0))
+        for w, n, dry, wet, rej, score in rows
+    ]
+
+
+def weekly_buckets_numpy(
+    log_dates: np.ndarray,
+    dry: np.ndarray,
+    wet: np.ndarray,
+    reject: np.ndarray,
+    score: np.ndarray,
+) -> list[WeekBucket]:
+    """Monday-aligned weekly sums over columnar arrays (log_dates as datetime64[D])."""
+    if len(log_dates) == 0:
+        return []
+    days = np.asarray(log_dates, dtype="datetime64[D]")
+    # 1970-01-01 was a Thursday: shift by 3 days so week numbers break on Mondays.
+    week_index = (days.astype(np.int64) + 3) // 7
+    weeks, inverse = np.unique(week_index, return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = [np.bincount(inverse, weights=np.asarray(col, dtype=float)) for col in (dry, wet, reject, score)]
+    starts = (weeks * 7 - 3).astype("datetime64[D]")
+    return [
+        WeekBucket(
+            week_start=starts[i].astype(date),
+            logs=int(counts[i]),
+            dry_kg=float(sums[0][i]),
+            wet_kg=float(sums[1][i]),
+            reject_kg=float(sums[2][i]),
+            score_sum=float(sums[3][i]),
+        )
+        for i in range(len(weeks))
+    ]
+
+
+def _fetch_columns(db: Session, *, user_id: int, since: date) -> tuple[list[WeekBucket], list[dict[str, Any]]]:
+    rows = db.execute(
+        select(
+            SegregationLog.log_date,
+            func.coalesce(SegregationLog.dry_kg, 0),
+            func.coalesce(SegregationLog.wet_kg, 0),
+            func.coalesce(SegregationLog.reject_kg, 0),
+            _score(),
+        )
+        .where(*_scope(user_id, None), SegregationLog.log_date >= since)
+        .order_by(SegregationLog.log_date.asc())
+    ).all()
+    if not rows:
+        return [], []
+    log_dates, dry, wet, reject, score = (np.asarray(col) for col in zip(*rows))
+    buckets = weekly_buckets_numpy(
+        log_dates.astype("datetime64[D]"),
+        dry.astype(float),
+        wet.astype(float),
+        reject.astype(float),
+        score.astype(float),
+    )
+    recent = [_recent(r) for r in rows[-RECENT_LOGS:][::-1]]
+    return buckets, recent
+
+
+def _recent(row) -> dict[str, Any]:
+    log_date, dry, wet, reject, score = row
+    return {
+        "date": log_date,
+        "dry": float(dry or 0),
+        "wet": float(wet or 0),
+        "reject": float(reject or 0),
+        "score": float(score or 0),
+    }
+
+
+def _recent_logs_sql(db: Session, *, user_id: int, household_id: int, since: date) -> list[dict[str, Any]]:
+    rows = db.execute(
+        select(
+            SegregationLog.log_date,
+            SegregationLog.dry_kg,
+            SegregationLog.wet_kg,
+            SegregationLog.reject_kg,
+            _score(),
+        )
+        .where(*_scope(user_id, household_id), SegregationLog.log_date >= since)
+        .order_by(SegregationLog.log_date.desc())
+        .limit(RECENT_LOGS)
+    )
+    return [_recent(r) for r in rows]
+
+
+# ---------------------------------------------------------------------------
+# Summary
+# ---------------------------------------------------------------------------
+
+def _week_label(week_start: date) -> str:
+    week_end = week_start + timedelta(days=6)
+    return f"{week_start.strftime('%d %b')} - {week_end.strftime('%d %b')}"
+
+
+def _preview_inputs(db: Session) -> tuple[dict[str, float], float]:
+    factor_rows = db.execute(
+        select(EmissionFactor.category, EmissionFactor.kgco2e_per_kg).where(EmissionFactor.active.is_(True))
+    ).all()
+    factors = dict(DEFAULT_FACTORS)
+    factors.update({category.lower(): float(value) for category, value in factor_rows if category.lower() in factors})
+    unit_value = db.execute(select(PlatformSetting.value_json).where(PlatformSetting.key == PCC_UNIT_SETTING)).scalar()
+    unit = setting_number(unit_value, PCC_UNIT_SETTING, DEFAULT_PCC_UNIT_KGCO2E) if unit_value is not None else DEFAULT_PCC_UNIT_KGCO2E
+    return factors, unit
+
+
+def build_segregation_summary(
+    db: Session,
+    *,
+    user_id: int,
+    household_id: Optional[int],
+    weeks: int,
+    today: date,
+) -> dict[str, Any]:
+    since = today - timedelta(days=weeks * 7)
+    if household_id is not None:
+        buckets = weekly_buckets_sql(db, user_id=user_id, household_id=household_id, since=since)
+        recent = _recent_logs_sql(db, user_id=user_id, household_id=household_id, since=since) if buckets else []
+    else:
+        buckets, recent = _fetch_columns(db, user_id=user_id, since=since)
+
+    if not buckets:
+        return {
+            "avg_score": 0,
+            "totals": {"dry_total": 0, "wet_total": 0, "reject_total": 0},
+            "estimated_pcc_preview": 0,
+            "weekly_score_points": [],
+            "weekly_breakdown": [],
+            "recent_logs": [],
+        }
+
+    logs = sum(b.logs for b in buckets)
+    totals = {
+        "dry_total": round(sum(b.dry_kg for b in buckets), 2),
+        "wet_total": round(sum(b.wet_kg for b in buckets), 2),
+        "reject_total": round(sum(b.reject_kg for b in buckets), 2),
+    }
+    factors, unit = _preview_inputs(db)
+    co2e = (
+        totals["dry_total"] * factors["dry"]
+        + totals["wet_total"] * factors["wet"]
+        + totals["reject_total"] * factors["reject"]
+    )
+
+    return {
+        "avg_score": round(sum(b.score_sum for b in buckets) / logs, 2),
+        "totals": totals,
+        "estimated_pcc_preview": round(co2e / unit, 2) if unit > 0 else 0,
+        "weekly_score_points": [
+            {"week_label": _week_label(b.week_start), "avg_score": round(b.score_sum / b.logs, 2)} for b in buckets
+        ],
+        "weekly_breakdown": [
+            {
+                "week_label": _week_label(b.week_start),
+                "dry_kg": round(b.dry_kg, 2),
+                "wet_kg": round(b.wet_kg, 2),
+                "reject_kg": round(b.reject_kg, 2),
+            }
+            for b in buckets
+        ],
+        "recent_logs": recent,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+_cache: "OrderedDict[tuple, tuple[tuple[int, int], dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _log_marker(db: Session, *, user_id: int, household_id: Optional[int]) -> tuple[int, int]:
+    count, last_id = db.execute(
+        select(func.count(), func.coalesce(func.max(SegregationLog.id), 0)).where(*_scope(user_id, household_id))
+    ).one()
+    return int(count), int(last_id)
+
+
+def cached_segregation_summary(
+    db: Session,
+    *,
+    user_id: int,
+    household_id: Optional[int],
+    weeks: int,
+    today: Optional[date] = None,
+) -> dict[str, Any]:
+    today = today or datetime.utcnow().date()
+    key = (user_id, household_id, weeks, today)
+    marker = _log_marker(db, user_id=user_id, household_id=household_id)
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == marker:
+            _cache.move_to_end(key)
+            return hit[1]
+
+    summary = build_segregation_summary(db, user_id=user_id, household_id=household_id, weeks=weeks, today=today)
+    with _cache_lock:
+        _cache[key] = (marker, summary)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return summary
@@ -5,8 +5,16 @@ from dataclasses import dataclass
 from sqlalchemy import inspect, text
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.http_cache import ResponseCache
 from app.services.marketing_service import get_config
 
+SECTION_STATS = "stats"
+SECTION_SAMPLE_LEDGER = "sample_ledger"
+
+# Both sections change with every verification, so they expire instead of being invalidated.
+public_stats_cache = ResponseCache(ttl_seconds=settings.PUBLIC_STATS_CACHE_TTL_SECONDS)
+
 
 @dataclass
 class StatsSummary:
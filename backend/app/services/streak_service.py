@@ -0,0 +1,310 @@
+"""
+Incremental day streaks per subject (user, household, org) and activity stream.
+
+Each streak_counters row holds the current run, the longest run and the last
+active day, so reading a streak is a single-row lookup. Writes that add an
+activity day call record_activity() in the same transaction:
+
+  * the same day again, or any day inside the current run, is a no-op;
+  * the day after last_active_date extends the run, a later day restarts it;
+  * a back-dated day only looks at the neighbouring days in the source table
+    (bounded windows that widen while the adjacent run continues) to find the
+    run it joins, which may extend the current run or beat the longest.
+
+A subject without a row yet is rebuilt once from its full history with a
+gaps-and-islands query and tracked incrementally from then on.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Collection, Optional
+
+from sqlalchemy import Date, Integer, cast, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.bulk import Verification, WasteLog
+from app.models.household import SegregationLog
+from app.models.streak import StreakCounter
+
+STREAM_SEGREGATION = "segregation"
+STREAM_VERIFICATION = "verification"
+
+SUBJECT_USER = "user"
+SUBJECT_HOUSEHOLD = "household"
+SUBJECT_ORG = "org"
+SUBJECT_BULK_ORG = "bulk_org"
+
+# First window probed around a back-dated day; doubles while the run continues.
+NEIGHBOUR_WINDOW_DAYS = 32
+
+
+@dataclass(frozen=True)
+class StreakState:
+    current: int = 0
+    longest: int = 0
+    last_active: Optional[date] = None
+
+    def current_as_of(self, today: date, grace_days: int = 0) -> int:
+        """Current run if it reaches within `grace_days` of `today`, else 0."""
+        if self.last_active is None or (today - self.last_active).days > grace_days:
+            return 0
+        return self.current
+
+
+def advance_streak(state: StreakState, day: date) -> Optional[StreakState]:
+    """
+    Apply one activity day without looking at history.
+
+    Returns None for a back-dated day outside the current run; those need the
+    neighbouring runs (see merge_backdated).
+    """
+    last = state.last_active
+    if last is None:
+        return StreakState(current=1, longest=max(1, state.longest), last_active=day)
+    gap = (day - last).days
+    if gap == 0 or (gap < 0 and -gap < state.current):
+        return state
+    if gap == 1:
+        current = state.current + 1
+        return StreakState(current=current, longest=max(state.longest, current), last_active=day)
+    if gap > 1:
+        return StreakState(current=1, longest=max(state.longest, 1), last_active=day)
+    return None
+
+
+def merge_backdated(state: StreakState, day: date, *, run_before: int, run_after: int) -> StreakState:
+    """
+    Apply a back-dated day given the active days directly around it.
+
+    `run_before`/`run_after` count consecutive active days ending at day-1 and
+    starting at day+1. Both exclude `day`, so replaying a day is harmless.
+    """
+    merged = run_before + 1 + run_after
+    current = state.current
+    if state.last_active is not None and day + timedelta(days=run_after) == state.last_active:
+        current = merged
+    return StreakState(current=current, longest=max(state.longest, merged), last_active=state.last_active)
+
+
+def consecutive_days(days: Collection[date], start: date, step: int) -> int:
+    """How many of start, start+step, start+2*step, ... are in `days` before the first gap."""
+    n = 0
+    cursor = start
+    while cursor in days:
+        n += 1
+        cursor += timedelta(days=step)
+    return n
+
+
+def state_from_dates(days: Collection[date]) -> StreakState:
+    """Full recomputation from a set of active days (reference for the incremental path)."""
+    ordered = sorted(set(days))
+    if not ordered:
+        return StreakState()
+    longest = run = 1
+    for prev, cur in zip(ordered, ordered[1:]):
+        run = run + 1 if (cur - prev).days == 1 else 1
+        longest = max(longest, run)
+    return StreakState(current=run, longest=longest, last_active=ordered[-1])
+
+
+# ---------------------------------------------------------------------------
+# Activity sources
+# ---------------------------------------------------------------------------
+
+def _verification_user_col(db: Session):
+    # badge_engine imports this module; resolve its column helper lazily.
+    from app.services.badge_engine import _waste_log_user_col
+
+    return _waste_log_user_col(db)
+
+
+def _activity_days(db: Session, subject_type: str, subject_id: int, stream: str):
+    """SELECT of (distinct-able) active days for one subject, as column `d`."""
+    if stream == STREAM_SEGREGATION:
+        subject_col = {
+            SUBJECT_HOUSEHOLD: SegregationLog.household_id,
+            SUBJECT_USER: SegregationLog.citizen_id,
+        }.get(subject_type)
+        if subject_col is not None:
+            return select(SegregationLog.log_date.label("d")).where(subject_col == subject_id)
+    elif stream == STREAM_VERIFICATION:
+        subject_col = {
+            SUBJECT_USER: _verification_user_col(db),
+            SUBJECT_ORG: WasteLog.org_id,
+            SUBJECT_BULK_ORG: WasteLog.bulk_generator_id,
+        }.get(subject_type)
+        if subject_col is not None:
+            return (
+                select(cast(Verification.verified_at, Date).label("d"))
+                .join(WasteLog, WasteLog.id == Verification.waste_log_id)
+                .where(subject_col == subject_id, Verification.verified_at.isnot(None))
+            )
+    raise ValueError(f"Unknown streak source {subject_type!r}/{stream!r}")
+
+
+def _days_between(db: Session, subject_type: str, subject_id: int, stream: str, lo: date, hi: date) -> set[date]:
+    days = _activity_days(db, subject_type, subject_id, stream).subquery()
+    return set(db.execute(select(days.c.d).where(days.c.d.between(lo, hi)).distinct()).scalars())
+
+
+def _neighbour_run(db: Session, subject_type: str, subject_id: int, stream: str, day: date, step: int) -> int:
+    """Consecutive active days next to `day` in direction `step`, probing widening windows."""
+    total = 0
+    window = NEIGHBOUR_WINDOW_DAYS
+    start = day + timedelta(days=step)
+    while True:
+        end = start + timedelta(days=step * (window - 1))
+        lo, hi = min(start, end), max(start, end)
+        run = consecutive_days(_days_between(db, subject_type, subject_id, stream, lo, hi), start, step)
+        total += run
+        if run < window:
+            return total
+        start = end + timedelta(days=step)
+        window *= 2
+
+
+def _rebuild_state(db: Session, subject_type: str, subject_id: int, stream: str) -> StreakState:
+    """Gaps-and-islands over the subject's whole history, in one statement."""
+    days = _activity_days(db, subject_type, subject_id, stream).distinct().subquery()
+    islands = select(
+        days.c.d,
+        (days.c.d - cast(func.row_number().over(order_by=days.c.d), Integer)).label("grp"),
+    ).subquery()
+    runs = (
+        select(func.count().label("length"), func.max(islands.c.d).label("last_day"))
+        .group_by(islands.c.grp)
+        .cte("runs")
+    )
+    latest = select(runs.c.length).order_by(runs.c.last_day.desc()).limit(1).correlate(None).scalar_subquery()
+    current, longest, last = db.execute(
+        select(latest, func.max(runs.c.length), func.max(runs.c.last_day))
+    ).one()
+    if last is None:
+        return StreakState()
+    return StreakState(current=int(current or 0), longest=int(longest or 0), last_active=last)
+
+
+# ---------------------------------------------------------------------------
+# Counter rows
+# ---------------------------------------------------------------------------
+
+def _row_filter(subject_type: str, subject_id: int, stream: str):
+    return (
+        StreakCounter.subject_type == subject_type,
+        StreakCounter.subject_id == subject_id,
+        StreakCounter.stream == stream,
+    )
+
+
+def _state_of(row: StreakCounter) -> StreakState:
+    return StreakState(
+        current=int(row.current_streak or 0),
+        longest=int(row.longest_streak or 0),
+        last_active=row.last_active_date,
+    )
+
+
+def _insert_row(db: Session, subject_type: str, subject_id: int, stream: str, state: StreakState) -> None:
+    db.execute(
+        pg_insert(StreakCounter)
+        .values(
+            subject_type=subject_type,
+            subject_id=subject_id,
+            stream=stream,
+            current_streak=state.current,
+            longest_streak=state.longest,
+            last_active_date=state.last_active,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .on_conflict_do_nothing(constraint="uq_streak_counters_subject")
+    )
+
+
+def get_streak(db: Session, subject_type: str, subject_id: int, stream: str) -> StreakState:
+    """
+    Read a subject's streak. The first read for an untracked subject rebuilds
+    and stores its row (flush only; the caller's commit keeps it).
+    """
+    row = db.execute(select(StreakCounter).where(*_row_filter(subject_type, subject_id, stream))).scalar_one_or_none()
+    if row is not None:
+        return _state_of(row)
+    state = _rebuild_state(db, subject_type, subject_id, stream)
+    _insert_row(db, subject_type, subject_id, stream, state)
+    return state
+
+
+def record_activity(db: Session, *, subject_type: str, subject_id: int, stream: str, day: date) -> StreakState:
+    """
+    Fold one activity day into the subject's streak. Call after the activity
+    row is flushed, in the same transaction; does not commit.
+    """
+    # Make sure there is a row to lock, so concurrent writers for the same
+    # subject serialise on it instead of racing to create it.
+    _insert_row(db, subject_type, subject_id, stream, StreakState())
+    row = db.execute(
+        select(StreakCounter)
+        .where(*_row_filter(subject_type, subject_id, stream))
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalar_one()
+
+    previous = _state_of(row)
+    if previous.last_active is None:
+        # First activity we track for this subject: rebuild from history,
+        # which already includes `day`.
+        state = _rebuild_state(db, subject_type, subject_id, stream)
+    else:
+        state = advance_streak(previous, day)
+        if state is None:
+            state = merge_backdated(
+                previous,
+                day,
+                run_before=_neighbour_run(db, subject_type, subject_id, stream, day, -1),
+                run_after=_neighbour_run(db, subject_type, subject_id, stream, day, 1),
+            )
+    if state != previous:
+        row.current_streak = state.current
+        row.longest_streak = state.longest
+        row.last_active_date = state.last_active
+        db.flush()
+    return state
+
+
+def record_segregation_activity(db: Session, log: SegregationLog) -> None:
+    record_activity(
+        db,
+        subject_type=SUBJECT_HOUSEHOLD,
+        subject_id=int(log.household_id),
+        stream=STREAM_SEGREGATION,
+        day=log.log_date,
+    )
+    if log.citizen_id is not None:
+        record_activity(
+            db,
+            subject_type=SUBJECT_USER,
+            subject_id=int(log.citizen_id),
+            stream=STREAM_SEGREGATION,
+            day=log.log_date,
+        )
+
+
+def record_verification_activity(db: Session, log: WasteLog, verified_at: datetime) -> None:
+    day = verified_at.date()
+    subjects = (
+        (SUBJECT_USER, getattr(log, _verification_user_col(db).key)),
+        (SUBJECT_ORG, log.org_id),
+        (SUBJECT_BULK_ORG, log.bulk_generator_id),
+    )
+    for subject_type, subject_id in subjects:
+        if subject_id is not None:
+            record_activity(
+                db,
+                subject_type=subject_type,
+                subject_id=int(subject_id),
+                stream=STREAM_VERIFICATION,
+                day=day,
+            )
@@ -0,0 +1,110 @@
+"""
+Handlers for background_tasks, keyed by task kind.
+
+Kept apart from task_queue_service so the services that enqueue work do not
+import each other through the queue.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.services.analytics_rollup_service import refresh_rollups, schedule_rollup_refresh
+from app.services.badge_engine import evaluate_bulk_worker_event_badges, notify_badge_unlocks
+from app.services.carbon_service import add_carbon_activity
+from app.services.segregation_service import _handle_segregation_badges
+from app.services.streak_service import STREAM_SEGREGATION, SUBJECT_HOUSEHOLD, record_activity
+from app.services.task_queue_service import (
+    TASK_ANALYTICS_ROLLUP,
+    TASK_BULK_VERIFICATION_BADGES,
+    TASK_CARBON_ACTIVITY,
+    TASK_REPORT_BADGES,
+    TASK_SEGREGATION_BADGES,
+    TASK_SEGREGATION_STREAKS,
+    TASK_TOKEN_BLOCK,
+    TASK_TRAINING_COMPLETED,
+    TaskHandler,
+)
+from app.services.token_service import seal_pending_transactions
+from app.services.training_service import apply_training_completion_effects
+from app.services.waste_report_service import _handle_reporting_badges_on_create
+
+
+def _report_badges(db: Session, payload: dict[str, Any]) -> None:
+    _handle_reporting_badges_on_create(db, int(payload["reporter_id"]))
+
+
+def _segregation_badges(db: Session, payload: dict[str, Any]) -> None:
+    _handle_segregation_badges(db, household_id=int(payload["household_id"]))
+
+
+def _segregation_streaks(db: Session, payload: dict[str, Any]) -> None:
+    # Bulk-ingested logs; replaying a day is a no-op for the streak.
+    for day in sorted(payload["days"]):
+        record_activity(
+            db,
+            subject_type=SUBJECT_HOUSEHOLD,
+            subject_id=int(payload["household_id"]),
+            stream=STREAM_SEGREGATION,
+            day=date.fromisoformat(day),
+        )
+
+
+def _carbon_activity(db: Session, payload: dict[str, Any]) -> None:
+    add_carbon_activity(db=db, **payload)
+    db.commit()
+
+
+def _training_completed(db: Session, payload: dict[str, Any]) -> None:
+    # No longer enqueued (completion awards badges in the request); drains older rows.
+    apply_training_completion_effects(
+        db,
+        user_id=int(payload["user_id"]),
+        module_id=int(payload["module_id"]),
+        score=float(payload["score"]),
+    )
+    db.commit()
+
+
+def _bulk_verification_badges(db: Session, payload: dict[str, Any]) -> None:
+    # The verifying worker's badges are awarded in the request; tasks queued
+    # before that change carry no "targets" and evaluate both sides.
+    awarded = evaluate_bulk_worker_event_badges(
+        db,
+        bulk_user_id=int(payload["bulk_user_id"]),
+        worker_user_id=payload.get("worker_user_id"),
+        org_id=payload.get("org_id"),
+        event_type="bulk_verification",
+        event_payload=payload.get("event_payload") or {},
+        targets=tuple(payload.get("targets") or ("bulk", "worker")),
+    )
+    for target, user_id in (("bulk", payload["bulk_user_id"]), ("worker", payload.get("worker_user_id"))):
+        if awarded.get(target):
+            notify_badge_unlocks(db, user_id=int(user_id), badges=awarded[target], source="bulk verification")
+    db.commit()
+
+
+def _token_block(db: Session, payload: dict[str, Any]) -> None:
+    # Older tasks carry a tx_id; every seal picks up all pending transactions.
+    seal_pending_transactions(db)
+
+
+def _analytics_rollup(db: Session, payload: dict[str, Any]) -> None:
+    refresh_rollups(db)
+    # Periodic: each run queues the next interval's refresh.
+    schedule_rollup_refresh(db)
+
+
+TASK_HANDLERS: dict[str, TaskHandler] = {
+    TASK_REPORT_BADGES: _report_badges,
+    TASK_SEGREGATION_BADGES: _segregation_badges,
+    TASK_SEGREGATION_STREAKS: _segregation_streaks,
+    TASK_CARBON_ACTIVITY: _carbon_activity,
+    TASK_TRAINING_COMPLETED: _training_completed,
+    TASK_BULK_VERIFICATION_BADGES: _bulk_verification_badges,
+    TASK_TOKEN_BLOCK: _token_block,
+    TASK_ANALYTICS_ROLLUP: _analytics_rollup,
+}
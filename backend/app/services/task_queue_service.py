@@ -0,0 +1,332 @@
+"""
+Durable queue for post-commit side effects, backed by background_tasks.
+
+Request handlers call enqueue_task() in the same transaction as their primary
+write, so a task exists exactly when that write committed. Workers claim due
+rows with FOR UPDATE SKIP LOCKED, which lets any number of threads or
+processes poll the table without claiming the same task twice.
+
+Delivery is at-least-once. The runner marks a task done in the handler's own
+session before calling it, so the handler's final commit also completes the
+task: a handler whose only non-repeatable write is that last commit runs
+exactly once, and anything it commits earlier must be safe to repeat.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.task_queue import BackgroundTask, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+TASK_REPORT_BADGES = "report.badges"
+TASK_SEGREGATION_BADGES = "segregation.badges"
+TASK_CARBON_ACTIVITY = "carbon.activity"
+TASK_TRAINING_COMPLETED = "training.completed"
+TASK_BULK_VERIFICATION_BADGES = "bulk.verification_badges"
+TASK_TOKEN_BLOCK = "token.block"
+TASK_ANALYTICS_ROLLUP = "analytics.rollup"
+TASK_SEGREGATION_STREAKS = "segregation.streaks"
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BATCH_SIZE = 20
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 15 * 60
+LEASE_SECONDS = 5 * 60
+FINISHED_RETENTION_DAYS = 7
+MAX_ERROR_CHARS = 2000
+
+TaskHandler = Callable[[Session, dict[str, Any]], None]
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay_seconds(attempts: int) -> int:
+    """Exponential backoff after the given number of failed attempts."""
+    return min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+def enqueue_task(
+    db: Session,
+    kind: str,
+    payload: dict[str, Any],
+    *,
+    key: Any,
+    run_after: Optional[datetime] = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> None:
+    """
+    Add a task to the caller's transaction. Does not commit.
+
+    `key` identifies the side effect within `kind`; enqueueing the same
+    kind/key twice is a no-op.
+    """
+    db.execute(
+        pg_insert(BackgroundTask)
+        .values(
+            kind=kind,
+            idempotency_key=f"{kind}:{key}",
+            payload=payload,
+            status=TaskStatus.PENDING.value,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_after=run_after or _utc_now(),
+        )
+        .on_conflict_do_nothing(index_elements=[BackgroundTask.idempotency_key])
+    )
+
+
+def enqueue_tasks(
+    db: Session,
+    kind: str,
+    items: Sequence[tuple[Any, dict[str, Any]]],
+    *,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> None:
+    """enqueue_task() for many (key, payload) pairs in one INSERT. Does not commit."""
+    if not items:
+        return
+    now = _utc_now()
+    db.execute(
+        pg_insert(BackgroundTask)
+        .values(
+            [
+                {
+                    "kind": kind,
+                    "idempotency_key": f"{kind}:{key}",
+                    "payload": payload,
+                    "status": TaskStatus.PENDING.value,
+                    "attempts": 0,
+                    "max_attempts": max_attempts,
+                    "run_after": now,
+                }
+                for key, payload in items
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=[BackgroundTask.idempotency_key])
+    )
+
+
+def claim_due_tasks(db: Session, *, worker_id: str, limit: int = DEFAULT_BATCH_SIZE) -> list[int]:
+    """
+    Lease up to `limit` due tasks to `worker_id` and commit the lease.
+
+    Running tasks whose lease expired (a worker died mid-task) are due again,
+    unless that was their last attempt: a task that keeps killing its worker
+    (OOM, segfault) goes DEAD instead of being leased forever.
+    """
+    now = _utc_now()
+    lease_expired = and_(
+        BackgroundTask.status == TaskStatus.RUNNING.value,
+        BackgroundTask.locked_at < now - timedelta(seconds=LEASE_SECONDS),
+    )
+    db.execute(
+        update(BackgroundTask)
+        .where(lease_expired, BackgroundTask.attempts >= BackgroundTask.max_attempts)
+        .values(
+            status=TaskStatus.DEAD.value,
+            locked_at=None,
+            locked_by=None,
+            last_error="Lease expired: the worker stopped during the final attempt.",
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    candidates = (
+        select(BackgroundTask.id)
+        .where(
+            or_(
+                and_(BackgroundTask.status == TaskStatus.PENDING.value, BackgroundTask.run_after <= now),
+                and_(lease_expired, BackgroundTask.attempts < BackgroundTask.max_attempts),
+            )
+        )
+        .order_by(BackgroundTask.run_after.asc(), BackgroundTask.id.asc())
+        .limit(max(1, limit))
+        .with_for_update(skip_locked=True)
+    )
+    claimed_ids = db.execute(
+        update(BackgroundTask)
+        .where(BackgroundTask.id.in_(candidates))
+        .values(
+            status=TaskStatus.RUNNING.value,
+            attempts=BackgroundTask.attempts + 1,
+            locked_at=now,
+            locked_by=worker_id,
+            updated_at=now,
+        )
+        .returning(BackgroundTask.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    return sorted(claimed_ids)
+
+
+def _record_failure(db: Session, task_id: int, attempts: int, max_attempts: int, exc: BaseException) -> None:
+    now = _utc_now()
+    dead = attempts >= max_attempts
+    db.execute(
+        update(BackgroundTask)
+        .where(BackgroundTask.id == task_id)
+        .values(
+            status=TaskStatus.DEAD.value if dead else TaskStatus.PENDING.value,
+            run_after=now if dead else now + timedelta(seconds=retry_delay_seconds(attempts)),
+            locked_at=None,
+            locked_by=None,
+            completed_at=None,
+            last_error=f"{type(exc).__name__}: {exc}"[:MAX_ERROR_CHARS],
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def run_task(db: Session, task_id: int, handlers: dict[str, TaskHandler]) -> bool:
+    task = db.get(BackgroundTask, task_id)
+    if task is None or task.status != TaskStatus.RUNNING.value:
+        return False
+
+    attempts, max_attempts = int(task.attempts), int(task.max_attempts)
+    try:
+        handler = handlers.get(task.kind)
+        if handler is None:
+            raise LookupError(f"No handler registered for task kind {task.kind!r}")
+        payload = dict(task.payload or {})
+        task.status = TaskStatus.DONE.value
+        task.completed_at = _utc_now()
+        task.locked_at = None
+        task.last_error = None
+        handler(db, payload)
+        db.commit()
+        return True
+    except Exception as exc:
+        db.rollback()
+        logger.warning("Background task %s failed (attempt %s/%s): %s", task_id, attempts, max_attempts, exc)
+        _record_failure(db, task_id, attempts, max_attempts, exc)
+        return False
+
+
+def run_pending_tasks(db: Session, *, worker_id: Optional[str] = None, limit: int = DEFAULT_BATCH_SIZE) -> int:
+    """Claim one batch and run it. Returns the number of tasks claimed."""
+    from app.services.task_handlers import TASK_HANDLERS
+
+    task_ids = claim_due_tasks(db, worker_id=worker_id or default_worker_id(), limit=limit)
+    for task_id in task_ids:
+        run_task(db, task_id, TASK_HANDLERS)
+    return len(task_ids)
+
+
+def purge_finished_tasks(db: Session, *, older_than_days: int = FINISHED_RETENTION_DAYS) -> int:
+    result = db.execute(
+        delete(BackgroundTask)
+        .where(
+            BackgroundTask.status == TaskStatus.DONE.value,
+            BackgroundTask.completed_at < _utc_now() - timedelta(days=older_than_days),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return int(result.rowcount or 0)
+
+
+def list_tasks(
+    db: Session,
+    *,
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+) -> tuple[list[BackgroundTask], int]:
+    q = db.query(BackgroundTask)
+    if status:
+        q = q.filter(BackgroundTask.status == status)
+    if kind:
+        q = q.filter(BackgroundTask.kind == kind)
+    total = q.count()
+    rows = (
+        q.order_by(BackgroundTask.updated_at.desc(), BackgroundTask.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+    return rows, total
+
+
+def retry_task(db: Session, task_id: int) -> Optional[BackgroundTask]:
+    """Put a dead task back on the queue with a fresh attempt budget. Does not commit."""
+    task = db.get(BackgroundTask, task_id)
+    if task is None:
+        return None
+    if task.status != TaskStatus.DEAD.value:
+        raise ValueError("Only dead tasks can be retried.")
+    task.status = TaskStatus.PENDING.value
+    task.attempts = 0
+    task.run_after = _utc_now()
+    task.locked_at = None
+    task.locked_by = None
+    db.flush()
+    return task
+
+
+# ---------------------------------------------------------------------------
+# In-process polling workers
+# ---------------------------------------------------------------------------
+
+class TaskWorker(threading.Thread):
+    def __init__(self, index: int, stop_event: threading.Event, poll_interval: float, batch_size: int) -> None:
+        super().__init__(name=f"task-worker-{index}", daemon=True)
+        self._stop_event = stop_event
+        self._poll_interval = poll_interval
+        self._batch_size = batch_size
+
+    def run(self) -> None:
+        worker_id = default_worker_id()
+        while not self._stop_event.is_set():
+            claimed = 0
+            db = SessionLocal()
+            try:
+                claimed = run_pending_tasks(db, worker_id=worker_id, limit=self._batch_size)
+            except Exception:
+                logger.exception("Task worker %s failed to poll", worker_id)
+            finally:
+                db.close()
+            if claimed < self._batch_size:
+                self._stop_event.wait(self._poll_interval)
+
+
+_stop_event = threading.Event()
+_workers: list[TaskWorker] = []
+
+
+def start_task_workers(count: int, *, poll_interval: float, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    if _workers or count <= 0:
+        return
+    _stop_event.clear()
+    for i in range(count):
+        worker = TaskWorker(i, _stop_event, poll_interval, batch_size)
+        worker.start()
+        _workers.append(worker)
+
+
+def stop_task_workers(timeout: float = 5.0) -> None:
+    _stop_event.set()
+    for worker in _workers:
+        worker.join(timeout=timeout)
+    _workers.clear()
@@ -1,13 +1,25 @@
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import hashlib
 import json
-from typing import Optional
+from typing import Any, Iterable, Optional
 
+from sqlalchemy import select, text, update
 from sqlalchemy.orm import Session
 
-from app.models.token import TokenAccount, TokenTransaction, TokenBlock, TokenAccount, TokenTransaction, TokenBlock
+from app.core.config import settings
+from app.models.token import TokenAccount, TokenTransaction, TokenBlock
+from app.services.pcc_ledger_service import (
+    ACCOUNT_TOKEN,
+    LEGACY_TOKEN_TRANSACTIONS,
+    LedgerPosting,
+    post_ledger_entries,
+)
+from app.services.task_queue_service import TASK_TOKEN_BLOCK, enqueue_task
 
 
 PCC_PER_CO2E_KG = 1.0  # 1 PCC token per 1 kg CO2e (we can tune later)
+TOKEN_CHAIN_LOCK_KEY = 0x70636301  # pg advisory lock serialising block appends
 
 
 def get_or_create_account(db: Session, user_id: int) -> TokenAccount:
@@ -43,40 +55,181 @@ def add_transaction(
         created_at=datetime.utcnow(),
     )
     db.add(tx)
+    db.flush()
+    post_ledger_entries(
+        db,
+        [
+            LedgerPosting(
+                account_kind=ACCOUNT_TOKEN,
+                account_id=account.id,
+                amount_pcc=float(amount),
+                source="token",
+                ref_type=tx_type,
+                legacy_table=LEGACY_TOKEN_TRANSACTIONS,
+                legacy_id=tx.id,
+                user_id=user_id,
+            )
+        ],
+    )
+    _schedule_block(db, tx.id)
     db.commit()
     db.refresh(tx)
 
-    _append_block_for_transaction(db, tx)
-
     return tx
 
 
-def _append_block_for_transaction(db: Session, tx: TokenTransaction) -> None:
-    # Serialize transaction into a simple string payload
-    data = json.dumps(
-        {
-            "tx_id": tx.id,
-            "account_id": tx.account_id,
-            "amount": tx.amount,
-            "type": tx.type,
-            "description": tx.description,
-            "created_at": tx.created_at.isoformat(),
-        },
-        sort_keys=True,
-    )
-
-    last_block = (
-        db.query(TokenBlock).order_by(TokenBlock.id.desc()).first()
-    )
-
-    previous_hash = last_block.hash if last_block else None
-    new_hash = TokenBlock.compute_hash(previous_hash, data)
-
-    block = TokenBlock(
-        previous_hash=previous_hash,
-        hash=new_hash,
-        data=data,
-        created_at=datetime.utcnow(),
+def _schedule_block(db: Session, tx_id: int) -> None:
+    """
+    Queue a seal for the current interval (one task per interval, due when it
+    ends), plus an immediate one every TOKEN_BLOCK_MAX_TXS transactions.
+    """
+    interval = max(1, settings.TOKEN_BLOCK_INTERVAL_SECONDS)
+    now = datetime.now(timezone.utc)
+    bucket = int(now.timestamp()) // interval
+    due = datetime.fromtimestamp((bucket + 1) * interval, tz=timezone.utc)
+    enqueue_task(db, TASK_TOKEN_BLOCK, {}, key=f"t{bucket}", run_after=due)
+    max_txs = max(1, settings.TOKEN_BLOCK_MAX_TXS)
+    if tx_id % max_txs == 0:
+        enqueue_task(db, TASK_TOKEN_BLOCK, {}, key=f"n{tx_id // max_txs}")
+
+
+# ---------------------------------------------------------------------------
+# Block writer
+# ---------------------------------------------------------------------------
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def transaction_payload(tx: TokenTransaction) -> dict[str, Any]:
+    return {
+        "tx_id": tx.id,
+        "account_id": tx.account_id,
+        "amount": tx.amount,
+        "type": tx.type,
+        "description": tx.description,
+        "created_at": tx.created_at.isoformat() if tx.created_at else None,
+    }
+
+
+def merkle_root(payloads: Iterable[dict[str, Any]]) -> str:
+    """SHA-256 Merkle root over canonical payloads; an odd node is paired with itself."""
+    level = [hashlib.sha256(_canonical_json(p).encode("utf-8")).digest() for p in payloads]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+def build_block_data(payloads: list[dict[str, Any]]) -> tuple[str, str]:
+    """(merkle_root, data) for a block sealing these transaction payloads."""
+    root = merkle_root(payloads)
+    return root, _canonical_json({"merkle_root": root, "txs": payloads})
+
+
+def seal_pending_transactions(db: Session, *, max_txs: Optional[int] = None) -> int:
+    """
+    Chain every unsealed token transaction into blocks of up to `max_txs`,
+    oldest first. Runs under an advisory lock so concurrent sealers queue
+    up behind each other instead of forking the chain off the same parent.
+    Returns the number of transactions sealed. Does not commit.
+    """
+    batch = max(1, max_txs or settings.TOKEN_BLOCK_MAX_TXS)
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": TOKEN_CHAIN_LOCK_KEY})
+    previous_hash = db.execute(select(TokenBlock.hash).order_by(TokenBlock.id.desc()).limit(1)).scalar()
+
+    sealed = 0
+    while True:
+        txs = db.execute(
+            select(TokenTransaction)
+            .where(TokenTransaction.block_id.is_(None))
+            .order_by(TokenTransaction.id)
+            .limit(batch)
+        ).scalars().all()
+        if not txs:
+            return sealed
+
+        root, data = build_block_data([transaction_payload(tx) for tx in txs])
+        block = TokenBlock(
+            previous_hash=previous_hash,
+            hash=TokenBlock.compute_hash(previous_hash, data),
+            data=data,
+            merkle_root=root,
+            tx_count=len(txs),
+            created_at=datetime.utcnow(),
+        )
+        db.add(block)
+        db.flush()
+        db.execute(
+            update(TokenTransaction)
+            .where(TokenTransaction.id.in_([tx.id for tx in txs]))
+            .values(block_id=block.id)
+            .execution_options(synchronize_session=False)
+        )
+        previous_hash = block.hash
+        sealed += len(txs)
+        if len(txs) < batch:
+            return sealed
+
+
+# ---------------------------------------------------------------------------
+# Chain verification
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ChainReport:
+    blocks: int = 0
+    transactions: int = 0
+    bad_block_id: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def verify_blocks(rows: Iterable[tuple]) -> ChainReport:
+    """
+    Check (id, previous_hash, hash, data, merkle_root) rows in chain order:
+    each block links to the previous hash, its hash covers its data, and a
+    batched block's Merkle root matches the transactions it carries. Stops
+    at the first broken block.
+    """
+    report = ChainReport()
+    previous_hash = None
+    for block_id, prev, block_hash, data, root in rows:
+        if prev != previous_hash:
+            report.bad_block_id, report.error = block_id, "previous_hash does not match the preceding block"
+            return report
+        if TokenBlock.compute_hash(prev, data) != block_hash:
+            report.bad_block_id, report.error = block_id, "hash does not match block data"
+            return report
+        tx_count = 1
+        if root is not None:
+            try:
+                body = json.loads(data)
+                txs = body["txs"]
+            except (ValueError, KeyError, TypeError):
+                report.bad_block_id, report.error = block_id, "block data is not a transaction batch"
+                return report
+            if body.get("merkle_root") != root or merkle_root(txs) != root:
+                report.bad_block_id, report.error = block_id, "merkle_root does not match block transactions"
+                return report
+            tx_count = len(txs)
+        report.blocks += 1
+        report.transactions += tx_count
+        previous_hash = block_hash
+    return report
+
+
+def verify_chain(db: Session, *, batch_size: int = 1000) -> ChainReport:
+    """Stream the whole chain from the database through verify_blocks()."""
+    rows = db.execute(
+        select(TokenBlock.id, TokenBlock.previous_hash, TokenBlock.hash, TokenBlock.data, TokenBlock.merkle_root)
+        .order_by(TokenBlock.id)
+        .execution_options(yield_per=batch_size)
     )
-    db.add(block)
-    db.commit()
+    return verify_blocks(tuple(row) for row in rows)
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime, UTC
 
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session, selectinload
 
-from app.models.badge import Badge, UserBadge
-from app.models.training import TrainingLesson, TrainingModule
+from app.models.badge import Badge, BadgeCategory
+from app.models.training import TrainingLesson, TrainingModule, TrainingProgress
 from app.schemas.training_cms import (
     LessonReorderRequest,
     TrainingLessonCreate,
@@ -16,6 +15,13 @@ from app.schemas.training_cms import (
     TrainingModuleListResponse,
     TrainingModuleUpdate,
 )
+from app.services.badge_engine import (
+    BadgeDefinition,
+    ensure_badge_definitions,
+    evaluate_rule_badges,
+    notify_badge_unlocks,
+)
+from app.services.badge_service import award_badge_if_not_awarded, create_badge_if_missing
 
 TRAINING_MILESTONE_BADGES: dict[str, list[tuple[int, str, str, str]]] = {
     "citizen": [
@@ -209,55 +215,47 @@ def get_published_module(db: Session, module_id: int) -> TrainingModule | None:
     )
 
 
-def _get_or_create_training_badge(
-    db: Session,
-    *,
-    code: str,
-    name: str,
-    description: str,
-    audience: str,
-    threshold: int,
-    criteria_key: str | None = None,
-) -> Badge:
-    badge = db.query(Badge).filter(Badge.code == code).first()
-    key = criteria_key or code
-    if badge is None:
-        badge = db.query(Badge).filter(Badge.criteria_key == key).first()
-    if badge is None:
-        badge = Badge(
-            code=code,
-            name=name,
-            description=description,
-            category="TRAINING",
-            criteria_key=key,
-            threshold=float(threshold),
-            rule_json={"kind": "training_milestone", "audience": audience, "threshold": threshold},
-            active=True,
-            is_active=True,
-            created_at=datetime.now(UTC).replace(tzinfo=None),
-        )
-        db.add(badge)
-        db.flush()
-    return badge
-
-
-def _award_training_badge_once(db: Session, *, user_id: int, badge: Badge, metadata: dict) -> bool:
-    exists = (
-        db.query(UserBadge)
-        .filter(UserBadge.user_id == user_id, UserBadge.badge_id == badge.id)
-        .first()
-    )
-    if exists:
-        return False
-    db.add(
-        UserBadge(
-            user_id=user_id,
-            badge_id=badge.id,
-            metadata_json=metadata,
-            awarded_at=datetime.now(UTC).replace(tzinfo=None),
-        )
+def _milestone_rule(audience: str, threshold: int) -> dict:
+    return {"scope": {"audience": audience}, "metric": "training_completed", "op": ">=", "threshold": threshold}
+
+
+TRAINING_BADGE_DEFINITIONS: list[BadgeDefinition] = [
+    BadgeDefinition(
+        code="GREEN_STARTER",
+        name="Green Starter",
+        category="TRAINING",
+        threshold=1,
+        rule=_milestone_rule("citizen", 1),
+        description="Completed your first citizen training module.",
+        criteria_key="citizen_training_first_module",
+    ),
+    BadgeDefinition(
+        code="CERTIFIED_CITIZEN",
+        name="Certified Citizen",
+        category="TRAINING",
+        threshold=1,
+        rule={
+            "scope": {"audience": "citizen"},
+            "all": [
+                {"metric": "training_total", "op": ">=", "threshold": 1},
+                {"metric": "training_completed", "op": ">=", "ref": "training_total"},
+            ],
+        },
+        description="Completed all published citizen training modules.",
+        criteria_key="citizen_training_all_modules",
+    ),
+] + [
+    BadgeDefinition(
+        code=code,
+        name=name,
+        category="TRAINING",
+        threshold=threshold,
+        rule=_milestone_rule(audience, threshold),
+        description=description,
     )
-    return True
+    for audience, rows in TRAINING_MILESTONE_BADGES.items()
+    for threshold, code, name, description in rows
+]
 
 
 def evaluate_training_milestone_badges(
@@ -268,51 +266,77 @@ def evaluate_training_milestone_badges(
     completed_count: int,
     total_count: int,
 ) -> list[Badge]:
-    newly_awarded: list[Badge] = []
-    metadata = {
-        "source": "training_milestone",
-        "audience": audience,
-        "completed_count": completed_count,
-        "total_count": total_count,
-    }
-
-    if audience == "citizen":
-        first_badge = _get_or_create_training_badge(
-            db,
-            code="GREEN_STARTER",
-            name="Green Starter",
-            description="Completed your first citizen training module.",
-            audience="citizen",
-            threshold=1,
-            criteria_key="citizen_training_first_module",
-        )
-        all_badge = _get_or_create_training_badge(
-            db,
-            code="CERTIFIED_CITIZEN",
-            name="Certified Citizen",
-            description="Completed all published citizen training modules.",
-            audience="citizen",
-            threshold=max(total_count, 1),
-            criteria_key="citizen_training_all_modules",
-        )
-        if completed_count >= 1 and _award_training_badge_once(db, user_id=user_id, badge=first_badge, metadata=metadata):
-            newly_awarded.append(first_badge)
-        if total_count > 0 and completed_count >= total_count and _award_training_badge_once(db, user_id=user_id, badge=all_badge, metadata=metadata):
-            newly_awarded.append(all_badge)
-
-    for threshold, code, name, description in TRAINING_MILESTONE_BADGES.get(audience, []):
-        badge = _get_or_create_training_badge(
-            db,
-            code=code,
-            name=name,
-            description=description,
-            audience=audience,
-            threshold=threshold,
-            criteria_key=code,
-        )
-        if completed_count >= threshold and _award_training_badge_once(db, user_id=user_id, badge=badge, metadata=metadata):
-            newly_awarded.append(badge)
-
+    ensure_badge_definitions(db, TRAINING_BADGE_DEFINITIONS)
+    newly_awarded = evaluate_rule_badges(
+        db,
+        user_id=user_id,
+        org_id=None,
+        metrics={"training_completed": completed_count, "training_total": total_count},
+        context={"audience": audience},
+        codes=[d.code for d in TRAINING_BADGE_DEFINITIONS],
+        metadata={
+            "source": "training_milestone",
+            "audience": audience,
+            "completed_count": completed_count,
+            "total_count": total_count,
+        },
+    )
     if newly_awarded:
         db.flush()
     return newly_awarded
+
+
+def apply_training_completion_effects(
+    db: Session,
+    *,
+    user_id: int,
+    module_id: int,
+    score: float,
+) -> list[Badge]:
+    """
+    Module badge + citizen milestone badges (with notifications) for a completion.
+
+    Runs in the completion request (and for training.completed tasks queued
+    before that); safe to repeat, and leaves the final commit to the caller.
+    """
+    criteria_key = f"training_module_{module_id}_completed"
+    create_badge_if_missing(
+        db=db,
+        name=f"Training Champion · Module {module_id}",
+        criteria_key=criteria_key,
+        category=BadgeCategory.TRAINING,
+        description=f"Completed training module {module_id}",
+        icon="badge_training_completed",
+    )
+    award_badge_if_not_awarded(
+        db=db,
+        user_id=user_id,
+        criteria_key=criteria_key,
+    )
+
+    completed_count = (
+        db.query(TrainingProgress)
+        .join(TrainingModule, TrainingModule.id == TrainingProgress.module_id)
+        .filter(
+            TrainingProgress.user_id == user_id,
+            TrainingProgress.completed.is_(True),
+            TrainingModule.audience == "citizen",
+            TrainingModule.is_published.is_(True),
+        )
+        .count()
+    )
+    total_count = (
+        db.query(TrainingModule)
+        .filter(TrainingModule.audience == "citizen", TrainingModule.is_published.is_(True))
+        .count()
+    )
+    unlocked = evaluate_training_milestone_badges(
+        db,
+        user_id=user_id,
+        audience="citizen",
+        completed_count=completed_count,
+        total_count=total_count,
+    )
+
+    notify_badge_unlocks(db, user_id=user_id, badges=unlocked, source="training milestones")
+    return unlocked
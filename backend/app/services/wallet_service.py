@@ -0,0 +1,208 @@
+"""
+Wallet balance snapshots.
+
+Every credit or debit written to `transactions` moves the owning wallet's
+snapshot through credit_wallet()/debit_wallet(), so balance_pcc,
+balance_points, lifetime_credited and lifetime_debited always change
+together. Each move is a single `UPDATE ... SET x = x + :delta RETURNING`,
+so concurrent awards never read-modify-write the same row, and amounts are
+quantized to PCC_QUANTUM before they reach the fixed-point columns.
+Summaries read the snapshots; find_wallet_drift() checks them against the
+transaction log for all wallets in one statement.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Optional, Union
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.bulk import Transaction, TransactionType, Wallet
+from app.models.user import User
+
+DRIFT_TOLERANCE = 1e-6
+PCC_QUANTUM = Decimal("0.000001")  # matches wallets NUMERIC(18, 6)
+
+Amount = Union[Decimal, float, int, str]
+
+
+@dataclass
+class WalletTotals:
+    credited: float
+    debited: float
+
+    @property
+    def net(self) -> float:
+        return self.credited - self.debited
+
+
+@dataclass
+class WalletDrift:
+    wallet_id: int
+    balance_pcc: float
+    lifetime_credited: float
+    lifetime_debited: float
+    ledger_credited: float
+    ledger_debited: float
+
+    @property
+    def ledger_balance(self) -> float:
+        return self.ledger_credited - self.ledger_debited
+
+
+def to_pcc(amount: Amount) -> Decimal:
+    """Fixed-point PCC amount. Floats go through str() so 0.1 stays 0.1."""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return amount.quantize(PCC_QUANTUM, rounding=ROUND_HALF_EVEN)
+
+
+_SNAPSHOT_COLUMNS = ("balance_pcc", "balance_points", "lifetime_credited", "lifetime_debited")
+
+
+def _move_wallet(db: Session, wallet: Wallet, *, credit: Decimal, debit: Decimal) -> None:
+    if wallet.id is None:
+        db.flush()
+    net = credit - debit
+    row = db.execute(
+        update(Wallet)
+        .where(Wallet.id == wallet.id)
+        .values(
+            balance_pcc=Wallet.balance_pcc + net,
+            balance_points=Wallet.balance_points + net,
+            lifetime_credited=Wallet.lifetime_credited + credit,
+            lifetime_debited=Wallet.lifetime_debited + debit,
+            updated_at=func.now(),
+        )
+        .returning(*(getattr(Wallet, c) for c in _SNAPSHOT_COLUMNS))
+        .execution_options(synchronize_session=False)
+    ).one()
+    # Mirror the new snapshot onto the loaded object without marking it dirty,
+    # so a later flush cannot write the stale values back.
+    for column, value in zip(_SNAPSHOT_COLUMNS, row):
+        set_committed_value(wallet, column, value)
+
+
+def credit_wallet(db: Session, wallet: Wallet, amount: Amount) -> None:
+    _move_wallet(db, wallet, credit=to_pcc(amount), debit=Decimal(0))
+
+
+def debit_wallet(db: Session, wallet: Wallet, amount: Amount) -> None:
+    _move_wallet(db, wallet, credit=Decimal(0), debit=to_pcc(amount))
+
+
+def adjust_user_balance(db: Session, user_id: int, amount: Amount) -> Optional[float]:
+    """Atomically add `amount` to users.pcc_balance. None when the user does not exist."""
+    balance = db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(pcc_balance=User.pcc_balance + to_pcc(amount))
+        .returning(User.pcc_balance)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if balance is None:
+        return None
+    user = db.identity_map.get(Session.identity_key(User, user_id))
+    if user is not None:
+        set_committed_value(user, "pcc_balance", balance)
+    return float(balance)
+
+
+def user_wallet_totals(db: Session, user_id: int) -> WalletTotals:
+    """Lifetime credits/debits across the user's wallets, from the snapshots."""
+    credited, debited = db.execute(
+        select(
+            func.coalesce(func.sum(Wallet.lifetime_credited), 0.0),
+            func.coalesce(func.sum(Wallet.lifetime_debited), 0.0),
+        ).where(Wallet.user_id == user_id)
+    ).one()
+    return WalletTotals(credited=float(credited), debited=float(debited))
+
+
+def _amount_columns():
+    amount = func.coalesce(Transaction.amount_pcc, Transaction.amount_points, 0.0)
+    is_debit = Transaction.tx_type == TransactionType.DEBIT
+    return (
+        func.coalesce(func.sum(amount).filter(~is_debit), 0.0),
+        func.coalesce(func.sum(amount).filter(is_debit), 0.0),
+    )
+
+
+def _ledger_totals():
+    credited, debited = _amount_columns()
+    return (
+        select(
+            Transaction.wallet_id.label("wallet_id"),
+            credited.label("credited"),
+            debited.label("debited"),
+        )
+        .group_by(Transaction.wallet_id)
+        .subquery("ledger")
+    )
+
+
+def find_wallet_drift(
+    db: Session,
+    *,
+    tolerance: float = DRIFT_TOLERANCE,
+    limit: Optional[int] = None,
+) -> list[WalletDrift]:
+    """Wallets whose snapshot disagrees with the sum of their transactions."""
+    ledger = _ledger_totals()
+    credited = func.coalesce(ledger.c.credited, 0.0)
+    debited = func.coalesce(ledger.c.debited, 0.0)
+    stmt = (
+        select(
+            Wallet.id,
+            Wallet.balance_pcc,
+            Wallet.lifetime_credited,
+            Wallet.lifetime_debited,
+            credited,
+            debited,
+        )
+        .outerjoin(ledger, ledger.c.wallet_id == Wallet.id)
+        .where(
+            (func.abs(Wallet.lifetime_credited - credited) > tolerance)
+            | (func.abs(Wallet.lifetime_debited - debited) > tolerance)
+            | (func.abs(Wallet.balance_pcc - (credited - debited)) > tolerance)
+        )
+        .order_by(Wallet.id)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [
+        WalletDrift(
+            wallet_id=int(row[0]),
+            balance_pcc=float(row[1] or 0.0),
+            lifetime_credited=float(row[2] or 0.0),
+            lifetime_debited=float(row[3] or 0.0),
+            ledger_credited=float(row[4]),
+            ledger_debited=float(row[5]),
+        )
+        for row in db.execute(stmt)
+    ]
+
+
+def repair_wallet_snapshots(db: Session, wallet_ids: list[int]) -> int:
+    """Reset the given wallets' snapshots to their transaction totals. Does not commit."""
+    if not wallet_ids:
+        return 0
+    credited_col, debited_col = _amount_columns()
+    credited = select(credited_col).where(Transaction.wallet_id == Wallet.id).scalar_subquery()
+    debited = select(debited_col).where(Transaction.wallet_id == Wallet.id).scalar_subquery()
+    result = db.execute(
+        update(Wallet)
+        .where(Wallet.id.in_(wallet_ids))
+        .values(
+            lifetime_credited=credited,
+            lifetime_debited=debited,
+            balance_pcc=credited - debited,
+            balance_points=credited - debited,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return int(result.rowcount or 0)
@@ -1,16 +1,19 @@
 from datetime import datetime, timezone
 from typing import Optional, List
 
+from fastapi import HTTPException
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 
+from app.core.geo import geohash_for
 from app.models.waste_report import WasteReport, WasteReportStatus
 from app.models.user import User, UserRole
 from app.models.badge import BadgeCategory
-from app.services.badge_service import (
-    create_badge_if_missing,
-    award_badge_if_not_awarded,
-)
+from app.schemas.waste_report import WasteReportRead
+from app.services.badge_engine import BadgeDefinition, ensure_badge_definitions, evaluate_rule_badges
 from app.services.carbon_service import add_carbon_activity
+from app.services.job_feed_service import REPORT_CLAIMED, REPORT_CREATED, publish_job_event
+from app.services.task_queue_service import TASK_REPORT_BADGES, enqueue_task
 
 
 def _now_utc() -> datetime:
@@ -63,6 +66,7 @@ def create_waste_report(
         description=description,
         latitude=latitude,
         longitude=longitude,
+        geohash=geohash_for(latitude, longitude),
         classification_label=classification_label,
         classification_confidence=classification_confidence,
         classification_recyclable=classification_recyclable,
@@ -72,31 +76,53 @@ def create_waste_report(
         household_id=household_id,
     )
     db.add(report)
+    db.flush()
+    enqueue_task(db, TASK_REPORT_BADGES, {"reporter_id": reporter_id}, key=report.id)
     db.commit()
     db.refresh(report)
-
-    _handle_reporting_badges_on_create(db, reporter_id)
+    publish_job_event(REPORT_CREATED, WasteReportRead.model_validate(report).model_dump(mode="json"))
 
     return report
 
 
-def _handle_reporting_badges_on_create(db: Session, reporter_id: int) -> None:
-    from app.models.badge import UserBadge, Badge  # noqa: F401
+def publish_reports_claimed(worker_id: int, report_ids) -> None:
+    for report_id in report_ids:
+        publish_job_event(
+            REPORT_CLAIMED,
+            {
+                "report_id": report_id,
+                "assigned_worker_id": worker_id,
+                "status": WasteReportStatus.IN_PROGRESS.value,
+            },
+        )
 
-    count = db.query(WasteReport).filter(WasteReport.reporter_id == reporter_id).count()
-    if count < 1:
-        return
 
-    criteria_key = "first_waste_report"
-    create_badge_if_missing(
-        db=db,
+REPORTING_BADGE_DEFINITIONS = [
+    BadgeDefinition(
+        code="first_waste_report",
         name="Active Reporter",
-        criteria_key=criteria_key,
-        category=BadgeCategory.REPORTING,
+        category=BadgeCategory.REPORTING.value,
+        threshold=1,
+        rule={"metric": "reports_submitted", "op": ">=", "threshold": 1},
         description="Submitted at least one waste report",
         icon="badge_reporting_active",
+    ),
+]
+
+
+def _handle_reporting_badges_on_create(db: Session, reporter_id: int) -> None:
+    count = db.query(func.count(WasteReport.id)).filter(WasteReport.reporter_id == reporter_id).scalar() or 0
+
+    ensure_badge_definitions(db, REPORTING_BADGE_DEFINITIONS)
+    evaluate_rule_badges(
+        db,
+        user_id=reporter_id,
+        org_id=None,
+        metrics={"reports_submitted": int(count)},
+        codes=[d.code for d in REPORTING_BADGE_DEFINITIONS],
+        metadata={"source": "reporting"},
     )
-    award_badge_if_not_awarded(db=db, user_id=reporter_id, criteria_key=criteria_key)
+    db.commit()
 
 
 def update_report_status(
@@ -125,6 +151,119 @@ def update_report_status(
     return report
 
 
+def claim_reports(db: Session, *, worker_id: int, report_ids) -> List[int]:
+    """
+    The report claim primitive: one conditional UPDATE .. RETURNING, so a
+    report can never end up with two workers. `report_ids` is a list or an id
+    subquery. Returns the ids that were claimed. Does not commit; publish with
+    publish_reports_claimed() after committing.
+    """
+    return db.execute(
+        update(WasteReport)
+        .where(
+            WasteReport.id.in_(report_ids),
+            WasteReport.status == WasteReportStatus.OPEN.value,
+            or_(
+                WasteReport.assigned_worker_id.is_(None),
+                WasteReport.assigned_worker_id == worker_id,
+            ),
+        )
+        .values(
+            assigned_worker_id=worker_id,
+            status=WasteReportStatus.IN_PROGRESS.value,
+            updated_at=_now_utc(),
+        )
+        .returning(WasteReport.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+
+def claim_open_report(db: Session, *, report_id: int, worker_id: int) -> Optional[WasteReport]:
+    """
+    Atomically assign an OPEN report to a worker.
+
+    Returns None when the report is missing, not OPEN, or already held by
+    another worker; callers inspect the row to pick the right error.
+    """
+    if not claim_reports(db, worker_id=worker_id, report_ids=[report_id]):
+        db.rollback()
+        return None
+
+    db.commit()
+    publish_reports_claimed(worker_id, [report_id])
+    report = db.get(WasteReport, report_id)
+    db.refresh(report)
+    return report
+
+
+def claim_report_for_worker(db: Session, *, report_id: int, worker_id: int) -> WasteReport:
+    """claim_open_report() that raises the API error when the claim does not take."""
+    report = claim_open_report(db, report_id=report_id, worker_id=worker_id)
+    if report is not None:
+        return report
+
+    report = db.query(WasteReport).filter(WasteReport.id == report_id).first()
+    if not report:
+        raise HTTPException(404, "Report not found")
+    if report.assigned_worker_id and report.assigned_worker_id != worker_id:
+        raise HTTPException(409, "Already assigned to another worker")
+    raise HTTPException(400, "Only OPEN reports may be claimed")
+
+
+WORKER_REPORT_STATUSES = (WasteReportStatus.IN_PROGRESS, WasteReportStatus.RESOLVED)
+
+
+def set_report_status_by_worker(
+    db: Session,
+    *,
+    report_id: int,
+    worker: User,
+    new_status: WasteReportStatus,
+) -> WasteReport:
+    report = db.query(WasteReport).filter(WasteReport.id == report_id).first()
+    if not report:
+        raise HTTPException(404, "Report not found")
+
+    if worker.role == UserRole.WASTE_WORKER and report.assigned_worker_id != worker.id:
+        raise HTTPException(403, "Not assigned to this report")
+
+    if new_status not in WORKER_REPORT_STATUSES:
+        raise HTTPException(400, "Workers can only set IN_PROGRESS or RESOLVED")
+
+    return update_report_status(
+        db=db,
+        report_id=report_id,
+        new_status=new_status,
+        assigned_worker_id=report.assigned_worker_id or worker.id,
+    )
+
+
+def auto_assign_open_reports(db: Session, *, worker_id: int, limit: int = 5) -> List[WasteReport]:
+    """Assign the oldest unclaimed OPEN reports, skipping rows other workers hold locks on."""
+    candidates = (
+        select(WasteReport.id)
+        .where(
+            WasteReport.status == WasteReportStatus.OPEN.value,
+            WasteReport.assigned_worker_id.is_(None),
+        )
+        .order_by(WasteReport.created_at.asc(), WasteReport.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed_ids = claim_reports(db, worker_id=worker_id, report_ids=candidates)
+    db.commit()
+
+    if not claimed_ids:
+        return []
+    publish_reports_claimed(worker_id, claimed_ids)
+    return (
+        db.query(WasteReport)
+        .filter(WasteReport.id.in_(claimed_ids))
+        .order_by(WasteReport.created_at.asc(), WasteReport.id.asc())
+        .all()
+    )
+
+
 def _handle_resolution_rewards(db: Session, report: WasteReport) -> None:
     co2e_worker = 0.2
     co2e_reporter = 0.1
@@ -0,0 +1,406 @@
+"""
+Offline-first sync for the worker app.
+
+One POST /worker/sync carries the worker's queued offline mutations and the
+watermark from its previous sync. The response holds the outcome of each
+mutation, then every pickup, report and segregation log relevant to the
+worker that changed after the watermark, plus a new watermark.
+
+Mutations
+  * are applied in the order sent, each in its own transaction, through the
+    same service functions as the one-shot endpoints;
+  * carry a client-generated key. The outcome row commits together with the
+    effect, so replaying a key returns the stored outcome and never applies
+    the mutation twice;
+  * resolve conflicts on the server, deterministically. The first committed
+    claim wins, a status change must be a valid transition from the current
+    server state, and a losing mutation is rejected, never merged. The
+    authoritative row is in the same response's delta, because deltas are
+    read after the mutations run.
+
+Deltas
+  updated_at is stamped by the app before commit, so a slow transaction can
+  commit a row stamped earlier than a watermark already handed out. Each
+  delta therefore re-reads WATERMARK_OVERLAP before the watermark, and
+  clients upsert rows by id. worker_sync_items records which pickup and
+  report ids the worker's device was sent; those that changed and no longer
+  concern the worker (claimed by someone else, reassigned, closed) come back
+  as bare ids under `removed`, and are forgotten once a later watermark shows
+  the device saw that response. An unreadable or very old watermark gets a
+  full snapshot instead, which also resets the device's ids.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import and_, delete, false, func, not_, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.bulk import PickupRequest, PickupRequestStatus
+from app.models.household import Household, SegregationLog
+from app.models.user import User, UserRole
+from app.models.waste_report import WasteReport, WasteReportStatus
+from app.models.worker_sync import WorkerSyncItem, WorkerSyncMutation
+from app.schemas.bulk import VerificationCreate, WorkerJobRead, WorkerPickupStatusUpdate
+from app.schemas.segregation import SegregationLogCreate
+from app.services.bulk_service import (
+    _worker_job_read,
+    _worker_jobs_query,
+    claim_worker_job,
+    update_worker_job_status,
+    verify_bulk_waste,
+)
+from app.services.segregation_service import log_segregation
+from app.services.waste_report_service import claim_report_for_worker, set_report_status_by_worker
+
+WATERMARK_PREFIX = "w1."
+WATERMARK_OVERLAP = timedelta(minutes=2)
+WATERMARK_MAX_AGE = timedelta(days=14)
+SNAPSHOT_LOG_DAYS = 30
+
+OP_PICKUP_CLAIM = "pickup.claim"
+OP_PICKUP_STATUS = "pickup.status"
+OP_REPORT_CLAIM = "report.claim"
+OP_REPORT_STATUS = "report.status"
+OP_VERIFICATION_CREATE = "verification.create"
+OP_SEGREGATION_LOG = "segregation.log"
+
+ITEM_PICKUP = "pickup"
+ITEM_REPORT = "report"
+
+MUTATION_APPLIED = "applied"
+MUTATION_REJECTED = "rejected"
+
+
+@dataclass
+class MutationOutcome:
+    key: str
+    status: str
+    http_status: int
+    detail: Optional[str] = None
+    result: dict[str, Any] = field(default_factory=dict)
+    replayed: bool = False
+
+
+@dataclass
+class SyncDelta:
+    watermark: str
+    full: bool
+    pickups: list[WorkerJobRead] = field(default_factory=list)
+    reports: list[WasteReport] = field(default_factory=list)
+    segregation_logs: list[SegregationLog] = field(default_factory=list)
+    removed_pickups: list[int] = field(default_factory=list)
+    removed_reports: list[int] = field(default_factory=list)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Watermarks
+# ---------------------------------------------------------------------------
+
+def encode_watermark(at: datetime) -> str:
+    return f"{WATERMARK_PREFIX}{int(at.timestamp() * 1_000_000)}"
+
+
+def decode_watermark(token: Optional[str], *, now: datetime) -> Optional[datetime]:
+    """The instant a watermark was issued, or None when a full snapshot is due."""
+    if not token or not token.startswith(WATERMARK_PREFIX):
+        return None
+    try:
+        at = datetime.fromtimestamp(int(token[len(WATERMARK_PREFIX):]) / 1_000_000, tz=timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return None
+    if at > now or now - at > WATERMARK_MAX_AGE:
+        return None
+    return at
+
+
+# ---------------------------------------------------------------------------
+# Mutations
+# ---------------------------------------------------------------------------
+
+def _pickup_claim(db: Session, user: User, args: dict[str, Any]) -> dict[str, Any]:
+    pickup = claim_worker_job(db, current_user=user, pickup_request_id=int(args["pickup_request_id"]))
+    return {"pickup_request_id": pickup.id, "status": pickup.status.value}
+
+
+def _pickup_status(db: Session, user: User, args: dict[str, Any]) -> dict[str, Any]:
+    pickup = update_worker_job_status(
+        db,
+        current_user=user,
+        pickup_request_id=int(args["pickup_request_id"]),
+        payload=WorkerPickupStatusUpdate(status=args["status"], note=args.get("note")),
+    )
+    return {"pickup_request_id": pickup.id, "status": pickup.status.value}
+
+
+def _report_claim(db: Session, user: User, args: dict[str, Any]) -> dict[str, Any]:
+    report = claim_report_for_worker(db, report_id=int(args["report_id"]), worker_id=user.id)
+    return {"report_id": report.id, "status": report.status}
+
+
+def _report_status(db: Session, user: User, args: dict[str, Any]) -> dict[str, Any]:
+    report = set_report_status_by_worker(
+        db,
+        report_id=int(args["report_id"]),
+        worker=user,
+        new_status=WasteReportStatus(args["status"]),
+    )
+    return {"report_id": report.id, "status": report.status}
+
+
+def _verification_create(db: Session, user: User, args: dict[str, Any]) -> dict[str, Any]:
+    # Offline verifications carry no proof photo; it can be attached later.
+    verification, _, _ = verify_bulk_waste(
+        db,
+        current_user=user,
+        payload=VerificationCreate(**args),
+        proof_photo=None,
+    )
+    return {"verification_id": verification.id, "pcc_awarded": verification.pcc_awarded}
+
+
+def _segregation_log(db: Session, user: User, args: dict[str, Any]) -> dict[str, Any]:
+    if user.role != UserRole.WASTE_WORKER:
+        raise HTTPException(status_code=403, detail="Only waste workers can record logs")
+    body = SegregationLogCreate(**args)
+    if db.get(Household, body.household_id) is None:
+        raise HTTPException(status_code=404, detail="Household not found")
+    log = log_segregation(
+        db=db,
+        household_id=body.household_id,
+        worker_id=user.id,
+        log_date=body.log_date,
+        dry_kg=body.dry_kg,
+        wet_kg=body.wet_kg,
+        reject_kg=body.reject_kg,
+        notes=body.notes,
+        waste_report_id=body.waste_report_id,
+    )
+    return {"log_id": log.id, "segregation_score": log.segregation_score}
+
+
+MUTATION_HANDLERS: dict[str, Callable[[Session, User, dict[str, Any]], dict[str, Any]]] = {
+    OP_PICKUP_CLAIM: _pickup_claim,
+    OP_PICKUP_STATUS: _pickup_status,
+    OP_REPORT_CLAIM: _report_claim,
+    OP_REPORT_STATUS: _report_status,
+    OP_VERIFICATION_CREATE: _verification_create,
+    OP_SEGREGATION_LOG: _segregation_log,
+}
+
+
+def _outcome_of(row: WorkerSyncMutation, *, replayed: bool) -> MutationOutcome:
+    return MutationOutcome(
+        key=row.client_key,
+        status=row.status,
+        http_status=int(row.http_status),
+        detail=row.detail,
+        result=dict(row.result_json or {}),
+        replayed=replayed,
+    )
+
+
+def _stored(db: Session, user_id: int, key: str) -> Optional[WorkerSyncMutation]:
+    return db.execute(
+        select(WorkerSyncMutation).where(WorkerSyncMutation.user_id == user_id, WorkerSyncMutation.client_key == key)
+    ).scalar_one_or_none()
+
+
+def _reject(db: Session, user: User, key: str, op: str, http_status: int, detail: str) -> MutationOutcome:
+    db.rollback()
+    row = WorkerSyncMutation(
+        user_id=user.id,
+        client_key=key,
+        op=op,
+        status=MUTATION_REJECTED,
+        http_status=http_status,
+        detail=str(detail)[:500],
+        result_json={},
+    )
+    db.add(row)
+    try:
+        db.commit()
+    except IntegrityError:
+        # The same key landed from a concurrent sync; its outcome wins.
+        db.rollback()
+        existing = _stored(db, user.id, key)
+        if existing is not None:
+            return _outcome_of(existing, replayed=True)
+        raise
+    return _outcome_of(row, replayed=False)
+
+
+def _apply_one(db: Session, user: User, key: str, op: str, args: dict[str, Any]) -> MutationOutcome:
+    handler = MUTATION_HANDLERS.get(op)
+    if handler is None:
+        return _reject(db, user, key, op, 422, f"Unknown op {op!r}")
+
+    # Pending until the handler's own commit, so the outcome row and the
+    # effect commit (or roll back) together.
+    row = WorkerSyncMutation(user_id=user.id, client_key=key, op=op, status=MUTATION_APPLIED, http_status=200, result_json={})
+    db.add(row)
+    try:
+        result = handler(db, user, args)
+    except HTTPException as exc:
+        return _reject(db, user, key, op, exc.status_code, exc.detail)
+    except (KeyError, TypeError, ValueError, ValidationError) as exc:
+        return _reject(db, user, key, op, 422, f"Invalid args: {exc}")
+    except IntegrityError:
+        db.rollback()
+        existing = _stored(db, user.id, key)
+        if existing is not None:
+            return _outcome_of(existing, replayed=True)
+        return _reject(db, user, key, op, 409, "Conflicts with an existing record")
+
+    row.result_json = result
+    db.commit()
+    return _outcome_of(row, replayed=False)
+
+
+def apply_mutations(db: Session, *, user: User, mutations: Sequence[tuple[str, str, dict[str, Any]]]) -> list[MutationOutcome]:
+    """Apply (key, op, args) mutations in order; keys seen before return their stored outcome."""
+    keys = list(dict.fromkeys(key for key, _, _ in mutations))
+    known: dict[str, MutationOutcome] = {}
+    if keys:
+        rows = db.execute(
+            select(WorkerSyncMutation).where(
+                WorkerSyncMutation.user_id == user.id,
+                WorkerSyncMutation.client_key.in_(keys),
+            )
+        ).scalars()
+        known = {row.client_key: _outcome_of(row, replayed=True) for row in rows}
+
+    outcomes: list[MutationOutcome] = []
+    for key, op, args in mutations:
+        if key in known:
+            outcomes.append(known[key])
+            continue
+        outcome = _apply_one(db, user, key, op, args)
+        known[key] = replace(outcome, replayed=True)
+        outcomes.append(outcome)
+    return outcomes
+
+
+# ---------------------------------------------------------------------------
+# Deltas
+# ---------------------------------------------------------------------------
+
+def _pickup_relevant(user_id: int):
+    return or_(
+        PickupRequest.assigned_worker_id.is_not_distinct_from(user_id),
+        and_(
+            PickupRequest.status == PickupRequestStatus.REQUESTED,
+            PickupRequest.assigned_worker_id.is_(None),
+        ),
+    )
+
+
+def _report_relevant(user_id: int):
+    return or_(
+        WasteReport.assigned_worker_id.is_not_distinct_from(user_id),
+        and_(
+            WasteReport.status == WasteReportStatus.OPEN.value,
+            WasteReport.assigned_worker_id.is_(None),
+        ),
+    )
+
+
+def _removed_items(db: Session, *, user_id: int, kind: str, model, relevant, since: datetime) -> list[int]:
+    """
+    Held ids whose row no longer concerns the worker and changed after `since`
+    (or is gone). Held ids the device was already told about are forgotten.
+    """
+    tell = or_(model.id.is_(None), func.coalesce(model.updated_at > since, false()))
+    rows = db.execute(
+        select(WorkerSyncItem.item_id, tell)
+        .outerjoin(model, model.id == WorkerSyncItem.item_id)
+        .where(
+            WorkerSyncItem.user_id == user_id,
+            WorkerSyncItem.kind == kind,
+            or_(model.id.is_(None), not_(relevant)),
+        )
+        .order_by(WorkerSyncItem.item_id)
+    ).all()
+    told = [item_id for item_id, pending in rows if not pending]
+    if told:
+        db.execute(
+            delete(WorkerSyncItem).where(
+                WorkerSyncItem.user_id == user_id,
+                WorkerSyncItem.kind == kind,
+                WorkerSyncItem.item_id.in_(told),
+            )
+        )
+    return [item_id for item_id, pending in rows if pending]
+
+
+def _remember_items(db: Session, *, user_id: int, full: bool, items: list[tuple[str, int]]) -> None:
+    if full:
+        db.execute(delete(WorkerSyncItem).where(WorkerSyncItem.user_id == user_id))
+    if items:
+        db.execute(
+            pg_insert(WorkerSyncItem)
+            .values([{"user_id": user_id, "kind": kind, "item_id": item_id} for kind, item_id in items])
+            .on_conflict_do_nothing()
+        )
+
+
+def collect_delta(db: Session, *, user: User, watermark: Optional[str], today: Optional[date] = None) -> SyncDelta:
+    """
+    Everything relevant to the worker that changed since `watermark`. Records
+    the ids sent but does not commit: the caller commits once the response is
+    built, so the loaded rows are not expired first.
+    """
+    now = _utc_now()
+    issued = decode_watermark(watermark, now=now)
+    since = issued - WATERMARK_OVERLAP if issued is not None else None
+    delta = SyncDelta(watermark=encode_watermark(now), full=since is None)
+
+    pickups = _worker_jobs_query(db).filter(_pickup_relevant(user.id))
+    reports = (
+        db.query(WasteReport)
+        .options(selectinload(WasteReport.household))
+        .filter(_report_relevant(user.id))
+    )
+    logs = (
+        db.query(SegregationLog)
+        .options(selectinload(SegregationLog.waste_report))
+        .filter(SegregationLog.worker_id == user.id)
+    )
+    if since is None:
+        logs = logs.filter(SegregationLog.log_date >= (today or now.date()) - timedelta(days=SNAPSHOT_LOG_DAYS))
+    else:
+        pickups = pickups.filter(PickupRequest.updated_at > since)
+        reports = reports.filter(WasteReport.updated_at > since)
+        # Logs are never edited, so created_at is their change time.
+        logs = logs.filter(SegregationLog.created_at > since)
+        delta.removed_pickups = _removed_items(
+            db, user_id=user.id, kind=ITEM_PICKUP, model=PickupRequest, relevant=_pickup_relevant(user.id), since=since
+        )
+        delta.removed_reports = _removed_items(
+            db, user_id=user.id, kind=ITEM_REPORT, model=WasteReport, relevant=_report_relevant(user.id), since=since
+        )
+
+    delta.pickups = [
+        _worker_job_read(pickup, log, org)
+        for pickup, log, org in pickups.order_by(PickupRequest.id.asc()).all()
+    ]
+    delta.reports = reports.order_by(WasteReport.id.asc()).all()
+    delta.segregation_logs = logs.order_by(SegregationLog.id.asc()).all()
+    _remember_items(
+        db,
+        user_id=user.id,
+        full=delta.full,
+        items=[(ITEM_PICKUP, p.pickup_request_id) for p in delta.pickups] + [(ITEM_REPORT, r.id) for r in delta.reports],
+    )
+    return delta
@@ -0,0 +1,29 @@
+-- Durable queue for post-commit side effects (badges, carbon, token blocks).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS background_tasks (
+  id SERIAL PRIMARY KEY,
+  kind VARCHAR(64) NOT NULL,
+  idempotency_key VARCHAR(200) NOT NULL UNIQUE,
+  payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+  status VARCHAR(16) NOT NULL DEFAULT 'pending',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 5,
+  run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  locked_at TIMESTAMPTZ NULL,
+  locked_by VARCHAR(128) NULL,
+  last_error TEXT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  completed_at TIMESTAMPTZ NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_background_tasks_id ON background_tasks(id);
+CREATE INDEX IF NOT EXISTS ix_background_tasks_kind ON background_tasks(kind);
+CREATE INDEX IF NOT EXISTS ix_background_tasks_status ON background_tasks(status);
+CREATE INDEX IF NOT EXISTS ix_background_tasks_due
+  ON background_tasks(run_after, id)
+  WHERE status IN ('pending', 'running');
+
+COMMIT;
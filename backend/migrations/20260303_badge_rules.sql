@@ -0,0 +1,44 @@
+-- Adopt criteria_key-only badges and store declarative rules in badges.rule_json.
+
+BEGIN;
+
+UPDATE badges SET code = 'first_waste_report'
+WHERE code IS NULL AND criteria_key = 'first_waste_report';
+
+UPDATE badges SET code = 'segregation_star_7', criteria_key = 'segregation_star_7'
+WHERE code IS NULL AND name = 'Segregation Star (7-day streak)';
+
+UPDATE badges AS b
+SET rule_json = r.rule
+FROM (VALUES
+  ('impact_10', '{"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": 10.0}'::jsonb),
+  ('impact_50', '{"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": 50.0}'::jsonb),
+  ('impact_200', '{"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": 200.0}'::jsonb),
+  ('impact_500', '{"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": 500.0}'::jsonb),
+  ('impact_1000', '{"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": 1000.0}'::jsonb),
+  ('streak_7', '{"metric": "current_streak_days", "op": ">=", "threshold": 7}'::jsonb),
+  ('streak_30', '{"metric": "current_streak_days", "op": ">=", "threshold": 30}'::jsonb),
+  ('streak_180', '{"metric": "current_streak_days", "op": ">=", "threshold": 180}'::jsonb),
+  ('quality_95', '{"all": [{"metric": "rolling_30d_quality_score", "op": ">=", "threshold": 0.95}, {"metric": "rolling_30d_verified_logs", "op": ">=", "threshold": 10}]}'::jsonb),
+  ('quality_85', '{"all": [{"metric": "rolling_30d_quality_score", "op": ">=", "threshold": 0.85}, {"metric": "rolling_30d_verified_logs", "op": ">=", "threshold": 10}]}'::jsonb),
+  ('bulk_first_verified', '{"metric": "org_verified_count", "op": ">=", "scope": {"target": "bulk"}, "threshold": 1}'::jsonb),
+  ('bulk_segregation_star', '{"metric": "event_score", "op": ">=", "scope": {"target": "bulk"}, "threshold": 95.0}'::jsonb),
+  ('bulk_century_pcc', '{"metric": "pcc_snapshot", "op": ">=", "scope": {"target": "bulk"}, "threshold": 100.0}'::jsonb),
+  ('worker_bulk_verifier_1', '{"metric": "worker_verified_count", "op": ">=", "scope": {"target": "worker"}, "threshold": 1}'::jsonb),
+  ('worker_bulk_verifier_25', '{"metric": "worker_verified_count", "op": ">=", "scope": {"target": "worker"}, "threshold": 25}'::jsonb),
+  ('worker_bulk_quality_guardian', '{"all": [{"metric": "worker_quality_count", "op": ">=", "threshold": 10}, {"metric": "event_score", "op": ">=", "threshold": 95.0}], "scope": {"target": "worker"}}'::jsonb),
+  ('GREEN_STARTER', '{"metric": "training_completed", "op": ">=", "scope": {"audience": "citizen"}, "threshold": 1}'::jsonb),
+  ('CERTIFIED_CITIZEN', '{"all": [{"metric": "training_total", "op": ">=", "threshold": 1}, {"metric": "training_completed", "op": ">=", "ref": "training_total"}], "scope": {"audience": "citizen"}}'::jsonb),
+  ('citizen_training_3', '{"metric": "training_completed", "op": ">=", "scope": {"audience": "citizen"}, "threshold": 3}'::jsonb),
+  ('citizen_training_5', '{"metric": "training_completed", "op": ">=", "scope": {"audience": "citizen"}, "threshold": 5}'::jsonb),
+  ('citizen_training_10', '{"metric": "training_completed", "op": ">=", "scope": {"audience": "citizen"}, "threshold": 10}'::jsonb),
+  ('bulk_training_1', '{"metric": "training_completed", "op": ">=", "scope": {"audience": "bulk_generator"}, "threshold": 1}'::jsonb),
+  ('bulk_training_3', '{"metric": "training_completed", "op": ">=", "scope": {"audience": "bulk_generator"}, "threshold": 3}'::jsonb),
+  ('bulk_training_5', '{"metric": "training_completed", "op": ">=", "scope": {"audience": "bulk_generator"}, "threshold": 5}'::jsonb),
+  ('segregation_star_7', '{"metric": "household_good_logs_7d", "op": ">=", "threshold": 7}'::jsonb),
+  ('first_waste_report', '{"metric": "reports_submitted", "op": ">=", "threshold": 1}'::jsonb)
+) AS r(code, rule)
+WHERE b.code = r.code
+  AND NOT (b.rule_json ? 'metric' OR b.rule_json ? 'all' OR b.rule_json ? 'any');
+
+COMMIT;
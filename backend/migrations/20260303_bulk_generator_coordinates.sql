@@ -0,0 +1,8 @@
+-- Pickup coordinates for bulk organizations (worker route planning).
+
+BEGIN;
+
+ALTER TABLE IF EXISTS bulk_generators ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION NULL;
+ALTER TABLE IF EXISTS bulk_generators ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION NULL;
+
+COMMIT;
@@ -0,0 +1,12 @@
+-- Geohash columns + prefix indexes for near / bbox queries on reports and facilities.
+-- Backfill existing rows with: python -m app.scripts.backfill_geohash
+
+BEGIN;
+
+ALTER TABLE IF EXISTS waste_reports ADD COLUMN IF NOT EXISTS geohash VARCHAR(12) NULL;
+ALTER TABLE IF EXISTS facilities ADD COLUMN IF NOT EXISTS geohash VARCHAR(12) NULL;
+
+CREATE INDEX IF NOT EXISTS ix_waste_reports_geohash ON waste_reports(geohash text_pattern_ops);
+CREATE INDEX IF NOT EXISTS ix_facilities_geohash ON facilities(geohash text_pattern_ops);
+
+COMMIT;
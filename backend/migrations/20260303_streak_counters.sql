@@ -0,0 +1,22 @@
+-- Incremental day streaks per user/household/org; rows are built lazily on first read or write.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS streak_counters (
+  id SERIAL PRIMARY KEY,
+  subject_type VARCHAR(16) NOT NULL,
+  subject_id INTEGER NOT NULL,
+  stream VARCHAR(32) NOT NULL,
+  current_streak INTEGER NOT NULL DEFAULT 0,
+  longest_streak INTEGER NOT NULL DEFAULT 0,
+  last_active_date DATE NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  CONSTRAINT uq_streak_counters_subject UNIQUE (subject_type, subject_id, stream)
+);
+
+CREATE INDEX IF NOT EXISTS ix_streak_counters_id ON streak_counters(id);
+
+-- Neighbour-window probes for back-dated activity.
+CREATE INDEX IF NOT EXISTS ix_segregation_logs_citizen_date ON segregation_logs(citizen_id, log_date);
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Partial indexes backing the atomic claim / auto-assign queue scans.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS ix_pickup_requests_open_queue
+  ON pickup_requests(created_at, id)
+  WHERE status = 'REQUESTED' AND assigned_worker_id IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_waste_reports_open_queue
+  ON waste_reports(created_at, id)
+  WHERE status = 'OPEN' AND assigned_worker_id IS NULL;
+
+COMMIT;
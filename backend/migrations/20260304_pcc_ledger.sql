@@ -0,0 +1,41 @@
+-- Unified append-only PCC ledger. Backfill history with
+-- `python -m app.scripts.reconcile_pcc_ledger --backfill`.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS pcc_ledger (
+  id BIGSERIAL PRIMARY KEY,
+  account_kind VARCHAR(16) NOT NULL,
+  account_id INTEGER NOT NULL,
+  user_id INTEGER NULL,
+  org_id INTEGER NULL,
+  amount_pcc DOUBLE PRECISION NOT NULL,
+  carbon_kgco2e DOUBLE PRECISION NOT NULL DEFAULT 0,
+  source VARCHAR(32) NOT NULL,
+  ref_type VARCHAR(64) NULL,
+  ref_id INTEGER NULL,
+  legacy_table VARCHAR(32) NOT NULL,
+  legacy_id INTEGER NOT NULL,
+  created_by_user_id INTEGER NULL,
+  details JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  CONSTRAINT uq_pcc_ledger_legacy_row UNIQUE (legacy_table, legacy_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_pcc_ledger_account ON pcc_ledger(account_kind, account_id);
+CREATE INDEX IF NOT EXISTS ix_pcc_ledger_user_created ON pcc_ledger(user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_pcc_ledger_org_id ON pcc_ledger(org_id);
+CREATE INDEX IF NOT EXISTS ix_pcc_ledger_source ON pcc_ledger(source);
+
+CREATE OR REPLACE FUNCTION pcc_ledger_append_only() RETURNS trigger AS $$
+BEGIN
+  RAISE EXCEPTION 'pcc_ledger is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_pcc_ledger_append_only ON pcc_ledger;
+CREATE TRIGGER trg_pcc_ledger_append_only
+  BEFORE UPDATE OR DELETE ON pcc_ledger
+  FOR EACH ROW EXECUTE FUNCTION pcc_ledger_append_only();
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Token chain blocks seal batches of transactions under a Merkle root.
+-- Verify with `python -m app.scripts.verify_token_chain`.
+
+BEGIN;
+
+ALTER TABLE token_blocks ADD COLUMN IF NOT EXISTS merkle_root VARCHAR(64) NULL;
+ALTER TABLE token_blocks ADD COLUMN IF NOT EXISTS tx_count INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE token_transactions ADD COLUMN IF NOT EXISTS block_id INTEGER NULL REFERENCES token_blocks(id);
+
+-- Transactions chained one-per-block before batching keep their block.
+UPDATE token_transactions t
+SET block_id = b.id
+FROM token_blocks b
+WHERE t.block_id IS NULL
+  AND b.merkle_root IS NULL
+  AND (b.data::jsonb ->> 'tx_id')::int = t.id;
+
+CREATE INDEX IF NOT EXISTS ix_token_transactions_pending
+  ON token_transactions(id)
+  WHERE block_id IS NULL;
+
+COMMIT;
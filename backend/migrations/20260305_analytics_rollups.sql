@@ -0,0 +1,35 @@
+-- Daily rollups for admin analytics, refreshed by the analytics.rollup task.
+-- The first refresh builds them from scratch; force one with
+-- `python -m app.scripts.refresh_rollups --rebuild`.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS carbon_daily_rollups (
+  day DATE NOT NULL,
+  role VARCHAR(32) NOT NULL,
+  activity_type VARCHAR(40) NOT NULL,
+  ward VARCHAR(120) NOT NULL,
+  activity_count INTEGER NOT NULL DEFAULT 0,
+  carbon_kg DOUBLE PRECISION NOT NULL DEFAULT 0,
+  pcc_tokens DOUBLE PRECISION NOT NULL DEFAULT 0,
+  refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (day, role, activity_type, ward)
+);
+
+CREATE TABLE IF NOT EXISTS segregation_daily_rollups (
+  day DATE NOT NULL,
+  ward VARCHAR(120) NOT NULL,
+  log_count INTEGER NOT NULL DEFAULT 0,
+  score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  dry_kg DOUBLE PRECISION NOT NULL DEFAULT 0,
+  wet_kg DOUBLE PRECISION NOT NULL DEFAULT 0,
+  reject_kg DOUBLE PRECISION NOT NULL DEFAULT 0,
+  refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (day, ward)
+);
+
+-- Trailing-window scans during incremental refresh.
+CREATE INDEX IF NOT EXISTS ix_carbon_activities_created_at ON carbon_activities(created_at);
+CREATE INDEX IF NOT EXISTS ix_segregation_logs_created_at ON segregation_logs(created_at);
+
+COMMIT;
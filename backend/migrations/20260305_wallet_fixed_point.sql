@@ -0,0 +1,12 @@
+-- Wallet snapshots move to fixed-point so concurrent
+-- `balance_pcc = balance_pcc + :delta` updates sum exactly.
+
+BEGIN;
+
+ALTER TABLE wallets
+  ALTER COLUMN balance_points TYPE NUMERIC(18, 6),
+  ALTER COLUMN balance_pcc TYPE NUMERIC(18, 6),
+  ALTER COLUMN lifetime_credited TYPE NUMERIC(18, 6),
+  ALTER COLUMN lifetime_debited TYPE NUMERIC(18, 6);
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- Stored responses for write requests sent with an Idempotency-Key header.
+-- Rows expire after IDEMPOTENCY_TTL_SECONDS and are purged by the API process.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  id SERIAL PRIMARY KEY,
+  principal VARCHAR(64) NOT NULL,
+  key VARCHAR(255) NOT NULL,
+  fingerprint VARCHAR(64) NOT NULL,
+  status_code INTEGER NULL,
+  headers_json JSONB NULL,
+  body BYTEA NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  expires_at TIMESTAMPTZ NOT NULL,
+  CONSTRAINT uq_idempotency_keys_principal_key UNIQUE (principal, key)
+);
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Shared GCRA rate-limit state used when RATE_LIMIT_BACKEND=postgres.
+-- UNLOGGED: counters are lost on a crash, which only resets the limits.
+
+BEGIN;
+
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+  key VARCHAR(255) PRIMARY KEY,
+  tat DOUBLE PRECISION NOT NULL,
+  allowed BOOLEAN NOT NULL DEFAULT TRUE
+);
+CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_tat ON rate_limit_buckets(tat);
+
+COMMIT;
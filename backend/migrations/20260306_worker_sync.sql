@@ -0,0 +1,24 @@
+-- Offline worker sync: stored mutation outcomes (idempotency keys) and the
+-- indexes behind the watermark deltas served by POST /worker/sync.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS worker_sync_mutations (
+  id SERIAL PRIMARY KEY,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  client_key VARCHAR(64) NOT NULL,
+  op VARCHAR(32) NOT NULL,
+  status VARCHAR(16) NOT NULL,
+  http_status INTEGER NOT NULL DEFAULT 200,
+  detail VARCHAR(500) NULL,
+  result_json JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  CONSTRAINT uq_worker_sync_mutations_user_key UNIQUE (user_id, client_key)
+);
+CREATE INDEX IF NOT EXISTS ix_worker_sync_mutations_id ON worker_sync_mutations(id);
+
+CREATE INDEX IF NOT EXISTS ix_pickup_requests_updated_at ON pickup_requests(updated_at);
+CREATE INDEX IF NOT EXISTS ix_waste_reports_updated_at ON waste_reports(updated_at);
+CREATE INDEX IF NOT EXISTS ix_segregation_logs_worker_created ON segregation_logs(worker_id, created_at);
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Pickup and report ids each worker's device holds, so POST /worker/sync only
+-- lists rows under `removed` that the device was actually sent.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS worker_sync_items (
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  kind VARCHAR(16) NOT NULL,
+  item_id INTEGER NOT NULL,
+  PRIMARY KEY (user_id, kind, item_id)
+);
+
+COMMIT;
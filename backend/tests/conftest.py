@@ -0,0 +1,130 @@
+"""
+Shared fixtures.
+
+Row locks, triggers, ON CONFLICT and UPDATE .. RETURNING only mean something
+against a real database, so tests of that behaviour take `pg_sessionmaker`
+or `db` and are skipped unless TEST_DATABASE_URL points at a throwaway
+PostgreSQL database:
+
+    TEST_DATABASE_URL=postgresql+psycopg2://... python -m pytest
+
+Every table is truncated after each such test.
+"""
+
+import itertools
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every table for create_all)
+from app.core.database import Base
+from app.models.bulk import (
+    BulkApprovalStatus,
+    BulkGenerator,
+    OrganizationStatus,
+    PickupRequest,
+    PickupRequestStatus,
+    WasteLog,
+    WasteLogCategory,
+    Wallet,
+)
+from app.models.user import User, UserRole
+from app.models.waste_report import WasteReport, WasteReportStatus
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    engine = create_engine(TEST_DATABASE_URL, pool_size=20, future=True)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_sessionmaker(pg_engine):
+    """Sessions on separate connections, for tests that race transactions."""
+    yield sessionmaker(bind=pg_engine, autoflush=False, future=True)
+    tables = ", ".join(f'"{t.name}"' for t in Base.metadata.sorted_tables)
+    with pg_engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+@pytest.fixture
+def db(pg_sessionmaker):
+    with pg_sessionmaker() as session:
+        yield session
+
+
+class Factory:
+    """Minimal valid rows; each call commits so other sessions can see them."""
+
+    def __init__(self, session):
+        self.session = session
+        self._seq = itertools.count(1)
+
+    def _add(self, row):
+        self.session.add(row)
+        self.session.commit()
+        return row
+
+    def user(self, role: UserRole = UserRole.CITIZEN, **kwargs) -> User:
+        n = next(self._seq)
+        return self._add(
+            User(
+                email=f"user{n}@example.test",
+                hashed_password="x",
+                full_name=f"User {n}",
+                role=role,
+                is_active=True,
+                **kwargs,
+            )
+        )
+
+    def bulk_org(self, owner: User | None = None, **kwargs) -> BulkGenerator:
+        owner = owner or self.user(UserRole.BULK_GENERATOR)
+        return self._add(
+            BulkGenerator(
+                user_id=owner.id,
+                organization_name=f"Org of {owner.email}",
+                approval_status=BulkApprovalStatus.APPROVED,
+                status=OrganizationStatus.APPROVED.value,
+                **kwargs,
+            )
+        )
+
+    def waste_log(self, org: BulkGenerator, **kwargs) -> WasteLog:
+        kwargs.setdefault("category", WasteLogCategory.PLASTIC)
+        kwargs.setdefault("weight_kg", 10.0)
+        return self._add(
+            WasteLog(bulk_generator_id=org.id, bulk_org_id=org.id, user_id=org.user_id, created_by_user_id=org.user_id, **kwargs)
+        )
+
+    def pickup(self, org: BulkGenerator | None = None, **kwargs) -> PickupRequest:
+        org = org or self.bulk_org()
+        log = self.waste_log(org)
+        kwargs.setdefault("status", PickupRequestStatus.REQUESTED)
+        return self._add(
+            PickupRequest(waste_log_id=log.id, bulk_org_id=org.id, requested_by_user_id=org.user_id, **kwargs)
+        )
+
+    def wallet(self, org: BulkGenerator | None = None, **kwargs) -> Wallet:
+        org = org or self.bulk_org()
+        for column in ("balance_pcc", "balance_points", "lifetime_credited", "lifetime_debited"):
+            kwargs.setdefault(column, 0.0)
+        return self._add(Wallet(bulk_generator_id=org.id, user_id=org.user_id, org_id=org.id, **kwargs))
+
+    def report(self, reporter: User | None = None, **kwargs) -> WasteReport:
+        reporter = reporter or self.user()
+        kwargs.setdefault("status", WasteReportStatus.OPEN.value)
+        return self._add(WasteReport(reporter_id=reporter.id, **kwargs))
+
+
+@pytest.fixture
+def factory(db):
+    return Factory(db)
@@ -0,0 +1,31 @@
+from app.api.v1.admin_ops import pcc_transactions
+from app.models.bulk import Transaction, TransactionType
+from app.services.pcc_ledger_service import post_wallet_movement
+
+
+def _list(db, **filters):
+    params = dict(date_from=None, date_to=None, user_id=None, tx_type=None, type=None, page=1, page_size=20)
+    return pcc_transactions(**{**params, **filters}, db=db, _=None)
+
+
+def test_transaction_summary_counts_the_entries_it_totals(factory, db):
+    wallet = factory.wallet()
+    for ref_id, (amount, debit) in enumerate([(4.0, False), (1.5, True)], start=1):
+        post_wallet_movement(
+            db, wallet=wallet, amount=amount, source="test", ref_type="test", ref_id=ref_id,
+            debit=debit, user_id=wallet.user_id, org_id=wallet.org_id,
+        )
+    # Written before the ledger existed: listed, but not part of the ledger totals.
+    db.add(
+        Transaction(
+            wallet_id=wallet.id, user_id=wallet.user_id, tx_type=TransactionType.CREDIT, amount_points=3.0, amount_pcc=3.0
+        )
+    )
+    db.commit()
+
+    page = _list(db)
+    assert (page.total, len(page.items)) == (3, 3)
+    assert (page.total_credited, page.total_debited, page.net_pcc, page.transactions_count) == (4.0, 1.5, 2.5, 2)
+
+    debits = _list(db, tx_type="debit")
+    assert (debits.total, debits.total_debited, debits.transactions_count) == (1, 1.5, 1)
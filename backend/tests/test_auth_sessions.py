@@ -0,0 +1,32 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.api import deps
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+from app.services.auth_session_service import access_claims
+
+
+def _token(role=UserRole.WASTE_WORKER, active=True, **extra):
+    user = User(id=7, role=role, is_active=active)
+    return create_access_token(subject=7, claims={**access_claims(user, "fam"), **extra})
+
+
+def test_session_token_is_trusted_without_a_query():
+    db = Session()  # unbound: any SQL would raise
+    user = deps.get_current_user(db=db, token=_token())
+    assert (user.id, user.role, user.is_active) == (7, UserRole.WASTE_WORKER, True)
+    assert user in db and not db.dirty and not db.new
+    assert deps.require_roles(UserRole.WASTE_WORKER)(current_user=user) is user
+
+
+def test_inactive_claim_and_non_access_tokens_are_rejected():
+    with pytest.raises(HTTPException) as exc:
+        deps.get_current_user(db=Session(), token=_token(active=False))
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        deps.get_current_user(db=Session(), token=_token(typ="refresh"))
+    assert exc.value.status_code == 401
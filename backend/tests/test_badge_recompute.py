@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.core.badge_rules import compile_rule, compile_vector_rule
+from app.services.badge_recompute_service import ChunkMetrics, ChunkRule, all_badge_definitions, evaluate_chunk
+
+
+def _rules(*codes):
+    defs = {d.code: d for d in all_badge_definitions()}
+    out = []
+    for badge_id, code in enumerate(codes, start=1):
+        predicate, scope = compile_vector_rule(defs[code].rule)
+        out.append(ChunkRule(badge_id=badge_id, code=code, predicate=predicate, scope=scope))
+    return out
+
+
+def test_vector_rules_match_scalar_rules():
+    rng = np.random.default_rng(7)
+    values = rng.uniform(0, 1200, size=200)
+    defs = [d for d in all_badge_definitions() if d.code.startswith("impact_")]
+    for d in defs:
+        vec, _ = compile_vector_rule(d.rule)
+        scalar = compile_rule(d.rule)
+        got = vec({"total_carbon_saved_kgco2e": values}, len(values))
+        expected = np.array([scalar({"total_carbon_saved_kgco2e": v}) for v in values])
+        assert np.array_equal(got, expected)
+
+
+def test_evaluate_chunk_skips_awarded_and_respects_scope():
+    rules = _rules("impact_10", "bulk_first_verified", "worker_bulk_verifier_1")
+    metrics = ChunkMetrics(
+        user_ids=np.array([11, 12, 13]),
+        columns={
+            (): {"total_carbon_saved_kgco2e": np.array([5.0, 20.0, 30.0])},
+            (("target", "bulk"),): {"org_verified_count": np.array([np.nan, 2.0, np.nan])},
+            (("target", "worker"),): {"worker_verified_count": np.array([0.0, 0.0, 3.0])},
+        },
+        org_ids=np.array([0, 4, 0]),
+    )
+    already = np.zeros((3, 3), dtype=bool)
+    already[2, 0] = True  # user 13 already holds impact_10
+
+    hits = evaluate_chunk(rules, metrics, already)
+    assert sorted(hits) == [(1, 0), (1, 1), (2, 2)]
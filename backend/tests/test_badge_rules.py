@@ -0,0 +1,49 @@
+import pytest
+
+from app.core.badge_rules import RuleError, compile_rule
+from app.services.badge_engine import CORE_BADGE_DEFINITIONS
+from app.services.training_service import TRAINING_BADGE_DEFINITIONS
+
+
+def _rule(code):
+    defs = {d.code: d for d in CORE_BADGE_DEFINITIONS + TRAINING_BADGE_DEFINITIONS}
+    return compile_rule(defs[code].rule)
+
+
+def test_threshold_and_missing_metric():
+    rule = compile_rule({"metric": "total_carbon_saved_kgco2e", "op": ">=", "threshold": 50})
+    assert rule({"total_carbon_saved_kgco2e": 50.0})
+    assert not rule({"total_carbon_saved_kgco2e": 49.9})
+    assert not rule({})
+
+
+def test_quality_badge_needs_minimum_sample():
+    rule = _rule("quality_95")
+    assert rule({"rolling_30d_quality_score": 0.97, "rolling_30d_verified_logs": 10})
+    assert not rule({"rolling_30d_quality_score": 0.97, "rolling_30d_verified_logs": 9})
+    assert not rule({"rolling_30d_quality_score": None, "rolling_30d_verified_logs": 12})
+
+
+def test_scope_keeps_bulk_and_worker_rules_apart():
+    star = _rule("bulk_segregation_star")
+    metrics = {"event_score": 99.0}
+    assert star(metrics, {"target": "bulk"})
+    assert not star(metrics, {"target": "worker"})
+
+
+def test_certified_citizen_compares_against_total():
+    rule = _rule("CERTIFIED_CITIZEN")
+    ctx = {"audience": "citizen"}
+    assert rule({"training_completed": 4, "training_total": 4}, ctx)
+    assert not rule({"training_completed": 3, "training_total": 4}, ctx)
+    assert not rule({"training_completed": 0, "training_total": 0}, ctx)
+    assert not rule({"training_completed": 4, "training_total": 4}, {"audience": "bulk_generator"})
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(RuleError):
+        compile_rule({"metric": "x", "op": "~", "threshold": 1})
+    with pytest.raises(RuleError):
+        compile_rule({"all": []})
+    with pytest.raises(RuleError):
+        compile_rule({"metric": "x"})
@@ -0,0 +1,102 @@
+import gzip
+import types
+
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, accepts_encoding
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/logs")
+    def logs():
+        return {"items": [{"id": i, "action": "update_status", "entity": "lead"} for i in range(200)]}
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(b"x" * 4096), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/export")
+    def export():
+        return StreamingResponse((b"%d,%s\n" % (i, b"y" * 2048) for i in range(3)), media_type="text/csv")
+
+    return TestClient(app)
+
+
+def test_large_responses_are_compressed_above_threshold_only():
+    client = _client()
+
+    compressed = client.get("/logs", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in compressed.headers["vary"].lower()
+    assert len(compressed.json()["items"]) == 200
+    assert int(compressed.headers["content-length"]) < len(compressed.content) // 4
+
+    assert "content-encoding" not in client.get("/health", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/logs", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in client.get("/logs", headers={"Accept-Encoding": "gzip;q=0"}).headers
+    # Pre-encoded bodies are passed through, not compressed twice.
+    assert client.get("/encoded", headers={"Accept-Encoding": "gzip"}).content == b"x" * 4096
+
+
+def test_accept_encoding_honours_q_zero():
+    assert accepts_encoding("gzip, deflate, br", "br")
+    assert accepts_encoding("br;q=0.5, gzip", "br")
+    assert not accepts_encoding("br;q=0, gzip", "br")
+    assert not accepts_encoding("gzip", "br")
+
+
+class _FakeBrotli:
+    """Stands in for the optional `brotli` package and records how it is driven."""
+
+    def __init__(self):
+        self.calls = []
+
+    def Compressor(self, quality):
+        calls = self.calls
+
+        class Compressor:
+            def process(self, body):
+                calls.append("process")
+                return b"<" + body[:4] + b">"
+
+            def flush(self):
+                calls.append("flush")
+                return b"|"
+
+            def finish(self):
+                calls.append("finish")
+                return b"."
+
+        return Compressor()
+
+
+def test_brotli_is_used_when_installed_and_accepted(monkeypatch):
+    fake = _FakeBrotli()
+    monkeypatch.setattr(compression, "brotli", types.SimpleNamespace(Compressor=fake.Compressor))
+    client = _client()
+
+    single = client.get("/logs", headers={"Accept-Encoding": "gzip, br"})
+    assert single.headers["content-encoding"] == "br"
+    assert single.content == b'<{"it>.'
+    assert fake.calls == ["process", "finish"]
+
+    fake.calls.clear()
+    streamed = client.get("/export", headers={"Accept-Encoding": "br"})
+    assert streamed.headers["content-encoding"] == "br"
+    assert "content-length" not in streamed.headers
+    assert streamed.content == b"<0,yy>|<1,yy>|<2,yy>|<>."
+    assert fake.calls == ["process", "flush"] * 3 + ["process", "finish"]
+
+    fake.calls.clear()
+    assert client.get("/logs", headers={"Accept-Encoding": "br;q=0, gzip"}).headers["content-encoding"] == "gzip"
+    assert fake.calls == []
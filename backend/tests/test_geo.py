@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.geo import (
+    bbox_around,
+    covering_prefixes,
+    geohash_encode,
+    geohash_for,
+    haversine_km,
+)
+from app.services.geo_service import parse_bbox
+
+
+def test_geohash_encode_known_value():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_geohash_for_skips_missing_or_invalid_coordinates():
+    assert geohash_for(None, 73.85) is None
+    assert geohash_for(95.0, 73.85) is None
+    assert len(geohash_for(18.52, 73.85)) == 9
+
+
+def test_haversine_pune_to_mumbai():
+    assert haversine_km(18.5204, 73.8567, 19.0760, 72.8777) == pytest.approx(120, abs=5)
+
+
+def test_covering_prefixes_contain_every_point_in_box():
+    lat, lon = 18.5204, 73.8567
+    box = bbox_around(lat, lon, 3.0)
+    prefixes = covering_prefixes(box)
+    assert 0 < len(prefixes) <= 32
+    min_lat, min_lon, max_lat, max_lon = box
+    for i in range(11):
+        for j in range(11):
+            p_lat = min_lat + (max_lat - min_lat) * i / 10
+            p_lon = min_lon + (max_lon - min_lon) * j / 10
+            gh = geohash_encode(p_lat, p_lon)
+            assert any(gh.startswith(prefix) for prefix in prefixes)
+
+
+def test_parse_bbox_rejects_inverted_box():
+    with pytest.raises(ValueError):
+        parse_bbox("19.0,73.0,18.0,74.0")
+    assert parse_bbox("18.0, 73.0, 19.0, 74.0") == (18.0, 73.0, 19.0, 74.0)
@@ -0,0 +1,48 @@
+from app.core.http_cache import compute_etag, etag_matches, serialize_json
+
+
+def test_etag_is_stable_and_content_sensitive():
+    a = serialize_json({"reports": {"total": 3}})
+    assert compute_etag(a) == compute_etag(serialize_json({"reports": {"total": 3}}))
+    assert compute_etag(a) != compute_etag(serialize_json({"reports": {"total": 4}}))
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = compute_etag(b"{}")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_response_cache_serves_gzip_etags_and_invalidates():
+    from fastapi import FastAPI, Request
+    from fastapi.testclient import TestClient
+
+    from app.core.http_cache import ResponseCache, cached_json_response
+
+    builds = []
+    cache = ResponseCache(ttl_seconds=60)
+    app = FastAPI()
+
+    @app.get("/faqs")
+    def faqs(request: Request):
+        def build():
+            builds.append(1)
+            return {"faqs": [{"question": "q" * 40, "answer": "a" * 40}] * 10, "rev": len(builds)}
+
+        return cached_json_response(request, cache.get_or_build("faqs", build))
+
+    client = TestClient(app)
+    first = client.get("/faqs")
+    assert first.headers["content-encoding"] == "gzip" and first.json()["rev"] == 1
+    plain = client.get("/faqs", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.headers["etag"] != first.headers["etag"]
+
+    assert client.get("/faqs", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+    assert len(builds) == 1
+
+    cache.invalidate("faqs")
+    changed = client.get("/faqs", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200 and changed.json()["rev"] == 2
@@ -0,0 +1,129 @@
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.services import idempotency_service as idem
+from app.services import rate_limit_service as rl
+
+
+class _MemoryStore:
+    """Dict-backed stand-in for the idempotency_keys table."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def begin(self, db, *, principal, key, fingerprint):
+        row = self.rows.get((principal, key))
+        if row is None:
+            self.rows[(principal, key)] = {"fingerprint": fingerprint, "response": None}
+            return idem.Claim(idem.CLAIM_NEW)
+        if row["fingerprint"] != fingerprint:
+            return idem.Claim(idem.CLAIM_MISMATCH)
+        if row["response"] is None:
+            return idem.Claim(idem.CLAIM_IN_PROGRESS)
+        return idem.Claim(idem.CLAIM_REPLAY, row["response"])
+
+    def complete(self, db, *, principal, key, response, ttl_seconds):
+        self.rows[(principal, key)]["response"] = response
+
+    def release(self, db, *, principal, key):
+        self.rows.pop((principal, key), None)
+
+
+def _client(monkeypatch):
+    store = _MemoryStore()
+    monkeypatch.setattr(idem, "begin_request", store.begin)
+    monkeypatch.setattr(idem, "complete_request", store.complete)
+    monkeypatch.setattr(idem, "release_request", store.release)
+    monkeypatch.setattr(idem, "purge_expired_keys", lambda db: 0)
+    monkeypatch.setattr(idem, "_in_session", lambda fn, **kwargs: fn(None, **kwargs))
+
+    app = FastAPI()
+    app.add_middleware(idem.IdempotencyMiddleware, ttl_seconds=60, max_response_bytes=1024)
+    calls = {"leads": 0, "flaky": 0, "limited": 0}
+
+    @app.post("/leads")
+    def create_lead(payload: dict):
+        calls["leads"] += 1
+        return JSONResponse({"id": calls["leads"], **payload}, status_code=201)
+
+    @app.post("/flaky")
+    def flaky():
+        calls["flaky"] += 1
+        return JSONResponse({"detail": "down"}, status_code=503)
+
+    @app.post("/limited", dependencies=[Depends(rl.rate_limit("test.limited", 1, per_seconds=60))])
+    def limited():
+        calls["limited"] += 1
+        return JSONResponse({"ok": True}, status_code=201)
+
+    return TestClient(app), calls
+
+
+def test_retry_replays_stored_response_without_rerunning(monkeypatch):
+    client, calls = _client(monkeypatch)
+    headers = {"Idempotency-Key": "abc", "Authorization": f"Bearer {create_access_token(1)}"}
+
+    first = client.post("/leads", json={"name": "A"}, headers=headers)
+    retry = client.post("/leads", json={"name": "A"}, headers=headers)
+    other_caller = client.post(
+        "/leads", json={"name": "A"}, headers={**headers, "Authorization": f"Bearer {create_access_token(2)}"}
+    )
+    reused = client.post("/leads", json={"name": "B"}, headers=headers)
+    unkeyed = client.post("/leads", json={"name": "A"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json() == {"id": 1, "name": "A"}
+    assert retry.headers[idem.REPLAYED_HEADER] == "true"
+    assert other_caller.json()["id"] == 2
+    assert reused.status_code == 422
+    assert unkeyed.json()["id"] == 3
+    assert calls["leads"] == 3
+
+
+def test_principal_is_the_token_subject_not_the_token():
+    refreshed = [create_access_token(7, claims={"jti": str(n)}) for n in range(2)]
+    assert refreshed[0] != refreshed[1]
+    assert idem.principal_for(f"Bearer {refreshed[0]}", "10.0.0.1") == idem.principal_for(f"Bearer {refreshed[1]}", "10.0.0.2")
+    assert idem.principal_for(f"Bearer {create_access_token(8)}", "10.0.0.1") != idem.principal_for(
+        f"Bearer {refreshed[0]}", "10.0.0.1"
+    )
+    # Anonymous or unverifiable callers are scoped to their address.
+    assert idem.principal_for("Bearer forged", "10.0.0.1") == idem.principal_for(None, "10.0.0.1")
+    assert idem.principal_for(None, "10.0.0.1") != idem.principal_for(None, "10.0.0.2")
+
+
+def test_server_errors_are_not_stored(monkeypatch):
+    client, calls = _client(monkeypatch)
+    for _ in range(2):
+        assert client.post("/flaky", headers={"Idempotency-Key": "k"}).status_code == 503
+    assert calls["flaky"] == 2
+
+
+def test_multipart_fingerprint_ignores_body():
+    a = idem.request_fingerprint("POST", "/r", "", "multipart/form-data; boundary=1", b"--1 x")
+    b = idem.request_fingerprint("POST", "/r", "", "multipart/form-data; boundary=2", b"--2 x")
+    c = idem.request_fingerprint("POST", "/r", "", "application/json", b"{}")
+    d = idem.request_fingerprint("POST", "/r", "", "application/json", b"{ }")
+    assert a == b
+    assert c != d
+
+
+def test_rate_limited_request_runs_when_retried_after_retry_after(monkeypatch):
+    clock = [1000.0]
+    rl.set_backend(rl.MemoryRateLimitBackend(max_keys=100, clock=lambda: clock[0]))
+    try:
+        client, calls = _client(monkeypatch)
+        assert client.post("/limited", headers={"Idempotency-Key": "first"}).status_code == 201
+
+        refused = client.post("/limited", headers={"Idempotency-Key": "second"})
+        assert refused.status_code == 429
+        clock[0] += int(refused.headers["retry-after"])
+
+        retry = client.post("/limited", headers={"Idempotency-Key": "second"})
+        assert retry.status_code == 201
+        assert idem.REPLAYED_HEADER not in retry.headers
+        assert calls["limited"] == 2
+    finally:
+        rl.set_backend(None)
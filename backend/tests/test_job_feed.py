@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+from app.services.job_feed_service import JOB_CLAIMED, JOB_CREATED, JobFeed
+
+
+def test_publish_from_worker_thread_reaches_subscriber():
+    async def scenario():
+        feed = JobFeed()
+        sub = feed.subscribe()
+        t = threading.Thread(target=feed.publish, args=(JOB_CREATED, {"pickup_request_id": 7}))
+        t.start()
+        t.join()
+        event = await asyncio.wait_for(sub.queue.get(), timeout=1)
+        feed.unsubscribe(sub)
+        return event, feed.subscriber_count
+
+    event, remaining = asyncio.run(scenario())
+    assert event.type == JOB_CREATED
+    assert event.data == {"pickup_request_id": 7}
+    assert remaining == 0
+
+
+def test_slow_subscriber_is_told_to_resync():
+    async def scenario():
+        feed = JobFeed(queue_size=2)
+        sub = feed.subscribe()
+        for i in range(5):
+            feed.publish(JOB_CLAIMED, {"pickup_request_id": i})
+        await asyncio.sleep(0)
+        return [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+
+    drained = asyncio.run(scenario())
+    assert drained == [None]
+
+
+def test_publish_without_subscribers_is_noop():
+    JobFeed().publish(JOB_CREATED, {"pickup_request_id": 1})
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.services.ops_heatmap_service import (
+    METRIC_AVG_SEGREGATION_SCORE,
+    METRIC_OPEN_REPORTS,
+    METRIC_SEGREGATION_LOGS,
+    METRIC_SEGREGATION_SCORE_SUM,
+    METRICS,
+    HeatmapCube,
+    floor_hour,
+)
+
+
+def _cube(now):
+    cube = HeatmapCube(METRICS, window_hours=4)
+    cube.roll_to(floor_hour(now))
+    return cube
+
+
+def test_cells_accumulate_and_derive_average_score():
+    cube = _cube(datetime(2026, 3, 5, 10, 30))
+    cube.add(METRIC_OPEN_REPORTS, ["W1", "W2", "W1"], ["2026-03-05T10", "2026-03-05T09", "2026-03-05T10"], [1, 1, 1])
+    cube.add(METRIC_SEGREGATION_LOGS, ["W1", "W1"], ["2026-03-05T08", "2026-03-05T08"], [1, 1])
+    cube.add(METRIC_SEGREGATION_SCORE_SUM, ["W1", "W1"], ["2026-03-05T08", "2026-03-05T08"], [70, 90])
+    # Outside the window: dropped.
+    cube.add(METRIC_OPEN_REPORTS, ["W1"], ["2026-03-05T02"], [5])
+
+    out = cube.slice(last_hours=3, metrics=[METRIC_OPEN_REPORTS, METRIC_AVG_SEGREGATION_SCORE])
+    assert out["hours"] == ["2026-03-05T08:00Z", "2026-03-05T09:00Z", "2026-03-05T10:00Z"]
+    assert out["areas"] == ["W1", "W2"]
+    assert out["cells"][METRIC_OPEN_REPORTS] == [[0, 0, 2], [0, 1, 0]]
+    assert out["cells"][METRIC_AVG_SEGREGATION_SCORE] == [[80, 0, 0], [0, 0, 0]]
+
+
+def test_roll_and_clear_keep_only_recomputed_hours():
+    cube = _cube(datetime(2026, 3, 5, 10))
+    cube.add(METRIC_OPEN_REPORTS, ["W1", "W1"], ["2026-03-05T07", "2026-03-05T10"], [3, 4])
+    cube.roll_to(floor_hour(datetime(2026, 3, 5, 12)))
+    assert cube.slice(last_hours=4, metrics=[METRIC_OPEN_REPORTS])["cells"][METRIC_OPEN_REPORTS] == [[0, 4, 0, 0]]
+    cube.clear_hours(np.array(["2026-03-05T10"], dtype="datetime64[h]"))
+    cube.add(METRIC_OPEN_REPORTS, ["W1"], ["2026-03-05T10"], [1])
+    assert cube.slice(last_hours=4, areas=["W1", "nope"])["cells"][METRIC_OPEN_REPORTS] == [[0, 1, 0, 0]]
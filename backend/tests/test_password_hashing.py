@@ -0,0 +1,31 @@
+import asyncio
+
+from passlib.context import CryptContext
+
+from app.core import security
+
+
+def test_check_password_rehashes_other_costs():
+    old = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__rounds=1000).hash("s3cret")
+
+    assert security.check_password("wrong", old) == (False, None)
+    ok, new_hash = security.check_password("s3cret", old)
+    assert ok and new_hash is not None
+    assert security.pwd_context.needs_update(old)
+    assert not security.pwd_context.needs_update(new_hash)
+    assert security.check_password("s3cret", new_hash) == (True, None)
+
+
+def test_unknown_user_still_runs_a_verify(monkeypatch):
+    calls = []
+    real_verify = security.pwd_context.verify
+    monkeypatch.setattr(security.pwd_context, "verify", lambda *a: calls.append(a) or real_verify(*a))
+
+    assert security.check_password("anything", None) == (False, None)
+    assert len(calls) == 1
+
+
+def test_async_check_without_pool(monkeypatch):
+    monkeypatch.setattr(security.settings, "PASSWORD_VERIFY_PROCESSES", 0)
+    stored = security.get_password_hash("pw")
+    assert asyncio.run(security.check_password_async("pw", stored)) == (True, None)
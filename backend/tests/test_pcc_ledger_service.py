@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.exc import DBAPIError
+
+from app.models.bulk import Transaction, TransactionType
+from app.models.pcc import PccLedgerEntry
+from app.services.pcc_ledger_service import (
+    ACCOUNT_WALLET,
+    LEGACY_TRANSACTIONS,
+    backfill_ledger,
+    find_ledger_drift,
+    post_wallet_movement,
+    wallet_ledger_totals,
+)
+
+
+def _move(db, wallet, amount, *, debit=False, ref_id=1, **kwargs):
+    tx = post_wallet_movement(
+        db,
+        wallet=wallet,
+        amount=amount,
+        source="test",
+        ref_type="test",
+        ref_id=ref_id,
+        debit=debit,
+        user_id=wallet.user_id,
+        org_id=wallet.org_id,
+        **kwargs,
+    )
+    db.commit()
+    return tx
+
+
+def test_wallet_movement_appends_one_entry_mirroring_the_legacy_row(factory, db):
+    wallet = factory.wallet()
+    tx = _move(db, wallet, 2.5, meta={"verification_score": 0.9})
+    _move(db, wallet, 1.0, debit=True, ref_id=2)
+
+    entries = db.query(PccLedgerEntry).order_by(PccLedgerEntry.id).all()
+    assert [(e.account_kind, e.account_id, e.amount_pcc) for e in entries] == [
+        (ACCOUNT_WALLET, wallet.id, 2.5),
+        (ACCOUNT_WALLET, wallet.id, -1.0),
+    ]
+    assert (entries[0].legacy_table, entries[0].legacy_id) == (LEGACY_TRANSACTIONS, tx.id)
+    assert entries[0].details == {"verification_score": 0.9}
+    assert entries[1].details == {}
+    db.refresh(wallet)
+    assert wallet.balance_pcc == 1.5
+    assert wallet_ledger_totals(db) == (2.5, 1.0, 2)
+    assert wallet_ledger_totals(db, tx_type="debit") == (0.0, 1.0, 1)
+
+
+def test_ledger_rejects_update_and_delete(factory, db):
+    _move(db, factory.wallet(), 2.5)
+
+    for stmt in (update(PccLedgerEntry).values(amount_pcc=100.0), delete(PccLedgerEntry)):
+        with pytest.raises(DBAPIError, match="pcc_ledger is append-only"):
+            db.execute(stmt)
+        db.rollback()
+    assert [e.amount_pcc for e in db.query(PccLedgerEntry)] == [2.5]
+
+
+def test_ledger_reconciles_with_legacy_rows_and_backfills_the_gap(factory, db):
+    first, second = factory.wallet(), factory.wallet()
+    _move(db, first, 4.0)
+    _move(db, first, 1.5, debit=True, ref_id=2)
+    _move(db, second, 0.25, ref_id=3)
+    assert find_ledger_drift(db) == []
+
+    # A credit written before the ledger existed: legacy row and snapshot only.
+    db.add(Transaction(wallet_id=second.id, tx_type=TransactionType.CREDIT, amount_points=3.0, amount_pcc=3.0))
+    second.balance_pcc = second.balance_points = 3.25
+    db.commit()
+    (drift,) = find_ledger_drift(db)
+    assert (drift.account_id, drift.ledger_total, drift.legacy_total, drift.snapshot) == (second.id, 0.25, 3.25, 3.25)
+
+    assert backfill_ledger(db) == 1
+    db.commit()
+    assert backfill_ledger(db) == 0
+    assert find_ledger_drift(db) == []
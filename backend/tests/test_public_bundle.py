@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import public
+from app.core.database import get_db
+from app.core.http_cache import ResponseCache
+
+
+def _client(monkeypatch):
+    calls = []
+
+    def source(section, payload):
+        def build(db):
+            calls.append(section)
+            return {"success": True, "message": "ok", "data": payload}
+
+        return build
+
+    faqs = {"faqs": [{"id": 2}]}
+    content, stats = ResponseCache(ttl_seconds=60), ResponseCache(ttl_seconds=60)
+    monkeypatch.setattr(public, "_bundle_bodies", {})
+    monkeypatch.setattr(
+        public,
+        "_SECTION_SOURCES",
+        {
+            "stats": (stats, source("stats", {"stats": {"total_users": 3}})),
+            "partners": (content, source("partners", {"partners": [{"id": 1}]})),
+            "testimonials": (content, source("testimonials", {"testimonials": []})),
+            "case_studies": (content, source("case_studies", {"case_studies": []})),
+            "faqs": (content, source("faqs", faqs)),
+            "config": (content, source("config", {"cta": {"label": "Go"}, "seed_metrics": {}, "org_type_copy": {}})),
+            "sample_ledger": (stats, source("sample_ledger", {"rows": []})),
+        },
+    )
+    app = FastAPI()
+    app.include_router(public.router)
+    app.dependency_overrides[get_db] = lambda: None
+    return TestClient(app), calls, content, faqs
+
+
+def test_bundle_selects_fields_and_revalidates(monkeypatch):
+    client, calls, content, faqs = _client(monkeypatch)
+
+    full = client.get("/public/bundle")
+    assert set(full.json()["data"]) == set(public._BUNDLE_FIELDS)
+    assert full.json()["data"]["config"]["cta"] == {"label": "Go"}
+
+    picked = client.get("/public/bundle", params={"fields": "faqs,stats"})
+    assert picked.json()["data"] == {"stats": {"total_users": 3}, "faqs": [{"id": 2}]}
+    assert picked.headers["etag"] != full.headers["etag"]
+    assert len(calls) == 7  # each section built once, shared by both selections
+
+    etag = picked.headers["etag"]
+    assert client.get("/public/bundle?fields=stats,faqs", headers={"If-None-Match": etag}).status_code == 304
+
+    faqs["faqs"].append({"id": 3})
+    content.invalidate("faqs")
+    assert client.get("/public/bundle?fields=stats,faqs", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/public/bundle", params={"fields": "nope"}).status_code == 400
@@ -0,0 +1,99 @@
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api import auth
+from app.core.security import create_access_token
+from app.services import rate_limit_service as rl
+
+
+def test_gcra_allows_burst_then_spaces_requests():
+    limit = rl.RateLimit(requests=3, period=60)
+    tat, now = None, 1000.0
+    for _ in range(3):
+        decision = rl.gcra(tat, now, limit)
+        assert decision.allowed
+        tat = decision.tat
+
+    rejected = rl.gcra(tat, now, limit)
+    assert not rejected.allowed
+    assert rejected.tat == tat
+    assert rejected.retry_after == 20.0
+
+    assert rl.gcra(tat, now + 20, limit).allowed
+    # An idle key is back to a full burst.
+    assert rl.gcra(tat, now + 60, limit).tat == now + 60 + 20
+
+
+def test_memory_backend_is_bounded_lru():
+    clock = [0.0]
+    backend = rl.MemoryRateLimitBackend(max_keys=2, clock=lambda: clock[0])
+    limit = rl.RateLimit(requests=1, period=10)
+    assert backend.hit("a", limit).allowed
+    assert not backend.hit("a", limit).allowed
+    backend.hit("b", limit)
+    backend.hit("c", limit)
+    assert set(backend._tats) == {"b", "c"}
+    assert backend.hit("a", limit).allowed
+
+
+def test_postgres_backend_runs_gcra_in_one_upsert():
+    sql = str(
+        rl.PostgresRateLimitBackend.statement("login:1.2.3.4", 100.0, rl.RateLimit(5, 60)).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "ON CONFLICT (key) DO UPDATE" in sql
+    assert "greatest(rate_limit_buckets.tat" in sql
+    assert "RETURNING rate_limit_buckets.tat, rate_limit_buckets.allowed" in sql
+
+
+def test_dependency_returns_429_with_retry_after():
+    rl.set_backend(rl.MemoryRateLimitBackend(max_keys=100))
+    try:
+        app = FastAPI()
+
+        @app.post("/login", dependencies=[Depends(rl.rate_limit("test.login", 2, per_seconds=60))])
+        def login():
+            return {"ok": True}
+
+        client = TestClient(app)
+        assert client.post("/login").status_code == 200
+        assert client.post("/login").status_code == 200
+        blocked = client.post("/login")
+        assert blocked.status_code == 429
+        assert 1 <= int(blocked.headers["retry-after"]) <= 30
+    finally:
+        rl.set_backend(None)
+
+
+def test_credentials_key_is_the_token_user():
+    def request(authorization=None, host="10.0.0.1"):
+        headers = [(b"authorization", authorization.encode())] if authorization else []
+        return Request({"type": "http", "headers": headers, "client": (host, 1234)})
+
+    refreshed = [create_access_token(7, claims={"jti": str(n)}) for n in range(2)]
+    assert rl.by_credentials(request(f"Bearer {refreshed[0]}")) == rl.by_credentials(
+        request(f"Bearer {refreshed[1]}", host="10.0.0.2")
+    ) == "user:7"
+    assert rl.by_credentials(request("Bearer forged")) == rl.by_credentials(request()) == "10.0.0.1"
+
+
+def test_login_is_limited_per_address_and_account():
+    rl.set_backend(rl.MemoryRateLimitBackend(max_keys=100))
+    try:
+        app = FastAPI()
+
+        @app.post("/login", dependencies=[Depends(auth.login_rate_limit)])
+        def login():
+            return {"ok": True}
+
+        client = TestClient(app)
+        attempts = auth.LOGIN_ACCOUNT_LIMIT.requests
+        for _ in range(attempts):
+            assert client.post("/login", data={"username": "a@example.test", "password": "x"}).status_code == 200
+        assert client.post("/login", data={"username": " A@example.test", "password": "x"}).status_code == 429
+        # Other workers behind the same address still get in.
+        assert client.post("/login", data={"username": "b@example.test", "password": "x"}).status_code == 200
+    finally:
+        rl.set_backend(None)
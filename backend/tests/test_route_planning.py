@@ -0,0 +1,88 @@
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.geo import geohash_for
+from app.models.bulk import PickupRequest
+from app.models.user import UserRole
+from app.models.waste_report import WasteReport
+from app.schemas.route_plan import RoutePlanRequest
+from app.services.bulk_service import claim_worker_job
+from app.services.route_planning_service import (
+    distance_matrix_km,
+    nearest_neighbour_order,
+    path_length_km,
+    plan_order,
+    plan_worker_route,
+    two_opt,
+)
+
+
+def _brute_force_open_path(dist: np.ndarray) -> float:
+    n = dist.shape[0]
+    best = float("inf")
+    for perm in itertools.permutations(range(1, n)):
+        best = min(best, path_length_km(np.array((0,) + perm), dist))
+    return best
+
+
+def test_distance_matrix_is_symmetric_with_zero_diagonal():
+    coords = np.array([[18.52, 73.85], [18.53, 73.86], [18.60, 73.70]])
+    dist = distance_matrix_km(coords)
+    assert np.allclose(dist, dist.T)
+    assert np.allclose(np.diag(dist), 0.0)
+    assert dist[0, 1] == pytest.approx(1.5, abs=0.1)
+
+
+def test_two_opt_never_worse_than_nearest_neighbour():
+    rng = np.random.default_rng(7)
+    coords = np.column_stack([18.4 + rng.random(30) * 0.3, 73.7 + rng.random(30) * 0.3])
+    dist = distance_matrix_km(coords)
+    nn = nearest_neighbour_order(dist, 0)
+    improved = two_opt(nn, dist)
+    assert improved[0] == 0
+    assert sorted(improved.tolist()) == list(range(30))
+    assert path_length_km(improved, dist) <= path_length_km(nn, dist) + 1e-9
+
+
+def test_small_instance_matches_brute_force():
+    rng = np.random.default_rng(3)
+    coords = np.column_stack([18.4 + rng.random(7) * 0.2, 73.7 + rng.random(7) * 0.2])
+    dist = distance_matrix_km(coords)
+    order = two_opt(nearest_neighbour_order(dist, 0), dist)
+    assert path_length_km(order, dist) == pytest.approx(_brute_force_open_path(dist), rel=0.05)
+
+
+def test_plan_order_returns_stop_indices_only():
+    stops = np.array([[18.60, 73.85], [18.53, 73.85], [18.56, 73.85]])
+    order, dist = plan_order((18.52, 73.85), stops)
+    assert order.tolist() == [1, 2, 0]
+    assert dist.shape == (4, 4)
+
+
+def test_assigned_plan_claims_through_the_shared_primitives(factory, db):
+    first = factory.user(UserRole.WASTE_WORKER)
+    second = factory.user(UserRole.WASTE_WORKER)
+    pickups = [factory.pickup(factory.bulk_org(latitude=18.52 + i / 100, longitude=73.85)).id for i in range(3)]
+    reports = [
+        factory.report(latitude=18.52, longitude=73.86 + i / 100, geohash=geohash_for(18.52, 73.86 + i / 100)).id
+        for i in range(2)
+    ]
+    claim_worker_job(db, current_user=second, pickup_request_id=pickups[0])
+
+    request = RoutePlanRequest(latitude=18.52, longitude=73.85, radius_km=10, assign=True)
+    plan = plan_worker_route(db, current_user=SimpleNamespace(id=first.id, role=first.role), payload=request)
+
+    assert plan.assigned
+    assert sorted((s.kind, s.ref_id) for s in plan.stops) == sorted(
+        [("pickup", i) for i in pickups[1:]] + [("report", i) for i in reports]
+    )
+    db.expire_all()
+    assert db.get(PickupRequest, pickups[0]).assigned_worker_id == second.id
+    assert all(db.get(PickupRequest, i).assigned_worker_id == first.id for i in pickups[1:])
+    assert all(db.get(WasteReport, i).assigned_worker_id == first.id for i in reports)
+
+    again = plan_worker_route(db, current_user=SimpleNamespace(id=second.id, role=second.role), payload=request)
+    assert again.stops == []
@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.segregation import SegregationBulkRow
+
+from app.services.segregation_service import (
+    ROW_INVALID,
+    BulkLogRow,
+    parse_segregation_csv,
+    validate_bulk_rows,
+)
+
+
+def _row(household_id, day, dry=1.0, wet=1.0, reject=0.0):
+    return BulkLogRow(household_id=household_id, log_date=day, dry_kg=dry, wet_kg=wet, reject_kg=reject)
+
+
+def test_csv_rows_parse_and_bad_rows_are_reported():
+    text = (
+        "household_id,log_date,dry_kg,wet_kg,reject_kg,notes\n"
+        "1,2026-03-01,1.5,2,0.25,block A\n"
+        "2,03/01/2026,1,1,1,\n"
+        "3,2026-03-01,,4,,\n"
+    )
+    rows, errors = parse_segregation_csv(text)
+
+    assert [n for n, _ in rows] == [1, 3]
+    assert rows[0][1] == BulkLogRow(1, date(2026, 3, 1), 1.5, 2.0, 0.25, "block A")
+    assert rows[1][1].dry_kg == 0.0 and rows[1][1].notes is None
+    assert [(e.row, e.status) for e in errors] == [(2, ROW_INVALID)]
+
+
+def test_validation_keeps_first_row_per_household_day():
+    today = date(2026, 3, 5)
+    rows = [
+        (1, _row(1, date(2026, 3, 1))),
+        (2, _row(1, date(2026, 3, 1), dry=9.0)),
+        (3, _row(99, date(2026, 3, 1))),
+        (4, _row(2, date(2026, 3, 1), reject=-1.0)),
+        (5, _row(2, date(2026, 3, 6))),
+        (6, _row(2, date(2026, 3, 2))),
+    ]
+    accepted, rejected = validate_bulk_rows(rows, known_households={1, 2}, today=today)
+
+    assert [n for n, _ in accepted] == [1, 6]
+    assert {r.row: r.detail for r in rejected} == {
+        2: "Repeats an earlier row for this household and date",
+        3: "Household not found",
+        4: "Weights must be non-negative",
+        5: "log_date is in the future",
+    }
+
+
+def test_non_finite_weights_are_rejected_on_both_paths():
+    rows, errors = parse_segregation_csv(
+        "household_id,log_date,dry_kg,wet_kg,reject_kg\n"
+        "1,2026-03-01,nan,1,0\n"
+        "1,2026-03-02,1,inf,0\n"
+        "1,2026-03-03,1,1,-inf\n"
+        "1,2026-03-04,1,1,0\n"
+    )
+    assert errors == []
+    accepted, rejected = validate_bulk_rows(rows, known_households={1}, today=date(2026, 3, 5))
+    assert [n for n, _ in accepted] == [4]
+    assert {r.row: r.detail for r in rejected} == {n: "Weights must be finite numbers" for n in (1, 2, 3)}
+
+    for weight in (float("nan"), float("inf"), -1.0):
+        with pytest.raises(ValidationError):
+            SegregationBulkRow(household_id=1, log_date=date(2026, 3, 1), dry_kg=weight)
@@ -0,0 +1,28 @@
+from datetime import date
+
+import numpy as np
+
+from app.services.segregation_summary_service import weekly_buckets_numpy
+
+
+def test_numpy_buckets_break_on_mondays():
+    days = np.array(["2026-03-01", "2026-03-02", "2026-03-08", "2026-03-09"], dtype="datetime64[D]")
+    buckets = weekly_buckets_numpy(
+        days,
+        np.array([1.0, 2.0, 3.0, 4.0]),
+        np.array([0.5, 0.5, 0.5, 0.5]),
+        np.zeros(4),
+        np.array([60.0, 80.0, 100.0, 40.0]),
+    )
+
+    # 1 Mar 2026 is a Sunday, so it closes the week of 23 Feb.
+    assert [b.week_start for b in buckets] == [date(2026, 2, 23), date(2026, 3, 2), date(2026, 3, 9)]
+    assert [b.logs for b in buckets] == [1, 2, 1]
+    assert buckets[1].dry_kg == 5.0
+    assert buckets[1].wet_kg == 1.0
+    assert buckets[1].score_sum == 180.0
+
+
+def test_numpy_buckets_empty():
+    empty = np.array([], dtype="datetime64[D]")
+    assert weekly_buckets_numpy(empty, np.array([]), np.array([]), np.array([]), np.array([])) == []
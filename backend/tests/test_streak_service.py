@@ -0,0 +1,54 @@
+import random
+from datetime import date, timedelta
+
+from app.services.streak_service import (
+    StreakState,
+    advance_streak,
+    consecutive_days,
+    merge_backdated,
+    state_from_dates,
+)
+
+
+def _apply(state, seen, day):
+    nxt = advance_streak(state, day)
+    if nxt is None:
+        nxt = merge_backdated(
+            state,
+            day,
+            run_before=consecutive_days(seen, day - timedelta(days=1), -1),
+            run_after=consecutive_days(seen, day + timedelta(days=1), 1),
+        )
+    seen.add(day)
+    return nxt
+
+
+def test_forward_days_extend_and_reset():
+    d = date(2026, 3, 1)
+    state = StreakState()
+    for offset in (0, 1, 2, 2, 5):
+        state = advance_streak(state, d + timedelta(days=offset))
+    assert state == StreakState(current=1, longest=3, last_active=d + timedelta(days=5))
+    assert state.current_as_of(d + timedelta(days=5)) == 1
+    assert state.current_as_of(d + timedelta(days=6)) == 0
+
+
+def test_backdated_day_bridging_into_current_run():
+    d = date(2026, 3, 1)
+    seen = {d, d + timedelta(days=1), d + timedelta(days=3), d + timedelta(days=4)}
+    state = state_from_dates(seen)
+    assert (state.current, state.longest) == (2, 2)
+    assert advance_streak(state, d + timedelta(days=2)) is None
+    state = _apply(state, seen, d + timedelta(days=2))
+    assert (state.current, state.longest) == (5, 5)
+
+
+def test_incremental_matches_full_recompute_in_any_order():
+    rng = random.Random(7)
+    start = date(2026, 1, 1)
+    for _ in range(50):
+        days = [start + timedelta(days=rng.randrange(60)) for _ in range(40)]
+        state, seen = StreakState(), set()
+        for day in days:
+            state = _apply(state, seen, day)
+        assert state == state_from_dates(days)
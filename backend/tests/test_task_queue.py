@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from sqlalchemy import update
+
+from app.services import task_queue_service as tq
+from app.services.task_handlers import TASK_HANDLERS
+
+
+def test_retry_delay_backs_off_exponentially_and_caps():
+    assert tq.retry_delay_seconds(1) == tq.RETRY_BASE_SECONDS
+    assert tq.retry_delay_seconds(2) == tq.RETRY_BASE_SECONDS * 2
+    assert tq.retry_delay_seconds(4) == tq.RETRY_BASE_SECONDS * 8
+    assert tq.retry_delay_seconds(50) == tq.RETRY_MAX_SECONDS
+
+
+def test_every_task_kind_has_a_handler():
+    kinds = {v for k, v in vars(tq).items() if k.startswith("TASK_") and isinstance(v, str)}
+    assert kinds == set(TASK_HANDLERS)
+
+
+def _task(db, key="k"):
+    return db.query(tq.BackgroundTask).filter_by(idempotency_key=f"test.kind:{key}").one()
+
+
+def test_enqueue_tasks_is_idempotent_per_key(db):
+    tq.enqueue_tasks(db, "test.kind", [("a", {"n": 1}), ("b", {"n": 2})])
+    db.commit()
+    tq.enqueue_tasks(db, "test.kind", [("a", {"n": 99}), ("c", {"n": 3})])
+    tq.enqueue_task(db, "test.kind", {"n": 99}, key="b")
+    db.commit()
+
+    rows = db.query(tq.BackgroundTask).order_by(tq.BackgroundTask.idempotency_key).all()
+    assert [(r.idempotency_key, r.payload["n"]) for r in rows] == [
+        ("test.kind:a", 1),
+        ("test.kind:b", 2),
+        ("test.kind:c", 3),
+    ]
+
+
+def test_due_task_is_leased_once_and_marked_done_by_the_handler_commit(pg_sessionmaker, db):
+    tq.enqueue_task(db, "test.kind", {"n": 1}, key="k")
+    db.commit()
+
+    with pg_sessionmaker() as first, pg_sessionmaker() as second:
+        (task_id,) = tq.claim_due_tasks(first, worker_id="w1")
+        assert tq.claim_due_tasks(second, worker_id="w2") == []
+
+        seen = []
+        assert tq.run_task(first, task_id, {"test.kind": lambda s, payload: seen.append(payload)})
+    assert seen == [{"n": 1}]
+
+    db.expire_all()
+    task = _task(db)
+    assert (task.status, task.attempts, task.locked_by) == (tq.TaskStatus.DONE.value, 1, "w1")
+    assert task.completed_at is not None
+
+
+def test_failing_task_retries_with_backoff_then_goes_dead(db):
+    tq.enqueue_task(db, "test.kind", {}, key="k", max_attempts=2)
+    db.commit()
+
+    def boom(session, payload):
+        raise RuntimeError("boom")
+
+    (task_id,) = tq.claim_due_tasks(db, worker_id="w")
+    assert not tq.run_task(db, task_id, {"test.kind": boom})
+    task = _task(db)
+    assert (task.status, task.attempts, task.last_error) == (tq.TaskStatus.PENDING.value, 1, "RuntimeError: boom")
+    assert tq.claim_due_tasks(db, worker_id="w") == []  # backing off
+
+    task.run_after = tq._utc_now()
+    db.commit()
+    (task_id,) = tq.claim_due_tasks(db, worker_id="w")
+    assert not tq.run_task(db, task_id, {"test.kind": boom})
+    db.expire_all()
+    assert (_task(db).status, _task(db).attempts) == (tq.TaskStatus.DEAD.value, 2)
+    assert tq.claim_due_tasks(db, worker_id="w") == []
+
+
+def test_expired_lease_is_released_until_the_last_attempt(db):
+    tq.enqueue_task(db, "test.kind", {}, key="k", max_attempts=2)
+    db.commit()
+    stale = tq._utc_now() - timedelta(seconds=tq.LEASE_SECONDS + 1)
+
+    # The worker holding attempt 1 died: the task is leased again.
+    (task_id,) = tq.claim_due_tasks(db, worker_id="dead-1")
+    db.execute(update(tq.BackgroundTask).values(locked_at=stale))
+    db.commit()
+    assert tq.claim_due_tasks(db, worker_id="w") == [task_id]
+
+    # The worker holding the final attempt died too: the task is given up.
+    db.execute(update(tq.BackgroundTask).values(locked_at=stale))
+    db.commit()
+    assert tq.claim_due_tasks(db, worker_id="w") == []
+    db.expire_all()
+    task = _task(db)
+    assert (task.status, task.attempts, task.locked_by) == (tq.TaskStatus.DEAD.value, 2, None)
+    assert task.last_error.startswith("Lease expired")
@@ -0,0 +1,47 @@
+import hashlib
+
+from app.models.token import TokenBlock
+from app.services.token_service import build_block_data, merkle_root, verify_blocks
+
+
+def _chain(batches):
+    rows, previous_hash = [], None
+    for i, payloads in enumerate(batches, start=1):
+        root, data = build_block_data(payloads)
+        block_hash = TokenBlock.compute_hash(previous_hash, data)
+        rows.append((i, previous_hash, block_hash, data, root))
+        previous_hash = block_hash
+    return rows
+
+
+def _tx(tx_id, amount=1.0):
+    return {"tx_id": tx_id, "account_id": 1, "amount": amount, "type": "MINT", "description": None, "created_at": None}
+
+
+def test_merkle_root_pairs_odd_leaf_with_itself():
+    leaves = [hashlib.sha256(f'{{"n":{n}}}'.encode()).digest() for n in range(3)]
+    left = hashlib.sha256(leaves[0] + leaves[1]).digest()
+    right = hashlib.sha256(leaves[2] + leaves[2]).digest()
+    assert merkle_root([{"n": 0}, {"n": 1}, {"n": 2}]) == hashlib.sha256(left + right).hexdigest()
+
+
+def test_verify_accepts_legacy_and_batched_blocks():
+    legacy_data = '{"tx_id": 1}'
+    legacy = (1, None, TokenBlock.compute_hash(None, legacy_data), legacy_data, None)
+    root, data = build_block_data([_tx(2), _tx(3), _tx(4)])
+    batched = (2, legacy[2], TokenBlock.compute_hash(legacy[2], data), data, root)
+    report = verify_blocks([legacy, batched])
+    assert report.ok and (report.blocks, report.transactions) == (2, 4)
+
+
+def test_verify_stops_at_first_broken_block():
+    rows = _chain([[_tx(1), _tx(2)], [_tx(3)], [_tx(4)]])
+    block_id, prev, block_hash, data, root = rows[1]
+    rows[1] = (block_id, prev, block_hash, data.replace('"amount":1.0', '"amount":9.0'), root)
+    report = verify_blocks(rows)
+    assert (report.ok, report.bad_block_id, report.blocks) == (False, 2, 1)
+
+    rows = _chain([[_tx(1)], [_tx(2)]])
+    forged_root, forged_data = build_block_data([_tx(2, amount=5.0)])
+    rows[1] = (2, rows[0][2], TokenBlock.compute_hash(rows[0][2], forged_data), forged_data, rows[1][4])
+    assert verify_blocks(rows).error == "merkle_root does not match block transactions"
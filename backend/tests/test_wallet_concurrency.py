@@ -0,0 +1,48 @@
+"""Stress test for atomic wallet credits; runs against the TEST_DATABASE_URL database."""
+
+import threading
+from decimal import Decimal
+
+from app.models.bulk import Wallet
+from app.services.wallet_service import credit_wallet, debit_wallet
+
+THREADS = 16
+CREDITS_PER_THREAD = 50
+AMOUNT = 0.1
+
+
+def test_parallel_credits_are_never_lost(pg_sessionmaker, factory):
+    wallet_id = factory.wallet().id
+    start = threading.Barrier(THREADS)
+    errors = []
+
+    def award(debit_every: int) -> None:
+        try:
+            start.wait()
+            for i in range(CREDITS_PER_THREAD):
+                with pg_sessionmaker() as db:
+                    # Each award works from its own (soon stale) copy of the row.
+                    wallet = db.get(Wallet, wallet_id)
+                    if debit_every and i % debit_every == 0:
+                        debit_wallet(db, wallet, AMOUNT)
+                    else:
+                        credit_wallet(db, wallet, AMOUNT)
+                    db.commit()
+        except Exception as exc:  # surfaced by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=award, args=(5 if n % 2 else 0,)) for n in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    debits = (THREADS // 2) * len(range(0, CREDITS_PER_THREAD, 5))
+    credits = THREADS * CREDITS_PER_THREAD - debits
+    with pg_sessionmaker() as db:
+        wallet = db.get(Wallet, wallet_id)
+        assert Decimal(str(wallet.lifetime_credited)) == Decimal(str(AMOUNT)) * credits
+        assert Decimal(str(wallet.lifetime_debited)) == Decimal(str(AMOUNT)) * debits
+        assert Decimal(str(wallet.balance_pcc)) == Decimal(str(AMOUNT)) * (credits - debits)
+        assert wallet.balance_points == wallet.balance_pcc
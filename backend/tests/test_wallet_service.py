@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+from sqlalchemy import inspect
+
+from app.models.bulk import Transaction, TransactionType, Wallet
+from app.services.wallet_service import (
+    WalletDrift,
+    credit_wallet,
+    find_wallet_drift,
+    repair_wallet_snapshots,
+    to_pcc,
+)
+
+
+def test_amounts_are_fixed_point():
+    assert to_pcc(0.1) + to_pcc(0.2) == Decimal("0.3")
+    assert to_pcc("2.0000005") == Decimal("2.000000")
+    assert to_pcc(2.5000015) == Decimal("2.500002")
+
+
+def test_credit_applies_to_the_stored_row_not_the_stale_copy(pg_sessionmaker, factory):
+    wallet_id = factory.wallet(balance_pcc=1.0, balance_points=1.0, lifetime_credited=1.0).id
+
+    with pg_sessionmaker() as stale, pg_sessionmaker() as other:
+        wallet = stale.get(Wallet, wallet_id)
+        credit_wallet(other, other.get(Wallet, wallet_id), 2.0)
+        other.commit()
+
+        credit_wallet(stale, wallet, 2.5)
+        assert wallet.balance_pcc == wallet.balance_points == 5.5
+        assert not inspect(wallet).attrs.balance_pcc.history.has_changes()
+        stale.commit()
+
+    with pg_sessionmaker() as db:
+        wallet = db.get(Wallet, wallet_id)
+        assert (wallet.balance_pcc, wallet.lifetime_credited, wallet.lifetime_debited) == (5.5, 5.5, 0.0)
+
+
+def test_drift_is_found_against_transactions_and_repaired(factory, db):
+    wallet = factory.wallet()
+    db.add_all(
+        [
+            Transaction(wallet_id=wallet.id, tx_type=TransactionType.CREDIT, amount_points=7.0, amount_pcc=7.0),
+            Transaction(wallet_id=wallet.id, tx_type=TransactionType.DEBIT, amount_points=3.0, amount_pcc=3.0),
+        ]
+    )
+    wallet.balance_pcc = wallet.balance_points = wallet.lifetime_credited = 5.0
+    db.commit()
+
+    (drift,) = find_wallet_drift(db)
+    assert (drift.wallet_id, drift.ledger_credited, drift.ledger_debited, drift.ledger_balance) == (wallet.id, 7.0, 3.0, 4.0)
+    assert repair_wallet_snapshots(db, [wallet.id]) == 1
+    db.commit()
+    assert find_wallet_drift(db) == []
+
+
+def test_drift_reports_ledger_balance():
+    d = WalletDrift(
+        wallet_id=1,
+        balance_pcc=5.0,
+        lifetime_credited=5.0,
+        lifetime_debited=0.0,
+        ledger_credited=7.0,
+        ledger_debited=3.0,
+    )
+    assert d.ledger_balance == 4.0
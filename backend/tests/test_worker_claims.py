@@ -0,0 +1,131 @@
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.core.database import get_db
+from app.models.bulk import PickupRequest, PickupRequestStatus
+from app.models.user import UserRole
+from app.models.waste_report import WasteReport, WasteReportStatus
+from app.services.bulk_service import auto_assign_worker_jobs, claim_worker_job
+from app.services.waste_report_service import auto_assign_open_reports, claim_open_report
+
+WORKERS = 8
+
+
+def _worker(factory) -> SimpleNamespace:
+    user = factory.user(UserRole.WASTE_WORKER)
+    return SimpleNamespace(id=user.id, role=user.role)
+
+
+def _race(pg_sessionmaker, workers, attempt):
+    """Run attempt(db, worker) for every worker at once; return {worker id: result or exception}."""
+    start = threading.Barrier(len(workers))
+    results = {}
+
+    def run(worker):
+        with pg_sessionmaker() as db:
+            start.wait()
+            try:
+                results[worker.id] = attempt(db, worker)
+            except Exception as exc:
+                results[worker.id] = exc
+
+    threads = [threading.Thread(target=run, args=(w,)) for w in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_second_claim_of_a_job_or_report_loses(pg_sessionmaker, factory, db):
+    workers = [_worker(factory) for _ in range(WORKERS)]
+    pickup_id = factory.pickup().id
+    report_id = factory.report().id
+
+    jobs = _race(
+        pg_sessionmaker,
+        workers,
+        lambda s, w: claim_worker_job(s, current_user=w, pickup_request_id=pickup_id).assigned_worker_id,
+    )
+    (winner,) = [wid for wid, r in jobs.items() if r == wid]
+    losses = [r for r in jobs.values() if isinstance(r, HTTPException)]
+    assert len(losses) == WORKERS - 1 and all(e.status_code == 409 for e in losses)
+    assert db.get(PickupRequest, pickup_id).assigned_worker_id == winner
+
+    reports = _race(
+        pg_sessionmaker,
+        workers,
+        lambda s, w: getattr(claim_open_report(s, report_id=report_id, worker_id=w.id), "assigned_worker_id", None),
+    )
+    (winner,) = [wid for wid, r in reports.items() if r == wid]
+    assert list(reports.values()).count(None) == WORKERS - 1
+    report = db.get(WasteReport, report_id)
+    assert (report.assigned_worker_id, report.status) == (winner, WasteReportStatus.IN_PROGRESS.value)
+
+
+@pytest.mark.parametrize("kind", ["jobs", "reports"])
+def test_auto_assign_never_hands_one_item_to_two_workers(pg_sessionmaker, factory, db, kind):
+    workers = [_worker(factory) for _ in range(WORKERS)]
+    org = factory.bulk_org()
+    if kind == "jobs":
+        ids = [factory.pickup(org).id for _ in range(20)]
+        got = _race(
+            pg_sessionmaker,
+            workers,
+            lambda s, w: [j.pickup_request_id for j in auto_assign_worker_jobs(s, current_user=w, limit=3)],
+        )
+    else:
+        ids = [factory.report().id for _ in range(20)]
+        got = _race(
+            pg_sessionmaker,
+            workers,
+            lambda s, w: [r.id for r in auto_assign_open_reports(s, worker_id=w.id, limit=3)],
+        )
+
+    handed_out = Counter(i for batch in got.values() for i in batch)
+    assert all(n == 1 for n in handed_out.values())
+    assert sum(handed_out.values()) == min(len(ids), WORKERS * 3)
+    model = PickupRequest if kind == "jobs" else WasteReport
+    for worker_id, batch in got.items():
+        for item_id in batch:
+            assert db.get(model, item_id).assigned_worker_id == worker_id
+
+
+def test_claim_endpoints_report_a_lost_race_as_conflict(pg_sessionmaker, factory):
+    from app.api import waste_reporting, worker_jobs
+
+    first, second = _worker(factory), _worker(factory)
+    pickup = factory.pickup()
+    report = factory.report()
+    current = {"user": first}
+
+    app = FastAPI()
+    app.include_router(worker_jobs.router)
+    app.include_router(waste_reporting.router)
+
+    def _db():
+        with pg_sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[deps.get_current_user] = lambda: current["user"]
+    client = TestClient(app)
+
+    assert client.post(f"/worker/jobs/{pickup.id}/claim").json()["data"]["pickup_request"]["status"] == (
+        PickupRequestStatus.ASSIGNED.value
+    )
+    assert client.post(f"/waste/reports/{report.id}/claim").status_code == 200
+    # Claiming again is idempotent for the holder.
+    assert client.post(f"/worker/jobs/{pickup.id}/claim").status_code == 200
+
+    current["user"] = second
+    assert client.post(f"/worker/jobs/{pickup.id}/claim").status_code == 409
+    assert client.post(f"/waste/reports/{report.id}/claim").status_code == 409
+    assert client.post("/worker/jobs/999999/claim").status_code == 404
+    assert client.post("/waste/reports/999999/claim").status_code == 404
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+
+from app.models.bulk import PickupRequest
+from app.models.user import UserRole
+from app.models.waste_report import WasteReport, WasteReportStatus
+from app.models.worker_sync import WorkerSyncItem, WorkerSyncMutation
+from app.services import worker_sync_service as sync
+from app.services.bulk_service import claim_worker_job
+
+
+def test_watermark_round_trip_and_fallbacks():
+    now = datetime(2026, 3, 6, 12, 0, tzinfo=timezone.utc)
+    issued = now - timedelta(hours=3)
+
+    assert sync.decode_watermark(sync.encode_watermark(issued), now=now) == issued
+    assert sync.decode_watermark(None, now=now) is None
+    assert sync.decode_watermark("w1.not-a-number", now=now) is None
+    assert sync.decode_watermark(sync.encode_watermark(now + timedelta(minutes=1)), now=now) is None
+    too_old = now - sync.WATERMARK_MAX_AGE - timedelta(seconds=1)
+    assert sync.decode_watermark(sync.encode_watermark(too_old), now=now) is None
+
+
+def test_mutations_apply_in_order_and_repeated_keys_replay(monkeypatch, factory, db):
+    calls = []
+
+    def claim(db, user, args):
+        calls.append(args["pickup_request_id"])
+        if args["pickup_request_id"] == 2:
+            raise HTTPException(status_code=409, detail="Pickup request already assigned to another worker.")
+        return {"pickup_request_id": args["pickup_request_id"], "status": "ASSIGNED"}
+
+    monkeypatch.setitem(sync.MUTATION_HANDLERS, sync.OP_PICKUP_CLAIM, claim)
+    worker = factory.user(UserRole.WASTE_WORKER)
+    mutations = [
+        ("a", sync.OP_PICKUP_CLAIM, {"pickup_request_id": 1}),
+        ("b", sync.OP_PICKUP_CLAIM, {"pickup_request_id": 2}),
+        ("a", sync.OP_PICKUP_CLAIM, {"pickup_request_id": 1}),
+        ("c", "pickup.teleport", {}),
+    ]
+    outcomes = sync.apply_mutations(db, user=worker, mutations=mutations)
+
+    assert calls == [1, 2]
+    assert [(o.key, o.status, o.http_status, o.replayed) for o in outcomes] == [
+        ("a", sync.MUTATION_APPLIED, 200, False),
+        ("b", sync.MUTATION_REJECTED, 409, False),
+        ("a", sync.MUTATION_APPLIED, 200, True),
+        ("c", sync.MUTATION_REJECTED, 422, False),
+    ]
+    assert outcomes[0].result == {"pickup_request_id": 1, "status": "ASSIGNED"}
+    stored = db.execute(select(WorkerSyncMutation.client_key, WorkerSyncMutation.status).order_by(WorkerSyncMutation.id))
+    assert stored.all() == [
+        ("a", sync.MUTATION_APPLIED),
+        ("b", sync.MUTATION_REJECTED),
+        ("c", sync.MUTATION_REJECTED),
+    ]
+
+    # A later sync replays every stored outcome without calling the handler.
+    assert all(o.replayed for o in sync.apply_mutations(db, user=worker, mutations=mutations))
+    assert calls == [1, 2]
+
+
+def _sync(db, user, watermark):
+    delta = sync.collect_delta(db, user=user, watermark=watermark)
+    db.commit()
+    return delta
+
+
+def test_removed_only_names_rows_the_device_was_sent(factory, db):
+    worker, other = factory.user(UserRole.WASTE_WORKER), factory.user(UserRole.WASTE_WORKER)
+    held_pickup = factory.pickup()
+    held_report = factory.report()
+    factory.pickup(assigned_worker_id=other.id)  # never relevant to `worker`
+
+    full = _sync(db, worker, None)
+    assert full.full
+    assert [p.pickup_request_id for p in full.pickups] == [held_pickup.id]
+    assert [r.id for r in full.reports] == [held_report.id]
+
+    # Elsewhere in the city: the held rows are taken, and new rows come and go unseen.
+    claim_worker_job(db, current_user=other, pickup_request_id=held_pickup.id)
+    db.execute(
+        update(WasteReport)
+        .where(WasteReport.id == held_report.id)
+        .values(status=WasteReportStatus.IN_PROGRESS.value, assigned_worker_id=other.id, updated_at=datetime.now(timezone.utc))
+    )
+    unseen = factory.pickup()
+    claim_worker_job(db, current_user=other, pickup_request_id=unseen.id)
+    db.commit()
+
+    before_changes = sync.encode_watermark(datetime.now(timezone.utc) - timedelta(minutes=10))
+    delta = _sync(db, worker, before_changes)
+    assert (delta.removed_pickups, delta.removed_reports) == ([held_pickup.id], [held_report.id])
+    assert delta.pickups == [] and delta.reports == []
+
+    # Once a watermark issued after the change comes back, the device has been told.
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+    db.execute(update(PickupRequest).values(updated_at=past))
+    db.execute(update(WasteReport).values(updated_at=past))
+    db.commit()
+    delta = _sync(db, worker, sync.encode_watermark(datetime.now(timezone.utc)))
+    assert (delta.removed_pickups, delta.removed_reports) == ([], [])
+    assert db.execute(select(WorkerSyncItem).where(WorkerSyncItem.user_id == worker.id)).all() == []
@@ -46,7 +46,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     params.append("username", email);
     params.append("password", password);
 
-    const res = await api.post<{ access_token: string; token_type: string }>(
+    const res = await api.post<{ access_token: string; token_type: string; refresh_token?: string | null }>(
       "/auth/login",
       params,
       {
@@ -57,11 +57,21 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     );
 
     localStorage.setItem("access_token", res.data.access_token);
+    if (res.data.refresh_token) {
+      localStorage.setItem("refresh_token", res.data.refresh_token);
+    } else {
+      localStorage.removeItem("refresh_token");
+    }
     await fetchMe();
   }
 
   function logout() {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (refreshToken) {
+      api.post("/auth/logout", { refresh_token: refreshToken }).catch(() => undefined);
+    }
     localStorage.removeItem("access_token");
+    localStorage.removeItem("refresh_token");
     setUser(null);
   }
 
@@ -69,11 +69,46 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// Access tokens live for minutes; on a 401 swap the refresh token for a new
+// pair once (shared by concurrent requests) and replay the original request.
+let refreshing: Promise<string | null> | null = null;
+
+const refreshAccessToken = async (): Promise<string | null> => {
+  const refreshToken = localStorage.getItem("refresh_token");
+  if (!refreshToken) return null;
+  try {
+    const res = await axios.post<{ access_token: string; refresh_token?: string | null }>(
+      `${API_ROOT}/api/v1/auth/refresh`,
+      { refresh_token: refreshToken }
+    );
+    localStorage.setItem("access_token", res.data.access_token);
+    if (res.data.refresh_token) localStorage.setItem("refresh_token", res.data.refresh_token);
+    return res.data.access_token;
+  } catch {
+    // Another tab may have rotated the token a moment ago.
+    const current = localStorage.getItem("refresh_token");
+    return current && current !== refreshToken ? localStorage.getItem("access_token") : null;
+  }
+};
+
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config;
+    if (error.response?.status === 401 && original && !original._retried) {
+      original._retried = true;
+      refreshing = refreshing ?? refreshAccessToken().finally(() => {
+        refreshing = null;
+      });
+      const token = await refreshing;
+      if (token) {
+        original.headers.set("Authorization", `Bearer ${token}`);
+        return api(original);
+      }
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem("access_token");
+      localStorage.removeItem("refresh_token");
     }
     return Promise.reject(error);
   }
@@ -278,11 +313,7 @@ export const fetchCitizenTrainingSummary = async () => {
   return res.data;
 };
 
-export const fetchPublicStats = async () => {
-  const res = await api.get("/public/stats");
-  const raw = (res.data?.data?.stats ?? res.data?.stats ?? res.data?.data ?? null) as Record<string, unknown> | null;
-  if (!raw) return null;
-
+const normalizePublicStats = (raw: Record<string, unknown>) => {
   const num = (v: unknown, d = 0) => {
     const n = Number(v);
     return Number.isFinite(n) ? n : d;
@@ -299,6 +330,13 @@ export const fetchPublicStats = async () => {
   } as PublicStats;
 };
 
+export const fetchPublicStats = async () => {
+  const res = await api.get("/public/stats");
+  const raw = (res.data?.data?.stats ?? res.data?.stats ?? res.data?.data ?? null) as Record<string, unknown> | null;
+  if (!raw) return null;
+  return normalizePublicStats(raw);
+};
+
 export const fetchPublicPartners = async () => {
   const res = await api.get("/public/partners");
   return (res.data?.data?.partners ?? res.data?.partners ?? []) as Partner[];
@@ -329,6 +367,31 @@ export const fetchSampleLedger = async () => {
   return (res.data?.data?.rows ?? res.data?.rows ?? []) as LedgerRow[];
 };
 
+export type PublicBundle = {
+  stats: PublicStats | null;
+  partners: Partner[];
+  testimonials: Testimonial[];
+  case_studies: CaseStudy[];
+  faqs: FAQItem[];
+  config: PublicConfig | null;
+  sample_ledger: LedgerRow[];
+};
+
+// Every landing-page section in one request (optionally only `fields`).
+export const fetchPublicBundle = async (fields?: Array<keyof PublicBundle>) => {
+  const res = await api.get("/public/bundle", { params: fields?.length ? { fields: fields.join(",") } : undefined });
+  const data = (res.data?.data ?? {}) as Record<string, unknown>;
+  return {
+    stats: data.stats ? normalizePublicStats(data.stats as Record<string, unknown>) : null,
+    partners: (data.partners ?? []) as Partner[],
+    testimonials: (data.testimonials ?? []) as Testimonial[],
+    case_studies: (data.case_studies ?? []) as CaseStudy[],
+    faqs: (data.faqs ?? []) as FAQItem[],
+    config: (data.config ?? null) as PublicConfig | null,
+    sample_ledger: (data.sample_ledger ?? []) as LedgerRow[],
+  } as PublicBundle;
+};
+
 export const submitLead = async (payload: LeadPayload) => {
   const res = await api.post<ApiEnvelope<{ lead_id: number; status: string }>>("/public/leads", payload);
   return res.data;
@@ -1,16 +1,8 @@
 import { useEffect, useMemo, useState } from "react";
 import { motion, useScroll } from "framer-motion";
 
-import {
-  fetchPublicCaseStudies,
-  fetchPublicConfig,
-  fetchPublicFAQs,
-  fetchPublicPartners,
-  fetchPublicStats,
-  fetchPublicTestimonials,
-  fetchSampleLedger,
-  submitLead,
-} from "../lib/api";
+import { fetchPublicBundle, submitLead } from "../lib/api";
+import type { PublicBundle } from "../lib/api";
 import {
   fallbackCaseStudies,
   fallbackConfig,
@@ -69,37 +61,35 @@ export default function Landing() {
 
   useEffect(() => {
     const load = async () => {
-      const [s, p, t, c, f, l, cfg] = await Promise.allSettled([
-        fetchPublicStats(),
-        fetchPublicPartners(),
-        fetchPublicTestimonials(),
-        fetchPublicCaseStudies(),
-        fetchPublicFAQs(),
-        fetchSampleLedger(),
-        fetchPublicConfig(),
-      ]);
+      let bundle: PublicBundle | null = null;
+      try {
+        bundle = await fetchPublicBundle();
+      } catch {
+        bundle = null;
+      }
 
       let hasFailure = false;
 
-      if (s.status === "fulfilled" && s.value) setStats(s.value);
+      if (bundle?.stats) setStats(bundle.stats);
       else hasFailure = true;
 
-      if (p.status === "fulfilled" && p.value?.length) setPartners(p.value);
+      if (bundle?.partners.length) setPartners(bundle.partners);
       else hasFailure = true;
 
-      if (t.status === "fulfilled" && t.value?.length) setTestimonials(t.value);
+      if (bundle?.testimonials.length) setTestimonials(bundle.testimonials);
       else hasFailure = true;
 
-      if (c.status === "fulfilled" && c.value?.length) setCaseStudies(c.value);
+      if (bundle?.case_studies.length) setCaseStudies(bundle.case_studies);
       else hasFailure = true;
 
-      if (f.status === "fulfilled" && f.value?.length) setFaqs(f.value);
+      if (bundle?.faqs.length) setFaqs(bundle.faqs);
       else hasFailure = true;
 
-      if (l.status === "fulfilled" && Array.isArray(l.value)) {
-        setLedgerRows(l.value);
-        if (l.value.length > 0) {
-          const derived = l.value
+      const ledger = bundle?.sample_ledger;
+      if (Array.isArray(ledger)) {
+        setLedgerRows(ledger);
+        if (ledger.length > 0) {
+          const derived = ledger
             .map((row) =>
               Number.isFinite(row.quality_score)
                 ? Math.round(row.quality_score * 100)
@@ -113,8 +103,8 @@ export default function Landing() {
         hasFailure = true;
       }
 
-      if (cfg.status === "fulfilled" && Object.keys(cfg.value?.org_type_copy || {}).length) {
-        setConfig(cfg.value.org_type_copy);
+      if (bundle?.config && Object.keys(bundle.config.org_type_copy || {}).length) {
+        setConfig(bundle.config.org_type_copy);
       } else {
         hasFailure = true;
       }
@@ -2,10 +2,7 @@
 import { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
 
-const API_BASE_URL =
-  import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000";
-
-const getAuthToken = () => localStorage.getItem("access_token");
+import api from "../../lib/api";
 
 interface AdminSummary {
   total_users: number;
@@ -57,33 +54,17 @@ export const AdminDashboardPage: React.FC = () => {
   const [logsError, setLogsError] = useState<string | null>(null);
 
   useEffect(() => {
-    const token = getAuthToken();
-    if (!token) {
-      setError("Not authenticated.");
-      setLoading(false);
-      return;
-    }
-
-    const headers = { Authorization: `Bearer ${token}` };
-
     const fetchData = async () => {
       try {
         const [summaryRes, carbonRes] = await Promise.all([
-          fetch(`${API_BASE_URL}/api/v1/admin/summary`, { headers }),
-          fetch(`${API_BASE_URL}/api/v1/admin/analytics/carbon`, { headers }),
+          api.get<AdminSummary>("/admin/summary"),
+          api.get<CarbonSummary>("/admin/analytics/carbon"),
         ]);
-
-        if (!summaryRes.ok) throw new Error("Failed to load admin summary");
-        if (!carbonRes.ok) throw new Error("Failed to load carbon analytics");
-
-        const summaryData = (await summaryRes.json()) as AdminSummary;
-        const carbonData = (await carbonRes.json()) as CarbonSummary;
-
-        setSummary(summaryData);
-        setCarbon(carbonData);
+        setSummary(summaryRes.data);
+        setCarbon(carbonRes.data);
       } catch (err: any) {
         console.error(err);
-        setError(err.message ?? "Error loading dashboard.");
+        setError(err?.response?.data?.detail ?? err.message ?? "Error loading dashboard.");
       } finally {
         setLoading(false);
       }
@@ -93,23 +74,12 @@ export const AdminDashboardPage: React.FC = () => {
       setLogsLoading(true);
       setLogsError(null);
       try {
-        const res = await fetch(
-          `${API_BASE_URL}/api/v1/admin/segregation/logs?limit=5`,
-          { headers },
-        );
-        if (!res.ok) {
-          const text = await res.text().catch(() => "");
-          throw new Error(
-            text?.trim()
-              ? `Failed to load segregation logs: ${text}`
-              : "Failed to load segregation logs",
-          );
-        }
-        const data = (await res.json()) as SegregationLogPreview[];
-        setRecentLogs(Array.isArray(data) ? data : []);
+        const res = await api.get<SegregationLogPreview[]>("/admin/segregation/logs", { params: { limit: 5 } });
+        setRecentLogs(Array.isArray(res.data) ? res.data : []);
       } catch (err: any) {
         console.error(err);
-        setLogsError(err.message ?? "Error loading segregation logs.");
+        const detail = err?.response?.data?.detail;
+        setLogsError(detail ? `Failed to load segregation logs: ${detail}` : "Failed to load segregation logs");
         setRecentLogs([]);
       } finally {
         setLogsLoading(false);
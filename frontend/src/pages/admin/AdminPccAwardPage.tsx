@@ -2,10 +2,7 @@
 import { type FormEvent, useEffect, useMemo, useState } from "react";
 import { useSearchParams } from "react-router-dom";
 
-const API_BASE_URL =
-  import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000";
-
-const getAuthToken = () => localStorage.getItem("access_token");
+import api from "../../lib/api";
 
 interface AwardResponseUser {
   id: number;
@@ -55,9 +52,6 @@ export const AdminPccAwardPage: React.FC = () => {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    const token = getAuthToken();
-    if (!token) return;
-
     if (!logId) {
       setSegLog(null);
       setSegError(null);
@@ -71,26 +65,14 @@ export const AdminPccAwardPage: React.FC = () => {
       setSegLog(null);
 
       try {
-        const res = await fetch(
-          `${API_BASE_URL}/api/v1/admin/segregation/logs/${logId}`,
-          {
-            headers: { Authorization: `Bearer ${token}` },
-          },
-        );
-
-        if (!res.ok) {
-          const data = await res.json().catch(() => null);
-          throw new Error(data?.detail || "Failed to load segregation log.");
-        }
-
-        const data = (await res.json()) as SegregationLogDetail;
+        const { data } = await api.get<SegregationLogDetail>(`/admin/segregation/logs/${logId}`);
         setSegLog(data);
 
         setUserId(String(data.citizen.id));
         setTokens(data.recommended_pcc ? String(data.recommended_pcc) : "");
         setReason(`Segregation reward · Log #${data.id} · Score ${data.score}`);
       } catch (e: any) {
-        setSegError(e?.message || "Error loading segregation log.");
+        setSegError(e?.response?.data?.detail || "Failed to load segregation log.");
       } finally {
         setSegLoading(false);
       }
@@ -126,35 +108,15 @@ export const AdminPccAwardPage: React.FC = () => {
       return;
     }
 
-    const token = getAuthToken();
-    if (!token) {
-      setError("Not authenticated.");
-      return;
-    }
-
     setLoading(true);
 
     try {
-      const res = await fetch(`${API_BASE_URL}/api/v1/admin/pcc/award`, {
-        method: "POST",
-        headers: {
-          Authorization: `Bearer ${token}`,
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          user_id: parsedUserId,
-          tokens: parsedTokens,
-          reason: reason.trim() || undefined,
-        }),
+      const { data } = await api.post<AwardResponse>("/admin/pcc/award", {
+        user_id: parsedUserId,
+        tokens: parsedTokens,
+        reason: reason.trim() || undefined,
       });
 
-      if (!res.ok) {
-        const data = await res.json().catch(() => null);
-        throw new Error(data?.detail || "Failed to award PCC tokens.");
-      }
-
-      const data = (await res.json()) as AwardResponse;
-
       setSuccess(
         `Awarded ${parsedTokens.toFixed(1)} PCC to ${data.user.email}. New balance: ${data.new_balance.toFixed(1)}.`,
       );
@@ -162,7 +124,7 @@ export const AdminPccAwardPage: React.FC = () => {
       setTokens("");
       setReason("");
     } catch (err: any) {
-      setError(err?.message || "Error awarding PCC tokens.");
+      setError(err?.response?.data?.detail || "Failed to award PCC tokens.");
     } finally {
       setLoading(false);
     }
@@ -184,40 +146,17 @@ export const AdminPccAwardPage: React.FC = () => {
       return;
     }
 
-    const token = getAuthToken();
-    if (!token) {
-      setError("Not authenticated.");
-      return;
-    }
-
     setLoading(true);
 
     try {
-      const res = await fetch(
-        `${API_BASE_URL}/api/v1/admin/segregation/logs/${logId}/award-pcc`,
+      const { data } = await api.post<{ awarded_pcc: number; new_balance: number }>(
+        `/admin/segregation/logs/${logId}/award-pcc`,
         {
-          method: "POST",
-          headers: {
-            Authorization: `Bearer ${token}`,
-            "Content-Type": "application/json",
-          },
-          body: JSON.stringify({
-            pcc_tokens: parsedTokens,
-            reason: reason.trim() || undefined,
-          }),
+          pcc_tokens: parsedTokens,
+          reason: reason.trim() || undefined,
         },
       );
 
-      if (!res.ok) {
-        const data = await res.json().catch(() => null);
-        throw new Error(data?.detail || "Failed to award PCC for log.");
-      }
-
-      const data = (await res.json()) as {
-        awarded_pcc: number;
-        new_balance: number;
-      };
-
       setSuccess(
         `Awarded ${data.awarded_pcc.toFixed(1)} PCC for segregation log #${logId}. Citizen new balance: ${data.new_balance.toFixed(1)}.`,
       );
@@ -231,7 +170,7 @@ export const AdminPccAwardPage: React.FC = () => {
           : prev,
       );
     } catch (err: any) {
-      setError(err?.message || "Error awarding PCC for log.");
+      setError(err?.response?.data?.detail || "Failed to award PCC for log.");
     } finally {
       setLoading(false);
     }
@@ -2,10 +2,7 @@
 
 import { useEffect, useState } from "react";
 
-const API_BASE_URL =
-  import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000";
-
-const getAuthToken = () => localStorage.getItem("access_token");
+import api from "../../lib/api";
 
 type UserRole = "CITIZEN" | "BULK_GENERATOR" | "WASTE_WORKER" | "SUPER_ADMIN";
 
@@ -33,43 +30,22 @@ export const AdminUsersPage: React.FC = () => {
   const [pincodeFilter, setPincodeFilter] = useState("");
   const [search, setSearch] = useState("");
 
-  const token = getAuthToken();
-
   const loadUsers = async () => {
-    if (!token) {
-      setError("Not authenticated.");
-      setLoading(false);
-      return;
-    }
-
     setLoading(true);
     setError(null);
 
-    const params = new URLSearchParams();
-    if (roleFilter) params.append("role", roleFilter);
-    if (statusFilter) params.append("status", statusFilter);
-    if (pincodeFilter) params.append("pincode", pincodeFilter.trim());
-    if (search) params.append("search", search.trim());
+    const params: Record<string, string> = {};
+    if (roleFilter) params.role = roleFilter;
+    if (statusFilter) params.status = statusFilter;
+    if (pincodeFilter) params.pincode = pincodeFilter.trim();
+    if (search) params.search = search.trim();
 
     try {
-      const res = await fetch(
-        `${API_BASE_URL}/api/v1/admin/users?${params.toString()}`,
-        {
-          headers: {
-            Authorization: `Bearer ${token}`,
-          },
-        }
-      );
-
-      if (!res.ok) {
-        throw new Error("Failed to load users.");
-      }
-
-      const data = (await res.json()) as AdminUser[];
-      setUsers(data);
+      const res = await api.get<AdminUser[]>("/admin/users", { params });
+      setUsers(res.data);
     } catch (err: any) {
       console.error(err);
-      setError(err.message ?? "Error loading users.");
+      setError(err?.response?.data?.detail ?? "Failed to load users.");
     } finally {
       setLoading(false);
     }
@@ -81,30 +57,12 @@ export const AdminUsersPage: React.FC = () => {
   }, []);
 
   const patchUser = async (userId: number, path: string, body?: any) => {
-    if (!token) return;
-
     try {
-      const res = await fetch(
-        `${API_BASE_URL}/api/v1/admin/users/${userId}/${path}`,
-        {
-          method: "PATCH",
-          headers: {
-            Authorization: `Bearer ${token}`,
-            "Content-Type": "application/json",
-          },
-          body: body ? JSON.stringify(body) : undefined,
-        }
-      );
-
-      if (!res.ok) {
-        const data = await res.json().catch(() => null);
-        throw new Error(data?.detail || "Request failed");
-      }
-
+      await api.patch(`/admin/users/${userId}/${path}`, body);
       await loadUsers();
     } catch (err: any) {
       console.error(err);
-      setError(err.message ?? "Update failed.");
+      setError(err?.response?.data?.detail ?? "Update failed.");
     }
   };
 